@@ -0,0 +1,99 @@
+"""Microbenchmark: per-command latency over the daemon socket vs in-process.
+
+Serves a real ``BrowserManager`` on a private socket and sends the same
+commands through ``DaemonClient`` (in each available encoding) and directly to
+``BrowserManager.execute``, as ``--mode inproc`` does. Commands are
+``execute-js`` calls on a mock page that returns a canned result, so the numbers
+are dispatch and IPC overhead only.
+
+Usage:
+    python benchmarks/bench_inproc.py [--repeat 200]
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from unittest.mock import AsyncMock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from playwright_mcp.browser_daemon.browser_manager import BrowserManager  # noqa: E402
+from playwright_mcp.browser_daemon.core.client import DaemonClient  # noqa: E402
+from playwright_mcp.browser_daemon.core.protocol import available_encodings  # noqa: E402
+
+SESSION_ID = "session_bench"
+PAGE_ID = "page_bench"
+
+# Canned page.evaluate results, keyed by script
+RESULTS = {
+    "small": {"title": "Example Domain", "links": 3},
+    "large": [{"tag": "a", "text": f"Link number {i}", "href": f"/news/{i}.html"} for i in range(2000)],
+}
+
+COMMANDS = {
+    "ping": ("ping", {}),
+    "execute-js (small)": ("execute-js", {"session_id": SESSION_ID, "page_id": PAGE_ID, "script": "small"}),
+    "execute-js (2000 rows)": ("execute-js", {"session_id": SESSION_ID, "page_id": PAGE_ID, "script": "large"}),
+}
+
+
+async def median_latency(call, repeat: int) -> float:
+    """Median seconds per call, after a short warm-up."""
+    for _ in range(min(repeat, 10)):
+        await call()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await call()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+async def run(repeat: int):
+    manager = BrowserManager()
+    page = AsyncMock()
+    page.evaluate = AsyncMock(side_effect=RESULTS.get)
+    manager.session_manager.sessions[SESSION_ID] = object()
+    manager.session_manager.pages[PAGE_ID] = page
+
+    directory = tempfile.mkdtemp(prefix="pwmcp")
+    socket_path = os.path.join(directory, "daemon.sock")
+    server = await asyncio.start_unix_server(manager.handle_connection, socket_path)
+    try:
+        encodings = available_encodings()
+        print(f"{'command':<24}" + "".join(f"{'socket/' + e:>16}" for e in encodings) + f"{'inproc':>12}{'saved':>12}")
+        for name, (command, args) in COMMANDS.items():
+            socket_times = []
+            for encoding in encodings:
+                client = DaemonClient(socket_path, encodings=[encoding])
+                try:
+                    socket_times.append(await median_latency(lambda: client.request(command, dict(args)), repeat))
+                finally:
+                    await client.close()
+            inproc = await median_latency(lambda: manager.execute(command, dict(args)), repeat)
+            socket_columns = "".join(f"{t * 1e6:>13.0f} us" for t in socket_times)
+            saved = min(socket_times) - inproc
+            print(f"{name:<24}{socket_columns}{inproc * 1e6:>9.0f} us{saved * 1e6:>9.0f} us")
+    finally:
+        # Let the daemon side finish closing the client connections
+        await asyncio.sleep(0.1)
+        server.close()
+        await server.wait_closed()
+        manager.session_manager.sessions.pop(SESSION_ID, None)
+        manager.session_manager.pages.pop(PAGE_ID, None)
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200, help="Calls per measurement")
+    args = parser.parse_args()
+    asyncio.run(run(args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Microbenchmark: JSON vs MessagePack for daemon IPC payloads.
+
+Builds real ``search-dom`` replies by running ``DOMHandler`` over an HTML page,
+then times encoding to frames and decoding back for each available encoding.
+
+Usage:
+    python benchmarks/bench_serialization.py [--html page.html ...] [--repeat 20]
+
+Without ``--html`` a generated news-style page of a few thousand elements is
+used. Save real pages with ``page.content()`` and pass them in to benchmark
+against your own sites.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from playwright_mcp.browser_daemon.core.protocol import (  # noqa: E402
+    HEADER, available_encodings, decode_message, encode_frames,
+)
+from playwright_mcp.browser_daemon.handlers.dom import DOMHandler  # noqa: E402
+
+
+def generated_page(articles: int = 400) -> str:
+    """A news homepage with navigation, article cards and a footer."""
+    nav = "".join(
+        f'<li class="nav-item"><a class="nav-link" href="/section/{i}" data-track="nav-{i}">Section {i}</a></li>'
+        for i in range(40)
+    )
+    cards = "".join(
+        f'<article class="card story" id="story-{i}" data-story-id="{i}">'
+        f'<a class="card-link" href="/news/2025/01/story-{i}.html">'
+        f'<img class="card-image" src="/img/{i}.jpg" alt="Photo for story {i}" loading="lazy"></a>'
+        f'<h2 class="card-title"><a href="/news/2025/01/story-{i}.html">Breaking news headline number {i}</a></h2>'
+        f'<p class="card-summary">Summary text for story {i} with enough words to look like a real teaser.</p>'
+        f'<span class="byline">By Reporter {i % 17}</span></article>'
+        for i in range(articles)
+    )
+    footer = "".join(f'<a class="footer-link" href="/about/{i}">About link {i}</a>' for i in range(60))
+    return (
+        "<html><head><title>Example News</title></head><body>"
+        f'<header class="site-header"><nav class="main-nav"><ul>{nav}</ul></nav></header>'
+        f'<main class="content">{cards}</main><footer class="site-footer">{footer}</footer>'
+        "</body></html>"
+    )
+
+
+async def search_dom_payloads(html: str) -> dict:
+    """Run DOMHandler search-dom queries over ``html`` and return the replies."""
+    page = AsyncMock()
+    page.content = AsyncMock(return_value=html)
+    session_manager = MagicMock()
+    session_manager.get_page = MagicMock(return_value=page)
+    handler = DOMHandler(session_manager)
+
+    queries = {
+        "tag=a": {"search_tag": "a"},
+        "text=news": {"search_text": "news"},
+        "text=card": {"search_text": "card"},
+    }
+    payloads = {}
+    for name, query in queries.items():
+        payloads[name] = await handler.handle(dict(query, command="search-dom", page_id="page"))
+    return payloads
+
+
+def time_round_trip(message: dict, encoding: str, repeat: int):
+    """Return (encoded size, median encode seconds, median decode seconds)."""
+    encode_times, decode_times = [], []
+    size = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        frames = list(encode_frames(1, message, encoding))
+        encode_times.append(time.perf_counter() - start)
+
+        payload = bytearray()
+        for frame in frames:
+            payload += memoryview(frame)[HEADER.size:]
+        size = len(payload)
+
+        start = time.perf_counter()
+        decode_message(payload, encoding)
+        decode_times.append(time.perf_counter() - start)
+    return size, statistics.median(encode_times), statistics.median(decode_times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--html", nargs="*", default=[], help="Saved HTML pages to search")
+    parser.add_argument("--repeat", type=int, default=20, help="Iterations per measurement")
+    args = parser.parse_args()
+
+    pages = {"generated": generated_page()}
+    for path in args.html:
+        with open(path, encoding="utf-8") as f:
+            pages[os.path.basename(path)] = f.read()
+
+    encodings = available_encodings()
+    if len(encodings) == 1:
+        print("msgpack is not installed; only JSON will be measured (pip install msgpack)")
+
+    print(f"{'page':<16}{'query':<12}{'matches':>8}{'encoding':>10}{'bytes':>12}{'encode ms':>11}{'decode ms':>11}")
+    for page_name, html in pages.items():
+        payloads = asyncio.run(search_dom_payloads(html))
+        for query, message in payloads.items():
+            for encoding in encodings:
+                size, encode_s, decode_s = time_round_trip(message, encoding, args.repeat)
+                print(
+                    f"{page_name:<16}{query:<12}{message.get('total', 0):>8}{encoding:>10}"
+                    f"{size:>12,}{encode_s * 1000:>11.2f}{decode_s * 1000:>11.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Benchmark: session-creation latency under bursty load, with and without the warm pool.
+
+Each burst starts ``--burst`` sessions at once (``launch_browser`` plus the first
+``new_page``, as ``navigate`` does), then waits ``--gap-ms`` for the pool to
+refill. The browser is simulated with fixed delays for launch, context and page
+creation, so the numbers show what the pool hides rather than any one machine's
+browser start-up time.
+
+Usage:
+    python benchmarks/bench_sessions.py [--bursts 20] [--burst 4] [--pool-size 4]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from unittest.mock import MagicMock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from playwright_mcp.browser_daemon.core.session import SessionManager, WarmPool  # noqa: E402
+
+
+class SimulatedBrowser:
+    """Browser, context and page stand-ins that take a fixed time to create."""
+
+    def __init__(self, delays):
+        self.delays = delays
+
+    def is_connected(self):
+        return True
+
+    async def new_context(self):
+        await asyncio.sleep(self.delays["context"])
+        context = MagicMock()
+        context.new_page = self.new_page
+        context.close = self.close
+        return context
+
+    async def new_page(self):
+        await asyncio.sleep(self.delays["page"])
+        return MagicMock()
+
+    async def close(self):
+        pass
+
+
+async def run(pool_size: int, bursts: int, burst: int, gap: float, delays) -> tuple:
+    """Return the seconds each session took to be ready for its first navigation, and pool stats."""
+    manager = SessionManager()
+    manager.sessions.clear()
+    manager.pages.clear()
+    manager.browsers.clear()
+
+    async def launch(browser_type, headless):
+        await asyncio.sleep(delays["launch"])
+        return SimulatedBrowser(delays)
+
+    manager._launch_browser = launch
+    manager.pool = WarmPool(manager._warm_session, pool_size)
+    manager._watch_page = lambda page_id, page: None
+    # Traffic starts once the start-up warm-up is done
+    await manager.pool.fill(("chromium", True))
+
+    async def start_session():
+        started = time.perf_counter()
+        session_id = await manager.launch_browser()
+        await manager.new_page(session_id)
+        return time.perf_counter() - started
+
+    times = []
+    for _ in range(bursts):
+        times += await asyncio.gather(*(start_session() for _ in range(burst)))
+        await asyncio.sleep(gap)
+    stats = manager.pool.stats()
+    await manager.shutdown()
+    return times, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bursts", type=int, default=20, help="Number of bursts")
+    parser.add_argument("--burst", type=int, default=4, help="Sessions started at once in each burst")
+    parser.add_argument("--gap-ms", type=float, default=200, help="Pause between bursts")
+    parser.add_argument("--pool-size", type=int, default=4, help="Warm sessions per browser type")
+    parser.add_argument("--launch-ms", type=float, default=800, help="Simulated browser launch time")
+    parser.add_argument("--context-ms", type=float, default=15, help="Simulated context creation time")
+    parser.add_argument("--page-ms", type=float, default=30, help="Simulated page creation time")
+    args = parser.parse_args()
+    delays = {"launch": args.launch_ms / 1000, "context": args.context_ms / 1000, "page": args.page_ms / 1000}
+
+    print(f"{'pool size':<12}{'p50':>10}{'p99':>10}{'max':>10}   hits/misses")
+    for size in (0, args.pool_size):
+        times, stats = asyncio.run(run(size, args.bursts, args.burst, args.gap_ms / 1000, delays))
+        times.sort()
+        p99 = times[min(len(times) - 1, int(len(times) * 0.99))]
+        print(f"{size:<12}{statistics.median(times) * 1000:>7.1f} ms{p99 * 1000:>7.1f} ms"
+              f"{times[-1] * 1000:>7.1f} ms   {stats['hits']}/{stats['misses']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Cold-start benchmark: time from launching the daemon to its first ``pong``.
+
+Each run launches ``python -m playwright_mcp.browser_daemon`` on a private
+socket, waits for its readiness signal and pings it over a fresh connection.
+Exits non-zero when the median exceeds the budget, so it can gate CI.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 5] [--budget-ms 500]
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+sys.path.insert(0, SRC)
+
+from playwright_mcp.browser_daemon.core.client import DaemonClient  # noqa: E402
+from playwright_mcp.browser_daemon.core.readiness import READY_FD_ENV, wait_until_ready  # noqa: E402
+
+
+async def time_to_first_pong() -> tuple:
+    """Launch one daemon and return (seconds until ready, seconds until first pong)."""
+    directory = tempfile.mkdtemp(prefix="pwmcp")
+    read_fd, write_fd = os.pipe()
+    env = dict(os.environ, PYTHONPATH=SRC, TMPDIR=directory, LOG_LEVEL="WARNING", **{READY_FD_ENV: str(write_fd)})
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "playwright_mcp.browser_daemon"],
+        env=env, pass_fds=(write_fd,), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    os.close(write_fd)
+    client = DaemonClient(os.path.join(directory, "playwright_mcp.sock"))
+    try:
+        if not await wait_until_ready(read_fd, timeout=60):
+            raise RuntimeError(f"Daemon exited during startup with code {process.wait()}")
+        ready = time.perf_counter() - started
+        await client.request("ping", {}, timeout=5)
+        return ready, time.perf_counter() - started
+    finally:
+        await client.close()
+        process.terminate()
+        process.wait()
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def import_time(module: str) -> float:
+    """Seconds a fresh interpreter spends importing ``module``."""
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    output = subprocess.run(
+        [sys.executable, "-c", code], env=dict(os.environ, PYTHONPATH=SRC), capture_output=True, text=True, check=True
+    ).stdout
+    return float(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Daemon launches to measure")
+    parser.add_argument("--budget-ms", type=float, default=500, help="Maximum median time to first pong")
+    args = parser.parse_args()
+
+    readies, pongs = [], []
+    for run in range(args.runs):
+        ready, pong = asyncio.run(time_to_first_pong())
+        readies.append(ready)
+        pongs.append(pong)
+        print(f"run {run + 1}: ready {ready * 1000:7.1f} ms   first pong {pong * 1000:7.1f} ms")
+
+    median = statistics.median(pongs) * 1000
+    print(f"median: ready {statistics.median(readies) * 1000:.1f} ms, first pong {median:.1f} ms "
+          f"(budget {args.budget_ms:.0f} ms)")
+    print(f"import playwright_mcp.mcp_server.server: "
+          f"{import_time('playwright_mcp.mcp_server.server') * 1000:.1f} ms (not budgeted; mostly the mcp SDK)")
+
+    if median > args.budget_ms:
+        print("FAIL: time to first pong is over budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
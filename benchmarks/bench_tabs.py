@@ -0,0 +1,68 @@
+"""Soak benchmark: tab churn with and without page recycling.
+
+Opens and closes ``--tabs`` tabs one after another in a single session, the way
+``new-tab``/``close-tab`` do, loading a small page in each. Runs once with
+recycling off (every tab closed and created again) and once with it on, and
+reports latency per tab and the RSS of the browser processes as the run goes.
+Needs a real browser (``playwright install chromium``).
+
+Usage:
+    python benchmarks/bench_tabs.py [--tabs 2000] [--browser chromium]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from playwright_mcp.browser_daemon.core.reaper import process_tree_rss  # noqa: E402
+from playwright_mcp.browser_daemon.core.session import SessionManager  # noqa: E402
+
+PAGE = "data:text/html,<title>tab</title><h1>Tab</h1><script>sessionStorage.setItem('k', 'v')</script>"
+SAMPLES = 5
+
+
+async def soak(manager: SessionManager, session_id: str, tabs: int) -> tuple:
+    """Churn through ``tabs`` tabs; return seconds per tab and (tab, RSS) samples."""
+    times, memory = [], []
+    every = max(1, tabs // SAMPLES)
+    for tab in range(tabs):
+        started = time.perf_counter()
+        page_id = await manager.new_page(session_id)
+        await manager.get_page(page_id).goto(PAGE)
+        await manager.close_page(page_id)
+        times.append(time.perf_counter() - started)
+        if (tab + 1) % every == 0:
+            memory.append((tab + 1, process_tree_rss()))
+    return times, memory
+
+
+async def run(tabs: int, browser_type: str):
+    manager = SessionManager()
+    try:
+        for label, free_pages in (("close and create", 0), ("recycle", manager.max_free_pages or 4)):
+            manager.max_free_pages = free_pages
+            session_id = await manager.launch_browser(browser_type)
+            times, memory = await soak(manager, session_id, tabs)
+            await manager.close_browser(session_id)
+            times.sort()
+            p99 = times[min(len(times) - 1, int(len(times) * 0.99))]
+            print(f"{label}: p50 {statistics.median(times) * 1000:.1f} ms, p99 {p99 * 1000:.1f} ms per tab")
+            print("  browser RSS: " + ", ".join(f"{n} tabs {rss / 2**20:.0f} MiB" for n, rss in memory))
+    finally:
+        await manager.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tabs", type=int, default=2000, help="Tabs to open and close per run")
+    parser.add_argument("--browser", default="chromium", help="Browser type")
+    args = parser.parse_args()
+    asyncio.run(run(args.tabs, args.browser))
+
+
+if __name__ == "__main__":
+    main()
@@ -10,9 +10,12 @@ sys.path.append(project_root)
 
 
 @click.group()
-def cli():
+@click.option("--har", help="Record or replay the daemon's traffic, e.g. record:news-site or replay:news-site.")
+def cli(har):
     """Functional test runner CLI."""
-    pass
+    if har:
+        # Inherited by the daemon the tests start, which applies it to every new session
+        os.environ["PLAYWRIGHT_MCP_HAR"] = har
 
 
 @cli.command()
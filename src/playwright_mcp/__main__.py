@@ -44,6 +44,28 @@ async def run_both():
         raise
 
 
+async def run_inproc():
+    """Run the MCP server with the browser manager in the same process and event loop.
+
+    Tool calls are dispatched straight to the manager's handlers, with no
+    daemon process, socket or serialization in between. Suited to a single
+    MCP client.
+    """
+    from .browser_daemon.browser_manager import BrowserManager
+    from .mcp_server.handlers.utils import set_inproc_manager
+
+    manager = BrowserManager()
+    set_inproc_manager(manager)
+    manager.start_background_tasks()
+    try:
+        await start_server()
+    except KeyboardInterrupt:
+        logger.info("Server stopped by user")
+    finally:
+        set_inproc_manager(None)
+        await manager.shutdown()
+
+
 async def run_server_only():
     """Run only the MCP server without the browser daemon."""
     try:
@@ -60,9 +82,9 @@ def main():
     parser = argparse.ArgumentParser(description="Playwright MCP Server")
     parser.add_argument(
         "--mode",
-        choices=["server", "both"],
+        choices=["server", "both", "inproc"],
         default="both",
-        help="Run mode: server-only or both server and daemon"
+        help="Run mode: server-only, both server and daemon, or the daemon inside the server process"
     )
     parser.add_argument(
         "--debug",
@@ -75,6 +97,8 @@ def main():
     try:
         if args.mode == "server":
             asyncio.run(run_server_only())
+        elif args.mode == "inproc":
+            asyncio.run(run_inproc())
         else:
             asyncio.run(run_both())
     except KeyboardInterrupt:
@@ -1,22 +1,31 @@
 """Main entry point for the browser daemon."""
+import argparse
 import asyncio
+from typing import Optional
 from playwright_mcp.utils.logging import setup_logging
-from .browser_manager import BrowserManager
 
 
 # Configure logging
 logger = setup_logging("browser_daemon")
 
 
-async def main():
+async def main(socket_path: Optional[str] = None, workers: Optional[int] = None):
     """Start and run the browser manager."""
     logger.info("Starting server initialization")
     try:
-        manager = BrowserManager()
+        from .browser_manager import BrowserManager
+        from .core.workers import exit_with_parent
+        manager = BrowserManager(socket_path, workers)
+        worker = exit_with_parent()
         logger.info("Starting browser manager service")
-        await manager.start()
-        logger.info("Browser manager started successfully")
-        await asyncio.Event().wait()  # Keep the daemon running
+        try:
+            await manager.start()
+            logger.info("Browser manager started successfully")
+            await asyncio.Event().wait()  # Keep the daemon running
+        except asyncio.CancelledError:
+            if not worker:
+                raise
+            await manager.shutdown()
     except Exception as e:
         logger.error(f"Failed to start browser manager: {e}", exc_info=True)
         raise
@@ -24,8 +33,29 @@ async def main():
 
 def run():
     """Run the browser manager."""
+    parser = argparse.ArgumentParser(description="Playwright MCP browser daemon")
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Report startup phase timings and import time by package, then exit"
+    )
+    parser.add_argument(
+        "--socket",
+        help="Listen on this Unix socket path, or on tcp://HOST:PORT, instead of the default socket"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Run browsers in this many worker processes behind one socket (default: $PLAYWRIGHT_MCP_WORKERS or 0)"
+    )
+    args = parser.parse_args()
+    if args.profile_startup:
+        from .startup_profile import main as profile_main
+        profile_main()
+        return
+
     try:
-        asyncio.run(main())
+        asyncio.run(main(args.socket, args.workers))
     except KeyboardInterrupt:
         logger.info("Shutting down browser manager...")
     except Exception as e:
@@ -1,7 +1,20 @@
 import asyncio
+import hmac
+import os
+from typing import Any, Dict, Optional
 
-from .core.server import UnixSocketServer
+from .core.server import TcpSocketServer, UnixSocketServer
+from .core.blobs import blob_store
+from .core.events import Subscription, event_bus
+from .core.readiness import notify_ready
+from .core.monitor import ResourceMonitor
+from .core.reaper import Reaper
+from .core.scheduler import CommandScheduler, Overloaded
+from .core.protocol import (
+    TOKEN_ENV, MessageReader, available_encodings, is_loopback, negotiate_encoding, parse_tcp_address,
+)
 from .core.session import session_manager
+from .core.workers import WORKERS_ENV, WorkerPool
 from .handlers.navigation import NavigationHandler
 from .handlers.dom import DOMHandler
 from .handlers.screenshot import ScreenshotHandler
@@ -9,21 +22,46 @@ from .handlers.session import SessionHandler
 from .handlers.interaction import InteractionHandler
 from .handlers.ai_agent import AIAgentHandler
 from .handlers.get_result import GetResultHandler
+from .handlers.batch import BatchHandler
+from .handlers.bulk import BulkNavigationHandler
+from .handlers.crawl import CrawlHandler
 from ..utils.logging import setup_logging
 from .handlers.ai_agent.job_store import job_store
 
 logger = setup_logging("browser_manager", "browser_manager.log")
 
+# Commands that bypass the scheduler: batch schedules each of its steps,
+# navigate-many each of its URLs, and a waiting get-ai-result or crawl-status
+# would hold a slot while doing no browser work
+UNSCHEDULED_COMMANDS = {"batch", "navigate-many", "get-ai-result", "crawl-status"}
+
 
 class BrowserManager:
-    def __init__(self):
+    def __init__(self, socket_path: Optional[str] = None, workers: Optional[int] = None):
         logger.info("Starting server initialization")
         # Use the shared session manager instance
         self.session_manager = session_manager
         logger.debug(f"BrowserManager using session manager instance: {id(self.session_manager)}")
         
-        self.server = UnixSocketServer()
+        tcp = parse_tcp_address(socket_path) if socket_path else None
+        # TCP clients must present this in their hello; Unix sockets rely on file permissions
+        self.token = os.getenv(TOKEN_ENV) if tcp else None
+        if tcp and not self.token and not is_loopback(tcp[0]):
+            # Anyone who can reach the port could run scripts in the browsers and write files
+            raise ValueError(f"Set {TOKEN_ENV} to listen on {socket_path}, which other hosts can reach")
+        self.server = TcpSocketServer(*tcp) if tcp else UnixSocketServer(socket_path)
         self.job_store = job_store  # Use the singleton job store instance
+        self.blob_store = blob_store
+        self.event_bus = event_bus
+        self.scheduler = CommandScheduler()
+        self.reaper = Reaper(self.session_manager, busy=self.scheduler.is_busy)
+        self.monitor = ResourceMonitor(self.session_manager, busy=self.scheduler.is_busy, hold=self.scheduler.hold)
+        self._listening = False
+
+        # With workers, this manager only dispatches: browsers live in the worker processes
+        if workers is None:
+            workers = int(os.getenv(WORKERS_ENV, "0"))
+        self.workers = WorkerPool(workers, self.event_bus) if workers > 0 else None
         
         # Initialize handlers with the same session manager instance
         logger.debug("Initializing handlers")
@@ -34,12 +72,16 @@ class BrowserManager:
         interaction_handler = InteractionHandler(self.session_manager)
         ai_agent_handler = AIAgentHandler(self.session_manager)
         get_result_handler = GetResultHandler(self.session_manager)
+        batch_handler = BatchHandler(self.session_manager, self.dispatch)
+        bulk_handler = BulkNavigationHandler(self.session_manager, self.scheduler.run)
+        crawl_handler = CrawlHandler(self.session_manager, self.scheduler.run)
 
         # Map commands to handlers
         self.handlers = {
             # Navigation commands
             "navigate": nav_handler,
             "new-tab": nav_handler,
+            "navigate-many": bulk_handler,
             
             # DOM commands
             "execute-js": dom_handler,
@@ -54,6 +96,9 @@ class BrowserManager:
             "new-session": session_handler,
             "close-session": session_handler,
             "close-tab": session_handler,
+            "save-storage": session_handler,
+            "list-storage": session_handler,
+            "delete-storage": session_handler,
             
             # Interaction commands
             "interact-dom": interaction_handler,
@@ -61,49 +106,192 @@ class BrowserManager:
             # AI agent commands
             "ai-agent": ai_agent_handler,
             "get-ai-result": get_result_handler,
+
+            # Batch commands
+            "batch": batch_handler,
+
+            # Crawl commands
+            "crawl": crawl_handler,
+            "crawl-status": crawl_handler,
+            "cancel-crawl": crawl_handler,
         }
         logger.info("MCP server initialized")
 
-    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
-        """Handle a connection from a client."""
+    async def dispatch(self, command: str, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a single command and return its response."""
+        if not command:
+            return {"error": "No command specified"}
+        if command == "ping":
+            return {"result": "pong"}
+        if command == "hello":
+            offered = args.get("encodings", [])
+            return {"encoding": negotiate_encoding(offered), "encodings": available_encodings()}
+        if command == "stats":
+            return await self.stats()
+        if self.workers:
+            return await self.workers.execute(command, args)
+
+        handler = self.handlers.get(command)
+        if not handler:
+            return {"error": f"Unknown command: {command}"}
+
+        # Add command to args so handler knows what to do
+        args["command"] = command
+        if command in UNSCHEDULED_COMMANDS:
+            return await handler.handle(args)
+
+        page_id = args.get("page_id")
+        for key in (page_id, args.get("session_id")):
+            reason = key and self.session_manager.eviction_reason(key)
+            if reason:
+                return {"error": f"{key} was closed by the daemon ({reason})", "code": "evicted"}
+
+        session_id = args.get("session_id")
+        if session_id and page_id in self.session_manager.pages and not self.session_manager.owns(session_id, page_id):
+            return {"error": f"Page {page_id} does not belong to session {session_id}"}
+        session_id = session_id or (page_id and self.session_manager.session_for_page(page_id))
+        self.session_manager.touch(page_id, session_id)
         try:
-            request = await self.server.read_command(reader)
-            logger.debug(f"Received request: {request}")
-            
-            command = request.get("command")
-            args = request.get("args", {})
-            if not command:
-                response = {"error": "No command specified"}
-            elif command == "ping":
-                response = {"result": "pong"}
-            else:
-                handler = self.handlers.get(command)
-                if not handler:
-                    response = {"error": f"Unknown command: {command}"}
-                else:
-                    # Add command to args so handler knows what to do
-                    args["command"] = command
-                    response = await handler.handle(args)
-
-            logger.info(f"Sending response: {response}")
-            await self.server.send_response(writer, response)
+            return await self.scheduler.run(lambda: handler.handle(args), page_id, session_id)
+        except Overloaded as e:
+            logger.warning(f"Rejected {command}: {e}")
+            return {"error": f"Browser daemon is overloaded: {e}", "code": "overloaded"}
+        finally:
+            self.session_manager.touch(page_id, session_id)
+
+    async def stats(self) -> Dict[str, Any]:
+        """Report open sessions and pages, reuse and eviction counters, resource use and scheduler load.
+
+        A front dispatcher reports each worker's stats instead.
+        """
+        if self.workers:
+            return {"workers": await self.workers.stats()}
+        return {
+            "sessions": len(self.session_manager.sessions),
+            "pages": len(self.session_manager.pages),
+            "free_pages": sum(len(pages) for pages in self.session_manager.free_pages.values()),
+            "recycled_pages": self.session_manager.recycled_pages,
+            "pool": self.session_manager.pool.stats(),
+            "evictions": self.reaper.stats(),
+            "resources": self.monitor.stats(),
+            "http_cache": self.session_manager.http_cache.stats() if self.session_manager.http_cache else None,
+            "scheduler": self.scheduler.stats(),
+        }
 
+    async def execute(self, command: str, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a command for a client, reporting any failure as an error response.
+
+        This is the entry point for both socket clients and an MCP server
+        running the manager in-process, so both see the same responses.
+        """
+        try:
+            return await self.dispatch(command, args)
+        except Exception as e:
+            logger.error(f"Error handling {command}: {e}")
+            return {"error": str(e)}
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Handle a connection from a client.
+
+        The connection stays open until the client closes it. Each request is
+        dispatched in its own task, so replies may be sent out of order; clients
+        match them up using the request id in the frame header. Events the client
+        subscribes to are pushed on the same connection.
+        """
+        messages = MessageReader(reader)
+        subscription = Subscription(self.event_bus, writer)
+        pending = set()
+        authenticated = not self.token
+        try:
+            while True:
+                message = await self.server.read_command(messages)
+                if message is None:
+                    break
+                request_id, request, encoding = message
+                if not authenticated:
+                    if not self._authenticate(request):
+                        logger.warning("Rejected a connection without a valid token")
+                        response = {"error": "Authentication required", "code": "unauthorized"}
+                        await self.server.send_response(writer, request_id, response, encoding)
+                        break
+                    authenticated = True
+                task = asyncio.create_task(
+                    self._handle_request(request_id, request, encoding, writer, subscription)
+                )
+                pending.add(task)
+                task.add_done_callback(pending.discard)
         except Exception as e:
             logger.error(f"Error handling connection: {e}")
-            error_response = {"error": str(e)}
-            await self.server.send_response(writer, error_response)
+        finally:
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+            subscription.close()
+            await self.server.close(writer)
+
+    def _authenticate(self, request: Dict[str, Any]) -> bool:
+        """Whether a connection's first request is a hello with the right token."""
+        token = (request.get("args") or {}).get("token")
+        if request.get("command") != "hello" or not isinstance(token, str):
+            return False
+        return hmac.compare_digest(token.encode(), self.token.encode())
+
+    async def _handle_request(self, request_id: int, request: Dict[str, Any], encoding: str,
+                              writer: asyncio.StreamWriter, subscription: Subscription):
+        """Dispatch one request and stream its reply back in the encoding it arrived in."""
+        logger.debug(f"Received request {request_id}: {request}")
+        command = request.get("command")
+        args = request.get("args") or {}
+        # Subscriptions belong to the connection, so they bypass dispatch
+        if command == "subscribe":
+            response = subscription.subscribe(args.get("topics"), encoding)
+        elif command == "unsubscribe":
+            response = subscription.unsubscribe()
+        else:
+            response = await self.execute(command, args)
+
+        if request.get("shm"):
+            try:
+                response = self.blob_store.export(response)
+            except OSError as e:
+                # Fall back to sending the bytes inline
+                logger.warning(f"Shared memory unavailable for request {request_id}: {e}")
+
+        # Replies can hold whole pages or screenshots, so only their keys are logged
+        logger.debug(f"Sending response for request {request_id} with keys: {', '.join(response)}")
+        await self.server.send_response(writer, request_id, response, encoding)
 
     async def start(self):
         """Start the browser manager service."""
         logger.info("Starting browser manager service")
-        await self.server.start(self.handle_connection)
+        if self.workers:
+            await self.workers.start()
+        else:
+            self.start_background_tasks()
+        await self.server.start(self.handle_connection, on_ready=self._on_listening)
         logger.info("Daemon started successfully")
 
+    def start_background_tasks(self):
+        """Start warming the session pool, reaping idle sessions and pages and monitoring browsers."""
+        self.session_manager.warm_up()
+        self.reaper.start()
+        self.monitor.start()
+
+    def _on_listening(self):
+        self._listening = True
+        notify_ready()
+
     async def shutdown(self):
         """Shutdown the browser manager service."""
         logger.info("Shutting down browser manager service")
+        await self.reaper.stop()
+        await self.monitor.stop()
+        if self.workers:
+            await self.workers.close()
         await self.session_manager.shutdown()
-        await self.server.cleanup()
+        self.blob_store.cleanup()
+        # An in-process manager never listened; the socket may belong to a separate daemon
+        if self._listening:
+            self.server.cleanup()
 
 
 async def main():
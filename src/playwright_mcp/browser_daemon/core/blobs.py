@@ -0,0 +1,159 @@
+"""Shared-memory transfer of large binary results.
+
+Screenshots and other large ``bytes`` values in a reply are copied into a POSIX
+shared-memory segment by the daemon, and only a small handle travels over the
+socket::
+
+    {"__shm__": {"name": "psm_1a2b3c", "size": 1048576}}
+
+The reply also lists the segments it refers to under ``SHM_MANIFEST_KEY`` at
+its top level. The client only maps segments named there, so a handle-shaped
+value in page data (an ``execute-js`` result, say) is left alone. The client
+maps each listed segment, copies the bytes out and unlinks it. The daemon
+unlinks any segment that was never collected once it is older than
+``BLOB_TTL`` seconds, and all remaining segments on shutdown.
+"""
+import sys
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Dict, List, Set
+
+from .logging import setup_logging
+
+logger = setup_logging("blobs")
+
+SHM_KEY = "__shm__"
+# Top-level key of a reply listing the names of the segments it hands over
+SHM_MANIFEST_KEY = "__shm_segments__"
+
+# Values smaller than this are cheaper to send inline
+BLOB_THRESHOLD = 64 * 1024
+
+# Seconds an uncollected segment is kept before the daemon reclaims it
+BLOB_TTL = 60.0
+
+
+def _open_segment(**kwargs) -> shared_memory.SharedMemory:
+    """Open a segment whose lifetime we manage ourselves.
+
+    Before Python 3.13 every process that touches a segment registers it with
+    its resource tracker, which unlinks it (and warns) when that process exits.
+    Ownership moves from daemon to client here, so opt out of tracking.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(track=False, **kwargs)
+    segment = shared_memory.SharedMemory(**kwargs)
+    resource_tracker.unregister(segment._name, "shared_memory")
+    return segment
+
+
+class BlobStore:
+    """Daemon-side registry of shared-memory segments handed to clients."""
+
+    _instance = None
+    _initialized = False
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(BlobStore, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if not self._initialized:
+            self._segments: Dict[str, float] = {}
+            self.threshold = BLOB_THRESHOLD
+            self.ttl = BLOB_TTL
+            self._initialized = True
+
+    def put(self, data: bytes) -> Dict[str, Any]:
+        """Copy ``data`` into a new segment and return its handle."""
+        self.expire()
+        segment = _open_segment(create=True, size=len(data))
+        try:
+            segment.buf[:len(data)] = data
+        finally:
+            # Only unmap here; the segment lives on until the client unlinks it
+            segment.close()
+        self._segments[segment.name] = time.monotonic()
+        logger.debug(f"Exported {len(data)} bytes to shared memory segment {segment.name}")
+        return {SHM_KEY: {"name": segment.name, "size": len(data)}}
+
+    def export(self, response: Dict[str, Any]) -> Dict[str, Any]:
+        """Move large bytes values anywhere in a reply into shared memory, listing them in its manifest."""
+        names: List[str] = []
+        exported = self._export(response, names)
+        # Only the daemon may name segments for the client to collect
+        exported.pop(SHM_MANIFEST_KEY, None)
+        if names:
+            exported[SHM_MANIFEST_KEY] = names
+        return exported
+
+    def _export(self, value: Any, names: List[str]) -> Any:
+        if isinstance(value, (bytes, bytearray)) and len(value) >= self.threshold:
+            handle = self.put(value)
+            names.append(handle[SHM_KEY]["name"])
+            return handle
+        if isinstance(value, dict):
+            return {key: self._export(item, names) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [self._export(item, names) for item in value]
+        return value
+
+    def expire(self, max_age: float = None):
+        """Unlink segments that were never collected."""
+        max_age = self.ttl if max_age is None else max_age
+        cutoff = time.monotonic() - max_age
+        for name, created in list(self._segments.items()):
+            if created <= cutoff:
+                self._unlink(name)
+
+    def cleanup(self):
+        """Unlink every segment we still know about."""
+        for name in list(self._segments):
+            self._unlink(name)
+
+    def _unlink(self, name: str):
+        self._segments.pop(name, None)
+        try:
+            segment = _open_segment(name=name)
+        except FileNotFoundError:
+            return  # Already collected by the client
+        segment.close()
+        segment.unlink()
+        logger.debug(f"Reclaimed uncollected shared memory segment {name}")
+
+
+def read_blob(handle: Dict[str, Any]) -> bytes:
+    """Copy a blob out of shared memory and unlink the segment (client side)."""
+    segment = _open_segment(name=handle["name"])
+    try:
+        return bytes(segment.buf[:handle["size"]])
+    finally:
+        segment.close()
+        segment.unlink()
+
+
+def import_blobs(message: Dict[str, Any]) -> Dict[str, Any]:
+    """Replace the shared-memory handles a reply lists in its manifest with the bytes they refer to."""
+    names = message.pop(SHM_MANIFEST_KEY, None)
+    if not isinstance(names, list) or not names:
+        return message
+    return _import(message, set(names))
+
+
+def _import(value: Any, names: Set[str]) -> Any:
+    if isinstance(value, dict):
+        handle = value.get(SHM_KEY)
+        if len(value) == 1 and isinstance(handle, dict) and handle.get("name") in names:
+            names.discard(handle["name"])
+            return read_blob(handle)
+        for key, item in value.items():
+            value[key] = _import(item, names)
+    elif isinstance(value, list):
+        for index, item in enumerate(value):
+            value[index] = _import(item, names)
+    return value
+
+
+# Create the singleton instance
+blob_store = BlobStore()
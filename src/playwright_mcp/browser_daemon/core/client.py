@@ -0,0 +1,261 @@
+"""Client side of the browser daemon socket protocol."""
+import asyncio
+import itertools
+import os
+from typing import Any, Callable, Dict, List, Optional
+
+from .blobs import import_blobs
+from .logging import setup_logging
+from .protocol import (
+    ENCODING_JSON, EVENT_REQUEST_ID, TOKEN_ENV, MessageReader, available_encodings, decode_message,
+    parse_tcp_address, write_message,
+)
+
+logger = setup_logging("client")
+
+# Request ids travel in a u32 frame header
+MAX_REQUEST_ID = 2 ** 32 - 1
+
+
+class DaemonClient:
+    """A long-lived, multiplexed connection to the browser daemon.
+
+    Every request is tagged with an id in its frame header. A background task
+    reads replies and resolves the matching waiter, so many requests can be in
+    flight on the one connection and replies may arrive in any order. The
+    connection is opened on first use and re-opened transparently if the
+    daemon goes away.
+
+    On connect the client offers its payload encodings to the daemon with a
+    ``hello`` command and uses the one the daemon picks. Daemons that do not
+    understand ``hello`` are spoken to in JSON.
+
+    Unless ``shared_memory`` is off, requests tell the daemon it may hand back
+    large binary values (screenshots) through shared memory; they are read back
+    into ``bytes`` before the reply is returned.
+
+    After ``subscribe`` the daemon pushes events on the connection; they are
+    passed to the callbacks registered with ``add_event_listener``. The
+    subscription is renewed whenever the connection is re-opened.
+
+    ``socket_path`` may also be a ``tcp://host:port`` address, for a daemon on
+    another host. Shared memory is never used over TCP, and the ``token``
+    (by default ``$PLAYWRIGHT_MCP_TOKEN``) is presented in the ``hello``.
+    """
+
+    def __init__(self, socket_path: str, encodings: Optional[List[str]] = None, shared_memory: bool = True,
+                 token: Optional[str] = None):
+        self.socket_path = socket_path
+        self.tcp_address = parse_tcp_address(socket_path)
+        self.encodings = encodings or available_encodings()
+        self.shared_memory = shared_memory and self.tcp_address is None
+        self.token = token or (os.getenv(TOKEN_ENV) if self.tcp_address else None)
+        self.encoding = ENCODING_JSON
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._read_task: Optional[asyncio.Task] = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._ids = itertools.count(1)
+        self._connect_lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._event_listeners: List[Callable[[Dict[str, Any]], None]] = []
+        # Arguments of the active subscribe command, renewed on every new connection
+        self._subscription: Optional[Dict[str, Any]] = None
+
+    @property
+    def connected(self) -> bool:
+        """Whether the connection is open on the running event loop."""
+        if self._writer is None or self._writer.is_closing():
+            return False
+        return self._loop is asyncio.get_running_loop()
+
+    async def connect(self):
+        """Open the connection if it is not already open.
+
+        Raises:
+            OSError: If the daemon socket cannot be reached
+            PermissionError: If the daemon does not accept our token
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Streams and locks are bound to the loop that created them
+            self._reset(loop)
+
+        async with self._connect_lock:
+            if self.connected:
+                return
+            logger.debug(f"Opening persistent connection to {self.socket_path}")
+            if self.tcp_address:
+                self._reader, self._writer = await asyncio.open_connection(*self.tcp_address)
+            else:
+                self._reader, self._writer = await asyncio.open_unix_connection(self.socket_path)
+            self._read_task = asyncio.create_task(self._read_loop(self._reader))
+            try:
+                self.encoding = await self._negotiate()
+            except PermissionError:
+                await self.close()
+                raise
+            if self._subscription is not None:
+                await self._send("subscribe", self._subscription, self.encoding, timeout=5)
+
+    async def _negotiate(self) -> str:
+        """Agree on a payload encoding with the daemon."""
+        if self.encodings == [ENCODING_JSON] and not self.token:
+            return ENCODING_JSON
+        args = {"encodings": self.encodings}
+        if self.token:
+            args["token"] = self.token
+        reply = await self._send("hello", args, ENCODING_JSON, timeout=5)
+        if reply.get("code") == "unauthorized":
+            raise PermissionError(reply["error"])
+        encoding = reply.get("encoding", ENCODING_JSON)
+        if encoding not in self.encodings:
+            encoding = ENCODING_JSON
+        logger.debug(f"Negotiated {encoding} encoding with browser daemon")
+        return encoding
+
+    async def request(self, command: str, args: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Send a command and wait for its reply.
+
+        Args:
+            command: The command name to execute
+            args: Dictionary of arguments for the command
+            timeout: Optional number of seconds to wait for the reply
+
+        Returns:
+            dict: The response data from the daemon
+
+        Raises:
+            OSError: If the connection fails or is lost before the reply arrives
+            asyncio.TimeoutError: If the reply does not arrive within ``timeout``
+        """
+        await self.connect()
+        return await self._send(command, args, self.encoding, timeout)
+
+    def add_event_listener(self, callback: Callable[[Dict[str, Any]], None]):
+        """Call ``callback`` with each event ({"event": topic, "data": {...}}) the daemon pushes."""
+        self._event_listeners.append(callback)
+
+    def remove_event_listener(self, callback: Callable[[Dict[str, Any]], None]):
+        """Stop passing events to ``callback``."""
+        if callback in self._event_listeners:
+            self._event_listeners.remove(callback)
+
+    @property
+    def subscribed(self) -> bool:
+        """Whether the open connection is currently receiving events."""
+        return self._subscription is not None and self.connected
+
+    async def subscribe(self, topics: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Ask the daemon to push events on the given topics (all topics if None).
+
+        If the daemon cannot be reached, the subscription is made once a later
+        request connects.
+        """
+        args = {"topics": list(topics) if topics is not None else None}
+        try:
+            await self.connect()
+        except OSError:
+            # Subscribe as part of the next connection, made by the next request
+            self._subscription = args
+            raise
+        reply = await self._send("subscribe", args, self.encoding)
+        if "error" not in reply:
+            self._subscription = args
+        return reply
+
+    async def unsubscribe(self) -> Dict[str, Any]:
+        """Stop receiving events."""
+        self._subscription = None
+        if not self.connected:
+            return {"subscribed": []}
+        return await self._send("unsubscribe", {}, self.encoding)
+
+    async def _send(self, command: str, args: Dict[str, Any], encoding: str,
+                    timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Write a request on the open connection and wait for the matching reply."""
+        request_id = next(self._ids) % MAX_REQUEST_ID + 1
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        request = {"command": command, "args": args}
+        if self.shared_memory:
+            request["shm"] = True
+        try:
+            await write_message(self._writer, request_id, request, encoding)
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def close(self):
+        """Close the connection and fail any requests still waiting."""
+        writer = self._writer
+        self._writer = None
+        if self._read_task and self._read_task is not asyncio.current_task():
+            self._read_task.cancel()
+        self._read_task = None
+        if writer and self._loop is asyncio.get_running_loop():
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except Exception as e:
+                logger.debug(f"Error closing daemon connection: {e}")
+        self._fail_pending(ConnectionResetError("Connection to browser daemon closed"))
+
+    async def _read_loop(self, reader: asyncio.StreamReader):
+        """Resolve waiters as replies arrive until the daemon closes the connection."""
+        messages = MessageReader(reader)
+        try:
+            while True:
+                message = await messages.read()
+                if message is None:
+                    break
+                request_id, encoding, payload = message
+                if request_id == EVENT_REQUEST_ID:
+                    self._dispatch_event(payload, encoding)
+                    continue
+                future = self._pending.get(request_id)
+                if future is None or future.done():
+                    logger.warning(f"Reply for unknown request id: {request_id}")
+                    continue
+                try:
+                    future.set_result(import_blobs(decode_message(payload, encoding)))
+                except (ValueError, OSError) as e:
+                    logger.error(f"Malformed reply from daemon for request {request_id}: {e}")
+                    future.set_exception(e)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Daemon connection read failed: {e}")
+        finally:
+            if self._reader is reader:
+                self._writer = None
+                self._fail_pending(ConnectionResetError("Browser daemon closed the connection"))
+
+    def _dispatch_event(self, payload: bytearray, encoding: str):
+        """Hand a pushed event to every listener."""
+        try:
+            event = decode_message(payload, encoding)
+        except ValueError as e:
+            logger.error(f"Malformed event from daemon: {e}")
+            return
+        for callback in list(self._event_listeners):
+            try:
+                callback(event)
+            except Exception as e:
+                logger.error(f"Event listener failed: {e}")
+
+    def _fail_pending(self, error: Exception):
+        """Fail every request still waiting for a reply."""
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(error)
+        self._pending.clear()
+
+    def _reset(self, loop: asyncio.AbstractEventLoop):
+        """Forget any connection state left over from a previous event loop."""
+        self._reader = None
+        self._writer = None
+        self._read_task = None
+        self._pending.clear()
+        self._connect_lock = asyncio.Lock()
+        self._loop = loop
@@ -0,0 +1,147 @@
+"""Events pushed by the daemon to subscribed clients.
+
+Anything in the daemon can ``publish`` an event; clients that sent a
+``subscribe`` command on their connection receive it as a frame with request id
+``EVENT_REQUEST_ID``::
+
+    {"event": "job.status", "data": {"job_id": "...", "status": "completed"}}
+
+Topics:
+    job.status      An AI agent or crawl job changed status
+    job.progress    A crawl job fetched another page
+    page.navigated  A page's main frame navigated
+    page.console    A page logged a console error or threw an uncaught exception
+    page.crashed    A page's renderer crashed
+    page.closed     A page was closed
+    bulk.result     A URL of a navigate-many job finished
+
+Subscribing to ``page`` matches every ``page.*`` topic.
+"""
+import asyncio
+import itertools
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .logging import setup_logging
+from .protocol import ENCODING_JSON, EVENT_REQUEST_ID, write_message
+
+logger = setup_logging("events")
+
+# Events buffered per connection before new ones are dropped, so a client that
+# stops reading cannot make the daemon hold on to events without bound
+MAX_QUEUED_EVENTS = 1000
+
+
+def topic_matches(topic: str, topics: Optional[Tuple[str, ...]]) -> bool:
+    """Whether ``topic`` is selected by a subscription filter (None selects all)."""
+    if topics is None:
+        return True
+    return any(topic == selected or topic.startswith(selected + ".") for selected in topics)
+
+
+class EventBus:
+    """Fans published events out to listeners."""
+
+    _instance = None
+    _initialized = False
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(EventBus, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if not self._initialized:
+            self._listeners: Dict[int, Tuple[Callable[[Dict[str, Any]], None], Optional[Tuple[str, ...]]]] = {}
+            self._tokens = itertools.count(1)
+            self._initialized = True
+
+    def add_listener(self, callback: Callable[[Dict[str, Any]], None],
+                     topics: Optional[List[str]] = None) -> int:
+        """Call ``callback`` with every event on the given topics; returns a token for removal."""
+        token = next(self._tokens)
+        self._listeners[token] = (callback, tuple(topics) if topics is not None else None)
+        return token
+
+    def remove_listener(self, token: int):
+        """Stop calling a listener."""
+        self._listeners.pop(token, None)
+
+    def publish(self, topic: str, data: Dict[str, Any]):
+        """Deliver an event to every listener subscribed to its topic.
+
+        Listeners must not block; this is called from synchronous code such as
+        job status updates and Playwright event callbacks.
+        """
+        if not self._listeners:
+            return
+        event = {"event": topic, "data": data}
+        for callback, topics in list(self._listeners.values()):
+            if topic_matches(topic, topics):
+                try:
+                    callback(event)
+                except Exception as e:
+                    logger.error(f"Event listener failed for {topic}: {e}")
+
+
+class Subscription:
+    """Streams the events a client connection subscribed to back over that connection."""
+
+    def __init__(self, bus: EventBus, writer: asyncio.StreamWriter):
+        self._bus = bus
+        self._writer = writer
+        self._encoding = ENCODING_JSON
+        self._token: Optional[int] = None
+        self._queue: asyncio.Queue = asyncio.Queue(MAX_QUEUED_EVENTS)
+        self._task: Optional[asyncio.Task] = None
+        self.dropped = 0
+
+    def subscribe(self, topics: Optional[List[str]] = None, encoding: str = ENCODING_JSON) -> Dict[str, Any]:
+        """Start (or change) the subscription; events are sent in ``encoding``."""
+        if topics is not None and not all(isinstance(topic, str) for topic in topics):
+            return {"error": "topics must be a list of strings"}
+        self._encoding = encoding
+        if self._token is not None:
+            self._bus.remove_listener(self._token)
+        self._token = self._bus.add_listener(self._enqueue, topics)
+        if self._task is None:
+            self._task = asyncio.create_task(self._pump())
+        return {"subscribed": topics if topics is not None else ["*"]}
+
+    def unsubscribe(self) -> Dict[str, Any]:
+        """Stop receiving events; anything already queued is still delivered."""
+        if self._token is not None:
+            self._bus.remove_listener(self._token)
+            self._token = None
+        return {"subscribed": []}
+
+    def close(self):
+        """Drop the subscription when its connection goes away."""
+        self.unsubscribe()
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    def _enqueue(self, event: Dict[str, Any]):
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            if not self.dropped:
+                logger.warning("Subscriber is not reading events; dropping new ones")
+            self.dropped += 1
+
+    async def _pump(self):
+        """Write queued events to the connection in order."""
+        while True:
+            event = await self._queue.get()
+            try:
+                await write_message(self._writer, EVENT_REQUEST_ID, event, self._encoding)
+            except (TypeError, ValueError) as e:
+                logger.error(f"Could not encode {event['event']} event: {e}")
+            except Exception as e:
+                logger.debug(f"Stopped sending events: {e}")
+                self.unsubscribe()
+                return
+
+
+# Create the singleton instance
+event_bus = EventBus()
@@ -0,0 +1,46 @@
+"""Values extracted from loaded pages, for bulk navigation and crawls.
+
+The options are an object with any of:
+
+- ``title``: true to extract the page title;
+- ``text``: a selector, extracting the ``innerText`` of the first matching
+  element (None if there is none), cut off at ``MAX_TEXT_LENGTH``;
+- ``js``: a JS expression evaluated in the page, extracted as ``value``.
+"""
+from typing import Any, Dict
+
+from playwright.async_api import Page
+
+MAX_TEXT_LENGTH = 10_000
+EXTRACT_KEYS = {"title", "text", "js"}
+
+TEXT_OF = "selector => { const element = document.querySelector(selector); return element ? element.innerText : null; }"
+
+
+def extract_options(value: Any) -> Dict[str, Any]:
+    """Validate extraction options.
+
+    Raises:
+        ValueError: For anything but an object with title, text and js
+    """
+    if value is None:
+        return {}
+    if not isinstance(value, dict) or set(value) - EXTRACT_KEYS:
+        raise ValueError(f"extract must be an object with any of: {', '.join(sorted(EXTRACT_KEYS))}")
+    for key in ("text", "js"):
+        if key in value and not isinstance(value[key], str):
+            raise ValueError(f"extract.{key} must be a string")
+    return value
+
+
+async def extract(page: Page, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract what ``options`` asks for from a loaded page."""
+    extracted: Dict[str, Any] = {}
+    if options.get("title"):
+        extracted["title"] = await page.title()
+    if options.get("text"):
+        text = await page.evaluate(TEXT_OF, options["text"])
+        extracted["text"] = text[:MAX_TEXT_LENGTH] if isinstance(text, str) else text
+    if options.get("js"):
+        extracted["value"] = await page.evaluate(options["js"])
+    return extracted
@@ -0,0 +1,218 @@
+"""HAR record and replay, for deterministic offline runs.
+
+A session can be created in one of two HAR modes:
+
+- ``record``: its browser context writes all of its traffic to a HAR file,
+  which Playwright saves when the context closes (closing the session, or the
+  daemon shutting down).
+- ``replay``: its requests are answered from recorded HAR files and never
+  reach the network. Requests the archive has no response for fail as if the
+  network were down.
+
+An archive is a named directory under ``PLAYWRIGHT_MCP_HAR_DIR`` (default
+``~/.playwright_mcp/har``) holding one HAR file per recorded session, so a
+flow that opens several sessions records them all into one archive. For
+replay the archive's entries are indexed by method and URL once and the index
+is shared by every session replaying it until the files change, so lookups
+do not scan the archive. A request recorded several times gets its recorded
+responses in order, and then the last one again. A recorded redirect is
+replayed as the redirect it was, and the browser then requests its target as
+it did when recording. ``PLAYWRIGHT_MCP_HAR`` (e.g. ``replay:news-site``) sets
+a mode for new sessions that do not ask for one.
+"""
+import base64
+import json
+import os
+import time
+from collections import Counter, OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from playwright.async_api import BrowserContext, Route
+
+from .logging import setup_logging
+from .storage import NAME_PATTERN
+
+logger = setup_logging("har")
+
+HAR_ENV = "PLAYWRIGHT_MCP_HAR"
+HAR_DIR_ENV = "PLAYWRIGHT_MCP_HAR_DIR"
+DEFAULT_HAR_DIR = os.path.join(os.path.expanduser("~"), ".playwright_mcp", "har")
+HAR_MODES = ("record", "replay")
+SUFFIX = ".har"
+
+# Headers not replayed: bodies are recorded decoded and their length is set on fulfil
+DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+# Parsed archives kept for reuse, least recently used dropped first
+MAX_INDEXES = 8
+# Missed URLs kept per session, for the report
+MAX_MISSED_URLS = 20
+
+
+def _key(method: str, url: str) -> Tuple[str, str]:
+    return method.upper(), url.split("#", 1)[0]
+
+
+@dataclass(frozen=True)
+class HarMode:
+    """A session's HAR mode and the archive it records to or replays from."""
+    mode: str
+    archive: str
+
+    @classmethod
+    def parse(cls, value: Union[None, str, Dict[str, Any]]) -> Optional["HarMode"]:
+        """Parse ``"record:<archive>"``, ``{"mode": ..., "archive": ...}`` or None.
+
+        Raises:
+            ValueError: For an unknown mode or an invalid archive name
+        """
+        if value is None:
+            return None
+        if isinstance(value, str):
+            mode, _, archive = value.partition(":")
+        elif isinstance(value, dict) and set(value) <= {"mode", "archive"}:
+            mode, archive = value.get("mode"), value.get("archive")
+        else:
+            raise ValueError("har must be \"<mode>:<archive>\" or an object with mode and archive")
+        if mode not in HAR_MODES:
+            raise ValueError(f"Unknown HAR mode {mode!r}; use one of: {', '.join(HAR_MODES)}")
+        if not isinstance(archive, str) or not NAME_PATTERN.fullmatch(archive):
+            raise ValueError(f"Invalid HAR archive name: {archive!r}")
+        return cls(mode, archive)
+
+
+def default_har() -> Optional[HarMode]:
+    """The mode set with ``PLAYWRIGHT_MCP_HAR``, if any."""
+    value = os.getenv(HAR_ENV)
+    if not value:
+        return None
+    try:
+        return HarMode.parse(value)
+    except ValueError as e:
+        logger.warning(f"Ignoring {HAR_ENV}: {e}")
+        return None
+
+
+class HarIndex:
+    """A HAR archive's entries, by method and URL."""
+
+    def __init__(self, entries: List[Dict[str, Any]]):
+        self.entries: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        for entry in sorted(entries, key=lambda e: e.get("startedDateTime", "")):
+            request = entry["request"]
+            self.entries.setdefault(_key(request["method"], request["url"]), []).append(entry)
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self.entries.values())
+
+    def candidates(self, method: str, url: str, post_data: Optional[str] = None) -> List[Dict[str, Any]]:
+        """The recorded exchanges for a request; those with the same body, if there are any."""
+        entries = self.entries.get(_key(method, url), [])
+        if post_data is not None and len(entries) > 1:
+            same = [e for e in entries if e["request"].get("postData", {}).get("text") == post_data]
+            return same or entries
+        return entries
+
+
+class HarArchives:
+    """HAR archives on disk, by name, with their parsed indexes."""
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or os.getenv(HAR_DIR_ENV) or DEFAULT_HAR_DIR
+        # Archive name to (file signature, index)
+        self._indexes: "OrderedDict[str, Tuple[Tuple, HarIndex]]" = OrderedDict()
+
+    def path(self, archive: str) -> str:
+        return os.path.join(self.directory, archive)
+
+    def record_path(self, archive: str) -> str:
+        """A new HAR file in the archive, for one session's traffic."""
+        directory = self.path(archive)
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        return os.path.join(directory, f"{time.time_ns()}{SUFFIX}")
+
+    def index(self, archive: str) -> Optional[HarIndex]:
+        """The archive's index, or None if nothing was recorded to it."""
+        directory = self.path(archive)
+        try:
+            names = sorted(n for n in os.listdir(directory) if n.endswith(SUFFIX))
+        except FileNotFoundError:
+            return None
+        if not names:
+            return None
+        files = [os.path.join(directory, name) for name in names]
+        stats = [os.stat(f) for f in files]
+        signature = tuple((f, s.st_mtime_ns, s.st_size) for f, s in zip(files, stats))
+        cached = self._indexes.get(archive)
+        if cached and cached[0] == signature:
+            self._indexes.move_to_end(archive)
+            return cached[1]
+        entries: List[Dict[str, Any]] = []
+        for f in files:
+            with open(f) as har:
+                entries += json.load(har)["log"]["entries"]
+        index = HarIndex(entries)
+        self._indexes[archive] = (signature, index)
+        while len(self._indexes) > MAX_INDEXES:
+            self._indexes.popitem(last=False)
+        logger.debug(f"Indexed {len(index)} requests from HAR archive {archive}")
+        return index
+
+
+class HarReplayer:
+    """Answers a context's requests from a HAR index, never from the network."""
+
+    PATTERN = "**/*"
+
+    def __init__(self, archive: str, index: HarIndex):
+        self.archive = archive
+        self.index = index
+        self.served = 0
+        self.missed = 0
+        self.missed_urls: deque = deque(maxlen=MAX_MISSED_URLS)
+        # Times each request was served, to step through repeated recordings
+        self._seen: Counter = Counter()
+
+    async def install(self, context: BrowserContext):
+        await context.route(self.PATTERN, self.handle)
+
+    async def handle(self, route: Route):
+        request = route.request
+        entry = self.lookup(request.method, request.url, request.post_data)
+        if entry is None:
+            self.missed += 1
+            self.missed_urls.append(request.url)
+            await route.abort("internetdisconnected")
+            return
+        self.served += 1
+        response = entry["response"]
+        headers = {h["name"]: h["value"] for h in response.get("headers", [])
+                   if h["name"].lower() not in DROPPED_HEADERS}
+        if response.get("redirectURL") and not any(name.lower() == "location" for name in headers):
+            headers["Location"] = response["redirectURL"]
+        await route.fulfill(status=response["status"], headers=headers, body=self._body(response))
+
+    def lookup(self, method: str, url: str, post_data: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """The recorded exchange to answer a request with: its recordings in order, then the last again."""
+        entries = self.index.candidates(method, url, post_data)
+        if not entries:
+            return None
+        key = (_key(method, url), post_data)
+        entry = entries[min(self._seen[key], len(entries) - 1)]
+        self._seen[key] += 1
+        return entry
+
+    @staticmethod
+    def _body(response: Dict[str, Any]) -> bytes:
+        content = response.get("content", {})
+        text = content.get("text", "")
+        if content.get("encoding") == "base64":
+            return base64.b64decode(text)
+        return text.encode()
+
+    def report(self) -> Dict[str, Any]:
+        return {"mode": "replay", "archive": self.archive, "served": self.served, "missed": self.missed,
+                "missed_urls": list(self.missed_urls)}
+
+
+har_archives = HarArchives()
@@ -0,0 +1,360 @@
+"""A shared on-disk HTTP cache for static assets, across sessions.
+
+Browser contexts do not share a cache and sessions are short-lived, so every
+new session downloads the same scripts, stylesheets, fonts and images again.
+With ``PLAYWRIGHT_MCP_HTTP_CACHE_DIR`` set, the daemon keeps those responses
+in that directory, up to ``PLAYWRIGHT_MCP_HTTP_CACHE_MB`` megabytes (default
+256, least recently used evicted first), and answers later requests for them
+from disk through a route on each session's context.
+
+It behaves like a shared HTTP cache: responses marked ``no-store`` or
+``private``, that set cookies, or to requests with ``Authorization`` (unless
+marked ``public`` or given an ``s-maxage``) are not kept; fresh entries (by
+``s-maxage``, ``max-age``, ``Expires`` or, failing those, a tenth of the time
+since ``Last-Modified``) are served without a request; stale ones with an
+``ETag`` or ``Last-Modified`` are revalidated with a conditional request.
+Entries are keyed by URL, and responses that vary on anything but
+``Accept-Encoding`` are not kept. Hits and bytes served are counted per page
+and overall. Redirects are passed back for the browser to follow, and a request
+the cache cannot answer is left to the browser.
+"""
+import asyncio
+import email.utils
+import hashlib
+import json
+import os
+import re
+import struct
+import tempfile
+import time
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from playwright.async_api import BrowserContext, Page, Route
+
+from .logging import setup_logging
+
+logger = setup_logging("http_cache")
+
+HTTP_CACHE_DIR_ENV = "PLAYWRIGHT_MCP_HTTP_CACHE_DIR"
+HTTP_CACHE_MB_ENV = "PLAYWRIGHT_MCP_HTTP_CACHE_MB"
+
+CACHED_TYPES = {"script", "stylesheet", "font", "image"}
+CACHEABLE_STATUSES = {200, 203}
+# Headers not replayed from the cache: the body is stored decoded and its length is set on fulfil
+DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "set-cookie"}
+HEURISTIC_FRACTION = 0.1
+MAX_HEURISTIC_LIFETIME = 86400.0
+# Entries larger than this fraction of the whole cache are not kept
+MAX_ENTRY_FRACTION = 0.125
+
+HEADER = struct.Struct("!I")
+# Entry files are named by the sha256 of their URL; anything else in the directory is left alone
+ENTRY_NAME = re.compile(r"[0-9a-f]{64}")
+TEMP_PREFIX = ".tmp"
+
+
+def cache_control(headers: Dict[str, str]) -> Dict[str, Optional[str]]:
+    """Parse a Cache-Control header into {directive: value or None}."""
+    directives: Dict[str, Optional[str]] = {}
+    for part in headers.get("cache-control", "").split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"') or None
+    return directives
+
+
+def _http_date(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return email.utils.parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def freshness_lifetime(headers: Dict[str, str]) -> float:
+    """Seconds a response stays fresh, from its caching headers."""
+    directives = cache_control(headers)
+    for name in ("s-maxage", "max-age"):
+        if directives.get(name):
+            try:
+                return max(0.0, float(directives[name]))
+            except ValueError:
+                return 0.0
+    date = _http_date(headers.get("date")) or time.time()
+    expires = _http_date(headers.get("expires"))
+    if "expires" in headers:
+        return max(0.0, expires - date) if expires else 0.0
+    last_modified = _http_date(headers.get("last-modified"))
+    if last_modified:
+        return min(MAX_HEURISTIC_LIFETIME, max(0.0, (date - last_modified) * HEURISTIC_FRACTION))
+    return 0.0
+
+
+def storable(status: int, headers: Dict[str, str], authorized: bool = False) -> bool:
+    """Whether a shared cache may keep this response, to a request with Authorization if ``authorized``."""
+    directives = cache_control(headers)
+    if status not in CACHEABLE_STATUSES or "no-store" in directives or "private" in directives:
+        return False
+    if "set-cookie" in headers:
+        return False
+    if authorized and not directives.keys() & {"public", "s-maxage"}:
+        return False
+    vary = {v.strip().lower() for v in headers.get("vary", "").split(",") if v.strip()}
+    if vary - {"accept-encoding"}:
+        return False
+    validated = "etag" in headers or "last-modified" in headers
+    return bool(directives.keys() & {"max-age", "s-maxage"} or "expires" in headers or validated)
+
+
+@dataclass
+class CacheEntry:
+    """A stored response's metadata; the body is in its file."""
+    url: str
+    status: int
+    headers: Dict[str, str]
+    stored_at: float
+    size: int
+
+    @property
+    def fresh(self) -> bool:
+        if "no-cache" in cache_control(self.headers):
+            return False
+        try:
+            age = float(self.headers.get("age", "0") or 0)
+        except ValueError:
+            # Unknown age: revalidate rather than serve
+            return False
+        return age + time.time() - self.stored_at < freshness_lifetime(self.headers)
+
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers that revalidate this entry."""
+        headers = {}
+        if "etag" in self.headers:
+            headers["if-none-match"] = self.headers["etag"]
+        if "last-modified" in self.headers:
+            headers["if-modified-since"] = self.headers["last-modified"]
+        return headers
+
+
+@dataclass
+class CacheCounts:
+    """Cacheable requests seen and how they were answered."""
+    requests: int = 0
+    hits: int = 0
+    revalidated: int = 0
+    bytes_served: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        answered = self.hits + self.revalidated
+        return {
+            "requests": self.requests,
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "hit_ratio": round(answered / self.requests, 3) if self.requests else 0.0,
+            "bytes_served": self.bytes_served,
+        }
+
+
+class HttpCache:
+    """Size-bounded LRU store of responses on disk, served through context routes."""
+
+    PATTERN = "**/*"
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self.size = 0
+        self.total = CacheCounts()
+        self.pages: "weakref.WeakKeyDictionary[Page, CacheCounts]" = weakref.WeakKeyDictionary()
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        self._load_index()
+
+    @classmethod
+    def from_env(cls) -> Optional["HttpCache"]:
+        """The cache configured with ``PLAYWRIGHT_MCP_HTTP_CACHE_DIR``, or None if it is not set."""
+        directory = os.getenv(HTTP_CACHE_DIR_ENV)
+        if not directory:
+            return None
+        return cls(directory, int(float(os.getenv(HTTP_CACHE_MB_ENV, "256")) * 2**20))
+
+    async def install(self, context: BrowserContext):
+        await context.route(self.PATTERN, self.handle)
+
+    async def handle(self, route: Route):
+        request = route.request
+        if request.method != "GET" or request.resource_type not in CACHED_TYPES or "range" in request.headers:
+            await route.fallback()
+            return
+        counts = self._counts_for(request)
+        for c in counts:
+            c.requests += 1
+        try:
+            await self._answer(route, counts)
+        except Exception as e:
+            logger.debug(f"Leaving {request.url} to the browser: {e}")
+            try:
+                await route.fallback()
+            except Exception:
+                # Already answered, or the page is gone
+                pass
+
+    async def _answer(self, route: Route, counts: Tuple[CacheCounts, ...]):
+        request = route.request
+        key = request.url
+        entry = self.entries.get(key)
+        if entry and entry.fresh:
+            body = await self._read_body(key)
+            if body is not None:
+                await self._serve(route, entry, body, counts, "hits")
+                return
+            entry = None
+
+        headers = dict(request.headers, **entry.validators()) if entry else None
+        # A redirect goes back to the browser to follow, so entries are only ever their own URL's response
+        response = await route.fetch(headers=headers, max_redirects=0)
+        if entry and response.status == 304:
+            # Still valid: refresh its caching headers and serve it
+            body = await self._read_body(key)
+            if body is not None:
+                entry.headers.update({k: v for k, v in response.headers.items() if k not in DROPPED_HEADERS})
+                entry.stored_at = time.time()
+                await self._serve(route, entry, body, counts, "revalidated")
+                await asyncio.to_thread(self._write, key, entry, body)
+                return
+            # The stored body is gone, so the 304 is no use: fetch the whole response
+            response = await route.fetch(max_redirects=0)
+        body = await response.body()
+        headers = {k.lower(): v for k, v in response.headers.items()}
+        authorized = "authorization" in request.headers
+        if storable(response.status, headers, authorized) and len(body) <= self.max_bytes * MAX_ENTRY_FRACTION:
+            stored = {k: v for k, v in headers.items() if k not in DROPPED_HEADERS}
+            entry = CacheEntry(key, response.status, stored, time.time(), len(body))
+            await asyncio.to_thread(self._write, key, entry, body)
+            self._add(key, entry)
+        await route.fulfill(response=response, body=body)
+
+    def start_counting(self, page: Page):
+        """Reset a page's counts, e.g. at the start of a navigation."""
+        self.pages[page] = CacheCounts()
+
+    def counts(self, page: Page) -> CacheCounts:
+        return self.pages.get(page) or CacheCounts()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"entries": len(self.entries), "bytes": self.size, "max_bytes": self.max_bytes,
+                **self.total.to_dict()}
+
+    def _counts_for(self, request) -> Tuple[CacheCounts, ...]:
+        try:
+            page = request.frame.page
+        except Exception:
+            # Requests from service workers have no frame
+            return (self.total,)
+        return (self.total, self.pages.setdefault(page, CacheCounts()))
+
+    async def _serve(self, route: Route, entry: CacheEntry, body: bytes, counts, kind: str):
+        await route.fulfill(status=entry.status, headers=entry.headers, body=body)
+        self.entries.move_to_end(entry.url)
+        for c in counts:
+            setattr(c, kind, getattr(c, kind) + 1)
+            c.bytes_served += len(body)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(key.encode()).hexdigest())
+
+    def _write(self, key: str, entry: CacheEntry, body: bytes):
+        """Write an entry's file atomically: metadata length, metadata, body."""
+        meta = json.dumps({"url": entry.url, "status": entry.status, "headers": entry.headers,
+                           "stored_at": entry.stored_at}).encode()
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix=TEMP_PREFIX)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(HEADER.pack(len(meta)) + meta + body)
+            os.replace(temp_path, self._path(key))
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+
+    async def _read_body(self, key: str) -> Optional[bytes]:
+        try:
+            return (await asyncio.to_thread(self._read, self._path(key)))[1]
+        except (OSError, ValueError, struct.error) as e:
+            logger.debug(f"Dropping unreadable cache entry for {key}: {e}")
+            self._remove(key)
+            return None
+
+    @staticmethod
+    def _read(path: str) -> Tuple[Dict[str, Any], bytes]:
+        with open(path, "rb") as f:
+            data = f.read()
+        (meta_length,) = HEADER.unpack_from(data)
+        meta = json.loads(data[HEADER.size:HEADER.size + meta_length])
+        return meta, data[HEADER.size + meta_length:]
+
+    @staticmethod
+    def _read_meta(path: str) -> Tuple[Dict[str, Any], int, float]:
+        """An entry file's metadata, body size and modification time, without reading the body."""
+        with open(path, "rb") as f:
+            (meta_length,) = HEADER.unpack(f.read(HEADER.size))
+            meta = json.loads(f.read(meta_length))
+            stat = os.fstat(f.fileno())
+        size = stat.st_size - HEADER.size - meta_length
+        if size < 0:
+            raise ValueError("truncated entry")
+        return meta, size, stat.st_mtime
+
+    def _add(self, key: str, entry: CacheEntry):
+        old = self.entries.pop(key, None)
+        if old:
+            self.size -= old.size
+        self.entries[key] = entry
+        self.size += entry.size
+        while self.size > self.max_bytes and self.entries:
+            self._remove(next(iter(self.entries)))
+
+    def _remove(self, key: str):
+        entry = self.entries.pop(key, None)
+        if entry:
+            self.size -= entry.size
+        try:
+            os.unlink(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def _load_index(self):
+        """Rebuild the index from the entry files on disk, least recently written first.
+
+        Unreadable entries and leftover temporary files are removed; other
+        files and directories are not the cache's and are skipped.
+        """
+        files = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name.startswith(TEMP_PREFIX):
+                self._unlink(path)
+                continue
+            if not ENTRY_NAME.fullmatch(name):
+                continue
+            try:
+                meta, size, mtime = self._read_meta(path)
+                files.append((mtime, meta, size))
+            except (OSError, ValueError, struct.error) as e:
+                logger.debug(f"Dropping unreadable cache entry {name}: {e}")
+                self._unlink(path)
+        for _, meta, size in sorted(files, key=lambda f: f[0]):
+            self._add(meta["url"], CacheEntry(meta["url"], meta["status"], meta["headers"], meta["stored_at"], size))
+
+    @staticmethod
+    def _unlink(path: str):
+        try:
+            os.unlink(path)
+        except OSError as e:
+            logger.debug(f"Could not remove {path}: {e}")
@@ -2,15 +2,38 @@ import os
 import logging
 import logging.handlers
 
+from ...utils.logging import DeferredFileHandler
+
+# Shared by every daemon logger, so each log file is opened once
+_handlers = []
+
+
+def _file_handlers():
+    """Create the debug and error file handlers on first use."""
+    if not _handlers:
+        project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+        log_dir = os.path.join(project_root, "logs")
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+        # Debug file handler
+        debug_handler = DeferredFileHandler(os.path.join(log_dir, "debug.log"))
+        debug_handler.setLevel(logging.DEBUG)
+        debug_handler.setFormatter(formatter)
+
+        # Error file handler
+        error_handler = DeferredFileHandler(os.path.join(log_dir, "error.log"))
+        error_handler.setLevel(logging.ERROR)
+        error_handler.setFormatter(formatter)
+
+        _handlers.extend([debug_handler, error_handler])
+    return _handlers
+
 
 def setup_logging(logger_name: str) -> logging.Logger:
-    """Set up logging configuration."""
-    # Create logs directory if it doesn't exist
-    project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
-    log_dir = os.path.join(project_root, "logs")
-    if not os.path.exists(log_dir):
-        os.makedirs(log_dir)
+    """Set up logging configuration.
 
+    The logs directory and files are only created once something is logged.
+    """
     # Get or create logger
     logger = logging.getLogger(logger_name)
     
@@ -24,18 +47,7 @@ def setup_logging(logger_name: str) -> logging.Logger:
     
     # Avoid duplicate handlers
     if not logger.handlers:
-        # Debug file handler
-        debug_handler = logging.FileHandler(os.path.join(log_dir, "debug.log"))
-        debug_handler.setLevel(logging.DEBUG)
-        debug_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        debug_handler.setFormatter(debug_formatter)
-        logger.addHandler(debug_handler)
-
-        # Error file handler
-        error_handler = logging.FileHandler(os.path.join(log_dir, "error.log"))
-        error_handler.setLevel(logging.ERROR)
-        error_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        error_handler.setFormatter(error_formatter)
-        logger.addHandler(error_handler)
+        for handler in _file_handlers():
+            logger.addHandler(handler)
 
-    return logger 
\ No newline at end of file
+    return logger
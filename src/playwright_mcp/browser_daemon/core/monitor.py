@@ -0,0 +1,205 @@
+"""Resource usage of the daemon's browsers and pages, and recycling of bloated browsers.
+
+Every ``PLAYWRIGHT_MCP_MONITOR_INTERVAL`` seconds (default 30; 0 turns the
+monitor off) the monitor samples:
+
+- per browser, the resident memory and CPU use of its processes. Chromium
+  lists its processes (browser, renderers, GPU, utilities) with their CPU time
+  over CDP ``SystemInfo.getProcessInfo``; their memory is read from ``/proc``.
+  Other browsers do not offer this and report their sessions only.
+- per page, a few of Chromium's CDP ``Performance.getMetrics`` counters:
+  JS heap size, DOM nodes, documents and event listeners.
+
+The latest samples are part of the daemon's ``stats``. A browser whose
+processes use more than ``PLAYWRIGHT_MCP_RECYCLE_RSS_MB`` (0, the default,
+turns this off) is recycled: its sessions move to a fresh browser, keeping
+their IDs, cookies, localStorage and page URLs. Browsers with a command running
+or waiting are left for a later round, and commands that arrive while a browser
+is being recycled wait until its sessions have moved.
+"""
+import asyncio
+import os
+import time
+import weakref
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from playwright.async_api import Browser, Page
+
+from .logging import setup_logging
+from .reaper import process_tree_rss
+from .scheduler import Hold, hold_nothing
+from .session import SessionManager
+
+logger = setup_logging("monitor")
+
+MONITOR_INTERVAL = float(os.getenv("PLAYWRIGHT_MCP_MONITOR_INTERVAL", "30"))
+RECYCLE_RSS_MB = int(os.getenv("PLAYWRIGHT_MCP_RECYCLE_RSS_MB", "0"))
+
+# Performance.getMetrics counters reported per page, by the name they are reported under
+PAGE_METRICS = {
+    "JSHeapUsedSize": "js_heap_used",
+    "JSHeapTotalSize": "js_heap_total",
+    "Nodes": "nodes",
+    "Documents": "documents",
+    "JSEventListeners": "event_listeners",
+}
+
+
+def process_rss(pid: int) -> int:
+    """Resident memory of one process in bytes, or 0 if it cannot be read."""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, IndexError, ValueError):
+        return 0
+
+
+class ResourceMonitor:
+    """Samples browser and page resource use and recycles browsers over the memory threshold."""
+
+    def __init__(self, session_manager: SessionManager, busy: Optional[Callable[[str], bool]] = None,
+                 interval: float = MONITOR_INTERVAL, recycle_rss_mb: int = RECYCLE_RSS_MB,
+                 rss: Callable[[int], int] = process_rss, hold: Hold = hold_nothing):
+        self.session_manager = session_manager
+        self.busy = busy or (lambda key: False)
+        self.hold = hold
+        self.interval = interval
+        self.recycle_rss_mb = recycle_rss_mb
+        self.rss = rss
+        self.samples: Dict[str, Any] = {}
+        self.recycled = 0
+        # CDP sessions, or False where the browser or page has none
+        self._browser_cdp: "weakref.WeakKeyDictionary[Browser, Any]" = weakref.WeakKeyDictionary()
+        self._page_cdp: "weakref.WeakKeyDictionary[Page, Any]" = weakref.WeakKeyDictionary()
+        # Last (monotonic time, total CPU seconds) per browser, for CPU percentages
+        self._cpu: "weakref.WeakKeyDictionary[Browser, Tuple[float, float]]" = weakref.WeakKeyDictionary()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start sampling in the background, unless the interval is 0."""
+        if self.interval > 0 and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop sampling."""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.check()
+            except Exception as e:
+                logger.error(f"Resource monitor failed: {e}")
+
+    async def check(self) -> List[str]:
+        """Take a sample, then recycle browsers over the memory threshold.
+
+        Returns:
+            The IDs of sessions moved to fresh browsers
+        """
+        browsers = await self.sample()
+        moved: List[str] = []
+        if self.recycle_rss_mb <= 0:
+            return moved
+        for browser, sample in browsers:
+            if sample.get("rss", 0) <= self.recycle_rss_mb * 2**20 or self._in_use(sample["sessions"]):
+                continue
+            if browser in self.session_manager.browser_keys:
+                recycled = await self.session_manager.recycle_browser(browser, "memory", self.hold)
+                if recycled:
+                    self.recycled += 1
+                    moved += recycled
+        return moved
+
+    async def sample(self) -> List[Tuple[Browser, Dict[str, Any]]]:
+        """Sample every browser and page, keep the result for ``stats`` and return the browsers'."""
+        now = time.monotonic()
+        browsers = [(browser, await self._sample_browser(browser, label, sessions, now))
+                    for browser, label, sessions in self._browsers()]
+        pages = list(self.session_manager.pages.items())
+        metrics = await asyncio.gather(*(self._page_metrics(page) for _, page in pages))
+        self.samples = {
+            "sampled_at": time.time(),
+            "total_rss": process_tree_rss(),
+            "browsers": [sample for _, sample in browsers],
+            "pages": {page_id: m for (page_id, _), m in zip(pages, metrics) if m},
+        }
+        return browsers
+
+    def stats(self) -> Dict[str, Any]:
+        """The latest samples and how many browsers were recycled."""
+        return {"interval": self.interval, "recycled": self.recycled, **self.samples}
+
+    def _browsers(self) -> List[Tuple[Browser, str, List[str]]]:
+        """Each open browser with a label and the IDs of its sessions."""
+        manager = self.session_manager
+        shared: Dict[Browser, List[str]] = {browser: [] for browser in manager.browsers.values()}
+        for session_id, context in manager.sessions.items():
+            if session_id not in manager.session_browsers and context.browser in shared:
+                shared[context.browser].append(session_id)
+        browsers = [(browser, self._label(browser), session_ids) for browser, session_ids in shared.items()]
+        browsers += [(browser, self._label(browser), [session_id])
+                     for session_id, browser in manager.session_browsers.items()]
+        return browsers
+
+    def _label(self, browser: Browser) -> str:
+        browser_type, headless = self.session_manager.browser_keys.get(browser, ("unknown", True))
+        return f"{browser_type}/{'headless' if headless else 'headed'}"
+
+    def _in_use(self, session_ids: List[str]) -> bool:
+        return any(self.busy(key) for session_id in session_ids
+                   for key in (session_id, *self.session_manager.pages_of(session_id)))
+
+    async def _sample_browser(self, browser: Browser, label: str, sessions: List[str], now: float) -> Dict[str, Any]:
+        sample: Dict[str, Any] = {"browser": label, "sessions": sessions}
+        processes = await self._processes(browser)
+        if processes is None:
+            return sample
+        cpu_time = sum(cpu for _, cpu in processes)
+        sample.update(processes=len(processes), rss=sum(self.rss(pid) for pid, _ in processes),
+                      cpu_time=round(cpu_time, 3))
+        previous = self._cpu.get(browser)
+        if previous and now > previous[0]:
+            sample["cpu_percent"] = round(100 * max(0.0, cpu_time - previous[1]) / (now - previous[0]), 1)
+        self._cpu[browser] = (now, cpu_time)
+        return sample
+
+    async def _processes(self, browser: Browser) -> Optional[List[Tuple[int, float]]]:
+        """(pid, CPU seconds) of a Chromium browser's processes, or None if they cannot be listed."""
+        cdp = self._browser_cdp.get(browser)
+        if cdp is None:
+            try:
+                cdp = await browser.new_browser_cdp_session()
+            except Exception:
+                cdp = False
+            self._browser_cdp[browser] = cdp
+        if cdp is False:
+            return None
+        try:
+            info = await cdp.send("SystemInfo.getProcessInfo")
+        except Exception as e:
+            logger.debug(f"Could not list browser processes: {e}")
+            return None
+        return [(int(p["id"]), float(p.get("cpuTime", 0))) for p in info.get("processInfo", [])]
+
+    async def _page_metrics(self, page: Page) -> Optional[Dict[str, float]]:
+        """A page's Performance.getMetrics counters, or None where CDP is not available."""
+        cdp = self._page_cdp.get(page)
+        if cdp is None:
+            try:
+                cdp = await page.context.new_cdp_session(page)
+                await cdp.send("Performance.enable")
+            except Exception:
+                cdp = False
+            self._page_cdp[page] = cdp
+        if cdp is False:
+            return None
+        try:
+            reply = await cdp.send("Performance.getMetrics")
+        except Exception:
+            return None
+        return {PAGE_METRICS[m["name"]]: m["value"] for m in reply.get("metrics", []) if m["name"] in PAGE_METRICS}
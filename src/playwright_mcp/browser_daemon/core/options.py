@@ -0,0 +1,25 @@
+"""Checks on command options shared by several handlers.
+
+``bounded`` validates integer options such as concurrency limits, and
+``url_matches`` is how URL pattern options (crawl include/exclude, readiness
+ignore) match: a glob if the pattern has ``*``, otherwise a substring.
+"""
+import fnmatch
+from typing import Any, Dict, Iterable
+
+
+def bounded(args: Dict[str, Any], key: str, default: int, low: int, high: int) -> int:
+    """The integer option ``key``, or ``default`` if it is not given.
+
+    Raises:
+        ValueError: If it is not an integer from ``low`` to ``high``
+    """
+    value = args.get(key, default)
+    if not isinstance(value, int) or not low <= value <= high:
+        raise ValueError(f"{key} must be an integer from {low} to {high}")
+    return value
+
+
+def url_matches(url: str, patterns: Iterable[str]) -> bool:
+    """Whether a URL matches any pattern: a glob if it has ``*``, otherwise a substring."""
+    return any(fnmatch.fnmatchcase(url, p) if "*" in p else p in url for p in patterns)
@@ -0,0 +1,206 @@
+"""Adaptive page readiness: the ``ready`` wait mode for navigations.
+
+``networkidle`` waits for 500 ms without any network traffic, which pages with
+analytics beacons, long polling or streaming connections reach late or never.
+The ``ready`` mode loads the page to ``DOMContentLoaded`` and then resolves as
+soon as the page is usable:
+
+- with a ``selector``, once a matching element is visible;
+- otherwise once the DOM has had no mutations for ``quiet_ms`` and no
+  request the page is waiting on is in flight. Requests that never settle do
+  not count: WebSockets, event streams, anything matching an ``ignore``
+  pattern (``PLAYWRIGHT_MCP_READY_IGNORE``, a comma-separated list, plus the
+  tracker domains from ``resources``), and requests already pending for
+  ``long_request_ms``, which are taken to be long polls.
+
+Loading to ``DOMContentLoaded`` has Playwright's navigation timeout, unless
+``goto`` is given another. If the page is not ready ``timeout_ms`` after that,
+readiness gives up waiting and reports ``timeout``; the page has still loaded
+its DOM, so this is not an error. The report names the signal that fired and
+when each phase finished, in milliseconds since the navigation started, so the
+settings can be tuned per site.
+"""
+import asyncio
+import os
+import time
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from playwright.async_api import Page, Request, Response
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from .logging import setup_logging
+from .options import url_matches
+from .resources import TRACKER_DOMAINS
+
+logger = setup_logging("page_ready")
+
+READY_IGNORE_ENV = "PLAYWRIGHT_MCP_READY_IGNORE"
+DEFAULT_QUIET_MS = 500
+DEFAULT_TIMEOUT_MS = 10_000
+DEFAULT_LONG_REQUEST_MS = 5_000
+
+# Resource types that stay open for the life of the page
+LONG_LIVED_TYPES = {"websocket", "eventsource"}
+
+# Resolves once the DOM has gone quietMs without a mutation. The observer lives
+# on the window, so a repeated call (e.g. after the network settles) picks up
+# where the last one left off; a new document starts a new observer.
+DOM_QUIET = """(quietMs) => new Promise(resolve => {
+    if (!window.__pwmcpDomQuiet) {
+        const state = window.__pwmcpDomQuiet = {last: performance.now()};
+        new MutationObserver(() => { state.last = performance.now(); }).observe(
+            document, {subtree: true, childList: true, attributes: true, characterData: true});
+    }
+    const check = () => {
+        const idle = performance.now() - window.__pwmcpDomQuiet.last;
+        if (idle >= quietMs) resolve(idle); else setTimeout(check, Math.max(16, quietMs - idle));
+    };
+    check();
+})"""
+
+
+def ignore_patterns(extra: Optional[List[str]] = None) -> List[str]:
+    """Patterns of requests readiness does not wait for: the configured ones plus ``extra``."""
+    configured = [p.strip() for p in os.getenv(READY_IGNORE_ENV, "").split(",") if p.strip()]
+    return configured + list(extra or [])
+
+
+class PageReadiness:
+    """Tracks one navigation's requests and DOM until the page is ready."""
+
+    def __init__(self, page: Page, quiet_ms: float = DEFAULT_QUIET_MS, timeout_ms: float = DEFAULT_TIMEOUT_MS,
+                 selector: Optional[str] = None, ignore: Optional[List[str]] = None,
+                 long_request_ms: float = DEFAULT_LONG_REQUEST_MS):
+        self.page = page
+        self.quiet_ms = quiet_ms
+        self.timeout_ms = timeout_ms
+        self.selector = selector
+        self.ignore = ignore_patterns(ignore)
+        self.long_request_ms = long_request_ms
+        self.inflight: Dict[Request, float] = {}
+        self.ignored = 0
+        self.phases: Dict[str, float] = {}
+        # The main document's response, once navigated
+        self.response: Optional[Response] = None
+        self._network_changed = asyncio.Event()
+        self._start = time.monotonic()
+        self._deadline = self._start + timeout_ms / 1000
+        self._listeners = [
+            ("request", self._on_request),
+            ("requestfinished", self._on_done),
+            ("requestfailed", self._on_done),
+        ]
+
+    @classmethod
+    def from_args(cls, page: Page, options: Optional[Dict[str, Any]]) -> "PageReadiness":
+        """Build from a command's ``ready`` options.
+
+        Raises:
+            ValueError: For unknown options
+        """
+        options = dict(options or {})
+        unknown = set(options) - {"quiet_ms", "timeout_ms", "selector", "ignore", "long_request_ms"}
+        if unknown:
+            raise ValueError(f"Unknown readiness options: {', '.join(sorted(unknown))}")
+        return cls(page, **options)
+
+    def ignores(self, request: Request) -> bool:
+        """Whether the page is not waited on for this request."""
+        if request.resource_type in LONG_LIVED_TYPES:
+            return True
+        url = request.url
+        host = (urlsplit(url).hostname or "").lower()
+        if any(host == domain or host.endswith("." + domain) for domain in TRACKER_DOMAINS):
+            return True
+        return url_matches(url, self.ignore)
+
+    async def goto(self, url: str, navigation_timeout_ms: Optional[float] = None) -> Dict[str, Any]:
+        """Navigate to ``url`` and wait until the page is ready.
+
+        ``navigation_timeout_ms`` bounds loading to ``DOMContentLoaded``
+        (Playwright's default if None); ``timeout_ms`` bounds the wait after.
+
+        Returns:
+            The readiness report: the signal that fired, phase times and request counts
+        """
+        for event, listener in self._listeners:
+            self.page.on(event, listener)
+        try:
+            self._start = time.monotonic()
+            options = {} if navigation_timeout_ms is None else {"timeout": navigation_timeout_ms}
+            self.response = await self.page.goto(url, wait_until="domcontentloaded", **options)
+            self._mark("domcontentloaded")
+            self._deadline = time.monotonic() + self.timeout_ms / 1000
+            try:
+                signal = await asyncio.wait_for(self._wait(), self.timeout_ms / 1000)
+            except (asyncio.TimeoutError, PlaywrightTimeoutError):
+                signal = "timeout"
+            self._mark("ready")
+            return {
+                "signal": signal,
+                "phases": self.phases,
+                "pending_requests": len(self.inflight),
+                "ignored_requests": self.ignored,
+            }
+        finally:
+            for event, listener in self._listeners:
+                self.page.remove_listener(event, listener)
+
+    async def _wait(self) -> str:
+        if self.selector:
+            # Playwright's own timeout, so its waiter stops with ours
+            remaining_ms = max(1.0, (self._deadline - time.monotonic()) * 1000)
+            await self.page.wait_for_selector(self.selector, state="visible", timeout=remaining_ms)
+            self._mark("selector")
+            return "selector"
+        while True:
+            await self._dom_quiet()
+            self._mark("dom_quiet")
+            await self._network_quiet()
+            self._mark("network_quiet")
+            # The DOM may have changed while the network settled; this returns at once if not
+            await self._dom_quiet()
+            if not self._pending():
+                return "quiet"
+
+    async def _dom_quiet(self):
+        while True:
+            try:
+                await self.page.evaluate(DOM_QUIET, self.quiet_ms)
+                return
+            except Exception as e:
+                # The document was replaced mid-wait, e.g. by a client-side redirect
+                if "context was destroyed" not in str(e) and "navigation" not in str(e).lower():
+                    raise
+                await asyncio.sleep(self.quiet_ms / 1000)
+
+    async def _network_quiet(self):
+        """Wait until no request the page waits on is in flight."""
+        while self._pending():
+            self._network_changed.clear()
+            oldest = min(self.inflight[r] for r in self._pending())
+            until_long = max(0.0, oldest + self.long_request_ms / 1000 - time.monotonic())
+            try:
+                await asyncio.wait_for(self._network_changed.wait(), until_long)
+            except asyncio.TimeoutError:
+                pass
+
+    def _pending(self) -> List[Request]:
+        """Requests in flight, less those pending long enough to count as long polls."""
+        cutoff = time.monotonic() - self.long_request_ms / 1000
+        return [r for r, started in self.inflight.items() if started > cutoff]
+
+    def _mark(self, phase: str):
+        self.phases.setdefault(phase, round((time.monotonic() - self._start) * 1000, 1))
+
+    def _on_request(self, request: Request):
+        if self.ignores(request):
+            self.ignored += 1
+            return
+        self.inflight[request] = time.monotonic()
+        self._network_changed.set()
+
+    def _on_done(self, request: Request):
+        if self.inflight.pop(request, None) is not None:
+            self._network_changed.set()
@@ -0,0 +1,350 @@
+"""Wire protocol shared by the browser daemon and its clients.
+
+Every message travels as one or more frames. A frame is a fixed-size header
+followed by ``length`` bytes of payload::
+
+    +----------------+----------------+---------+
+    | request id u32 | length u32     | flags u8|  payload ...
+    +----------------+----------------+---------+
+
+Frames of different requests may be interleaved on the connection. The frames
+of one message are concatenated in order; the frame carrying ``FLAG_END``
+completes it. Large replies are therefore streamed in ``CHUNK_SIZE`` pieces as
+they are encoded, without building the whole payload in memory first.
+
+Payloads are JSON by default. When MessagePack is installed on both sides the
+client negotiates it with a ``hello`` command; frames encoded that way carry
+``FLAG_MSGPACK`` and raw ``bytes`` values travel as-is instead of as base64.
+The daemon always replies in the encoding the request was sent in.
+
+Request ids start at 1. Frames with request id ``EVENT_REQUEST_ID`` (0) carry
+events the daemon pushes to subscribed clients rather than replies.
+
+The daemon listens on a Unix socket, or on TCP for daemons on other hosts
+(addresses of the form ``tcp://host:port``). A daemon started with
+``PLAYWRIGHT_MCP_TOKEN`` set requires TCP clients to send that token in their
+``hello`` before anything else; it refuses to listen on a non-loopback host
+without one.
+"""
+import asyncio
+import base64
+import ipaddress
+import json
+import struct
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+try:
+    import msgpack
+except ImportError:  # Optional dependency; JSON is always available
+    msgpack = None
+
+HEADER = struct.Struct("!IIB")
+
+# Flag bits
+FLAG_END = 0x01
+FLAG_ABORT = 0x02  # Sender gave up mid-message; discard what has arrived so far
+FLAG_MSGPACK = 0x04  # Payload is MessagePack rather than JSON
+
+# Request id reserved for events pushed by the daemon
+EVENT_REQUEST_ID = 0
+
+# Daemon addresses that are not Unix socket paths
+TCP_SCHEME = "tcp://"
+
+# Shared secret TCP clients must present in their hello
+TOKEN_ENV = "PLAYWRIGHT_MCP_TOKEN"
+
+# Payload encodings
+ENCODING_JSON = "json"
+ENCODING_MSGPACK = "msgpack"
+
+# JSON has no bytes type, so bytes values are wrapped as {BYTES_KEY: base64}. Keys of
+# other dicts that are BYTES_KEY followed by any number of KEY_ESCAPE get one more
+# KEY_ESCAPE on the wire, so no data can be mistaken for a wrapped bytes value
+BYTES_KEY = "__bytes__"
+KEY_ESCAPE = "~"
+
+# Payload size of the frames we send, and the largest frame we accept
+CHUNK_SIZE = 64 * 1024
+MAX_FRAME_SIZE = 1024 * 1024
+
+# Upper bound on a reassembled message, so a bad peer cannot exhaust memory
+MAX_MESSAGE_SIZE = 256 * 1024 * 1024
+
+# How many levels of dicts/lists are streamed element by element: the reply
+# dict and the lists inside it, e.g. each match of a search-dom reply
+STREAM_DEPTH = 2
+
+
+class ProtocolError(Exception):
+    """Raised when the peer sends data that violates the framing protocol."""
+
+
+class Message(NamedTuple):
+    """A reassembled message and the encoding it was sent in."""
+    request_id: int
+    encoding: str
+    payload: bytearray
+
+
+def parse_tcp_address(address: str) -> Optional[Tuple[str, int]]:
+    """Split a ``tcp://host:port`` address into host and port; None for a Unix socket path.
+
+    Raises:
+        ValueError: If a TCP address has no valid port
+    """
+    if not address.startswith(TCP_SCHEME):
+        return None
+    host, _, port = address[len(TCP_SCHEME):].rpartition(":")
+    return host.strip("[]") or "127.0.0.1", int(port)
+
+
+def is_loopback(host: str) -> bool:
+    """Whether a listening host only accepts connections from this machine."""
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        # A host name other than localhost may resolve to any interface
+        return False
+
+
+def available_encodings() -> List[str]:
+    """Encodings this process can speak, most preferred first."""
+    if msgpack is not None:
+        return [ENCODING_MSGPACK, ENCODING_JSON]
+    return [ENCODING_JSON]
+
+
+def negotiate_encoding(offered: List[str]) -> str:
+    """Pick the first encoding offered by the peer that we also support."""
+    supported = available_encodings()
+    for encoding in offered or []:
+        if encoding in supported:
+            return encoding
+    return ENCODING_JSON
+
+
+def _json_default(value: Any) -> Any:
+    """Encode values the json module does not support natively."""
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return {BYTES_KEY: base64.b64encode(value).decode("ascii")}
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _is_marker_key(key: Any) -> bool:
+    """Whether a key is ``BYTES_KEY`` followed by any number of ``KEY_ESCAPE``."""
+    return isinstance(key, str) and key.startswith(BYTES_KEY) and not key[len(BYTES_KEY):].strip(KEY_ESCAPE)
+
+
+def _escape_key(key: Any) -> Any:
+    return key + KEY_ESCAPE if _is_marker_key(key) else key
+
+
+def _escape(value: Any) -> Any:
+    """A copy of ``value`` with every dict key that could read as a bytes marker escaped."""
+    if isinstance(value, dict):
+        return {_escape_key(key): _escape(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_escape(item) for item in value]
+    return value
+
+
+def _json_object_hook(value: Dict[str, Any]) -> Any:
+    """Restore bytes values wrapped by ``_json_default`` and unescape marker-like keys."""
+    if len(value) == 1 and BYTES_KEY in value:
+        return base64.b64decode(value[BYTES_KEY])
+    if any(_is_marker_key(key) for key in value):
+        return {key[:-1] if _is_marker_key(key) else key: item for key, item in value.items()}
+    return value
+
+
+# Reused for every leaf value; building an encoder per call costs more than encoding small values
+_encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=_json_default).encode
+
+
+def _json_encode(value: Any) -> str:
+    """Encode a value as JSON, escaping its keys only if the marker shows up in the text."""
+    text = _encode(value)
+    if BYTES_KEY in text and not isinstance(value, (bytes, bytearray, memoryview)):
+        text = _encode(_escape(value))
+    return text
+
+
+def _iter_json(value: Any, depth: int = STREAM_DEPTH) -> Iterator[str]:
+    """Encode ``value`` as JSON text in pieces.
+
+    The outer ``depth`` levels of containers are walked here so that no piece is
+    larger than a single element; everything below is handed to ``json.dumps``,
+    which keeps the fast C encoder for the bulk of the work.
+    """
+    if depth and isinstance(value, dict) and value:
+        separator = "{"
+        for key, item in value.items():
+            if not isinstance(key, str):
+                key = _json_encode(key)
+            yield separator + _json_encode(_escape_key(key)) + ":"
+            yield from _iter_json(item, depth - 1)
+            separator = ","
+        yield "}"
+    elif depth and isinstance(value, (list, tuple)) and value:
+        separator = "["
+        for item in value:
+            yield separator
+            yield from _iter_json(item, depth - 1)
+            separator = ","
+        yield "]"
+    else:
+        yield _json_encode(value)
+
+
+def _iter_msgpack(value: Any, packer: "msgpack.Packer", depth: int = STREAM_DEPTH) -> Iterator[bytes]:
+    """Encode ``value`` as MessagePack in pieces, mirroring ``_iter_json``."""
+    if depth and isinstance(value, dict) and value:
+        yield packer.pack_map_header(len(value))
+        for key, item in value.items():
+            yield packer.pack(key)
+            yield from _iter_msgpack(item, packer, depth - 1)
+    elif depth and isinstance(value, (list, tuple)) and value:
+        yield packer.pack_array_header(len(value))
+        for item in value:
+            yield from _iter_msgpack(item, packer, depth - 1)
+    else:
+        yield packer.pack(value)
+
+
+def _iter_encoded(message: Dict[str, Any], encoding: str) -> Iterator[bytes]:
+    """Encode a message in pieces of bytes, batching small pieces together."""
+    if encoding == ENCODING_MSGPACK:
+        packer = msgpack.Packer(use_bin_type=True, datetime=False)
+        yield from _iter_msgpack(message, packer)
+        return
+
+    pieces = []
+    buffered = 0
+    for piece in _iter_json(message):
+        pieces.append(piece)
+        buffered += len(piece)
+        if buffered >= CHUNK_SIZE:
+            yield "".join(pieces).encode()
+            pieces.clear()
+            buffered = 0
+    yield "".join(pieces).encode()
+
+
+def encode_frames(request_id: int, message: Dict[str, Any], encoding: str = ENCODING_JSON) -> Iterator[bytes]:
+    """Encode a message as a sequence of frames of at most ``CHUNK_SIZE`` bytes."""
+    flags = FLAG_MSGPACK if encoding == ENCODING_MSGPACK else 0
+    pending = []
+    buffered = 0
+    for piece in _iter_encoded(message, encoding):
+        pending.append(piece)
+        buffered += len(piece)
+        if buffered < CHUNK_SIZE:
+            continue
+        data = b"".join(pending)
+        # Send whole chunks now and carry the tail over into the next frame
+        cut = len(data) - len(data) % CHUNK_SIZE
+        for offset in range(0, cut, CHUNK_SIZE):
+            yield HEADER.pack(request_id, CHUNK_SIZE, flags) + data[offset:offset + CHUNK_SIZE]
+        pending = [data[cut:]]
+        buffered = len(data) - cut
+
+    data = b"".join(pending)
+    last = max(len(data) - 1, 0) // CHUNK_SIZE * CHUNK_SIZE
+    for offset in range(0, last, CHUNK_SIZE):
+        yield HEADER.pack(request_id, CHUNK_SIZE, flags) + data[offset:offset + CHUNK_SIZE]
+    yield HEADER.pack(request_id, len(data) - last, flags | FLAG_END) + data[last:]
+
+
+async def write_message(writer: asyncio.StreamWriter, request_id: int, message: Dict[str, Any],
+                        encoding: str = ENCODING_JSON):
+    """Stream a message to the peer, waiting for the socket to drain between frames.
+
+    Each frame is handed to the transport in a single ``write`` call, so frames
+    from concurrent writers never interleave mid-frame. If the message cannot be
+    encoded, an abort frame is sent before the error is re-raised.
+    """
+    frames = encode_frames(request_id, message, encoding)
+    while True:
+        try:
+            frame = next(frames)
+        except StopIteration:
+            return
+        except Exception:
+            # Let the peer drop any frames already sent for this message
+            writer.write(HEADER.pack(request_id, 0, FLAG_ABORT))
+            raise
+        writer.write(frame)
+        await writer.drain()
+
+
+class MessageReader:
+    """Reassembles framed messages read from a stream.
+
+    Frames for different request ids may arrive interleaved; each message is
+    collected into its own buffer and returned once its final frame arrives.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader):
+        self._reader = reader
+        self._partial: Dict[int, bytearray] = {}
+
+    async def read(self) -> Optional[Message]:
+        """Read until a message is complete.
+
+        Returns:
+            The request id, encoding and raw payload of the message, or None at
+            end of stream
+
+        Raises:
+            ProtocolError: If a frame or message exceeds the size limits
+        """
+        while True:
+            try:
+                header = await self._reader.readexactly(HEADER.size)
+            except asyncio.IncompleteReadError as e:
+                if e.partial:
+                    raise ProtocolError("Connection closed in the middle of a frame header")
+                return None
+
+            request_id, length, flags = HEADER.unpack(header)
+            if flags & FLAG_ABORT:
+                self._partial.pop(request_id, None)
+                continue
+            if length > MAX_FRAME_SIZE:
+                raise ProtocolError(f"Frame of {length} bytes exceeds limit of {MAX_FRAME_SIZE}")
+
+            buffer = self._partial.setdefault(request_id, bytearray())
+            if len(buffer) + length > MAX_MESSAGE_SIZE:
+                del self._partial[request_id]
+                raise ProtocolError(f"Message {request_id} exceeds limit of {MAX_MESSAGE_SIZE} bytes")
+            if length:
+                try:
+                    buffer += await self._reader.readexactly(length)
+                except asyncio.IncompleteReadError:
+                    raise ProtocolError("Connection closed in the middle of a frame")
+
+            if flags & FLAG_END:
+                encoding = ENCODING_MSGPACK if flags & FLAG_MSGPACK else ENCODING_JSON
+                return Message(request_id, encoding, self._partial.pop(request_id))
+
+
+def decode_message(payload: bytearray, encoding: str = ENCODING_JSON) -> Dict[str, Any]:
+    """Parse a reassembled message payload.
+
+    Raises:
+        ValueError: If the payload is malformed or uses an unsupported encoding
+    """
+    if encoding == ENCODING_MSGPACK:
+        if msgpack is None:
+            raise ValueError("Received a MessagePack message but msgpack is not installed")
+        try:
+            return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+        except Exception as e:
+            raise ValueError(f"Malformed MessagePack payload: {e}")
+    if BYTES_KEY.encode() not in payload:
+        # Nothing to restore, so skip calling the hook for every object
+        return json.loads(payload)
+    return json.loads(payload, object_hook=_json_object_hook)
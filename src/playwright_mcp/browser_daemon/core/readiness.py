@@ -0,0 +1,64 @@
+"""Startup readiness signalling between the daemon and whoever launched it.
+
+The launcher creates a pipe, passes the write end to the daemon and names it in
+``READY_FD_ENV``. Once the socket server is listening the daemon writes
+``READY=1`` to it and closes it, so the launcher can stop waiting the moment
+the daemon can take connections instead of sleeping and polling. If the daemon
+dies first the pipe reaches EOF without the message.
+
+Under systemd (``Type=notify``) the same message is sent to ``NOTIFY_SOCKET``.
+"""
+import asyncio
+import os
+import socket
+
+from .logging import setup_logging
+
+logger = setup_logging("readiness")
+
+READY_FD_ENV = "PLAYWRIGHT_MCP_READY_FD"
+READY_MESSAGE = b"READY=1\n"
+
+
+def notify_ready():
+    """Tell the launcher (and systemd, if present) that the daemon is accepting connections."""
+    fd = os.environ.pop(READY_FD_ENV, None)
+    if fd is not None:
+        try:
+            os.write(int(fd), READY_MESSAGE)
+            os.close(int(fd))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not signal readiness on fd {fd}: {e}")
+
+    notify_socket = os.environ.get("NOTIFY_SOCKET")
+    if notify_socket:
+        if notify_socket.startswith("@"):
+            notify_socket = "\0" + notify_socket[1:]  # Abstract namespace
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+                sock.sendto(READY_MESSAGE.strip(), notify_socket)
+        except OSError as e:
+            logger.warning(f"Could not notify systemd: {e}")
+
+
+async def wait_until_ready(read_fd: int, timeout: float) -> bool:
+    """Wait for the daemon to write its readiness message to the pipe.
+
+    Takes ownership of ``read_fd`` and closes it.
+
+    Returns:
+        True once the daemon is ready, False if the pipe closed without the message
+
+    Raises:
+        asyncio.TimeoutError: If nothing arrives within ``timeout`` seconds
+    """
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    transport, _ = await loop.connect_read_pipe(
+        lambda: asyncio.StreamReaderProtocol(reader), os.fdopen(read_fd, "rb", buffering=0)
+    )
+    try:
+        line = await asyncio.wait_for(reader.readline(), timeout)
+        return line == READY_MESSAGE
+    finally:
+        transport.close()
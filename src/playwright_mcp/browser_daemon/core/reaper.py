@@ -0,0 +1,178 @@
+"""Background eviction of idle and excess browser sessions and pages.
+
+Every ``PLAYWRIGHT_MCP_REAP_INTERVAL`` seconds the reaper closes sessions and
+pages that have not been used for ``PLAYWRIGHT_MCP_IDLE_TTL`` seconds, then
+evicts the least recently used ones while a hard limit is exceeded: the number
+of pages (``PLAYWRIGHT_MCP_MAX_PAGES``), of sessions
+(``PLAYWRIGHT_MCP_MAX_SESSIONS``) or the resident memory of the browser
+processes (``PLAYWRIGHT_MCP_MAX_BROWSER_RSS_MB``). A limit of 0 turns it off.
+Anything with a command running or waiting is left alone.
+
+Memory is measured once per round, across all browsers, and closing a session
+that shares a browser may free little of it. So each round evicts at most one
+session for memory, and stops evicting for memory once an eviction has not
+lowered it, until it drops again.
+
+Evicted IDs are remembered, so later commands for them fail with
+``"code": "evicted"`` rather than a generic "not found".
+"""
+import asyncio
+import os
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .logging import setup_logging
+from .session import SessionManager
+
+logger = setup_logging("reaper")
+
+IDLE_TTL = float(os.getenv("PLAYWRIGHT_MCP_IDLE_TTL", "1800"))
+MAX_PAGES = int(os.getenv("PLAYWRIGHT_MCP_MAX_PAGES", "0"))
+MAX_SESSIONS = int(os.getenv("PLAYWRIGHT_MCP_MAX_SESSIONS", "0"))
+MAX_BROWSER_RSS_MB = int(os.getenv("PLAYWRIGHT_MCP_MAX_BROWSER_RSS_MB", "0"))
+REAP_INTERVAL = float(os.getenv("PLAYWRIGHT_MCP_REAP_INTERVAL", "30"))
+
+
+def process_tree_rss(pid: Optional[int] = None) -> int:
+    """Resident memory in bytes of every process descended from ``pid`` (this process by default).
+
+    Browsers are started by the playwright driver, a child of the daemon, so
+    this covers all of them. Reads ``/proc``; returns 0 where it is not available.
+    """
+    pid = os.getpid() if pid is None else pid
+    children: Dict[int, List[int]] = {}
+    rss: Dict[int, int] = {}
+    try:
+        entries = os.listdir("/proc")
+    except OSError:
+        return 0
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # Fields after the command name, which may itself contain spaces and parentheses
+                fields = f.read().rsplit(")", 1)[1].split()
+        except (OSError, IndexError):
+            continue
+        children.setdefault(int(fields[1]), []).append(int(entry))
+        rss[int(entry)] = int(fields[21]) * page_size
+    total, stack = 0, list(children.get(pid, []))
+    while stack:
+        child = stack.pop()
+        total += rss.get(child, 0)
+        stack.extend(children.get(child, []))
+    return total
+
+
+class Reaper:
+    """Evicts idle sessions and pages, and the least recently used ones over the limits."""
+
+    def __init__(self, session_manager: SessionManager, busy: Optional[Callable[[str], bool]] = None,
+                 idle_ttl: float = IDLE_TTL, max_pages: int = MAX_PAGES, max_sessions: int = MAX_SESSIONS,
+                 max_rss_mb: int = MAX_BROWSER_RSS_MB, interval: float = REAP_INTERVAL,
+                 rss: Callable[[], int] = process_tree_rss):
+        self.session_manager = session_manager
+        self.busy = busy or (lambda key: False)
+        self.idle_ttl = idle_ttl
+        self.max_pages = max_pages
+        self.max_sessions = max_sessions
+        self.max_rss_mb = max_rss_mb
+        self.interval = interval
+        self.rss = rss
+        self.evictions: Dict[str, int] = {}
+        # Memory use when the last session was evicted for memory, while still over the limit
+        self._rss_at_eviction: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start sweeping in the background."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop sweeping."""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.sweep()
+            except Exception as e:
+                logger.error(f"Reaper sweep failed: {e}")
+
+    async def sweep(self) -> List[Tuple[str, str]]:
+        """Run one round of eviction.
+
+        Returns:
+            (session or page ID, reason) for everything evicted
+        """
+        manager = self.session_manager
+        evicted: List[Tuple[str, str]] = []
+
+        if self.idle_ttl > 0:
+            cutoff = time.monotonic() - self.idle_ttl
+            for session_id in self._by_last_use(manager.sessions):
+                if self._last_used(session_id) < cutoff:
+                    await self._evict_session(session_id, "idle", evicted)
+            for page_id in self._by_last_use(manager.pages):
+                if self._last_used(page_id) < cutoff:
+                    await self._evict_page(page_id, "idle", evicted)
+
+        if self.max_pages > 0:
+            for page_id in self._by_last_use(manager.pages)[:max(0, len(manager.pages) - self.max_pages)]:
+                await self._evict_page(page_id, "page limit", evicted)
+
+        if self.max_sessions > 0:
+            for session_id in self._by_last_use(manager.sessions)[:max(0, len(manager.sessions) - self.max_sessions)]:
+                await self._evict_session(session_id, "session limit", evicted)
+
+        if self.max_rss_mb > 0:
+            await self._reduce_memory(evicted)
+
+        if evicted:
+            logger.info(f"Evicted {len(evicted)} sessions and pages: {evicted}")
+        return evicted
+
+    async def _reduce_memory(self, evicted: List[Tuple[str, str]]):
+        """Evict the least recently used session if over the memory limit and the last eviction helped."""
+        rss = self.rss()
+        if rss <= self.max_rss_mb * 2**20:
+            self._rss_at_eviction = None
+            return
+        if self._rss_at_eviction is not None and rss >= self._rss_at_eviction:
+            logger.warning(f"Browsers use {rss // 2**20} MB, over the limit, but evicting a session did not help")
+            return
+        for session_id in self._by_last_use(self.session_manager.sessions):
+            count = len(evicted)
+            await self._evict_session(session_id, "memory limit", evicted)
+            if len(evicted) > count:
+                self._rss_at_eviction = rss
+                return
+
+    def stats(self) -> Dict[str, int]:
+        """Evictions so far, by reason."""
+        return dict(self.evictions)
+
+    def _last_used(self, key: str) -> float:
+        # Anything not seen before counts as used now
+        return self.session_manager.last_used.setdefault(key, time.monotonic())
+
+    def _by_last_use(self, keys) -> List[str]:
+        """IDs that may be evicted, least recently used first."""
+        return sorted((key for key in list(keys) if not self.busy(key)), key=self._last_used)
+
+    async def _evict_session(self, session_id: str, reason: str, evicted: List[Tuple[str, str]]):
+        if await self.session_manager.evict_session(session_id, reason):
+            self.evictions[reason] = self.evictions.get(reason, 0) + 1
+            evicted.append((session_id, reason))
+
+    async def _evict_page(self, page_id: str, reason: str, evicted: List[Tuple[str, str]]):
+        if await self.session_manager.evict_page(page_id, reason):
+            self.evictions[reason] = self.evictions.get(reason, 0) + 1
+            evicted.append((page_id, reason))
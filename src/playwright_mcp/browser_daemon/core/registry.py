@@ -0,0 +1,108 @@
+"""Opaque IDs for the daemon's sessions and pages.
+
+A ``Registry`` keeps its objects in a table of slots and names each one
+``<prefix>_<slot>.<generation>``, e.g. ``page_3.0``. Freeing a slot bumps its
+generation, so when the slot is used again the new object gets a different ID
+(``page_3.1``) and the old one stops resolving: IDs are never handed out twice,
+unlike IDs built from ``id()``, which Python reuses once an object is collected.
+Lookups go straight to the slot and compare the whole ID, so they cost the same
+however many objects are open.
+
+A registry also works as a mapping, and keys that are not its own IDs (set
+directly, as tests and tools sometimes do) are kept alongside the slots.
+"""
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+def parse_id(key: str) -> Optional[Tuple[str, int, int]]:
+    """Split a registry ID into prefix, slot and generation, or None if it is not one."""
+    if not isinstance(key, str):
+        return None
+    prefix, separator, rest = key.rpartition("_")
+    slot, dot, generation = rest.partition(".")
+    if not separator or not dot or not slot.isdigit() or not generation.isdigit():
+        return None
+    return prefix, int(slot), int(generation)
+
+
+class Registry(MutableMapping):
+    """Objects by generation-checked ID, with slots reused from a free list."""
+
+    def __init__(self):
+        # Per slot: its current generation, and the (ID, object) it holds, if any
+        self._generations: List[int] = []
+        self._entries: List[Optional[Tuple[str, Any]]] = []
+        self._free: List[int] = []
+        self._live = 0
+        self._other: Dict[str, Any] = {}
+
+    def add(self, prefix: str, value: Any) -> str:
+        """Store ``value`` in a free slot and return its new ID."""
+        if self._free:
+            slot = self._free.pop()
+        else:
+            slot = len(self._entries)
+            self._generations.append(0)
+            self._entries.append(None)
+        key = f"{prefix}_{slot}.{self._generations[slot]}"
+        self._entries[slot] = (key, value)
+        self._live += 1
+        return key
+
+    def _slot(self, key: str) -> Optional[int]:
+        """The slot holding ``key``, or None if no live object has that ID."""
+        parsed = parse_id(key)
+        if parsed is None or parsed[1] >= len(self._entries):
+            return None
+        slot = parsed[1]
+        entry = self._entries[slot]
+        return slot if entry is not None and entry[0] == key else None
+
+    def _release(self, slot: int):
+        self._entries[slot] = None
+        self._generations[slot] += 1
+        self._free.append(slot)
+        self._live -= 1
+
+    def __getitem__(self, key: str) -> Any:
+        slot = self._slot(key)
+        if slot is not None:
+            return self._entries[slot][1]
+        return self._other[key]
+
+    def __setitem__(self, key: str, value: Any):
+        slot = self._slot(key)
+        if slot is not None:
+            self._entries[slot] = (key, value)
+        else:
+            self._other[key] = value
+
+    def __delitem__(self, key: str):
+        slot = self._slot(key)
+        if slot is not None:
+            self._release(slot)
+        else:
+            del self._other[key]
+
+    def __contains__(self, key: object) -> bool:
+        return self._slot(key) is not None or key in self._other
+
+    def __iter__(self) -> Iterator[str]:
+        for entry in list(self._entries):
+            if entry is not None:
+                yield entry[0]
+        yield from list(self._other)
+
+    def __len__(self) -> int:
+        return self._live + len(self._other)
+
+    def clear(self):
+        """Drop every object; their IDs stay retired."""
+        for slot, entry in enumerate(self._entries):
+            if entry is not None:
+                self._release(slot)
+        self._other.clear()
+
+    def __repr__(self) -> str:
+        return f"Registry({dict(self.items())!r})"
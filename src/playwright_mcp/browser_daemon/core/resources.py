@@ -0,0 +1,179 @@
+"""Per-session resource policies: requests a session's pages never make.
+
+A policy blocks requests by resource type (images, media, fonts, ...) and by
+domain, e.g. trackers. It is enforced with one route on the session's
+``BrowserContext``, so it covers every page of the session, including tabs
+opened later. Requests it lets through fall back to any other route.
+
+A policy is given as a preset name or as ``{"block_types": [...],
+"block_domains": [...]}``; ``PLAYWRIGHT_MCP_RESOURCE_POLICY`` sets one for
+sessions that do not ask for their own.
+
+Blocked requests are counted per page, with an estimate of the bytes they
+would have downloaded: blocked requests are never sent, so their real size is
+unknown, and each one is counted at a typical transfer size for its type.
+"""
+import os
+import weakref
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Optional, Tuple
+from urllib.parse import urlsplit
+
+from playwright.async_api import BrowserContext, Page, Route
+
+from .logging import setup_logging
+
+logger = setup_logging("resources")
+
+RESOURCE_POLICY_ENV = "PLAYWRIGHT_MCP_RESOURCE_POLICY"
+
+# Resource types as reported by Playwright's Request.resource_type
+RESOURCE_TYPES = frozenset({
+    "document", "stylesheet", "image", "media", "font", "script", "texttrack", "xhr", "fetch",
+    "eventsource", "websocket", "manifest", "other",
+})
+ASSET_TYPES = frozenset({"image", "media", "font"})
+
+# Analytics, ad and session-recording hosts; subdomains are blocked too
+TRACKER_DOMAINS = (
+    "google-analytics.com", "googletagmanager.com", "googlesyndication.com", "doubleclick.net",
+    "googleadservices.com", "facebook.net", "connect.facebook.com", "hotjar.com", "segment.io",
+    "segment.com", "mixpanel.com", "amplitude.com", "fullstory.com", "clarity.ms", "newrelic.com",
+    "nr-data.net", "scorecardresearch.com", "quantserve.com", "adnxs.com", "criteo.com",
+    "taboola.com", "outbrain.com", "bat.bing.com", "ads-twitter.com", "snap.licdn.com",
+)
+
+# Typical transfer size per blocked request, by resource type, for the bytes-saved estimate
+TYPICAL_BYTES = {
+    "image": 25_000, "media": 500_000, "font": 30_000, "stylesheet": 10_000, "script": 25_000,
+}
+DEFAULT_TYPICAL_BYTES = 5_000
+
+
+@dataclass(frozen=True)
+class ResourcePolicy:
+    """Resource types and domains a session does not load."""
+    block_types: FrozenSet[str] = frozenset()
+    block_domains: Tuple[str, ...] = ()
+
+    @classmethod
+    def parse(cls, value: Any) -> Optional["ResourcePolicy"]:
+        """Build a policy from a preset name or a dict; None or "none" means no policy.
+
+        Raises:
+            ValueError: For an unknown preset or resource type, or a malformed policy
+        """
+        if value is None:
+            return None
+        if isinstance(value, str):
+            if value not in PRESETS:
+                raise ValueError(f"Unknown resource policy {value!r}; presets are {', '.join(PRESETS)}")
+            return PRESETS[value]
+        if not isinstance(value, dict) or set(value) - {"preset", "block_types", "block_domains"}:
+            raise ValueError("A resource policy is a preset name or {'block_types': [...], 'block_domains': [...]}")
+        base = cls.parse(value.get("preset")) or cls()
+        block_types = value.get("block_types", [])
+        block_domains = value.get("block_domains", [])
+        if not isinstance(block_types, list) or not isinstance(block_domains, list):
+            raise ValueError("block_types and block_domains must be lists")
+        unknown = set(block_types) - RESOURCE_TYPES
+        if unknown:
+            raise ValueError(f"Unknown resource types: {', '.join(sorted(unknown))}")
+        domains = tuple(d.strip().lower().lstrip(".") for d in block_domains if d.strip())
+        policy = cls(base.block_types | frozenset(block_types), base.block_domains + domains)
+        return policy if policy else None
+
+    def __bool__(self) -> bool:
+        return bool(self.block_types or self.block_domains)
+
+    def blocks(self, url: str, resource_type: str) -> bool:
+        """Whether a request for ``url`` of ``resource_type`` is blocked."""
+        if resource_type in self.block_types:
+            return True
+        if not self.block_domains:
+            return False
+        host = (urlsplit(url).hostname or "").lower()
+        return any(host == domain or host.endswith("." + domain) for domain in self.block_domains)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"block_types": sorted(self.block_types), "block_domains": list(self.block_domains)}
+
+
+PRESETS: Dict[str, Optional[ResourcePolicy]] = {
+    "none": None,
+    "assets": ResourcePolicy(ASSET_TYPES),
+    "trackers": ResourcePolicy(block_domains=TRACKER_DOMAINS),
+    "lean": ResourcePolicy(ASSET_TYPES, TRACKER_DOMAINS),
+}
+
+
+def default_policy() -> Optional[ResourcePolicy]:
+    """The policy from ``PLAYWRIGHT_MCP_RESOURCE_POLICY`` (a preset name), or None."""
+    name = os.getenv(RESOURCE_POLICY_ENV, "").strip()
+    if not name:
+        return None
+    try:
+        return ResourcePolicy.parse(name)
+    except ValueError as e:
+        logger.warning(f"Ignoring {RESOURCE_POLICY_ENV}: {e}")
+        return None
+
+
+@dataclass
+class BlockedCounts:
+    """Requests blocked for one page, and the bytes they would likely have cost."""
+    requests: int = 0
+    bytes_saved: int = 0
+    by_type: Dict[str, int] = field(default_factory=dict)
+
+    def add(self, resource_type: str):
+        self.requests += 1
+        self.bytes_saved += TYPICAL_BYTES.get(resource_type, DEFAULT_TYPICAL_BYTES)
+        self.by_type[resource_type] = self.by_type.get(resource_type, 0) + 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"requests": self.requests, "bytes_saved": self.bytes_saved, "by_type": dict(self.by_type)}
+
+
+class ResourceBlocker:
+    """Enforces a session's policy through a route on its context and counts what it blocks."""
+
+    PATTERN = "**/*"
+
+    def __init__(self, policy: ResourcePolicy):
+        self.policy = policy
+        self.total = BlockedCounts()
+        # Per page, so concurrent navigations in one session are reported apart
+        self.pages: "weakref.WeakKeyDictionary[Page, BlockedCounts]" = weakref.WeakKeyDictionary()
+        self._context: Optional[BrowserContext] = None
+
+    async def install(self, context: BrowserContext):
+        await context.route(self.PATTERN, self.handle)
+        self._context = context
+
+    async def uninstall(self):
+        if self._context is not None:
+            await self._context.unroute(self.PATTERN, self.handle)
+            self._context = None
+
+    async def handle(self, route: Route):
+        request = route.request
+        if not self.policy.blocks(request.url, request.resource_type):
+            await route.fallback()
+            return
+        self.total.add(request.resource_type)
+        try:
+            page = request.frame.page
+        except Exception:
+            # Requests from service workers have no frame
+            page = None
+        if page is not None:
+            self.pages.setdefault(page, BlockedCounts()).add(request.resource_type)
+        await route.abort("blockedbyclient")
+
+    def start_counting(self, page: Page):
+        """Reset a page's counts, e.g. at the start of a navigation."""
+        self.pages[page] = BlockedCounts()
+
+    def counts(self, page: Page) -> BlockedCounts:
+        return self.pages.get(page) or BlockedCounts()
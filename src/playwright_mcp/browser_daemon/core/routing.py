@@ -0,0 +1,95 @@
+"""Owner-prefixed IDs, for routing commands to the process that holds their browser.
+
+When browsers are spread over several workers or daemons, the session, page
+and job IDs a client sees carry the name of their owner: ``w1:chromium_3.0``.
+Requests are routed on that prefix and it is stripped before the owner sees
+them; replies and events have it added on the way back. Owners can nest, e.g.
+``node2:w1:page_8.1``, with each layer handling its own prefix.
+
+Only a reply's (or event payload's) own ID fields get the prefix, plus those
+of the replies of batch steps: an ``execute-js`` result or extracted JSON
+with a ``page_id`` key in it is page data and is left alone.
+"""
+from typing import Any, Optional, Tuple
+
+SEPARATOR = ":"
+
+# Keys whose string values (or lists of strings) are routable IDs
+ROUTED_KEYS = {"session_id", "page_id", "job_id", "page_ids"}
+
+
+def split_owner(value: str) -> Tuple[Optional[str], str]:
+    """Split an ID into its owner and the owner's own ID; the owner is None if there is no prefix."""
+    owner, separator, local = value.partition(SEPARATOR)
+    return (owner, local) if separator else (None, value)
+
+
+def add_owner(value: Any, owner: str) -> Any:
+    """Copy a reply or event payload with its own routed IDs prefixed with ``owner``."""
+    if not isinstance(value, dict):
+        return value
+    result = dict(value)
+    for key in ROUTED_KEYS & value.keys():
+        item = value[key]
+        if isinstance(item, str):
+            result[key] = f"{owner}{SEPARATOR}{item}"
+        elif isinstance(item, list):
+            result[key] = [f"{owner}{SEPARATOR}{i}" if isinstance(i, str) else i for i in item]
+    if isinstance(value.get("results"), list):
+        # A batch reply: each step's result is a reply of its own
+        result["results"] = [
+            {**step, "result": add_owner(step["result"], owner)} if _is_batch_step(step) else step
+            for step in value["results"]
+        ]
+    return result
+
+
+def _is_batch_step(value: Any) -> bool:
+    return isinstance(value, dict) and "command" in value and isinstance(value.get("result"), dict)
+
+
+def strip_owner(value: Any, owner: str) -> Any:
+    """Copy ``value`` with ``owner``'s prefix removed from every routed ID in it.
+
+    Raises:
+        ValueError: If an ID belongs to a different owner
+    """
+    def strip(key: str) -> str:
+        found, local = split_owner(key)
+        if found is None:
+            return key
+        if found != owner:
+            raise ValueError(f"{key} does not belong to {owner}")
+        return local
+    return _rewrite(value, strip)
+
+
+def find_ids(value: Any):
+    """Yield every routed ID in ``value``, including those nested in batch steps."""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key in ROUTED_KEYS and isinstance(item, (str, list)):
+                items = [item] if isinstance(item, str) else item
+                # "$0.page_id" is a batch reference to an earlier step's result, not an ID
+                yield from (i for i in items if isinstance(i, str) and not i.startswith("$"))
+            else:
+                yield from find_ids(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from find_ids(item)
+
+
+def _rewrite(value: Any, rewrite) -> Any:
+    if isinstance(value, dict):
+        result = {}
+        for key, item in value.items():
+            if key in ROUTED_KEYS and isinstance(item, str) and not item.startswith("$"):
+                result[key] = rewrite(item)
+            elif key in ROUTED_KEYS and isinstance(item, list):
+                result[key] = [rewrite(i) if isinstance(i, str) and not i.startswith("$") else i for i in item]
+            else:
+                result[key] = _rewrite(item, rewrite)
+        return result
+    if isinstance(value, list):
+        return [_rewrite(item, rewrite) for item in value]
+    return value
@@ -0,0 +1,167 @@
+"""Admission and ordering of daemon commands.
+
+Commands for the same page run one at a time, in the order they arrived, so a
+click can never land in the middle of a navigation. Commands for different
+pages run in parallel, bounded by a global limit and a per-session limit. When
+too many commands are already waiting, new ones are rejected straight away
+rather than queued without bound.
+"""
+import asyncio
+import os
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Any, AsyncContextManager, Awaitable, Callable, Dict, List, Optional
+
+from .logging import setup_logging
+
+logger = setup_logging("scheduler")
+
+MAX_CONCURRENT = int(os.getenv("PLAYWRIGHT_MCP_MAX_CONCURRENT", "16"))
+MAX_PER_SESSION = int(os.getenv("PLAYWRIGHT_MCP_MAX_PER_SESSION", "8"))
+MAX_QUEUED = int(os.getenv("PLAYWRIGHT_MCP_MAX_QUEUED", "256"))
+
+
+# Runs a coroutine function as a command on a page and session, e.g. ``CommandScheduler.run``
+Runner = Callable[[Callable[[], Awaitable[Any]], Optional[str], Optional[str]], Awaitable[Any]]
+
+
+async def run_directly(func: Callable[[], Awaitable[Any]], page_id: Optional[str] = None,
+                       session_id: Optional[str] = None) -> Any:
+    """A ``Runner`` that runs the function straight away, outside any scheduler."""
+    return await func()
+
+
+# Holds sessions and pages (IDs) so no command runs on them meanwhile, e.g. ``CommandScheduler.hold``
+Hold = Callable[[List[str], List[str]], AsyncContextManager[None]]
+
+
+@asynccontextmanager
+async def hold_nothing(session_ids: List[str], page_ids: List[str]):
+    """A ``Hold`` that holds nothing, outside any scheduler."""
+    yield
+
+
+class Overloaded(Exception):
+    """Raised when a command is rejected because too many are already waiting."""
+
+
+class KeyedSlots:
+    """A semaphore per key, created on first use and dropped once idle.
+
+    ``asyncio.Semaphore`` wakes waiters in arrival order, so with a limit of
+    one this is a FIFO queue per key.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._slots: Dict[str, asyncio.Semaphore] = {}
+        self._users: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._slots
+
+    @asynccontextmanager
+    async def acquire(self, key: str):
+        if key not in self._slots:
+            self._slots[key] = asyncio.Semaphore(self.limit)
+            self._users[key] = 0
+        self._users[key] += 1
+        try:
+            async with self._slots[key]:
+                yield
+        finally:
+            self._users[key] -= 1
+            if not self._users[key]:
+                del self._slots[key]
+                del self._users[key]
+
+
+class CommandScheduler:
+    """Serializes commands per page and caps concurrency globally and per session."""
+
+    def __init__(self, max_concurrent: int = MAX_CONCURRENT, max_per_session: int = MAX_PER_SESSION,
+                 max_queued: int = MAX_QUEUED):
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self._global: Optional[asyncio.Semaphore] = None
+        self._pages = KeyedSlots(1)
+        self._sessions = KeyedSlots(max_per_session)
+        self.queued = 0
+        self.running = 0
+        self.rejected = 0
+
+    async def run(self, func: Callable[[], Awaitable[Any]], page_id: Optional[str] = None,
+                  session_id: Optional[str] = None) -> Any:
+        """Run ``func`` once the page, session and global slots are free.
+
+        Raises:
+            Overloaded: If ``max_queued`` commands are already waiting
+        """
+        if self.queued >= self.max_queued:
+            self.rejected += 1
+            raise Overloaded(f"{self.queued} commands are already waiting; try again later")
+        if self._global is None:
+            self._global = asyncio.Semaphore(self.max_concurrent)
+
+        self.queued += 1
+        waiting = True
+        try:
+            # Always taken in this order (page, session, global), so waiters cannot deadlock
+            async with self._page(page_id), self._session(session_id), self._global:
+                self.queued -= 1
+                waiting = False
+                self.running += 1
+                try:
+                    return await func()
+                finally:
+                    self.running -= 1
+        finally:
+            if waiting:
+                self.queued -= 1
+
+    @asynccontextmanager
+    async def hold(self, session_ids: List[str], page_ids: List[str]):
+        """Take every slot of these sessions and pages, once their running commands finish.
+
+        Commands for them wait until the hold is released. Slots are taken in
+        the same order as ``run`` takes them (pages, then sessions).
+        """
+        async with AsyncExitStack() as stack:
+            for page_id in page_ids:
+                await stack.enter_async_context(self._pages.acquire(page_id))
+            for session_id in session_ids:
+                for _ in range(self._sessions.limit):
+                    await stack.enter_async_context(self._sessions.acquire(session_id))
+            yield
+
+    def is_busy(self, key: str) -> bool:
+        """Whether a command for this page or session is running or waiting."""
+        return key in self._pages or key in self._sessions
+
+    def stats(self) -> Dict[str, int]:
+        """Current load, for diagnostics."""
+        return {
+            "running": self.running,
+            "queued": self.queued,
+            "rejected": self.rejected,
+            "active_pages": len(self._pages),
+            "active_sessions": len(self._sessions),
+        }
+
+    @asynccontextmanager
+    async def _page(self, page_id: Optional[str]):
+        if page_id is None:
+            yield
+            return
+        async with self._pages.acquire(page_id):
+            yield
+
+    @asynccontextmanager
+    async def _session(self, session_id: Optional[str]):
+        if session_id is None:
+            yield
+            return
+        async with self._sessions.acquire(session_id):
+            yield
@@ -1,21 +1,24 @@
 import asyncio
-import json
 import os
 import tempfile
-from asyncio import StreamReader, StreamWriter
-from typing import Callable, Dict, Any
+from asyncio import StreamWriter
+from typing import Callable, Dict, Any, Optional, Tuple
 
 from .logging import setup_logging
+from .protocol import ENCODING_JSON, MessageReader, decode_message, write_message
 
 logger = setup_logging("server")
 
 
 class UnixSocketServer:
-    def __init__(self):
-        self._socket_path = os.path.join(tempfile.gettempdir(), 'playwright_mcp.sock')
+    def __init__(self, socket_path: Optional[str] = None):
+        self._socket_path = socket_path or os.path.join(tempfile.gettempdir(), 'playwright_mcp.sock')
 
-    async def start(self, connection_handler: Callable):
-        """Start the Unix socket server."""
+    async def start(self, connection_handler: Callable, on_ready: Optional[Callable[[], None]] = None):
+        """Start the Unix socket server.
+
+        ``on_ready`` is called once the socket is accepting connections.
+        """
         # Remove existing socket if it exists
         try:
             os.unlink(self._socket_path)
@@ -29,35 +32,81 @@ class UnixSocketServer:
         )
 
         logger.info(f"Server listening on {self._socket_path}")
+        if on_ready:
+            on_ready()
         async with server:
             await server.serve_forever()
 
     @staticmethod
-    async def read_command(reader: StreamReader) -> Dict[str, Any]:
-        """Read and parse a command from the client."""
+    async def read_command(messages: MessageReader) -> Optional[Tuple[int, Dict[str, Any], str]]:
+        """Read and parse the next command from the client.
+
+        Returns:
+            The request id, command and the encoding it was sent in, or None
+            once the client has closed its end of the connection. A command that
+            cannot be parsed is returned as an empty dict so the caller can still
+            reply to it.
+
+        Raises:
+            ProtocolError: If the client breaks the framing protocol
+        """
+        message = await messages.read()
+        if message is None:
+            return None
         try:
-            data = await reader.readline()
-            if not data:
-                return {}
-            return json.loads(data.decode())
+            return message.request_id, decode_message(message.payload, message.encoding), message.encoding
         except Exception as e:
             logger.error(f"Error reading command: {e}")
-            return {}
+            return message.request_id, {}, message.encoding
 
     @staticmethod
-    async def send_response(writer: StreamWriter, response: Dict[str, Any]):
-        """Send a response back to the client."""
+    async def send_response(writer: StreamWriter, request_id: int, response: Dict[str, Any],
+                            encoding: str = ENCODING_JSON):
+        """Stream a response back to the client in the given encoding.
+
+        The connection is left open so the client can keep sending commands.
+        """
         try:
-            response_json = json.dumps(response, ensure_ascii=False)
-            writer.write(response_json.encode() + b"\n")
-            await writer.drain()
+            await write_message(writer, request_id, response, encoding)
+        except (TypeError, ValueError) as e:
+            logger.error(f"Error encoding response: {e}")
+            await write_message(writer, request_id, {"error": f"Failed to encode response: {e}"}, encoding)
         except Exception as e:
             logger.error(f"Error sending response: {e}")
-        finally:
+
+    @staticmethod
+    async def close(writer: StreamWriter):
+        """Close a client connection."""
+        try:
             writer.close()
             await writer.wait_closed()
+        except Exception as e:
+            logger.debug(f"Error closing connection: {e}")
 
     def cleanup(self):
         """Clean up the socket file."""
         if os.path.exists(self._socket_path):
-            os.unlink(self._socket_path) 
\ No newline at end of file
+            os.unlink(self._socket_path)
+
+
+class TcpSocketServer(UnixSocketServer):
+    """Serves the daemon protocol on a TCP port, for clients on other hosts."""
+
+    def __init__(self, host: str, port: int):
+        super().__init__(f"tcp://{host}:{port}")
+        self.host = host
+        self.port = port
+
+    async def start(self, connection_handler: Callable, on_ready: Optional[Callable[[], None]] = None):
+        """Start listening. With port 0 a free port is picked; ``port`` is updated to it."""
+        server = await asyncio.start_server(connection_handler, self.host, self.port)
+        self.port = server.sockets[0].getsockname()[1]
+        self._socket_path = f"tcp://{self.host}:{self.port}"
+        logger.info(f"Server listening on {self._socket_path}")
+        if on_ready:
+            on_ready()
+        async with server:
+            await server.serve_forever()
+
+    def cleanup(self):
+        """Nothing to clean up for a TCP listener."""
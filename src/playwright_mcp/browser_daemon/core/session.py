@@ -1,10 +1,158 @@
-"""Session management module."""
-from typing import Dict, Optional
-from playwright.async_api import Browser, Page, async_playwright
+"""Session management module.
+
+Sessions are isolated ``BrowserContext``s. By default every session of a given
+browser type and headless mode shares one long-lived browser process, so
+starting or closing a session costs a context rather than a browser launch.
+Setting ``PLAYWRIGHT_MCP_ISOLATION=browser`` gives each session its own
+browser process instead.
+
+A warm pool keeps blank sessions (a context with one page) ready ahead of
+demand, so a new session does not wait for playwright, a browser launch or a
+first page. Its size per browser type and mode is set with
+``PLAYWRIGHT_MCP_WARM_POOL_SIZE`` (0, the default, turns it off) and the
+browser types warmed at startup with ``PLAYWRIGHT_MCP_WARM_POOL_BROWSERS``.
+
+Closed tabs are recycled: the page is reset to ``about:blank`` and kept on its
+session's free list (up to ``PLAYWRIGHT_MCP_RECYCLED_PAGES`` per session) for
+the next ``new_page``, instead of being closed and created again. The reset
+clears the tab's routes, its sessionStorage and (over CDP) its back/forward
+history; the daemon sets no other tab-level state. sessionStorage can only be
+cleared for the origin the tab is on, so tabs that visited more than one
+origin, and tabs whose history cannot be reset (no CDP), are closed instead.
+
+Session and page IDs come from a ``Registry``, so an ID is never handed out
+twice, and the manager indexes pages by session, so closing a session or
+checking who owns a page only touches that session's pages.
+
+A session can have a resource policy (see ``resources``) blocking images,
+fonts, trackers and the like for all of its pages.
+
+With ``PLAYWRIGHT_MCP_HTTP_CACHE_DIR`` set, every session's static assets go
+through one shared on-disk cache (see ``http_cache``).
+
+A session can record its traffic to a HAR archive or replay one with no
+network (see ``har``).
+
+A browser can be recycled: its sessions move to a fresh browser of the same
+kind, keeping their IDs, storage state and page URLs (see ``monitor``).
+"""
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+from urllib.parse import urlsplit
+from playwright.async_api import Browser, BrowserContext, Page, async_playwright
+from .events import event_bus
+from .har import HarMode, HarReplayer, har_archives
+from .http_cache import HttpCache
 from .logging import setup_logging
+from .registry import Registry
+from .resources import ResourceBlocker, ResourcePolicy
+from .scheduler import Hold, hold_nothing
 
 logger = setup_logging("session")
 
+ISOLATION_ENV = "PLAYWRIGHT_MCP_ISOLATION"
+ISOLATION_MODES = ("context", "browser")
+WARM_POOL_SIZE_ENV = "PLAYWRIGHT_MCP_WARM_POOL_SIZE"
+WARM_POOL_BROWSERS_ENV = "PLAYWRIGHT_MCP_WARM_POOL_BROWSERS"
+RECYCLED_PAGES_ENV = "PLAYWRIGHT_MCP_RECYCLED_PAGES"
+
+# How many evicted session and page IDs are remembered, to explain later requests for them
+MAX_EVICTED_IDS = 1024
+
+# Run on a closed tab before it is recycled; sessionStorage belongs to the tab,
+# unlike cookies and localStorage, which the session's other tabs share
+CLEAR_TAB_STORAGE = "() => { try { sessionStorage.clear(); } catch (e) {} }"
+
+
+class WarmSession(NamedTuple):
+    """A started session waiting in the warm pool."""
+    context: BrowserContext
+    page: Page
+    browser: Optional[Browser]  # Set when the session owns its browser
+
+
+class WarmPool:
+    """Sessions started ahead of demand, kept per (browser_type, headless).
+
+    Taking a session schedules a background refill, so bursts of new sessions
+    are served from the pool while it catches up.
+    """
+
+    def __init__(self, create: Callable[[str, bool], Awaitable[WarmSession]], size: int = 0,
+                 browser_types: Optional[List[str]] = None):
+        self.create = create
+        self.size = size
+        self.browser_types = browser_types or ["chromium"]
+        self.entries: Dict[Tuple[str, bool], List[WarmSession]] = {}
+        self.hits = 0
+        self.misses = 0
+        self._refills: Dict[Tuple[str, bool], asyncio.Task] = {}
+
+    def take(self, key: Tuple[str, bool]) -> Optional[WarmSession]:
+        """Take a warm session for ``key``, or None if there is none ready."""
+        if self.size <= 0:
+            return None
+        entries = self.entries.get(key)
+        warm = entries.pop() if entries else None
+        if warm:
+            self.hits += 1
+        else:
+            self.misses += 1
+        self.refill(key)
+        return warm
+
+    def warm_up(self):
+        """Start filling the pool for the configured browser types, headless."""
+        for browser_type in self.browser_types:
+            self.refill((browser_type, True))
+
+    def refill(self, key: Tuple[str, bool]):
+        """Top up ``key`` in the background, unless a refill is already running."""
+        if self.size <= 0:
+            return
+        task = self._refills.get(key)
+        if task is None or task.done():
+            self._refills[key] = asyncio.create_task(self.fill(key))
+
+    async def fill(self, key: Tuple[str, bool]):
+        """Start sessions for ``key`` until the pool holds ``size`` of them."""
+        entries = self.entries.setdefault(key, [])
+        while len(entries) < self.size:
+            try:
+                entries.append(await self.create(*key))
+            except Exception as e:
+                logger.warning(f"Could not warm a {key[0]} session: {e}")
+                return
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool size, hit and miss counts and warm sessions per browser type and mode."""
+        return {
+            "size": self.size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "warm": {f"{t}/{'headless' if h else 'headed'}": len(e) for (t, h), e in self.entries.items()},
+        }
+
+    def drop_browser(self, browser: Browser):
+        """Forget warm sessions in ``browser``, which is going away."""
+        for entries in self.entries.values():
+            entries[:] = [w for w in entries if w.browser is not browser and w.context.browser is not browser]
+
+    async def close(self):
+        """Stop refilling and close every warm session."""
+        for task in self._refills.values():
+            task.cancel()
+        self._refills.clear()
+        for entries in self.entries.values():
+            for warm in entries:
+                await warm.context.close()
+                if warm.browser:
+                    await warm.browser.close()
+        self.entries.clear()
+
 
 class SessionManager:
     _instance = None
@@ -17,8 +165,45 @@ class SessionManager:
 
     def __init__(self):
         if not self._initialized:
-            self.sessions: Dict[str, Browser] = {}
-            self.pages: Dict[str, Page] = {}
+            self.isolation = os.environ.get(ISOLATION_ENV, "context")
+            if self.isolation not in ISOLATION_MODES:
+                logger.warning(f"Unknown {ISOLATION_ENV} {self.isolation!r}, using 'context'")
+                self.isolation = "context"
+            self.sessions: Registry = Registry()
+            # Shared browsers by (browser_type, headless), and browsers owned by a single session
+            self.browsers: Dict[Tuple[str, bool], Browser] = {}
+            self.session_browsers: Dict[str, Browser] = {}
+            self.browser_keys: Dict[Browser, Tuple[str, bool]] = {}
+            self._launch_locks: Dict[Tuple[str, bool], asyncio.Lock] = {}
+            self.pages: Registry = Registry()
+            self.page_ids: Dict[Page, str] = {}
+            # Page ID to session ID, and each session's page IDs in the order they opened
+            self.page_sessions: Dict[str, str] = {}
+            self.session_pages: Dict[str, Dict[str, None]] = {}
+            # Blank pages that came with a warm session, handed out by its first new_page
+            self._warm_pages: Dict[str, Page] = {}
+            # Reset pages from closed tabs, per session, waiting to be reused
+            self.free_pages: Dict[str, List[Page]] = {}
+            self.max_free_pages = int(os.environ.get(RECYCLED_PAGES_ENV, "4"))
+            self.recycled_pages = 0
+            self._page_listeners: Dict[str, List[Tuple[str, Callable]]] = {}
+            # Origins each page's main frame has been on, which decides whether it can be recycled
+            self._page_origins: Dict[str, Set[str]] = {}
+            # Resource policies in force, by session
+            self.blockers: Dict[str, ResourceBlocker] = {}
+            # HAR mode of sessions that record or replay, and the replayers serving the latter
+            self.har_modes: Dict[str, HarMode] = {}
+            self.har_replayers: Dict[str, HarReplayer] = {}
+            # Shared cache of static assets, routed into every context; None when not configured
+            self.http_cache: Optional[HttpCache] = HttpCache.from_env()
+            # Monotonic time each session and page was last used, and why evicted IDs went away
+            self.last_used: Dict[str, float] = {}
+            self.evicted: "OrderedDict[str, str]" = OrderedDict()
+            browser_types = os.environ.get(WARM_POOL_BROWSERS_ENV, "chromium").split(",")
+            self.pool = WarmPool(
+                self._warm_session, int(os.environ.get(WARM_POOL_SIZE_ENV, "0")),
+                [t.strip() for t in browser_types if t.strip()],
+            )
             self.playwright = None
             self._initialized = True
             logger.debug("SessionManager initialized")
@@ -40,29 +225,227 @@ class SessionManager:
         browser_class = getattr(self.playwright, browser_type)
         return await browser_class.launch(headless=headless)
 
-    async def launch_browser(self, browser_type: str = "chromium", headless: bool = True) -> str:
-        """Launch a browser and return its session ID."""
-        browser = await self._launch_browser(browser_type, headless)
-        session_id = f"{browser_type}_{id(browser)}"
-        self.sessions[session_id] = browser
-        logger.debug(f"Browser launched with session_id: {session_id}")
+    async def _shared_browser(self, browser_type: str, headless: bool) -> Browser:
+        """Get the shared browser for a browser type and mode, launching it on first use."""
+        key = (browser_type, headless)
+        lock = self._launch_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            browser = self.browsers.get(key)
+            if browser is None or not browser.is_connected():
+                browser = await self._launch_browser(browser_type, headless)
+                self.browsers[key] = browser
+                self.browser_keys[browser] = key
+            return browser
+
+    async def _new_context(self, browser_type: str, headless: bool,
+                           **options: Any) -> Tuple[BrowserContext, Optional[Browser]]:
+        """Create a session's context with ``new_context`` options, and return it with the browser it owns, if any."""
+        owned = None
+        if self.isolation == "browser":
+            browser = owned = await self._launch_browser(browser_type, headless)
+            self.browser_keys[browser] = (browser_type, headless)
+        else:
+            browser = await self._shared_browser(browser_type, headless)
+        context = await browser.new_context(**options)
+        await self._route_cache(context)
+        return context, owned
+
+    async def _route_cache(self, context: BrowserContext):
+        """Serve a new context's static assets from the HTTP cache, if there is one.
+
+        Routes run last-installed first, so a resource policy installed later
+        blocks requests before they reach the cache.
+        """
+        if self.http_cache:
+            await self.http_cache.install(context)
+
+    async def _warm_session(self, browser_type: str, headless: bool) -> WarmSession:
+        """Start a session with one blank page for the warm pool."""
+        context, browser = await self._new_context(browser_type, headless)
+        return WarmSession(context, await context.new_page(), browser)
+
+    def warm_up(self):
+        """Start filling the warm pool in the background, if it is enabled."""
+        self.pool.warm_up()
+
+    async def launch_browser(self, browser_type: str = "chromium", headless: bool = True,
+                             policy: Optional[ResourcePolicy] = None,
+                             storage_state: Optional[Dict[str, Any]] = None,
+                             har: Optional[HarMode] = None) -> str:
+        """Start a browser session and return its session ID.
+
+        The session is a new context in the shared browser, or in a browser of
+        its own when isolation is set to ``browser``. It comes from the warm
+        pool when one is ready, unless it starts from a saved ``storage_state``
+        (cookies and localStorage) or in a ``har`` mode. ``policy`` sets the
+        resources its pages block.
+
+        Raises:
+            FileNotFoundError: When replaying an archive nothing was recorded to
+        """
+        replayer = None
+        if har and har.mode == "replay":
+            index = await asyncio.to_thread(har_archives.index, har.archive)
+            if index is None:
+                raise FileNotFoundError(f"No HAR archive named {har.archive}")
+            replayer = HarReplayer(har.archive, index)
+        warm = None if storage_state or har else self.pool.take((browser_type, headless))
+        if warm:
+            context, browser = warm.context, warm.browser
+        else:
+            options = {"storage_state": storage_state} if storage_state else {}
+            context, browser = await self._new_context(browser_type, headless, **options, **self._har_options(har))
+        if replayer:
+            await replayer.install(context)
+        session_id = self.sessions.add(browser_type, context)
+        self.session_pages[session_id] = {}
+        self.evicted.pop(session_id, None)
+        self.touch(session_id)
+        if warm:
+            self._warm_pages[session_id] = warm.page
+        if browser:
+            self.session_browsers[session_id] = browser
+        if har:
+            self.har_modes[session_id] = har
+        if replayer:
+            self.har_replayers[session_id] = replayer
+        if policy:
+            await self.set_resource_policy(session_id, policy)
+        logger.debug(f"Browser session started with session_id: {session_id} (isolation: {self.isolation})")
         return session_id
 
+    @staticmethod
+    def _har_options(har: Optional[HarMode]) -> Dict[str, Any]:
+        """``new_context`` options for a session recording to a HAR archive."""
+        if har and har.mode == "record":
+            return {"record_har_path": har_archives.record_path(har.archive)}
+        return {}
+
+    def har_report(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """What a session in a HAR mode recorded to or served from its archive, or None."""
+        replayer = self.har_replayers.get(session_id)
+        if replayer:
+            return replayer.report()
+        har = self.har_modes.get(session_id)
+        if har:
+            return {"mode": har.mode, "archive": har.archive, "path": har_archives.path(har.archive)}
+        return None
+
+    async def set_resource_policy(self, session_id: str,
+                                  policy: Optional[ResourcePolicy]) -> Optional[ResourceBlocker]:
+        """Replace a session's resource policy; None lifts it.
+
+        Returns:
+            The blocker enforcing the policy, or None if the session has no policy
+        """
+        blocker = self.blockers.get(session_id)
+        if blocker and blocker.policy == policy:
+            return blocker
+        context = self.get_session(session_id)
+        if blocker:
+            del self.blockers[session_id]
+            await blocker.uninstall()
+        if not policy or not context:
+            return None
+        blocker = ResourceBlocker(policy)
+        await blocker.install(context)
+        self.blockers[session_id] = blocker
+        return blocker
+
     async def new_page(self, session_id: str) -> Optional[str]:
         """Create a new page in the given browser session."""
-        browser = self.get_session(session_id)
-        if not browser:
+        context = self.get_session(session_id)
+        if not context:
             logger.error(f"No browser found for session_id: {session_id}")
             return None
             
         logger.debug(f"Creating new page in session: {session_id}")
-        page = await browser.new_page()
-        page_id = f"page_{id(page)}"
-        self.pages[page_id] = page
+        page = self._warm_pages.pop(session_id, None) or self._reuse_page(session_id)
+        if not page:
+            page = await context.new_page()
+        # A reused page gets a new ID too, so IDs from its last use stay invalid
+        page_id = self.pages.add("page", page)
+        self.page_ids[page] = page_id
+        self.page_sessions[page_id] = session_id
+        self.session_pages.setdefault(session_id, {})[page_id] = None
+        self.evicted.pop(page_id, None)
+        self.touch(page_id, session_id)
+        self._watch_page(page_id, page)
         logger.debug(f"Created page with ID: {page_id}")
         logger.debug(f"Current pages: {list(self.pages.keys())}")
         return page_id
 
+    def _watch_page(self, page_id: str, page: Page):
+        """Publish a page's navigations, errors, crashes and closing as events."""
+        origins = self._page_origins.setdefault(page_id, set())
+
+        def on_navigated(frame):
+            if frame.parent_frame is None:
+                parts = urlsplit(frame.url)
+                if parts.scheme in ("http", "https"):
+                    origins.add(f"{parts.scheme}://{parts.netloc}")
+                event_bus.publish("page.navigated", {"page_id": page_id, "url": frame.url})
+
+        def on_console(message):
+            if message.type == "error":
+                event_bus.publish("page.console", {"page_id": page_id, "type": "error", "text": message.text})
+
+        def on_page_error(error):
+            event_bus.publish("page.console", {"page_id": page_id, "type": "pageerror", "text": str(error)})
+
+        listeners = [
+            ("framenavigated", on_navigated),
+            ("console", on_console),
+            ("pageerror", on_page_error),
+            ("crash", lambda _: event_bus.publish("page.crashed", {"page_id": page_id})),
+            ("close", lambda _: event_bus.publish("page.closed", {"page_id": page_id})),
+        ]
+        for event, listener in listeners:
+            page.on(event, listener)
+        self._page_listeners[page_id] = listeners
+
+    def _unwatch_page(self, page_id: str, page: Page):
+        """Stop publishing events for a page under this ID."""
+        self._page_origins.pop(page_id, None)
+        for event, listener in self._page_listeners.pop(page_id, []):
+            page.remove_listener(event, listener)
+
+    def _reuse_page(self, session_id: str) -> Optional[Page]:
+        """Take a recycled page from the session's free list, if one is still open."""
+        free = self.free_pages.get(session_id, [])
+        while free:
+            page = free.pop()
+            if not page.is_closed():
+                return page
+        return None
+
+    async def _recycle_page(self, session_id: Optional[str], page: Page, origins: Set[str]) -> bool:
+        """Reset a closed tab's page and put it on its session's free list.
+
+        Returns:
+            False if the page should be closed instead: its session is gone,
+            the free list is full, it visited several origins (whose
+            sessionStorage would survive) or the reset failed
+        """
+        free = self.free_pages.setdefault(session_id, []) if session_id in self.sessions else None
+        if free is None or len(free) >= self.max_free_pages or page.is_closed() or len(origins) > 1:
+            return False
+        try:
+            await page.unroute_all(behavior="ignoreErrors")
+            await page.evaluate(CLEAR_TAB_STORAGE)
+            await page.goto("about:blank")
+            cdp = await page.context.new_cdp_session(page)
+            try:
+                await cdp.send("Page.resetNavigationHistory")
+            finally:
+                await cdp.detach()
+        except Exception as e:
+            logger.debug(f"Could not reset page for reuse: {e}")
+            return False
+        free.append(page)
+        self.recycled_pages += 1
+        return True
+
     def get_page(self, page_id: str) -> Optional[Page]:
         """Get a page by its ID."""
         page = self.pages.get(page_id)
@@ -80,56 +463,245 @@ class SessionManager:
         """Remove a page from the session manager."""
         if page_id in self.pages:
             logger.debug(f"Removing page {page_id}")
-            del self.pages[page_id]
+            page = self.pages.pop(page_id)
+            if self.page_ids.get(page) == page_id:
+                del self.page_ids[page]
+            session_id = self.page_sessions.pop(page_id, None)
+            self.session_pages.get(session_id, {}).pop(page_id, None)
+            self._page_listeners.pop(page_id, None)
+            self._page_origins.pop(page_id, None)
+            self.last_used.pop(page_id, None)
             logger.debug(f"Current pages: {list(self.pages.keys())}")
 
-    def get_session(self, session_id: str) -> Optional[Browser]:
-        """Get a browser session by its ID."""
+    def session_for_page(self, page_id: str) -> Optional[str]:
+        """Get the ID of the browser session a page belongs to."""
+        return self.page_sessions.get(page_id)
+
+    def pages_of(self, session_id: str) -> List[str]:
+        """Get the IDs of a browser session's open pages."""
+        return list(self.session_pages.get(session_id, ()))
+
+    def owns(self, session_id: str, page_id: str) -> bool:
+        """Whether a page is open in the given browser session."""
+        return page_id in self.session_pages.get(session_id, ())
+
+    def page_id_for(self, page: Page) -> Optional[str]:
+        """Get the current ID of an open page."""
+        return self.page_ids.get(page)
+
+    def touch(self, *ids: Optional[str]):
+        """Mark open sessions or pages as used now, for idle and LRU eviction."""
+        now = time.monotonic()
+        for key in ids:
+            if key in self.sessions or key in self.pages:
+                self.last_used[key] = now
+
+    def eviction_reason(self, key: str) -> Optional[str]:
+        """Why the daemon closed a session or page, if it evicted it."""
+        return self.evicted.get(key)
+
+    def _record_eviction(self, keys: List[str], reason: str):
+        for key in keys:
+            self.evicted[key] = reason
+            self.evicted.move_to_end(key)
+        while len(self.evicted) > MAX_EVICTED_IDS:
+            self.evicted.popitem(last=False)
+
+    async def evict_page(self, page_id: str, reason: str) -> bool:
+        """Close a page on the daemon's initiative, remembering why."""
+        if not await self.close_page(page_id):
+            return False
+        self._record_eviction([page_id], reason)
+        event_bus.publish("page.evicted", {"page_id": page_id, "reason": reason})
+        return True
+
+    async def evict_session(self, session_id: str, reason: str) -> bool:
+        """Close a session and its pages on the daemon's initiative, remembering why."""
+        page_ids = self.pages_of(session_id)
+        if not await self.close_browser(session_id):
+            return False
+        self._record_eviction([session_id, *page_ids], reason)
+        event_bus.publish("session.evicted", {"session_id": session_id, "page_ids": page_ids, "reason": reason})
+        return True
+
+    def get_session(self, session_id: str) -> Optional[BrowserContext]:
+        """Get a browser session's context by its ID."""
         session = self.sessions.get(session_id)
         logger.debug(f"Getting session {session_id}: {'found' if session else 'not found'}")
         return session
 
-    def add_session(self, session_id: str, browser: Browser):
+    def add_session(self, session_id: str, context: BrowserContext):
         """Add a browser session to the session manager."""
         logger.debug(f"Adding session {session_id}")
-        self.sessions[session_id] = browser
+        self.sessions[session_id] = context
+        self.session_pages.setdefault(session_id, {})
 
     def remove_session(self, session_id: str):
         """Remove a browser session from the session manager."""
         if session_id in self.sessions:
             logger.debug(f"Removing session {session_id}")
-            del self.sessions[session_id]
+            self.sessions.pop(session_id)
+            self.session_pages.pop(session_id, None)
+            self.blockers.pop(session_id, None)
+            self.har_modes.pop(session_id, None)
+            self.har_replayers.pop(session_id, None)
+            self.session_browsers.pop(session_id, None)
+            self._warm_pages.pop(session_id, None)
+            self.free_pages.pop(session_id, None)
+            self.last_used.pop(session_id, None)
 
     async def close_page(self, page_id: str) -> bool:
-        """Close a page by its ID."""
+        """Close a page by its ID.
+
+        The page is recycled for the session's next tab when there is room on
+        its free list, and closed otherwise. Either way its ID stops working.
+        """
         page = self.get_page(page_id)
         if page:
             logger.debug(f"Closing page {page_id}")
-            await page.close()
+            session_id = self.session_for_page(page_id)
+            origins = self._page_origins.get(page_id, set())
+            self._unwatch_page(page_id, page)
             self.remove_page(page_id)
+            if not await self._recycle_page(session_id, page, origins):
+                await page.close()
+            event_bus.publish("page.closed", {"page_id": page_id})
             return True
         return False
 
     async def close_browser(self, session_id: str) -> bool:
-        """Close a browser session and all its pages."""
-        browser = self.get_session(session_id)
-        if browser:
+        """Close a browser session and all its pages.
+
+        Shared browsers stay up for other sessions; a browser owned by the
+        session is closed with it.
+        """
+        context = self.get_session(session_id)
+        if context:
             logger.debug(f"Closing browser session {session_id}")
-            await browser.close()
+            browser = self.session_browsers.get(session_id)
+            await context.close()
+            if browser:
+                self.browser_keys.pop(browser, None)
+                await browser.close()
+            for page_id in self.pages_of(session_id):
+                self.remove_page(page_id)
             self.remove_session(session_id)
             return True
         return False
 
+    async def recycle_browser(self, browser: Browser, reason: str, hold: Hold = hold_nothing) -> List[str]:
+        """Move a browser's sessions onto a fresh browser of the same kind, then close it.
+
+        Each session gets a new context seeded with its storage state (cookies
+        and localStorage), its resource policy and its HAR mode (a recording
+        continues in a new file of its archive), and each of its pages is
+        reopened at its current URL under the same page ID. State that lives
+        only in the page, such as form input or sessionStorage, is lost. A
+        session that cannot be moved is evicted. The sessions and their pages
+        are held with ``hold`` while they move, so no command runs on them.
+
+        Returns:
+            The IDs of the sessions moved
+        """
+        key = self.browser_keys.get(browser)
+        if key is None:
+            return []
+        owner = next((sid for sid, owned in self.session_browsers.items() if owned is browser), None)
+        if owner is None:
+            async with self._launch_locks.setdefault(key, asyncio.Lock()):
+                if self.browsers.get(key) is not browser:
+                    return []
+                fresh = await self._launch_browser(*key)
+                self.browsers[key] = fresh
+            session_ids = [sid for sid, context in self.sessions.items() if context.browser is browser]
+        else:
+            fresh = await self._launch_browser(*key)
+            self.session_browsers[owner] = fresh
+            session_ids = [owner]
+        self.browser_keys[fresh] = key
+        logger.info(f"Recycling {key[0]} browser ({reason}) with {len(session_ids)} sessions")
+
+        moved = []
+        page_ids = [page_id for session_id in session_ids for page_id in self.pages_of(session_id)]
+        async with hold(session_ids, page_ids):
+            for session_id in session_ids:
+                try:
+                    await self._migrate_session(session_id, fresh)
+                    moved.append(session_id)
+                    event_bus.publish("session.recycled", {"session_id": session_id, "reason": reason})
+                except Exception as e:
+                    logger.error(f"Could not move session {session_id} to a fresh browser: {e}")
+                    await self.evict_session(session_id, "recycling failed")
+        self.pool.drop_browser(browser)
+        self.browser_keys.pop(browser, None)
+        try:
+            await browser.close()
+        except Exception as e:
+            logger.debug(f"Closing the recycled browser failed: {e}")
+        return moved
+
+    async def _migrate_session(self, session_id: str, browser: Browser):
+        """Recreate a session's context and pages in ``browser``, keeping their IDs."""
+        context = self.sessions[session_id]
+        new_context = await browser.new_context(storage_state=await context.storage_state(),
+                                                **self._har_options(self.har_modes.get(session_id)))
+        await self._route_cache(new_context)
+        replayer = self.har_replayers.get(session_id)
+        if replayer:
+            await replayer.install(new_context)
+        self.sessions[session_id] = new_context
+        blocker = self.blockers.pop(session_id, None)
+        if blocker:
+            await self.set_resource_policy(session_id, blocker.policy)
+        self._warm_pages.pop(session_id, None)
+        self.free_pages.pop(session_id, None)
+        for page_id in self.pages_of(session_id):
+            page = self.pages[page_id]
+            url = page.url
+            new_page = await new_context.new_page()
+            self._unwatch_page(page_id, page)
+            self.page_ids.pop(page, None)
+            self.pages[page_id] = new_page
+            self.page_ids[new_page] = page_id
+            self._watch_page(page_id, new_page)
+            if url and url != "about:blank":
+                try:
+                    await new_page.goto(url)
+                except Exception as e:
+                    logger.warning(f"Could not reopen {url} in page {page_id}: {e}")
+        try:
+            await context.close()
+        except Exception as e:
+            logger.debug(f"Closing the old context of {session_id} failed: {e}")
+
     async def shutdown(self):
-        """Close all browser sessions."""
+        """Close all browser sessions and browsers."""
         logger.debug("Shutting down all sessions")
-        for browser in self.sessions.values():
+        await self.pool.close()
+        for context in self.sessions.values():
+            await context.close()
+        for browser in [*self.session_browsers.values(), *self.browsers.values()]:
             await browser.close()
         if self.playwright:
             await self.playwright.stop()
             self.playwright = None
         self.sessions.clear()
+        self.browsers.clear()
+        self.browser_keys.clear()
+        self._launch_locks.clear()
+        self.session_browsers.clear()
+        self._warm_pages.clear()
+        self.free_pages.clear()
+        self._page_listeners.clear()
+        self._page_origins.clear()
+        self.blockers.clear()
+        self.har_modes.clear()
+        self.har_replayers.clear()
+        self.last_used.clear()
         self.pages.clear()
+        self.page_ids.clear()
+        self.page_sessions.clear()
+        self.session_pages.clear()
         logger.debug("Shutdown complete")
 
 
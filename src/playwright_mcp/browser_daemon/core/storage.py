@@ -0,0 +1,143 @@
+"""Named storage-state snapshots, so new sessions can start logged in.
+
+A snapshot is a session's Playwright storage state (cookies and localStorage)
+saved under a name in a local directory, ``PLAYWRIGHT_MCP_STORAGE_DIR``
+(default ``~/.playwright_mcp/storage``). Sessions created from a snapshot get
+that state before their first page loads, so flows that log in to the same
+site can skip the login navigation.
+
+Snapshots expire after a TTL (``PLAYWRIGHT_MCP_STORAGE_TTL`` seconds by
+default, one day) and are then treated as missing. Each one is a JSON file
+written to a temporary file and renamed into place, so readers never see a
+partial snapshot, and readable only by its owner since it holds credentials.
+"""
+import json
+import os
+import re
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+from .logging import setup_logging
+
+logger = setup_logging("storage")
+
+STORAGE_DIR_ENV = "PLAYWRIGHT_MCP_STORAGE_DIR"
+STORAGE_TTL_ENV = "PLAYWRIGHT_MCP_STORAGE_TTL"
+DEFAULT_STORAGE_DIR = os.path.join(os.path.expanduser("~"), ".playwright_mcp", "storage")
+DEFAULT_TTL = 86400.0
+
+NAME_PATTERN = re.compile(r"[A-Za-z0-9_-][A-Za-z0-9_.-]{0,127}")
+SUFFIX = ".json"
+
+
+class SnapshotStore:
+    """Storage-state snapshots on disk, by name."""
+
+    def __init__(self, directory: Optional[str] = None, default_ttl: Optional[float] = None):
+        self.directory = directory or os.getenv(STORAGE_DIR_ENV) or DEFAULT_STORAGE_DIR
+        if default_ttl is None:
+            default_ttl = float(os.getenv(STORAGE_TTL_ENV, DEFAULT_TTL))
+        self.default_ttl = default_ttl
+
+    def _path(self, name: str) -> str:
+        """The file for a snapshot.
+
+        Raises:
+            ValueError: If the name is not a plain file name of letters, digits, ".", "_" and "-"
+        """
+        if not isinstance(name, str) or not NAME_PATTERN.fullmatch(name):
+            raise ValueError(f"Invalid snapshot name: {name!r}")
+        return os.path.join(self.directory, name + SUFFIX)
+
+    def save(self, name: str, state: Dict[str, Any], ttl: Optional[float] = None) -> Dict[str, Any]:
+        """Save ``state`` under ``name``, replacing any earlier snapshot atomically.
+
+        Returns:
+            The snapshot's metadata: name, saved_at and expires_at (Unix times)
+
+        Raises:
+            ValueError: For an invalid name or a TTL that is not positive
+        """
+        path = self._path(name)
+        ttl = self.default_ttl if ttl is None else float(ttl)
+        if ttl <= 0:
+            raise ValueError("ttl must be positive")
+        now = time.time()
+        meta = {"name": name, "saved_at": now, "expires_at": now + ttl}
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(prefix=f".{name}.", dir=self.directory)
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump({**meta, "state": state}, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+        logger.debug(f"Saved storage snapshot {name}")
+        return meta
+
+    def _read(self, name: str) -> Optional[Dict[str, Any]]:
+        """The stored snapshot, or None if it is missing, unreadable or expired (then removed)."""
+        path = self._path(name)
+        try:
+            with open(path) as f:
+                snapshot = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read storage snapshot {name}: {e}")
+            return None
+        if snapshot.get("expires_at", 0) <= time.time():
+            self._remove(path)
+            return None
+        return snapshot
+
+    def load(self, name: str) -> Optional[Dict[str, Any]]:
+        """The storage state saved under ``name``, or None if there is none or it expired.
+
+        Raises:
+            ValueError: For an invalid name
+        """
+        snapshot = self._read(name)
+        return snapshot["state"] if snapshot else None
+
+    def delete(self, name: str) -> bool:
+        """Remove a snapshot; returns whether there was one.
+
+        Raises:
+            ValueError: For an invalid name
+        """
+        return self._remove(self._path(name))
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Metadata of every unexpired snapshot, removing expired ones."""
+        try:
+            entries = sorted(os.listdir(self.directory))
+        except FileNotFoundError:
+            return []
+        snapshots = []
+        for entry in entries:
+            name = entry[:-len(SUFFIX)]
+            if not entry.endswith(SUFFIX) or not NAME_PATTERN.fullmatch(name):
+                continue
+            snapshot = self._read(name)
+            if snapshot:
+                snapshots.append({key: snapshot[key] for key in ("name", "saved_at", "expires_at")})
+        return snapshots
+
+    @staticmethod
+    def _remove(path: str) -> bool:
+        try:
+            os.unlink(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+
+snapshot_store = SnapshotStore()
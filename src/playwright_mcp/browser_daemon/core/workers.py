@@ -0,0 +1,223 @@
+"""Browser worker processes behind one daemon socket.
+
+With ``PLAYWRIGHT_MCP_WORKERS`` (or ``--workers``) set to N, the daemon becomes
+a front dispatcher: it starts N worker daemons, each a separate process with
+its own Playwright instance, sessions and event loop, and forwards every
+browser command to one of them. Clients keep talking to the one socket.
+
+Session, page and job IDs handed out by a worker carry its name (see
+``routing``), so later commands go back to the worker that holds the browser.
+IDs without a worker prefix are spread over the workers by hash, and new
+sessions go to the worker with the fewest commands in flight.
+"""
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import zlib
+from typing import Any, Dict, List, Optional
+
+from .client import DaemonClient
+from .events import EventBus
+from .logging import setup_logging
+from .protocol import ProtocolError
+from .readiness import READY_FD_ENV, wait_until_ready
+from .routing import add_owner, find_ids, split_owner, strip_owner
+
+logger = setup_logging("workers")
+
+WORKERS_ENV = "PLAYWRIGHT_MCP_WORKERS"
+# Read end of a pipe the front dispatcher holds open for as long as it runs
+PARENT_FD_ENV = "PLAYWRIGHT_MCP_PARENT_FD"
+WORKER_START_TIMEOUT = 30
+
+# Directory holding the playwright_mcp package, for the workers' PYTHONPATH
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+
+def exit_with_parent() -> bool:
+    """In a worker, cancel the current task once the front dispatcher goes away.
+
+    Returns:
+        Whether this process is a worker being watched
+    """
+    fd = os.environ.pop(PARENT_FD_ENV, None)
+    if fd is None:
+        return False
+    fd = int(fd)
+    loop = asyncio.get_running_loop()
+    task = asyncio.current_task()
+
+    def on_parent_gone():
+        loop.remove_reader(fd)
+        os.close(fd)
+        logger.info("Front dispatcher went away; stopping worker")
+        task.cancel()
+
+    loop.add_reader(fd, on_parent_gone)
+    return True
+
+
+class Worker:
+    """One worker daemon process and the front's connection to it."""
+
+    def __init__(self, name: str, socket_path: str):
+        self.name = name
+        self.socket_path = socket_path
+        self.client = DaemonClient(socket_path)
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.in_flight = 0
+        self._lifeline: Optional[int] = None
+
+    async def start(self):
+        """Start the worker process and wait until it accepts connections.
+
+        Raises:
+            RuntimeError: If the worker exits or does not become ready in time
+        """
+        if self._lifeline is not None:
+            os.close(self._lifeline)
+        read_fd, write_fd = os.pipe()
+        parent_fd, self._lifeline = os.pipe()
+        # A worker must not start workers of its own
+        python_path = os.pathsep.join(filter(None, [SRC_DIR, os.environ.get("PYTHONPATH")]))
+        env = dict(os.environ, **{
+            WORKERS_ENV: "0", READY_FD_ENV: str(write_fd), PARENT_FD_ENV: str(parent_fd), "PYTHONPATH": python_path,
+        })
+        try:
+            self.process = await asyncio.create_subprocess_exec(
+                sys.executable, "-m", "playwright_mcp.browser_daemon", "--socket", self.socket_path,
+                env=env, pass_fds=(write_fd, parent_fd), stdin=asyncio.subprocess.DEVNULL,
+            )
+        finally:
+            os.close(write_fd)
+            os.close(parent_fd)
+        try:
+            ready = await wait_until_ready(read_fd, WORKER_START_TIMEOUT)
+        except asyncio.TimeoutError:
+            ready = False
+        if not ready:
+            await self.stop()
+            raise RuntimeError(f"Browser worker {self.name} failed to start")
+        logger.info(f"Browser worker {self.name} started (pid {self.process.pid})")
+
+    async def request(self, command: str, args: Dict[str, Any]) -> Dict[str, Any]:
+        self.in_flight += 1
+        try:
+            return await self.client.request(command, args)
+        finally:
+            self.in_flight -= 1
+
+    async def stop(self):
+        """Close the connection and stop the worker process."""
+        await self.client.close()
+        if self._lifeline is not None:
+            os.close(self._lifeline)
+            self._lifeline = None
+        if self.process and self.process.returncode is None:
+            self.process.terminate()
+            try:
+                await asyncio.wait_for(self.process.wait(), 10)
+            except asyncio.TimeoutError:
+                self.process.kill()
+                await self.process.wait()
+
+
+class WorkerPool:
+    """Starts the browser workers and routes commands between them."""
+
+    def __init__(self, count: int, event_bus: Optional[EventBus] = None):
+        self.directory = tempfile.mkdtemp(prefix="pwmcp-workers")
+        self.workers: List[Worker] = [
+            Worker(f"w{index}", os.path.join(self.directory, f"w{index}.sock")) for index in range(count)
+        ]
+        self.by_name = {worker.name: worker for worker in self.workers}
+        self.event_bus = event_bus
+        self._closing = False
+        self._watchers: List[asyncio.Task] = []
+
+    async def start(self):
+        """Start every worker, relay their events and restart any that exit."""
+        await asyncio.gather(*(worker.start() for worker in self.workers))
+        for worker in self.workers:
+            if self.event_bus is not None:
+                worker.client.add_event_listener(self._relay(worker))
+                await worker.client.subscribe()
+            self._watchers.append(asyncio.create_task(self._watch(worker)))
+
+    def route(self, args: Dict[str, Any]) -> Worker:
+        """Pick the worker for a command from the IDs in its arguments.
+
+        Raises:
+            ValueError: If the IDs name an unknown worker, or more than one worker
+        """
+        owners = set()
+        for key in find_ids(args):
+            owner, _ = split_owner(key)
+            owners.add(owner if owner is not None else self._by_hash(key).name)
+        if len(owners) > 1:
+            raise ValueError(f"Command refers to browsers on different workers: {sorted(owners)}")
+        if owners:
+            name = owners.pop()
+            if name not in self.by_name:
+                raise ValueError(f"Unknown browser worker: {name}")
+            return self.by_name[name]
+        return min(self.workers, key=lambda worker: worker.in_flight)
+
+    async def execute(self, command: str, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a command on the worker that owns its session, page or job."""
+        try:
+            worker = self.route(args)
+            args = strip_owner(args, worker.name)
+        except ValueError as e:
+            return {"error": str(e)}
+        try:
+            response = await worker.request(command, args)
+        except (OSError, asyncio.IncompleteReadError, ProtocolError) as e:
+            logger.error(f"Browser worker {worker.name} failed on {command}: {e}")
+            if isinstance(e, ProtocolError):
+                # The stream is out of step; reconnect on the next request
+                await worker.client.close()
+            return {"error": f"Browser worker {worker.name} is unavailable: {e}"}
+        return add_owner(response, worker.name)
+
+    async def stats(self) -> Dict[str, Any]:
+        """Each worker's own stats, by worker name."""
+        async def worker_stats(worker: Worker):
+            try:
+                return await worker.client.request("stats", {}, timeout=5)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ProtocolError) as e:
+                return {"error": str(e)}
+        results = await asyncio.gather(*(worker_stats(worker) for worker in self.workers))
+        return {worker.name: result for worker, result in zip(self.workers, results)}
+
+    async def close(self):
+        """Stop every worker."""
+        self._closing = True
+        for task in self._watchers:
+            task.cancel()
+        await asyncio.gather(*(worker.stop() for worker in self.workers), return_exceptions=True)
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _by_hash(self, key: str) -> Worker:
+        return self.workers[zlib.crc32(key.encode()) % len(self.workers)]
+
+    def _relay(self, worker: Worker):
+        def relay(event: Dict[str, Any]):
+            self.event_bus.publish(event.get("event"), add_owner(event.get("data") or {}, worker.name))
+        return relay
+
+    async def _watch(self, worker: Worker):
+        """Restart a worker that exits unexpectedly; its sessions are lost."""
+        while not self._closing:
+            code = await worker.process.wait()
+            if self._closing:
+                return
+            logger.error(f"Browser worker {worker.name} exited with code {code}; restarting")
+            await worker.client.close()
+            try:
+                await worker.start()
+            except RuntimeError as e:
+                logger.error(str(e))
+                return
@@ -0,0 +1,11 @@
+"""Crawler package: a prioritized, deduplicated crawl writing JSONL records."""
+
+from .crawler import Crawler
+from .fetchers import FetchResult, HttpFetcher, PageFetcher
+from .frontier import Frontier
+from .seen import BloomFilter, seen_set
+from .store import JsonlStore
+from .urls import normalize_url
+
+__all__ = ['Crawler', 'FetchResult', 'HttpFetcher', 'PageFetcher', 'Frontier', 'BloomFilter', 'seen_set',
+           'JsonlStore', 'normalize_url']
@@ -0,0 +1,177 @@
+"""The crawl loop: fetch from the frontier, record, follow links.
+
+Workers take URLs from the ``Frontier`` under one condition, so the page
+budget, the in-flight count and the per-domain rate limit are always checked
+together. A URL is only queued the first time the seen-set sees it, after
+normalization, and links are only followed from pages shallower than
+``max_depth``. Every fetched URL becomes one record in the store; the crawl
+ends when the budget is spent or nothing is left to fetch.
+"""
+import asyncio
+import inspect
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Union
+
+from ..core.logging import setup_logging
+from ..core.options import url_matches
+from .fetchers import FetchResult
+from .frontier import Frontier, Score, breadth_first
+from .seen import seen_set
+from .store import JsonlStore
+from .urls import SCOPES, host_of, in_scope, normalize_url
+
+logger = setup_logging("crawler")
+
+# Links kept in each record; all of them are still followed
+MAX_RECORD_LINKS = 500
+
+# Extracts more data from a fetched page, merged into its record's data
+Hook = Callable[[FetchResult], Union[Optional[Dict[str, Any]], Awaitable[Optional[Dict[str, Any]]]]]
+
+
+class Crawler:
+    """Crawls outwards from seed URLs, writing a record per page to a store."""
+
+    def __init__(self, fetcher: Any, store: JsonlStore, seeds: Iterable[str], max_pages: int = 100,
+                 max_depth: int = 2, scope: str = "host", include: Iterable[str] = (),
+                 exclude: Iterable[str] = (), rate: float = 1.0, concurrency: int = 4,
+                 hooks: Iterable[Hook] = (), score: Score = breadth_first,
+                 on_progress: Optional[Callable[[Dict[str, Any]], None]] = None):
+        if scope not in SCOPES:
+            raise ValueError(f"scope must be one of: {', '.join(SCOPES)}")
+        self.fetcher = fetcher
+        self.store = store
+        self.max_pages = max_pages
+        self.max_depth = max_depth
+        self.scope = scope
+        self.include = list(include)
+        self.exclude = list(exclude)
+        self.concurrency = concurrency
+        self.hooks = list(hooks)
+        self.on_progress = on_progress
+        self.frontier = Frontier(rate, score)
+        # Room for the links of every page in the budget, without growing a large crawl's set
+        self.seen = seen_set(max(max_pages * 20, 10_000))
+        self.seeds: List[str] = []
+        for seed in seeds:
+            url = normalize_url(seed)
+            if url is None:
+                raise ValueError(f"Not an http(s) URL: {seed}")
+            self.seeds.append(url)
+        self.seed_hosts = {host_of(url) for url in self.seeds}
+        self.fetched = 0
+        self.failed = 0
+        self.in_flight = 0
+        self.stopped: Optional[str] = None
+        self._changed = asyncio.Condition()
+        self._started = time.monotonic()
+
+    async def run(self) -> Dict[str, Any]:
+        """Crawl until the budget is spent or the frontier is empty; returns the crawl's stats."""
+        self._started = time.monotonic()
+        for url in self.seeds:
+            if self.seen.add(url):
+                self.frontier.push(url, 0)
+        try:
+            await asyncio.gather(*(self._worker() for _ in range(self.concurrency)))
+        except asyncio.CancelledError:
+            self.stopped = "cancelled"
+            raise
+        finally:
+            self.store.close()
+            await self.fetcher.close()
+        self.stopped = self.stopped or ("budget" if self.fetched >= self.max_pages else "exhausted")
+        return self.stats()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pages": self.fetched,
+            "succeeded": self.fetched - self.failed,
+            "failed": self.failed,
+            "queued": len(self.frontier),
+            "seen": len(self.seen),
+            "max_pages": self.max_pages,
+            "elapsed_ms": round((time.monotonic() - self._started) * 1000, 1),
+            "stopped": self.stopped,
+            "output": str(self.store.path),
+        }
+
+    async def _take(self):
+        """The next URL to fetch, waiting out rate limits; None once the crawl is over."""
+        async with self._changed:
+            while True:
+                if self.fetched + self.in_flight >= self.max_pages:
+                    return None
+                entry, wait = self.frontier.pop(time.monotonic())
+                if entry is not None:
+                    self.in_flight += 1
+                    return entry
+                if not self.frontier and not self.in_flight:
+                    # Nothing queued and nothing that could queue more
+                    self._changed.notify_all()
+                    return None
+                try:
+                    # An empty frontier waits for a page in flight to add links
+                    await asyncio.wait_for(self._changed.wait(), wait if self.frontier else None)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def _worker(self):
+        while True:
+            entry = await self._take()
+            if entry is None:
+                return
+            started = time.monotonic()
+            record: Dict[str, Any] = {"url": entry.url, "depth": entry.depth, "parent": entry.parent}
+            result = None
+            try:
+                result = await self.fetcher.fetch(entry.url)
+                record.update(final_url=result.final_url, status=result.status, data=result.data,
+                              links=result.links[:MAX_RECORD_LINKS], error=None)
+                await self._run_hooks(result, record)
+            except Exception as e:
+                logger.debug(f"Fetching {entry.url} failed: {e}")
+                record.setdefault("status", None)
+                record["error"] = str(e)
+            record["elapsed_ms"] = round((time.monotonic() - started) * 1000, 1)
+            self.store.append(record)
+
+            async with self._changed:
+                self.in_flight -= 1
+                self.fetched += 1
+                ok = record["error"] is None and (record["status"] is None or record["status"] < 400)
+                if not ok:
+                    self.failed += 1
+                if result is not None:
+                    self._follow(entry.depth, entry.url, result)
+                self._changed.notify_all()
+            if self.on_progress:
+                self.on_progress(self.stats())
+
+    async def _run_hooks(self, result: FetchResult, record: Dict[str, Any]):
+        for hook in self.hooks:
+            try:
+                data = hook(result)
+                if inspect.isawaitable(data):
+                    data = await data
+            except Exception as e:
+                raise RuntimeError(f"Hook {getattr(hook, '__name__', hook)} failed: {e}") from e
+            if data:
+                record["data"].update(data)
+
+    def _follow(self, depth: int, url: str, result: FetchResult):
+        """Queue the result's new in-scope links, if its depth allows."""
+        final_url = result.final_url and normalize_url(result.final_url)
+        if final_url:
+            # A redirect's target counts as seen, so links to it are not fetched again
+            self.seen.add(final_url)
+        if depth >= self.max_depth:
+            return
+        for link in result.links:
+            link = normalize_url(link, final_url or url)
+            if link is None or not in_scope(link, self.seed_hosts, self.scope):
+                continue
+            if (self.include and not url_matches(link, self.include)) or url_matches(link, self.exclude):
+                continue
+            if self.seen.add(link):
+                self.frontier.push(link, depth + 1, url)
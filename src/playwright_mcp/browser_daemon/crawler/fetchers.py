@@ -0,0 +1,162 @@
+"""Fetchers load one URL for the crawler and report its links.
+
+``PageFetcher`` loads pages in a browser session, so links added by scripts are
+found and anything ``core.extract`` can extract is available. ``HttpFetcher``
+makes plain HTTP requests and parses the HTML itself: much cheaper, for sites
+that do not need a browser, but it only extracts titles.
+"""
+import asyncio
+import urllib.error
+import urllib.request
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from typing import Any, Dict, List, Optional
+from urllib.parse import urljoin
+
+from ..core.extract import extract
+from ..core.page_ready import PageReadiness
+from ..core.scheduler import Runner, run_directly
+from ..core.session import SessionManager
+
+USER_AGENT = "playwright-mcp-crawler"
+# Larger HTTP responses are cut off before their links are parsed
+MAX_BODY_BYTES = 5 * 1024 * 1024
+
+LINKS_OF = "() => Array.from(document.querySelectorAll('a[href]'), a => a.href)"
+
+
+@dataclass
+class FetchResult:
+    """A fetched URL: where it ended up, its links and what was extracted from it."""
+    url: str
+    final_url: Optional[str] = None
+    status: Optional[int] = None
+    links: List[str] = field(default_factory=list)
+    data: Dict[str, Any] = field(default_factory=dict)
+    html: Optional[str] = None
+
+
+class PageFetcher:
+    """Loads URLs on a pool of pages in a browser session."""
+
+    def __init__(self, session_manager: SessionManager, session_id: str, extract: Dict[str, Any],
+                 run: Runner = run_directly, wait_until: str = "load", ready: Optional[Dict[str, Any]] = None,
+                 timeout_ms: float = 30_000):
+        self.session_manager = session_manager
+        self.session_id = session_id
+        self.extract = extract
+        self.run = run
+        self.wait_until = wait_until
+        self.ready = ready
+        self.timeout_ms = timeout_ms
+        self.page_ids: List[str] = []
+        self._idle: List[str] = []
+
+    async def fetch(self, url: str) -> FetchResult:
+        page_id = await self._acquire()
+        try:
+            self.session_manager.touch(page_id, self.session_id)
+            return await self.run(lambda: self._load(page_id, url), page_id, self.session_id)
+        finally:
+            self._idle.append(page_id)
+
+    async def _acquire(self) -> str:
+        while self._idle:
+            page_id = self._idle.pop()
+            page = self.session_manager.get_page(page_id)
+            if page is not None and not page.is_closed():
+                return page_id
+        page_id = await self.session_manager.new_page(self.session_id)
+        if not page_id:
+            raise RuntimeError(f"Could not open a page in session {self.session_id}")
+        self.page_ids.append(page_id)
+        return page_id
+
+    async def _load(self, page_id: str, url: str) -> FetchResult:
+        page = self.session_manager.get_page(page_id)
+        if self.wait_until == "ready":
+            readiness = PageReadiness.from_args(page, self.ready)
+            await readiness.goto(url, self.timeout_ms)
+            response = readiness.response
+        else:
+            response = await page.goto(url, wait_until=self.wait_until, timeout=self.timeout_ms)
+        result = FetchResult(url, page.url, response.status if response is not None else None)
+        result.links = await page.evaluate(LINKS_OF)
+        result.data = await extract(page, self.extract)
+        return result
+
+    async def close(self):
+        for page_id in self.page_ids:
+            await self.session_manager.close_page(page_id)
+
+
+class LinkParser(HTMLParser):
+    """Collects a document's links, title and base URL."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.links: List[str] = []
+        self.base: Optional[str] = None
+        self.title: Optional[str] = None
+        self._in_title = False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "a" and attrs.get("href"):
+            self.links.append(attrs["href"])
+        elif tag == "base" and attrs.get("href") and self.base is None:
+            self.base = attrs["href"]
+        elif tag == "title" and self.title is None:
+            self._in_title = True
+            self.title = ""
+
+    def handle_endtag(self, tag):
+        if tag == "title":
+            self._in_title = False
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data
+
+
+class HttpFetcher:
+    """Fetches URLs over plain HTTP, parsing links out of HTML responses."""
+
+    def __init__(self, extract: Dict[str, Any], timeout_ms: float = 30_000, keep_html: bool = False):
+        if set(extract) - {"title"}:
+            raise ValueError("The http fetcher can only extract titles; use the browser fetcher")
+        self.extract = extract
+        self.timeout = timeout_ms / 1000
+        self.keep_html = keep_html
+
+    async def fetch(self, url: str) -> FetchResult:
+        return await asyncio.to_thread(self._fetch, url)
+
+    def _fetch(self, url: str) -> FetchResult:
+        request = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
+        try:
+            response = urllib.request.urlopen(request, timeout=self.timeout)
+        except urllib.error.HTTPError as e:
+            # Error pages are still results, just without links to follow
+            e.close()
+            return FetchResult(url, e.geturl(), e.code)
+        with response:
+            result = FetchResult(url, response.geturl(), response.status)
+            if response.headers.get_content_type() not in ("text/html", "application/xhtml+xml"):
+                return result
+            charset = response.headers.get_content_charset() or "utf-8"
+            html = response.read(MAX_BODY_BYTES).decode(charset, errors="replace")
+        parser = LinkParser()
+        parser.feed(html)
+        base = result.final_url
+        if parser.base:
+            base = urljoin(base, parser.base)
+        result.links = [urljoin(base, link) for link in parser.links]
+        if self.extract.get("title"):
+            result.data["title"] = (parser.title or "").strip()
+        if self.keep_html:
+            result.html = html
+        return result
+
+    async def close(self):
+        pass
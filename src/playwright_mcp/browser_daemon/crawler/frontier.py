@@ -0,0 +1,68 @@
+"""The crawl frontier: URLs waiting to be fetched, by priority, per domain.
+
+Each domain has its own heap, so a domain that is waiting out its rate limit
+never holds up the others: ``pop`` takes the best URL among the domains free to
+be fetched now, and otherwise says how long until one is.
+"""
+import heapq
+import itertools
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .urls import host_of
+
+# Scores a URL given its depth; lower is fetched first
+Score = Callable[[str, int], float]
+
+
+@dataclass(order=True)
+class FrontierEntry:
+    priority: float
+    order: int
+    url: str = field(compare=False)
+    depth: int = field(compare=False)
+    parent: Optional[str] = field(compare=False, default=None)
+
+
+def breadth_first(url: str, depth: int) -> float:
+    return depth
+
+
+class Frontier:
+    """URLs to fetch, at most ``rate`` fetches per second per domain (no limit if 0)."""
+
+    def __init__(self, rate: float = 0, score: Score = breadth_first):
+        self.interval = 1 / rate if rate > 0 else 0
+        self.score = score
+        self._heaps: Dict[str, List[FrontierEntry]] = {}
+        # When each domain may next be fetched, on the caller's clock
+        self._next_allowed: Dict[str, float] = {}
+        self._order = itertools.count()
+        self._size = 0
+
+    def push(self, url: str, depth: int, parent: Optional[str] = None):
+        entry = FrontierEntry(self.score(url, depth), next(self._order), url, depth, parent)
+        heapq.heappush(self._heaps.setdefault(host_of(url), []), entry)
+        self._size += 1
+
+    def pop(self, now: float) -> Tuple[Optional[FrontierEntry], float]:
+        """The best URL that may be fetched at ``now``, or None and the seconds until one may be."""
+        best_domain, wait = None, float("inf")
+        for domain, heap in self._heaps.items():
+            delay = self._next_allowed.get(domain, now) - now
+            if delay > 0:
+                wait = min(wait, delay)
+            elif best_domain is None or heap[0] < self._heaps[best_domain][0]:
+                best_domain = domain
+        if best_domain is None:
+            return None, wait if self._heaps else 0
+        heap = self._heaps[best_domain]
+        entry = heapq.heappop(heap)
+        if not heap:
+            del self._heaps[best_domain]
+        self._next_allowed[best_domain] = now + self.interval
+        self._size -= 1
+        return entry, 0
+
+    def __len__(self) -> int:
+        return self._size
@@ -0,0 +1,78 @@
+"""The set of URLs a crawl has already seen.
+
+Small crawls keep an exact set of 8-byte URL digests. Crawls expected to see
+more than ``EXACT_LIMIT`` URLs use a Bloom filter instead, which takes about
+14 bits per URL at a 0.1% false-positive rate whatever the URLs' length; a
+false positive makes the crawler skip a URL it has not seen, never visit one
+twice.
+"""
+import hashlib
+import math
+from typing import Set
+
+EXACT_LIMIT = 100_000
+DEFAULT_ERROR_RATE = 0.001
+
+
+def _digest(url: str) -> bytes:
+    return hashlib.blake2b(url.encode(), digest_size=16).digest()
+
+
+class ExactSeen:
+    """Seen URLs, exactly, by 8-byte digest."""
+
+    def __init__(self):
+        self._digests: Set[bytes] = set()
+
+    def add(self, url: str) -> bool:
+        """Add a URL; returns whether it was new."""
+        digest = _digest(url)[:8]
+        if digest in self._digests:
+            return False
+        self._digests.add(digest)
+        return True
+
+    def __contains__(self, url: str) -> bool:
+        return _digest(url)[:8] in self._digests
+
+    def __len__(self) -> int:
+        return len(self._digests)
+
+
+class BloomFilter:
+    """Seen URLs in a fixed-size bit array, with a bounded false-positive rate."""
+
+    def __init__(self, capacity: int, error_rate: float = DEFAULT_ERROR_RATE):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, url: str):
+        # Double hashing: position i is h1 + i * h2 (Kirsch and Mitzenmacher)
+        digest = _digest(url)
+        h1, h2 = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, url: str) -> bool:
+        """Add a URL; returns whether it was new (or looked new)."""
+        new = False
+        for position in self._positions(url):
+            byte, bit = divmod(position, 8)
+            if not self.bits[byte] & (1 << bit):
+                self.bits[byte] |= 1 << bit
+                new = True
+        if new:
+            self.count += 1
+        return new
+
+    def __contains__(self, url: str) -> bool:
+        return all(self.bits[p // 8] & (1 << (p % 8)) for p in self._positions(url))
+
+    def __len__(self) -> int:
+        return self.count
+
+
+def seen_set(capacity: int, exact_limit: int = EXACT_LIMIT):
+    """A seen-set for a crawl expected to see about ``capacity`` URLs."""
+    return ExactSeen() if capacity <= exact_limit else BloomFilter(capacity)
@@ -0,0 +1,56 @@
+"""Crawl results on disk, one JSON record per line.
+
+Records are appended and flushed as pages finish, so a crawl's results are
+readable while it runs and survive the daemon stopping part way through.
+"""
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+CRAWL_DIR_ENV = "PLAYWRIGHT_MCP_CRAWL_DIR"
+
+
+def crawl_dir() -> Path:
+    return Path(os.getenv(CRAWL_DIR_ENV) or Path.home() / ".playwright_mcp" / "crawls")
+
+
+class JsonlStore:
+    """Appends records to a JSONL file."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file: Optional[Any] = open(self.path, "a", encoding="utf-8")
+        self.count = 0
+
+    @classmethod
+    def for_job(cls, job_id: str) -> "JsonlStore":
+        return cls(crawl_dir() / f"{job_id}.jsonl")
+
+    def append(self, record: Dict[str, Any]):
+        """Write a record, flushed so readers of the file see it straight away."""
+        self._file.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        self._file.flush()
+        self.count += 1
+
+    def flush(self):
+        if self._file:
+            self._file.flush()
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def records(self) -> Iterator[Dict[str, Any]]:
+        """The records written so far."""
+        self.flush()
+        return read_records(self.path)
+
+
+def read_records(path: Path) -> Iterator[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
@@ -0,0 +1,84 @@
+"""URL normalization and crawl scope.
+
+Links to the same page are written many ways: with a fragment, a default port,
+upper-case host, ``..`` segments, escapes or query parameters in another order,
+or tracking parameters. ``normalize_url`` maps them all to one string, so the
+crawler sees each page once.
+"""
+import re
+from typing import Iterable, List, Optional
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+SCHEMES = {"http", "https"}
+DEFAULT_PORTS = {"http": 80, "https": 443}
+# Query parameters that only track where a visit came from
+TRACKING_PARAMS = re.compile(r"^(utm_\w+|gclid|fbclid|msclkid|mc_cid|mc_eid)$", re.IGNORECASE)
+SCOPES = ("host", "domain", "any")
+
+ESCAPE = re.compile(r"%([0-9A-Fa-f]{2})")
+UNRESERVED = set("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-._~")
+
+
+def _normalize_escapes(value: str) -> str:
+    """Decode escaped unreserved characters and upper-case the other escapes."""
+    def replace(match):
+        char = chr(int(match.group(1), 16))
+        return char if char in UNRESERVED else "%" + match.group(1).upper()
+    return ESCAPE.sub(replace, value)
+
+
+def _remove_dot_segments(path: str) -> str:
+    """Resolve ``.`` and ``..`` path segments (RFC 3986, section 5.2.4)."""
+    segments: List[str] = []
+    for segment in path.split("/")[1:]:
+        if segment == "..":
+            if segments:
+                segments.pop()
+        elif segment != ".":
+            segments.append(segment)
+    resolved = "/" + "/".join(segments)
+    if path.endswith(("/.", "/..")) and not resolved.endswith("/"):
+        resolved += "/"
+    return resolved
+
+
+def normalize_url(url: str, base: Optional[str] = None) -> Optional[str]:
+    """The canonical form of ``url`` (resolved against ``base``), or None if it is not a web URL."""
+    try:
+        parts = urlsplit(urljoin(base, url.strip()) if base else url.strip())
+        port = parts.port
+    except ValueError:
+        return None
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").rstrip(".")
+    if scheme not in SCHEMES or not host:
+        return None
+    netloc = host
+    if ":" in host:
+        netloc = f"[{host}]"
+    if port is not None and port != DEFAULT_PORTS[scheme]:
+        netloc += f":{port}"
+    if parts.username is not None:
+        netloc = f"{parts.username}{':' + parts.password if parts.password else ''}@{netloc}"
+    path = _remove_dot_segments(_normalize_escapes(parts.path or "/"))
+    params = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if not TRACKING_PARAMS.match(k)]
+    query = urlencode(sorted(params))
+    return urlunsplit((scheme, netloc, path, query, ""))
+
+
+def host_of(url: str) -> str:
+    return urlsplit(url).hostname or ""
+
+
+def in_scope(url: str, seed_hosts: Iterable[str], scope: str) -> bool:
+    """Whether a normalized URL is inside the crawl.
+
+    ``host`` keeps to the seeds' hosts, ``domain`` also allows their
+    subdomains, and ``any`` follows links anywhere.
+    """
+    if scope == "any":
+        return True
+    host = host_of(url)
+    if scope == "host":
+        return host in seed_hosts
+    return any(host == seed or host.endswith("." + seed) for seed in seed_hosts)
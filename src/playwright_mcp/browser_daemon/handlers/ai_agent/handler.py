@@ -4,7 +4,6 @@ import asyncio
 
 from ....utils.logging import setup_logging
 from ..base import BaseHandler
-from .tools import create_agent
 from .job_store import job_store  # Import the singleton directly
 # from pydantic_ai.usage import UsageLimits
 
@@ -36,6 +35,9 @@ class AIAgentHandler(BaseHandler):
             raise Exception("Missing required arguments for AI agent")
 
         try:
+            # pydantic_ai and the model SDKs are only loaded once the agent is used
+            from .tools import create_agent
+
             # Get async parameter with default True for backward compatibility
             is_async = args.get("async", True)
             logger.debug(f"Running in {'async' if is_async else 'sync'} mode")
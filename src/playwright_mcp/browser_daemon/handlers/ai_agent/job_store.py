@@ -5,6 +5,7 @@ from typing import Dict, Optional, Any
 import uuid
 from dataclasses import dataclass
 from datetime import datetime
+from ...core.events import event_bus
 from ....utils.logging import setup_logging
 
 # Configure logging
@@ -16,10 +17,11 @@ class JobStatus:
     """Status of an AI agent job."""
     id: str
     status: str  # "running", "completed", "error"
-    page_id: str
+    page_id: Optional[str]
     query: str
     max_actions: Optional[int] = None
     result: Optional[Any] = None
+    progress: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
     created_at: datetime = datetime.now()
     completed_at: Optional[datetime] = None
@@ -41,10 +43,11 @@ class JobStore:
         if not self._initialized:
             self._jobs: Dict[str, JobStatus] = {}
             self._tasks: Dict[str, asyncio.Task] = {}
+            self._finished: Dict[str, asyncio.Event] = {}
             self._initialized = True
             logger.info("JobStore initialized")
     
-    async def create_job(self, page_id: str, query: str, max_actions: Optional[int] = None) -> str:
+    async def create_job(self, page_id: Optional[str], query: str, max_actions: Optional[int] = None) -> str:
         """Create a new job and return its ID."""
         job_id = str(uuid.uuid4())
         self._jobs[job_id] = JobStatus(
@@ -54,18 +57,46 @@ class JobStore:
             query=query,
             max_actions=max_actions
         )
+        self._finished[job_id] = asyncio.Event()
         logger.info(f"Created new job with ID: {job_id}")
-        logger.debug(f"Current jobs: {list(self._jobs.keys())}")
+        self._publish(self._jobs[job_id])
         return job_id
     
     def get_job(self, job_id: str) -> Optional[JobStatus]:
         """Get the status of a job."""
         job = self._jobs.get(job_id)
-        if job:
-            logger.info(f"Retrieved job {job_id} with status: {job.status}")
-        else:
-            logger.warning(f"Job {job_id} not found. Current jobs: {list(self._jobs.keys())}")
+        if not job:
+            logger.warning(f"Job {job_id} not found")
         return job
+
+    async def wait_for_job(self, job_id: str, timeout: Optional[float] = None) -> bool:
+        """Wait until a job completes or fails.
+
+        Returns:
+            True if the job finished, False if ``timeout`` elapsed first
+
+        Raises:
+            ValueError: If the job does not exist
+        """
+        if not self.get_job(job_id):
+            raise ValueError(f"Job {job_id} not found")
+        try:
+            await asyncio.wait_for(self._finished[job_id].wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def _publish(self, job: JobStatus) -> None:
+        """Tell subscribers about a job status change."""
+        data = {"job_id": job.id, "page_id": job.page_id, "status": job.status}
+        if job.status == "error":
+            data["error"] = job.error
+        event_bus.publish("job.status", data)
+
+    def _finish(self, job: JobStatus) -> None:
+        """Wake anything waiting on a job and announce its final status."""
+        self._finished[job.id].set()
+        self._publish(job)
     
     async def get_job_status(self, job_id: str) -> str:
         """Get the status of a job."""
@@ -82,8 +113,8 @@ class JobStore:
         - status: The current status ("pending", "running", "completed", "error")
         - result: The result if completed, or None
         - error: The error message if failed, or None
+        - progress: The job's latest progress, for jobs that report it
         """
-        logger.info(f"Getting result for job {job_id}")
         job = self.get_job(job_id)
         if not job:
             raise ValueError(f"Job {job_id} not found")
@@ -96,6 +127,8 @@ class JobStore:
         
         if job.status == "error":
             response["error"] = job.error
+        if job.progress is not None:
+            response["progress"] = job.progress
             
         return response
     
@@ -114,6 +147,14 @@ class JobStore:
         if job:
             job.status = "running"
             logger.info(f"Set job {job_id} to running")
+            self._publish(job)
+    
+    def set_progress(self, job_id: str, progress: Dict[str, Any]) -> None:
+        """Record a running job's progress and tell subscribers."""
+        job = self.get_job(job_id)
+        if job:
+            job.progress = progress
+            event_bus.publish("job.progress", {"job_id": job.id, "page_id": job.page_id, "progress": progress})
     
     def complete_job(self, job_id: str, result: Any) -> None:
         """Complete a job with its result."""
@@ -124,6 +165,7 @@ class JobStore:
             job.completed_at = datetime.now()
             logger.info(f"Completed job {job_id} with result")
             logger.debug(f"Result: {result}")
+            self._finish(job)
     
     def fail_job(self, job_id: str, error: str) -> None:
         """Mark a job as failed with an error message."""
@@ -133,6 +175,7 @@ class JobStore:
             job.error = error
             job.completed_at = datetime.now()
             logger.error(f"Job {job_id} failed: {error}")
+            self._finish(job)
 
 
 # Create singleton instance
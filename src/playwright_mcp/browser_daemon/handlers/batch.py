@@ -0,0 +1,111 @@
+import re
+from typing import Any, Awaitable, Callable, Dict, List
+
+from ..core.session import SessionManager
+from ..core.logging import setup_logging
+from .base import BaseHandler
+
+logger = setup_logging("batch_handler")
+
+# A string argument of the form "$<step>.<key>[.<key>...]" is replaced with a value
+# from an earlier step's result, e.g. "$0.page_id" or "$prev.session_id".
+REFERENCE_PATTERN = re.compile(r"^\$(prev|\d+)((?:\.[\w-]+)+)$")
+
+
+class UnresolvedReference(Exception):
+    """Raised when a step argument refers to a result that is not available."""
+
+
+class BatchHandler(BaseHandler):
+    def __init__(self, session_manager: SessionManager,
+                 dispatch: Callable[[str, Dict[str, Any]], Awaitable[Dict[str, Any]]]):
+        super().__init__(session_manager)
+        self.dispatch = dispatch
+        self.required_batch_args = ["steps"]
+
+    async def handle(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle batch commands."""
+        command = args.get("command")
+
+        if command == "batch":
+            return await self._handle_batch(args)
+        else:
+            return {"error": f"Unknown batch command: {command}"}
+
+    async def _handle_batch(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a list of commands in order and return all of their results."""
+        if not self._validate_required_args(args, self.required_batch_args):
+            return {"error": "Missing required arguments for batch"}
+
+        steps = args["steps"]
+        if not isinstance(steps, list) or not all(isinstance(step, dict) for step in steps):
+            return {"error": "steps must be a list of {command, args} objects"}
+
+        on_error = args.get("on_error", "stop")
+        if on_error not in ("stop", "continue"):
+            return {"error": f"Invalid on_error value: {on_error}"}
+
+        results: List[Dict[str, Any]] = []
+        failed = 0
+        for index, step in enumerate(steps):
+            command = step.get("command")
+            if command == "batch":
+                result = {"error": "Nested batch commands are not supported"}
+            else:
+                try:
+                    step_args = self._resolve(step.get("args") or {}, results)
+                    result = await self.dispatch(command, step_args)
+                except UnresolvedReference as e:
+                    result = {"error": str(e)}
+                except Exception as e:
+                    logger.error(f"Batch step {index} ({command}) failed: {e}")
+                    result = {"error": str(e)}
+
+            ok = "error" not in result
+            results.append({"command": command, "status": "ok" if ok else "error", "result": result})
+            if not ok:
+                failed += 1
+                if on_error == "stop":
+                    break
+
+        completed = len(results) - failed
+        skipped = len(steps) - len(results)
+        for step in steps[len(results):]:
+            results.append({"command": step.get("command"), "status": "skipped", "result": None})
+
+        return {
+            "results": results,
+            "completed": completed,
+            "failed": failed,
+            "skipped": skipped,
+        }
+
+    def _resolve(self, value: Any, results: List[Dict[str, Any]]) -> Any:
+        """Replace "$<step>.<key>" references in step arguments with earlier results."""
+        if isinstance(value, dict):
+            return {key: self._resolve(item, results) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._resolve(item, results) for item in value]
+        if not isinstance(value, str):
+            return value
+
+        match = REFERENCE_PATTERN.match(value)
+        if not match:
+            return value
+
+        step, path = match.groups()
+        index = len(results) - 1 if step == "prev" else int(step)
+        if not 0 <= index < len(results):
+            raise UnresolvedReference(f"Reference {value} points to a step that has not run")
+        if results[index]["status"] != "ok":
+            raise UnresolvedReference(f"Reference {value} points to a step that failed")
+
+        resolved = results[index]["result"]
+        for key in path.lstrip(".").split("."):
+            if isinstance(resolved, list) and key.isdigit() and int(key) < len(resolved):
+                resolved = resolved[int(key)]
+            elif isinstance(resolved, dict) and key in resolved:
+                resolved = resolved[key]
+            else:
+                raise UnresolvedReference(f"Reference {value} not found in step {index} result")
+        return resolved
@@ -0,0 +1,299 @@
+"""Bulk navigation: load a list of URLs over a bounded pool of pages.
+
+``navigate-many`` opens up to ``concurrency`` pages in one session and hands
+each the next URL whose domain has fewer than ``per_domain`` loads in flight,
+so no site gets more than a few requests at a time. A URL whose navigation
+fails (an error, a timeout or a 5xx response) is tried again up to
+``retries`` times, backing off between attempts. After loading, each URL can
+have its title, the text of a selector and the value of a JS expression
+extracted (see ``extract``).
+
+Every finished URL is published as a ``bulk.result`` event with its result and
+timings, so subscribers see results as they come in; the command's reply has
+all of them, in the order the URLs were given. Each URL is scheduled like a
+command of its own on its page, so bulk jobs share the daemon's concurrency
+limits with everything else.
+"""
+import asyncio
+import itertools
+import time
+from collections import Counter, OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from ..core.events import event_bus
+from ..core.extract import extract, extract_options
+from ..core.logging import setup_logging
+from ..core.options import bounded
+from ..core.page_ready import PageReadiness
+from ..core.resources import ResourcePolicy, default_policy
+from ..core.scheduler import Runner, run_directly
+from ..core.session import SessionManager
+from .base import BaseHandler
+from .navigation import WAIT_UNTIL
+
+logger = setup_logging("bulk_handler")
+
+MAX_URLS = 5000
+DEFAULT_CONCURRENCY = 8
+MAX_CONCURRENCY = 32
+DEFAULT_PER_DOMAIN = 2
+DEFAULT_RETRIES = 1
+# Seconds before the first retry, doubled for each one after
+RETRY_BACKOFF = 0.5
+DEFAULT_TIMEOUT_MS = 30_000
+
+
+class RetryableError(Exception):
+    """A navigation that failed in a way worth trying again, e.g. a 5xx response."""
+
+
+class ExtractionError(Exception):
+    """Extraction failed on a page that loaded; not worth a retry."""
+
+
+@dataclass
+class BulkItem:
+    """One URL of a bulk job and its progress."""
+    index: int
+    url: str
+    extract: Dict[str, Any]
+    domain: str
+    attempts: int = 0
+    started: Optional[float] = None
+
+
+class BulkJob:
+    """Loads a job's URLs over a pool of pages in one session."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, session_manager: SessionManager, run: Runner, session_id: str, items: List[BulkItem],
+                 concurrency: int, per_domain: int, retries: int, wait_until: str,
+                 ready: Optional[Dict[str, Any]], timeout_ms: float):
+        self.job_id = f"bulk_{next(self._ids)}"
+        self.session_manager = session_manager
+        self.run = run
+        self.session_id = session_id
+        self.items = items
+        self.concurrency = min(concurrency, len(items))
+        self.per_domain = per_domain
+        self.retries = retries
+        self.wait_until = wait_until
+        self.ready = ready
+        self.timeout_ms = timeout_ms
+        self.results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        self.done = 0
+        # URLs waiting per domain, domains in the order they are served
+        self._queues: "OrderedDict[str, Deque[BulkItem]]" = OrderedDict()
+        for item in items:
+            self._queues.setdefault(item.domain, deque()).append(item)
+        self._active: Counter = Counter()
+        self._changed = asyncio.Condition()
+        self.page_ids: List[str] = []
+
+    async def execute(self) -> List[Dict[str, Any]]:
+        """Load every URL and return the results in order."""
+        await asyncio.gather(*(self._worker() for _ in range(self.concurrency)))
+        return self.results
+
+    async def _take(self) -> Optional[BulkItem]:
+        """The next URL whose domain has a free slot, waiting for one; None once all are taken."""
+        async with self._changed:
+            while True:
+                for domain, queue in self._queues.items():
+                    if self._active[domain] < self.per_domain:
+                        item = queue.popleft()
+                        if not queue:
+                            del self._queues[domain]
+                        else:
+                            # Round robin, so one big domain does not hold up the rest
+                            self._queues.move_to_end(domain)
+                        self._active[domain] += 1
+                        return item
+                if not self._queues:
+                    return None
+                await self._changed.wait()
+
+    async def _release(self, item: BulkItem):
+        """Free the item's domain slot."""
+        async with self._changed:
+            self._active[item.domain] -= 1
+            self._changed.notify_all()
+
+    async def _requeue(self, item: BulkItem):
+        """Put an item to retry first in line, to wait for a domain slot like any other URL."""
+        async with self._changed:
+            self._queues.setdefault(item.domain, deque()).appendleft(item)
+            self._queues.move_to_end(item.domain, last=False)
+            self._changed.notify_all()
+
+    async def _worker(self):
+        page_id = None
+        while True:
+            item = await self._take()
+            if item is None:
+                return
+            if item.started is None:
+                item.started = time.monotonic()
+            item.attempts += 1
+            retry = False
+            try:
+                if page_id is None or self._closed(page_id):
+                    page_id = await self.session_manager.new_page(self.session_id)
+                    if not page_id:
+                        raise RuntimeError(f"Could not open a page in session {self.session_id}")
+                    self.page_ids.append(page_id)
+                self.session_manager.touch(page_id, self.session_id)
+                result = await self.run(lambda: self._load(page_id, item), page_id, self.session_id)
+            except Exception as e:
+                # Navigation errors, timeouts, 5xx responses and a full scheduler are worth another try
+                retry = item.attempts <= self.retries and not isinstance(e, ExtractionError)
+                result = {"status": "error", "error": str(e)}
+            await self._release(item)
+            if retry:
+                logger.debug(f"Retrying {item.url} after: {result['error']}")
+                await asyncio.sleep(RETRY_BACKOFF * 2 ** (item.attempts - 1))
+                await self._requeue(item)
+                continue
+            self._finish(item, result)
+
+    def _closed(self, page_id: str) -> bool:
+        page = self.session_manager.get_page(page_id)
+        return page is None or page.is_closed()
+
+    def _finish(self, item: BulkItem, result: Dict[str, Any]):
+        timing = result.setdefault("timing", {})
+        timing["total_ms"] = round((time.monotonic() - (item.started or time.monotonic())) * 1000, 1)
+        result = {"index": item.index, "url": item.url, "attempts": item.attempts, **result}
+        self.results[item.index] = result
+        self.done += 1
+        event_bus.publish("bulk.result", {"job_id": self.job_id, "done": self.done, "total": len(self.items),
+                                          "result": result})
+
+    async def _load(self, page_id: str, item: BulkItem) -> Dict[str, Any]:
+        page = self.session_manager.get_page(page_id)
+        started = time.monotonic()
+        if self.wait_until == "ready":
+            readiness = PageReadiness.from_args(page, self.ready)
+            await readiness.goto(item.url, self.timeout_ms)
+            response = readiness.response
+        else:
+            response = await page.goto(item.url, wait_until=self.wait_until, timeout=self.timeout_ms)
+        if response is not None and response.status >= 500:
+            raise RetryableError(f"HTTP {response.status} from {item.url}")
+        navigated = time.monotonic()
+        result: Dict[str, Any] = {
+            "status": "ok",
+            "http_status": response.status if response is not None else None,
+            "final_url": page.url,
+        }
+        try:
+            result.update(await extract(page, item.extract))
+        except Exception as e:
+            raise ExtractionError(f"Extraction failed: {e}") from e
+        result["timing"] = {
+            "navigate_ms": round((navigated - started) * 1000, 1),
+            "extract_ms": round((time.monotonic() - navigated) * 1000, 1),
+        }
+        return result
+
+
+class BulkNavigationHandler(BaseHandler):
+    def __init__(self, session_manager: SessionManager, run: Runner = run_directly):
+        super().__init__(session_manager)
+        self.run = run
+        self.required_navigate_many_args = ["urls"]
+
+    async def handle(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle bulk navigation commands."""
+        command = args.get("command")
+
+        if command == "navigate-many":
+            return await self._handle_navigate_many(args)
+        else:
+            return {"error": f"Unknown bulk navigation command: {command}"}
+
+    async def _handle_navigate_many(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Load a list of URLs concurrently and return each one's result."""
+        if not self._validate_required_args(args, self.required_navigate_many_args):
+            return {"error": "Missing required arguments for navigate-many"}
+
+        try:
+            items = self._items(args["urls"], extract_options(args.get("extract", {"title": True})))
+            concurrency = bounded(args, "concurrency", DEFAULT_CONCURRENCY, 1, MAX_CONCURRENCY)
+            per_domain = bounded(args, "per_domain", DEFAULT_PER_DOMAIN, 1, MAX_CONCURRENCY)
+            retries = bounded(args, "retries", DEFAULT_RETRIES, 0, 5)
+            policy = ResourcePolicy.parse(args.get("resource_policy"))
+            wait_until = args.get("wait_until", WAIT_UNTIL)
+            PageReadiness.from_args(None, args.get("ready"))
+        except ValueError as e:
+            return {"error": str(e)}
+
+        session_id = args.get("session_id")
+        created_session = False
+        started = time.monotonic()
+        try:
+            if not session_id or not self.session_manager.get_session(session_id):
+                if "resource_policy" not in args:
+                    policy = default_policy()
+                session_id = await self.session_manager.launch_browser(
+                    args.get("browser_type", "chromium"), args.get("headless", True), policy)
+                created_session = True
+            elif "resource_policy" in args:
+                await self.session_manager.set_resource_policy(session_id, policy)
+
+            job = BulkJob(self.session_manager, self.run, session_id, items, concurrency, per_domain, retries,
+                          wait_until, args.get("ready"), float(args.get("timeout_ms", DEFAULT_TIMEOUT_MS)))
+            logger.info(f"Bulk job {job.job_id}: {len(items)} URLs over {job.concurrency} pages")
+            try:
+                results = await job.execute()
+            finally:
+                await self._clean_up(job, created_session)
+        except Exception as e:
+            logger.error(f"Bulk navigation failed: {e}")
+            return {"error": str(e)}
+
+        failed = sum(1 for result in results if result["status"] != "ok")
+        return {
+            "job_id": job.job_id,
+            "session_id": None if created_session else session_id,
+            "results": results,
+            "succeeded": len(results) - failed,
+            "failed": failed,
+            "elapsed_ms": round((time.monotonic() - started) * 1000, 1),
+        }
+
+    async def _clean_up(self, job: BulkJob, created_session: bool):
+        """Close the job's pages, and its session if the job started it."""
+        try:
+            if created_session:
+                await self.session_manager.close_browser(job.session_id)
+                return
+            for page_id in job.page_ids:
+                await self.session_manager.close_page(page_id)
+        except Exception as e:
+            logger.warning(f"Cleaning up after bulk job {job.job_id} failed: {e}")
+
+    @staticmethod
+    def _items(urls: Any, extract: Dict[str, Any]) -> List[BulkItem]:
+        """Validate the URL list, which holds URLs or {url, extract} objects.
+
+        Raises:
+            ValueError: For an empty or too long list, or an invalid entry
+        """
+        if not isinstance(urls, list) or not urls:
+            raise ValueError("urls must be a non-empty list")
+        if len(urls) > MAX_URLS:
+            raise ValueError(f"At most {MAX_URLS} URLs per job")
+        items = []
+        for index, entry in enumerate(urls):
+            if isinstance(entry, dict) and isinstance(entry.get("url"), str) and set(entry) <= {"url", "extract"}:
+                url, options = entry["url"], extract_options(entry.get("extract", extract))
+            elif isinstance(entry, str):
+                url, options = entry, extract
+            else:
+                raise ValueError(f"urls[{index}] must be a URL or an object with url and extract")
+            items.append(BulkItem(index, url, options, (urlsplit(url).hostname or "").lower()))
+        return items
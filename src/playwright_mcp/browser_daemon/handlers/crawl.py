@@ -0,0 +1,207 @@
+"""Crawl jobs: follow links outwards from seed URLs in the background.
+
+``crawl`` validates the job, starts it as a job in the job store and replies
+straight away with the job ID and the JSONL file its records go to (see
+``crawler``). While it runs the job's progress is updated, at most every
+``PROGRESS_INTERVAL`` seconds, and published as ``job.progress`` events;
+``crawl-status`` reports it, or waits for the job to finish, and
+``cancel-crawl`` stops it, keeping the records written so far.
+
+The ``browser`` fetcher loads pages in a session of their own, scheduled like
+any other command; the ``http`` fetcher makes plain requests instead, for
+sites that do not need a browser.
+"""
+import asyncio
+import time
+from typing import Any, Dict, List
+
+from ..core.extract import extract_options
+from ..core.logging import setup_logging
+from ..core.options import bounded
+from ..core.page_ready import PageReadiness
+from ..core.resources import ResourcePolicy, default_policy
+from ..core.scheduler import Runner, run_directly
+from ..core.session import SessionManager
+from ..crawler import Crawler, HttpFetcher, JsonlStore, PageFetcher, normalize_url
+from ..crawler.urls import SCOPES
+from .ai_agent.job_store import job_store
+from .base import BaseHandler
+from .navigation import WAIT_UNTIL
+
+logger = setup_logging("crawl_handler")
+
+FETCHERS = ("browser", "http")
+MAX_SEEDS = 100
+DEFAULT_MAX_PAGES = 100
+MAX_PAGES = 100_000
+DEFAULT_MAX_DEPTH = 2
+MAX_DEPTH = 20
+DEFAULT_CONCURRENCY = 4
+MAX_CONCURRENCY = 32
+# Fetches per second per domain
+DEFAULT_RATE = 1.0
+DEFAULT_TIMEOUT_MS = 30_000
+# Seconds between progress updates
+PROGRESS_INTERVAL = 0.5
+# Longest a blocking crawl-status may wait, in seconds
+MAX_WAIT_TIMEOUT = 300
+DEFAULT_WAIT_TIMEOUT = 30
+
+
+class CrawlHandler(BaseHandler):
+    def __init__(self, session_manager: SessionManager, run: Runner = run_directly):
+        super().__init__(session_manager)
+        self.run = run
+        self.required_crawl_args = ["seeds"]
+        self.required_job_args = ["job_id"]
+
+    async def handle(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle crawl commands."""
+        command = args.get("command")
+
+        if command == "crawl":
+            return await self._handle_crawl(args)
+        elif command == "crawl-status":
+            return await self._handle_crawl_status(args)
+        elif command == "cancel-crawl":
+            return await self._handle_cancel_crawl(args)
+        else:
+            return {"error": f"Unknown crawl command: {command}"}
+
+    async def _handle_crawl(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Start a crawl job and return its ID."""
+        if not self._validate_required_args(args, self.required_crawl_args):
+            return {"error": "Missing required arguments for crawl"}
+
+        try:
+            seeds = self._seeds(args["seeds"])
+            options = {
+                "max_pages": bounded(args, "max_pages", DEFAULT_MAX_PAGES, 1, MAX_PAGES),
+                "max_depth": bounded(args, "max_depth", DEFAULT_MAX_DEPTH, 0, MAX_DEPTH),
+                "concurrency": bounded(args, "concurrency", DEFAULT_CONCURRENCY, 1, MAX_CONCURRENCY),
+                "scope": args.get("scope", "host"),
+                "include": self._patterns(args, "include"),
+                "exclude": self._patterns(args, "exclude"),
+                "rate": args.get("rate", DEFAULT_RATE),
+            }
+            if options["scope"] not in SCOPES:
+                raise ValueError(f"scope must be one of: {', '.join(SCOPES)}")
+            if not isinstance(options["rate"], (int, float)) or options["rate"] < 0:
+                raise ValueError("rate must be a number of fetches per second per domain, or 0 for no limit")
+            fetcher = args.get("fetcher", "browser")
+            if fetcher not in FETCHERS:
+                raise ValueError(f"fetcher must be one of: {', '.join(FETCHERS)}")
+            extract = extract_options(args.get("extract", {"title": True}))
+            timeout_ms = float(args.get("timeout_ms", DEFAULT_TIMEOUT_MS))
+            if fetcher == "http":
+                HttpFetcher(extract, timeout_ms)
+            else:
+                policy = ResourcePolicy.parse(args.get("resource_policy"))
+                PageReadiness.from_args(None, args.get("ready"))
+        except ValueError as e:
+            return {"error": str(e)}
+
+        job_id = await job_store.create_job(None, f"crawl {seeds[0]}")
+        store = JsonlStore.for_job(job_id)
+
+        async def process_job():
+            session_id = None
+            try:
+                job_store.set_running(job_id)
+                if fetcher == "http":
+                    pages = HttpFetcher(extract, timeout_ms)
+                else:
+                    session_id = await self.session_manager.launch_browser(
+                        args.get("browser_type", "chromium"), args.get("headless", True),
+                        policy if "resource_policy" in args else default_policy())
+                    pages = PageFetcher(self.session_manager, session_id, extract, self.run,
+                                        args.get("wait_until", WAIT_UNTIL), args.get("ready"), timeout_ms)
+                crawler = Crawler(pages, store, seeds, on_progress=self._progress_reporter(job_id), **options)
+                logger.info(f"Crawl {job_id}: from {len(seeds)} seeds, up to {options['max_pages']} pages")
+                result = await crawler.run()
+                job_store.set_progress(job_id, result)
+                job_store.complete_job(job_id, result)
+            except asyncio.CancelledError:
+                store.close()
+                job_store.fail_job(job_id, f"Crawl cancelled; records so far are in {store.path}")
+            except Exception as e:
+                logger.error(f"Crawl {job_id} failed: {e}")
+                store.close()
+                job_store.fail_job(job_id, str(e))
+            finally:
+                if session_id:
+                    await self._close_session(session_id)
+
+        job_store.set_task(job_id, asyncio.create_task(process_job()))
+        return {"status": "running", "job_id": job_id, "output": str(store.path)}
+
+    @staticmethod
+    def _progress_reporter(job_id: str):
+        """Passes a crawl's stats on to its job, at most every ``PROGRESS_INTERVAL`` seconds."""
+        last = 0.0
+
+        def report(stats: Dict[str, Any]):
+            nonlocal last
+            now = time.monotonic()
+            if now - last >= PROGRESS_INTERVAL:
+                last = now
+                job_store.set_progress(job_id, stats)
+        return report
+
+    async def _close_session(self, session_id: str):
+        try:
+            await self.session_manager.close_browser(session_id)
+        except Exception as e:
+            logger.warning(f"Closing crawl session {session_id} failed: {e}")
+
+    async def _handle_crawl_status(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Report a crawl's status and progress, waiting for it to finish if asked."""
+        if not self._validate_required_args(args, self.required_job_args):
+            return {"error": "Missing required arguments for crawl-status"}
+        job_id = args["job_id"]
+        try:
+            if args.get("wait"):
+                timeout = min(float(args.get("timeout", DEFAULT_WAIT_TIMEOUT)), MAX_WAIT_TIMEOUT)
+                await job_store.wait_for_job(job_id, timeout)
+            return await job_store.get_job_result(job_id)
+        except ValueError as e:
+            return {"error": str(e)}
+
+    async def _handle_cancel_crawl(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Stop a running crawl."""
+        if not self._validate_required_args(args, self.required_job_args):
+            return {"error": "Missing required arguments for cancel-crawl"}
+        job_id = args["job_id"]
+        task = job_store.get_task(job_id)
+        if not job_store.get_job(job_id) or task is None:
+            return {"error": f"Job {job_id} not found"}
+        if task.done():
+            return {"error": f"Job {job_id} has already finished"}
+        task.cancel()
+        await asyncio.wait([task])
+        return await job_store.get_job_result(job_id)
+
+    @staticmethod
+    def _seeds(seeds: Any) -> List[str]:
+        """Validate the seed URLs.
+
+        Raises:
+            ValueError: For an empty or too long list, or a seed that is not an http(s) URL
+        """
+        if isinstance(seeds, str):
+            seeds = [seeds]
+        if not isinstance(seeds, list) or not seeds:
+            raise ValueError("seeds must be a non-empty list of URLs")
+        if len(seeds) > MAX_SEEDS:
+            raise ValueError(f"At most {MAX_SEEDS} seeds per crawl")
+        for seed in seeds:
+            if not isinstance(seed, str) or normalize_url(seed) is None:
+                raise ValueError(f"Not an http(s) URL: {seed}")
+        return seeds
+
+    @staticmethod
+    def _patterns(args: Dict[str, Any], key: str) -> List[str]:
+        patterns = args.get(key, [])
+        if not isinstance(patterns, list) or not all(isinstance(p, str) for p in patterns):
+            raise ValueError(f"{key} must be a list of URL patterns")
+        return patterns
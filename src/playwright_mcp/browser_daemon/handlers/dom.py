@@ -3,7 +3,6 @@ from typing import Dict, Any
 from ..core.session import SessionManager
 from ..core.logging import setup_logging
 from .base import BaseHandler
-from bs4 import BeautifulSoup
 
 logger = setup_logging("dom_handler")
 
@@ -83,6 +82,9 @@ class DOMHandler(BaseHandler):
             return {"error": f"No page found with ID: {page_id}"}
 
         try:
+            # Imported on first use; most sessions never search the DOM
+            from bs4 import BeautifulSoup
+
             # Get page content and parse with BeautifulSoup using lxml parser
             content = await page.content()
             logger.debug(f"Got page content of length: {len(content)}")
@@ -6,6 +6,10 @@ from ...utils.logging import setup_logging
 
 logger = setup_logging("get_result_handler", "get_result_handler.log")
 
+# Longest a blocking get-ai-result may wait, in seconds
+MAX_WAIT_TIMEOUT = 300
+DEFAULT_WAIT_TIMEOUT = 30
+
 
 class GetResultHandler(BaseHandler):
     def __init__(self, session_manager):
@@ -23,7 +27,11 @@ class GetResultHandler(BaseHandler):
             raise Exception(f"Unknown get-result command: {command}")
 
     async def _handle_get_result(self, args: Dict[str, Any]) -> Dict[str, Any]:
-        """Handle get-result command."""
+        """Handle get-result command.
+
+        With ``wait`` set, the reply is held back until the job finishes or
+        ``timeout`` seconds pass, instead of returning the current status.
+        """
         if not self._validate_required_args(args, self.required_args):
             raise Exception("Missing required arguments for get-result")
         
@@ -31,6 +39,9 @@ class GetResultHandler(BaseHandler):
 
         # Get job status and result using job store singleton
         job_id = args.get("job_id")
+        if args.get("wait"):
+            timeout = min(float(args.get("timeout", DEFAULT_WAIT_TIMEOUT)), MAX_WAIT_TIMEOUT)
+            await job_store.wait_for_job(job_id, timeout)
         status = await job_store.get_job_status(job_id)
         result = await job_store.get_job_result(job_id)
 
@@ -1,12 +1,26 @@
-from typing import Dict, Any, Optional
+import asyncio
+import os
+from typing import TYPE_CHECKING, Dict, Any, Optional
+
+from playwright.async_api import Page
 
 from ..core.session import SessionManager
 from ..core.logging import setup_logging
+from ..core.har import HarMode, default_har
+from ..core.page_ready import PageReadiness
+from ..core.resources import ResourcePolicy, default_policy
+from ..core.storage import snapshot_store
 from .base import BaseHandler
-from ..daemon import BrowserDaemon
+
+if TYPE_CHECKING:
+    # Only needed for annotations; importing it at runtime pulls in the MCP server
+    from ..daemon import BrowserDaemon
 
 logger = setup_logging("navigation_handler")
 
+# "ready" is the adaptive mode from core.page_ready; the others are Playwright's
+WAIT_UNTIL = os.getenv("PLAYWRIGHT_MCP_WAIT_UNTIL", "ready")
+
 
 class NavigationHandler(BaseHandler):
     def __init__(self, session_manager: SessionManager):
@@ -36,13 +50,39 @@ class NavigationHandler(BaseHandler):
         created_session = False
         created_page = False
 
+        try:
+            policy = ResourcePolicy.parse(args.get("resource_policy"))
+            har = HarMode.parse(args.get("har"))
+        except ValueError as e:
+            return {"error": str(e)}
+
         try:
             # Create new session if needed
             if not session_id or not self.session_manager.get_session(session_id):
                 browser_type = args.get("browser_type", "chromium")
                 headless = args.get("headless", True)
-                session_id = await self.session_manager.launch_browser(browser_type, headless)
+                if "resource_policy" not in args:
+                    policy = default_policy()
+                storage_state = None
+                if args.get("storage"):
+                    storage_state = await asyncio.to_thread(snapshot_store.load, args["storage"])
+                    if storage_state is None:
+                        return {"error": f"No storage snapshot named {args['storage']} (or it expired)",
+                                "code": "no_snapshot"}
+                if "har" not in args:
+                    har = default_har()
+                try:
+                    session_id = await self.session_manager.launch_browser(
+                        browser_type, headless, policy, storage_state, har=har)
+                except FileNotFoundError as e:
+                    return {"error": str(e), "code": "no_archive"}
                 created_session = True
+            elif har:
+                return {"error": "har can only be set for a new session"}
+            elif args.get("storage"):
+                return {"error": "storage can only be set for a new session"}
+            elif "resource_policy" in args:
+                await self.session_manager.set_resource_policy(session_id, policy)
 
             # Create new page if needed
             if not page_id or not self.session_manager.get_page(page_id):
@@ -56,14 +96,30 @@ class NavigationHandler(BaseHandler):
             if not page:
                 return {"error": f"No page found with ID: {page_id}"}
 
-            await page.goto(args["url"], wait_until=args.get("wait_until", "networkidle"))
+            blocker = self.session_manager.blockers.get(session_id)
+            if blocker:
+                blocker.start_counting(page)
+            cache = self.session_manager.http_cache
+            if cache:
+                cache.start_counting(page)
+            readiness = await self._goto(page, args)
 
-            return {
+            response = {
                 "session_id": session_id,
                 "page_id": page_id,
                 "created_session": created_session,
                 "created_page": created_page
             }
+            if readiness:
+                response["readiness"] = readiness
+            if blocker:
+                response["blocked"] = blocker.counts(page).to_dict()
+            if cache:
+                response["http_cache"] = cache.counts(page).to_dict()
+            har_report = self.session_manager.har_report(session_id)
+            if har_report:
+                response["har"] = har_report
+            return response
 
         except Exception as e:
             logger.error(f"Navigation failed: {e}")
@@ -87,7 +143,9 @@ class NavigationHandler(BaseHandler):
                 if not page:
                     return {"error": f"No page found with ID: {page_id}"}
 
-                await page.goto(args["url"], wait_until=args.get("wait_until", "networkidle"))
+                readiness = await self._goto(page, args)
+                if readiness:
+                    return {"page_id": page_id, "readiness": readiness}
 
             return {"page_id": page_id}
 
@@ -95,7 +153,22 @@ class NavigationHandler(BaseHandler):
             logger.error(f"New tab creation failed: {e}")
             return {"error": str(e)}
 
-    async def handle_navigate(self, args: dict, daemon: Optional[BrowserDaemon] = None) -> dict:
+    async def _goto(self, page: Page, args: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Navigate a page to ``args["url"]``, waiting as ``wait_until`` says.
+
+        Returns:
+            The readiness report in the ``ready`` mode, otherwise None
+
+        Raises:
+            ValueError: For unknown ``ready`` options
+        """
+        wait_until = args.get("wait_until", WAIT_UNTIL)
+        if wait_until == "ready":
+            return await PageReadiness.from_args(page, args.get("ready")).goto(args["url"])
+        await page.goto(args["url"], wait_until=wait_until)
+        return None
+
+    async def handle_navigate(self, args: dict, daemon: Optional["BrowserDaemon"] = None) -> dict:
         """Handle navigation command."""
         if not daemon:
             return {
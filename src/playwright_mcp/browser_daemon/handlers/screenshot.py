@@ -11,7 +11,7 @@ logger = setup_logging("screenshot_handler")
 class ScreenshotHandler(BaseHandler):
     def __init__(self, session_manager: SessionManager):
         super().__init__(session_manager)
-        self.required_screenshot_args = ["page_id", "save_path"]
+        self.required_screenshot_args = ["page_id"]
         self.required_highlight_args = ["page_id", "selector"]
 
     async def handle(self, args: Dict[str, Any]) -> Dict[str, Any]:
@@ -36,7 +36,13 @@ class ScreenshotHandler(BaseHandler):
                 return page_result
 
             page = page_result["page"]
-            save_path = args["save_path"]
+            save_path = args.get("save_path")
+            full_page = args.get("full_page", False)
+
+            if not save_path:
+                # Hand the image back in the reply; large images travel through shared memory
+                data = await page.screenshot(full_page=full_page)
+                return {"success": True, "data": data, "mime_type": "image/png"}
 
             # Validate absolute path
             if not os.path.isabs(save_path):
@@ -46,8 +52,11 @@ class ScreenshotHandler(BaseHandler):
             os.makedirs(os.path.dirname(save_path), exist_ok=True)
 
             # Take the screenshot
-            await page.screenshot(path=save_path)
-            return {"success": True, "path": save_path}
+            data = await page.screenshot(path=save_path, full_page=full_page)
+            response = {"success": True, "path": save_path}
+            if args.get("return_data"):
+                response.update(data=data, mime_type="image/png")
+            return response
 
         except Exception as e:
             logger.error(f"Screenshot failed: {e}")
@@ -1,17 +1,22 @@
+import asyncio
 from typing import Dict, Any
 
 from ..core.session import SessionManager
 from ..core.logging import setup_logging
+from ..core.storage import SnapshotStore, snapshot_store
 from .base import BaseHandler
 
 logger = setup_logging("session_handler")
 
 
 class SessionHandler(BaseHandler):
-    def __init__(self, session_manager: SessionManager):
+    def __init__(self, session_manager: SessionManager, snapshots: SnapshotStore = snapshot_store):
         super().__init__(session_manager)
+        self.snapshots = snapshots
         self.required_close_browser_args = ["session_id"]
         self.required_close_tab_args = ["page_id"]
+        self.required_save_storage_args = ["session_id", "name"]
+        self.required_delete_storage_args = ["name"]
 
     async def handle(self, args: Dict[str, Any]) -> Dict[str, Any]:
         """Handle session-related commands."""
@@ -21,6 +26,12 @@ class SessionHandler(BaseHandler):
             return await self._handle_close_browser(args)
         elif command == "close-tab":
             return await self._handle_close_tab(args)
+        elif command == "save-storage":
+            return await self._handle_save_storage(args)
+        elif command == "list-storage":
+            return {"snapshots": await asyncio.to_thread(self.snapshots.list)}
+        elif command == "delete-storage":
+            return await self._handle_delete_storage(args)
         else:
             return {"error": f"Unknown session command: {command}"}
 
@@ -50,4 +61,31 @@ class SessionHandler(BaseHandler):
 
         except Exception as e:
             logger.error(f"Tab close failed: {e}")
-            return {"error": str(e)} 
\ No newline at end of file
+            return {"error": str(e)}
+
+    async def _handle_save_storage(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle save-storage command: snapshot a session's cookies and localStorage."""
+        if not self._validate_required_args(args, self.required_save_storage_args):
+            return {"error": "Missing required arguments for saving storage"}
+
+        context = self.session_manager.get_session(args["session_id"])
+        if not context:
+            return {"error": f"No browser session found with ID: {args['session_id']}"}
+        try:
+            state = await context.storage_state()
+            meta = await asyncio.to_thread(self.snapshots.save, args["name"], state, args.get("ttl"))
+            return {**meta, "cookies": len(state.get("cookies", [])), "origins": len(state.get("origins", []))}
+
+        except Exception as e:
+            logger.error(f"Saving storage failed: {e}")
+            return {"error": str(e)}
+
+    async def _handle_delete_storage(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle delete-storage command."""
+        if not self._validate_required_args(args, self.required_delete_storage_args):
+            return {"error": "Missing required arguments for deleting storage"}
+
+        try:
+            return {"success": await asyncio.to_thread(self.snapshots.delete, args["name"])}
+        except ValueError as e:
+            return {"error": str(e)}
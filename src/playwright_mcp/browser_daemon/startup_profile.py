@@ -0,0 +1,98 @@
+"""Startup profiling for the browser daemon (``--profile-startup``).
+
+Starts a daemon on a private socket, times each startup phase up to the first
+``pong`` and breaks import time down by package, then exits.
+"""
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+DAEMON_MODULE = "playwright_mcp.browser_daemon.browser_manager"
+
+
+def import_breakdown(module: str = DAEMON_MODULE, top: int = 12) -> List[Tuple[str, float]]:
+    """Import ``module`` in a fresh interpreter and total the import time per package.
+
+    ``playwright_mcp`` modules are listed individually, everything else by its
+    top-level package.
+
+    Returns:
+        (package, milliseconds) pairs, slowest first
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path)),
+    )
+    totals: Dict[str, float] = defaultdict(float)
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        package = name if name.startswith("playwright_mcp.") else name.split(".")[0]
+        totals[package] += int(self_us) / 1000
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:top]
+
+
+async def profile_startup() -> Dict[str, float]:
+    """Start a daemon in this process and time each phase until it answers a ping.
+
+    Returns:
+        Seconds from the start of profiling to the end of each phase
+    """
+    phases = {}
+    started = time.perf_counter()
+
+    from .browser_manager import BrowserManager
+    from .core.client import DaemonClient
+    phases["import"] = time.perf_counter() - started
+
+    directory = tempfile.mkdtemp(prefix="pwmcp")
+    socket_path = os.path.join(directory, "daemon.sock")
+    manager = BrowserManager(socket_path)
+    phases["init"] = time.perf_counter() - started
+
+    listening = asyncio.Event()
+    disconnected = asyncio.Event()
+
+    async def handle_connection(reader, writer):
+        try:
+            await manager.handle_connection(reader, writer)
+        finally:
+            disconnected.set()
+
+    server = asyncio.create_task(manager.server.start(handle_connection, on_ready=listening.set))
+    client = DaemonClient(socket_path)
+    try:
+        await asyncio.wait_for(listening.wait(), 30)
+        phases["listening"] = time.perf_counter() - started
+        await client.request("ping", {}, timeout=5)
+        phases["first pong"] = time.perf_counter() - started
+    finally:
+        await client.close()
+        if "first pong" in phases:
+            # Let the daemon finish with the connection before shutting the server down
+            await asyncio.wait_for(disconnected.wait(), 5)
+        server.cancel()
+        manager.server.cleanup()
+        os.rmdir(directory)
+    return phases
+
+
+def report(phases: Dict[str, float], breakdown: List[Tuple[str, float]]) -> str:
+    """Format the profile as a plain-text table."""
+    lines = ["Startup phases (cumulative):"]
+    lines += [f"  {name:<14}{seconds * 1000:>9.1f} ms" for name, seconds in phases.items()]
+    lines.append(f"Import time by package ({DAEMON_MODULE}, fresh interpreter):")
+    lines += [f"  {package:<56}{ms:>9.1f} ms" for package, ms in breakdown]
+    return "\n".join(lines)
+
+
+def main():
+    phases = asyncio.run(profile_startup())
+    print(report(phases, import_breakdown()), file=sys.stderr)
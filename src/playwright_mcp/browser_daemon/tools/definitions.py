@@ -31,6 +31,16 @@ def get_tool_definitions() -> list[Tool]:
                     "job_id": {
                         "type": "string",
                         "description": "ID of the AI agent job to get results for"
+                    },
+                    "wait": {
+                        "type": "boolean",
+                        "description": "Wait for the job to finish instead of returning its current status",
+                        "default": False
+                    },
+                    "timeout": {
+                        "type": "number",
+                        "description": "Seconds to wait when wait is set (max 300)",
+                        "default": 30
                     }
                 },
                 "required": ["job_id"]
@@ -76,13 +86,184 @@ def get_tool_definitions() -> list[Tool]:
                     },
                     "wait_until": {
                         "type": "string",
-                        "description": "When to consider navigation complete",
-                        "enum": ["load", "domcontentloaded", "networkidle"]
+                        "description": (
+                            "When to consider navigation complete. 'ready' (the default) resolves once "
+                            "the DOM is quiet and no request the page waits on is pending, or once "
+                            "ready.selector is visible, and reports which signal fired"
+                        ),
+                        "enum": ["ready", "load", "domcontentloaded", "networkidle"]
+                    },
+                    "ready": {
+                        "type": "object",
+                        "description": "Options for wait_until 'ready'",
+                        "properties": {
+                            "selector": {
+                                "type": "string",
+                                "description": "Ready once an element matching this selector is visible"
+                            },
+                            "quiet_ms": {
+                                "type": "number",
+                                "description": "Milliseconds without DOM mutations that count as quiet",
+                                "default": 500
+                            },
+                            "timeout_ms": {
+                                "type": "number",
+                                "description": "Stop waiting this long after DOMContentLoaded and report 'timeout'",
+                                "default": 10000
+                            },
+                            "ignore": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                                "description": "URL substrings or globs of long-lived requests not to wait for"
+                            },
+                            "long_request_ms": {
+                                "type": "number",
+                                "description": "Requests pending this long are treated as long polls",
+                                "default": 5000
+                            }
+                        }
+                    },
+                    "resource_policy": {
+                        "description": (
+                            "Requests the session's pages do not make: a preset ('none', 'assets' for "
+                            "images, media and fonts, 'trackers', 'lean' for both) or an object with "
+                            "'block_types' (resource types) and 'block_domains' lists. Applies to the "
+                            "whole session; the response reports what was blocked."
+                        ),
+                        "oneOf": [
+                            {"type": "string", "enum": ["none", "assets", "trackers", "lean"]},
+                            {
+                                "type": "object",
+                                "properties": {
+                                    "preset": {"type": "string"},
+                                    "block_types": {"type": "array", "items": {"type": "string"}},
+                                    "block_domains": {"type": "array", "items": {"type": "string"}}
+                                }
+                            }
+                        ]
+                    },
+                    "storage": {
+                        "type": "string",
+                        "description": (
+                            "Name of a snapshot saved with save-storage. A new session starts with its "
+                            "cookies and localStorage, e.g. already logged in. Only for a new session."
+                        )
+                    },
+                    "har": {
+                        "description": (
+                            "HAR mode for a new session: 'record:<archive>' writes all its traffic to the "
+                            "named archive, 'replay:<archive>' answers its requests from the archive with "
+                            "no network. Also an object with 'mode' and 'archive'."
+                        ),
+                        "oneOf": [
+                            {"type": "string", "pattern": "^(record|replay):"},
+                            {
+                                "type": "object",
+                                "properties": {
+                                    "mode": {"type": "string", "enum": ["record", "replay"]},
+                                    "archive": {"type": "string"}
+                                },
+                                "required": ["mode", "archive"]
+                            }
+                        ]
                     }
                 },
                 "required": ["url"]
             }
         ),
+        Tool(
+            name="navigate-many",
+            description=(
+                "Load a list of URLs concurrently over a pool of pages and return each one's result "
+                "(HTTP status, final URL, extracted values, timings) in the order given. Limits how many "
+                "loads run per domain, retries failed loads, and streams each result as a 'bulk.result' "
+                "event as it finishes. Runs in a new session that is closed afterwards, unless "
+                "session_id is given."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "urls": {
+                        "type": "array",
+                        "description": "URLs to load, or objects with 'url' and their own 'extract'",
+                        "items": {
+                            "oneOf": [
+                                {"type": "string"},
+                                {
+                                    "type": "object",
+                                    "properties": {
+                                        "url": {"type": "string"},
+                                        "extract": {
+                                            "type": "object",
+                                            "description": "Replaces the job's extract for this URL"
+                                        }
+                                    },
+                                    "required": ["url"]
+                                }
+                            ]
+                        }
+                    },
+                    "extract": {
+                        "type": "object",
+                        "description": "What to extract from each loaded page; by default its title",
+                        "properties": {
+                            "title": {"type": "boolean", "description": "The page title"},
+                            "text": {
+                                "type": "string",
+                                "description": "innerText of the first element matching this selector"
+                            },
+                            "js": {
+                                "type": "string",
+                                "description": "A JS expression evaluated in the page, returned as 'value'"
+                            }
+                        }
+                    },
+                    "concurrency": {
+                        "type": "integer",
+                        "description": "Pages loading at once",
+                        "default": 8,
+                        "minimum": 1,
+                        "maximum": 32
+                    },
+                    "per_domain": {
+                        "type": "integer",
+                        "description": "Loads in flight per domain",
+                        "default": 2,
+                        "minimum": 1,
+                        "maximum": 32
+                    },
+                    "retries": {
+                        "type": "integer",
+                        "description": "Further attempts after a failed or 5xx load, with backoff",
+                        "default": 1,
+                        "minimum": 0,
+                        "maximum": 5
+                    },
+                    "wait_until": {
+                        "type": "string",
+                        "description": "When a page counts as loaded, as for navigate",
+                        "enum": ["ready", "load", "domcontentloaded", "networkidle"]
+                    },
+                    "timeout_ms": {
+                        "type": "number",
+                        "description": "Navigation timeout per attempt; with 'ready', for loading to DOMContentLoaded",
+                        "default": 30000
+                    },
+                    "session_id": {
+                        "type": "string",
+                        "description": "Session to open the pages in; by default a new one is used"
+                    },
+                    "resource_policy": {
+                        "description": "Resource policy for the session, as for navigate",
+                        "oneOf": [
+                            {"type": "string", "enum": ["none", "assets", "trackers", "lean"]},
+                            {"type": "object"}
+                        ]
+                    }
+                },
+                "required": ["urls"]
+            }
+        ),
         Tool(
             name="execute-js",
             description=(
@@ -294,15 +475,21 @@ def get_tool_definitions() -> list[Tool]:
                     },
                     "path": {
                         "type": "string",
-                        "description": "Path to save screenshot file"
+                        "description": "Optional absolute path to save the screenshot file. "
+                                       "When omitted the image is returned directly"
                     },
                     "full_page": {
                         "type": "boolean",
                         "description": "Whether to take full page screenshot",
                         "default": False
+                    },
+                    "return_image": {
+                        "type": "boolean",
+                        "description": "Also return the image when saving it to path",
+                        "default": False
                     }
                 },
-                "required": ["page_id", "path"]
+                "required": ["page_id"]
             }
         ),
         Tool(
@@ -366,5 +553,230 @@ def get_tool_definitions() -> list[Tool]:
                 },
                 "required": ["page_id", "query"]
             }
+        ),
+        Tool(
+            name="batch",
+            description=(
+                "Run several browser daemon commands in order in a single round trip and return all of "
+                "their results. Steps use the daemon command names and arguments (e.g. 'navigate', "
+                "'search-dom', 'interact-dom', 'screenshot' with 'save_path'). A string argument of the "
+                "form '$<step>.<key>' is replaced with a value from an earlier step's result, e.g. "
+                "'$0.page_id' or '$prev.session_id'."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "steps": {
+                        "type": "array",
+                        "description": "Ordered list of commands to run",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "command": {
+                                    "type": "string",
+                                    "description": "Daemon command name"
+                                },
+                                "args": {
+                                    "type": "object",
+                                    "description": "Arguments for the command"
+                                }
+                            },
+                            "required": ["command"]
+                        }
+                    },
+                    "on_error": {
+                        "type": "string",
+                        "description": (
+                            "'stop' to skip the remaining steps after a failure, "
+                            "'continue' to run every step regardless"
+                        ),
+                        "enum": ["stop", "continue"],
+                        "default": "stop"
+                    }
+                },
+                "required": ["steps"]
+            }
+        ),
+        Tool(
+            name="crawl",
+            description=(
+                "Start a background job crawling outwards from seed URLs: pages are fetched best first "
+                "(shallowest by default), each URL once after normalization, within a page budget, a "
+                "link depth and a per-domain rate limit. Every page becomes a JSON line (URL, status, "
+                "depth, parent, extracted values, links) in the returned 'output' file. Returns a job_id "
+                "for crawl-status and cancel-crawl; progress is also published as 'job.progress' events."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "seeds": {
+                        "type": "array",
+                        "description": "URLs to start from",
+                        "items": {"type": "string"}
+                    },
+                    "max_pages": {
+                        "type": "integer",
+                        "description": "Page budget: most pages fetched",
+                        "default": 100,
+                        "minimum": 1,
+                        "maximum": 100000
+                    },
+                    "max_depth": {
+                        "type": "integer",
+                        "description": "Most links followed from a seed; 0 fetches only the seeds",
+                        "default": 2,
+                        "minimum": 0,
+                        "maximum": 20
+                    },
+                    "scope": {
+                        "type": "string",
+                        "description": (
+                            "Links to follow: on the seeds' hosts, also on their subdomains ('domain'), "
+                            "or anywhere"
+                        ),
+                        "enum": ["host", "domain", "any"],
+                        "default": "host"
+                    },
+                    "include": {
+                        "type": "array",
+                        "description": "Only follow URLs matching one of these globs or substrings",
+                        "items": {"type": "string"}
+                    },
+                    "exclude": {
+                        "type": "array",
+                        "description": "Never follow URLs matching one of these globs or substrings",
+                        "items": {"type": "string"}
+                    },
+                    "rate": {
+                        "type": "number",
+                        "description": "Fetches per second per domain; 0 for no limit",
+                        "default": 1
+                    },
+                    "concurrency": {
+                        "type": "integer",
+                        "description": "Fetches in flight at once",
+                        "default": 4,
+                        "minimum": 1,
+                        "maximum": 32
+                    },
+                    "fetcher": {
+                        "type": "string",
+                        "description": (
+                            "'browser' loads pages in a new session; 'http' makes plain requests, much "
+                            "cheaper but blind to script-built links and only extracting titles"
+                        ),
+                        "enum": ["browser", "http"],
+                        "default": "browser"
+                    },
+                    "extract": {
+                        "type": "object",
+                        "description": "What to extract from each page, as for navigate-many; by default its title"
+                    },
+                    "wait_until": {
+                        "type": "string",
+                        "description": "When a page counts as loaded, for the browser fetcher, as for navigate",
+                        "enum": ["ready", "load", "domcontentloaded", "networkidle"]
+                    },
+                    "timeout_ms": {
+                        "type": "number",
+                        "description": "Timeout per fetch",
+                        "default": 30000
+                    },
+                    "resource_policy": {
+                        "description": "Resource policy for the browser fetcher's session, as for navigate",
+                        "oneOf": [
+                            {"type": "string", "enum": ["none", "assets", "trackers", "lean"]},
+                            {"type": "object"}
+                        ]
+                    }
+                },
+                "required": ["seeds"]
+            }
+        ),
+        Tool(
+            name="crawl-status",
+            description="Get a crawl job's status, progress and, once finished, its summary",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "job_id": {
+                        "type": "string",
+                        "description": "ID of the crawl job"
+                    },
+                    "wait": {
+                        "type": "boolean",
+                        "description": "Wait for the job to finish (up to 'timeout') before replying",
+                        "default": False
+                    },
+                    "timeout": {
+                        "type": "number",
+                        "description": "Seconds to wait when 'wait' is set (at most 300)",
+                        "default": 30
+                    }
+                },
+                "required": ["job_id"]
+            }
+        ),
+        Tool(
+            name="cancel-crawl",
+            description="Stop a running crawl job; the records written so far are kept",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "job_id": {
+                        "type": "string",
+                        "description": "ID of the crawl job"
+                    }
+                },
+                "required": ["job_id"]
+            }
+        ),
+        Tool(
+            name="save-storage",
+            description=(
+                "Save a browser session's storage state (cookies and localStorage) under a name, so "
+                "later sessions can start from it with navigate's 'storage' argument and skip logging in"
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "session_id": {
+                        "type": "string",
+                        "description": "Browser session to snapshot"
+                    },
+                    "name": {
+                        "type": "string",
+                        "description": "Snapshot name (letters, digits, '.', '_' and '-'); replaces any earlier one"
+                    },
+                    "ttl": {
+                        "type": "number",
+                        "description": "Seconds until the snapshot expires (defaults to the daemon's setting, one day)"
+                    }
+                },
+                "required": ["session_id", "name"]
+            }
+        ),
+        Tool(
+            name="list-storage",
+            description="List saved storage-state snapshots that have not expired",
+            inputSchema={
+                "type": "object",
+                "properties": {},
+                "additionalProperties": False
+            }
+        ),
+        Tool(
+            name="delete-storage",
+            description="Delete a saved storage-state snapshot",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "name": {
+                        "type": "string",
+                        "description": "Snapshot name"
+                    }
+                },
+                "required": ["name"]
+            }
         )
     ]
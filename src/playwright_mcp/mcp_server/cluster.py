@@ -0,0 +1,237 @@
+"""Several browser daemons, on this host or others, used as one pool.
+
+Set ``PLAYWRIGHT_MCP_NODES`` to a comma-separated list of ``name=address``
+pairs, e.g. ``a=tcp://10.0.0.5:9333,b=tcp://10.0.0.6:9333`` (an address may
+also be a Unix socket path). ``send_to_manager`` then sends each command to the
+node that owns its session, page or job: IDs handed to the MCP client are
+prefixed with the node name (``a:chromium_3.0``). Commands that start a new
+session go to the node reporting the least load in its ``stats``.
+
+Event subscriptions cover every node; a node that cannot be reached when the
+subscription is made is subscribed when it is next connected to.
+"""
+import asyncio
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from ..browser_daemon.core.client import DaemonClient
+from ..browser_daemon.core.protocol import ProtocolError
+from ..browser_daemon.core.routing import add_owner, find_ids, split_owner, strip_owner
+from ..utils.logging import setup_logging
+
+logger = setup_logging("cluster")
+
+NODES_ENV = "PLAYWRIGHT_MCP_NODES"
+
+# Seconds a node's reported load is trusted before it is asked again
+LOAD_TTL = 2.0
+STATS_TIMEOUT = 5.0
+
+# Load reported by a node that could not be reached
+UNREACHABLE = float("inf")
+
+# Commands that start a session when they name none, counted against a node's load
+SESSION_COMMANDS = {"navigate", "new-session", "navigate-many", "crawl"}
+
+
+def creates_session(command: str, args: Dict[str, Any]) -> bool:
+    """Whether a command with no session or page ID will start a new session."""
+    if command == "batch":
+        return any(isinstance(step, dict) and step.get("command") in SESSION_COMMANDS
+                   for step in args.get("steps") or [])
+    return command in SESSION_COMMANDS
+
+
+def parse_nodes(spec: str) -> Dict[str, str]:
+    """Parse ``name=address,...`` into {name: address}.
+
+    Raises:
+        ValueError: If an entry has no name or address, or a name repeats or contains ":"
+    """
+    nodes: Dict[str, str] = {}
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, address = entry.partition("=")
+        name, address = name.strip(), address.strip()
+        if not name or not address or ":" in name or name in nodes:
+            raise ValueError(f"Invalid node entry in {NODES_ENV}: {entry!r}")
+        nodes[name] = address
+    return nodes
+
+
+def node_load(stats: Dict[str, Any]) -> float:
+    """Load figure for placing new sessions: open sessions plus commands running or waiting.
+
+    A daemon running worker processes reports each worker; their loads are added up.
+    """
+    if "workers" in stats:
+        return sum(node_load(worker) for worker in stats["workers"].values())
+    if "error" in stats:
+        return UNREACHABLE
+    scheduler = stats.get("scheduler", {})
+    return stats.get("sessions", 0) + scheduler.get("running", 0) + scheduler.get("queued", 0)
+
+
+class Node:
+    """One daemon in the cluster and its last reported load."""
+
+    def __init__(self, name: str, address: str):
+        self.name = name
+        self.client = DaemonClient(address)
+        self.load = 0.0
+        self.load_at = 0.0
+
+    async def refresh_load(self):
+        try:
+            stats = await self.client.request("stats", {}, timeout=STATS_TIMEOUT)
+            self.load = node_load(stats)
+        except (OSError, asyncio.TimeoutError, ProtocolError) as e:
+            logger.warning(f"Browser daemon node {self.name} is unreachable: {e}")
+            self.load = UNREACHABLE
+        self.load_at = time.monotonic()
+
+
+class Cluster:
+    """Routes commands to the daemon nodes that own their browsers.
+
+    Also offers the event side of ``DaemonClient`` (``subscribe`` and event
+    listeners), covering every node, so the MCP event relay works unchanged.
+    """
+
+    def __init__(self, nodes: Dict[str, str]):
+        if not nodes:
+            raise ValueError("A cluster needs at least one node")
+        self.nodes = {name: Node(name, address) for name, address in nodes.items()}
+        self._event_listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self._subscribed = False
+        for node in self.nodes.values():
+            node.client.add_event_listener(self._relay(node))
+
+    @classmethod
+    def from_env(cls) -> Optional["Cluster"]:
+        """The cluster configured in ``PLAYWRIGHT_MCP_NODES``, or None if it is not set."""
+        spec = os.getenv(NODES_ENV, "")
+        return cls(parse_nodes(spec)) if spec.strip() else None
+
+    async def execute(self, command: str, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a command on the node that owns it, or the least loaded node for a new session.
+
+        Raises:
+            Exception: If the node cannot be reached
+        """
+        if command == "ping":
+            return await self._ping()
+        if command == "stats":
+            return await self.stats()
+        try:
+            node = await self.route(args, creates_session(command, args))
+            args = strip_owner(args, node.name)
+        except ValueError as e:
+            return {"error": str(e)}
+        try:
+            response = await node.client.request(command, args)
+        except (OSError, ProtocolError) as e:
+            node.load = UNREACHABLE
+            node.load_at = time.monotonic()
+            raise Exception(f"Browser daemon node {node.name} is unreachable: {e}")
+        return add_owner(response, node.name)
+
+    async def route(self, args: Dict[str, Any], new_session: bool = False) -> Node:
+        """Pick the node for a command from the IDs in its arguments.
+
+        A command naming no IDs goes to the least loaded node, which counts it
+        as one more session if ``new_session`` is set.
+
+        Raises:
+            ValueError: If the IDs have no node prefix, name an unknown node or more than one node
+        """
+        owners = set()
+        for key in find_ids(args):
+            owner, _ = split_owner(key)
+            if owner is None:
+                raise ValueError(f"{key} does not name a browser daemon node")
+            owners.add(owner)
+        if len(owners) > 1:
+            raise ValueError(f"Command refers to browsers on different nodes: {sorted(owners)}")
+        if owners:
+            name = owners.pop()
+            if name not in self.nodes:
+                raise ValueError(f"Unknown browser daemon node: {name}")
+            return self.nodes[name]
+        return await self.least_loaded(new_session)
+
+    async def least_loaded(self, new_session: bool = True) -> Node:
+        """The reachable node with the lowest reported load, refreshing stale reports first."""
+        now = time.monotonic()
+        stale = [node for node in self.nodes.values() if now - node.load_at > LOAD_TTL]
+        await asyncio.gather(*(node.refresh_load() for node in stale))
+        node = min(self.nodes.values(), key=lambda node: node.load)
+        if node.load == UNREACHABLE:
+            raise ValueError("No browser daemon node is reachable")
+        if new_session:
+            # Count the session we are about to place until the next report
+            node.load += 1
+        return node
+
+    async def stats(self) -> Dict[str, Any]:
+        """Each node's stats, by node name."""
+        async def node_stats(node: Node):
+            try:
+                return await node.client.request("stats", {}, timeout=STATS_TIMEOUT)
+            except (OSError, asyncio.TimeoutError, ProtocolError) as e:
+                return {"error": str(e)}
+        results = await asyncio.gather(*(node_stats(node) for node in self.nodes.values()))
+        return {"nodes": dict(zip(self.nodes, results))}
+
+    async def close(self):
+        """Close the connection to every node."""
+        await asyncio.gather(*(node.client.close() for node in self.nodes.values()))
+
+    async def _ping(self) -> Dict[str, Any]:
+        """Pong if any node answers."""
+        for node in self.nodes.values():
+            try:
+                reply = await node.client.request("ping", {}, timeout=STATS_TIMEOUT)
+            except (OSError, asyncio.TimeoutError, ProtocolError):
+                continue
+            if reply.get("result") == "pong":
+                return reply
+        return {"error": "No browser daemon node is reachable"}
+
+    # Event side, compatible with DaemonClient for the MCP event relay
+
+    @property
+    def connected(self) -> bool:
+        return any(node.client.connected for node in self.nodes.values())
+
+    @property
+    def subscribed(self) -> bool:
+        return self._subscribed
+
+    def add_event_listener(self, callback: Callable[[Dict[str, Any]], None]):
+        self._event_listeners.append(callback)
+
+    def remove_event_listener(self, callback: Callable[[Dict[str, Any]], None]):
+        if callback in self._event_listeners:
+            self._event_listeners.remove(callback)
+
+    async def subscribe(self, topics: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Subscribe to events on every reachable node."""
+        replies = {}
+        for node in self.nodes.values():
+            try:
+                replies[node.name] = await node.client.subscribe(topics)
+            except (OSError, asyncio.TimeoutError, ProtocolError) as e:
+                replies[node.name] = {"error": str(e)}
+        self._subscribed = True
+        return replies
+
+    def _relay(self, node: Node):
+        def relay(event: Dict[str, Any]):
+            event = {"event": event.get("event"), "data": add_owner(event.get("data") or {}, node.name)}
+            for callback in list(self._event_listeners):
+                try:
+                    callback(event)
+                except Exception as e:
+                    logger.error(f"Event listener failed: {e}")
+        return relay
@@ -0,0 +1,73 @@
+"""Relay browser daemon events to the MCP client as log notifications.
+
+Once a tool call has opened the shared daemon connection, the server subscribes
+to job, page, session and bulk navigation events on it and forwards each event to the client session as
+a ``notifications/message`` log entry from the ``browser_daemon`` logger. In
+inproc mode the relay listens on the in-process event bus instead.
+"""
+import asyncio
+from typing import Any, Dict, Optional
+
+from ..browser_daemon.core.client import DaemonClient
+from ..browser_daemon.core.events import EventBus
+from ..utils.logging import setup_logging
+
+logger = setup_logging("mcp_events")
+
+RELAYED_TOPICS = ["job", "page", "session", "bulk"]
+
+# Topics relayed at error level; everything else is info
+ERROR_TOPICS = {"page.crashed", "page.console"}
+
+
+class EventRelay:
+    """Forwards events from a daemon connection to one MCP session."""
+
+    def __init__(self, topics=None):
+        self.topics = topics or RELAYED_TOPICS
+        self._session = None
+        self._client: Optional[DaemonClient] = None
+        self._bus_token: Optional[int] = None
+        self._tasks = set()
+
+    async def attach(self, session, client: DaemonClient):
+        """Relay events from ``client`` to ``session``.
+
+        Does nothing until the client is connected, and is cheap to call again
+        once the relay is in place.
+        """
+        if session is None or not client.connected:
+            return
+        self._session = session
+        if self._client is not client:
+            if self._client is not None:
+                self._client.remove_event_listener(self._forward)
+            client.add_event_listener(self._forward)
+            self._client = client
+        if not client.subscribed:
+            reply = await client.subscribe(self.topics)
+            logger.debug(f"Subscribed to daemon events: {reply}")
+
+    def attach_bus(self, session, bus: EventBus):
+        """Relay events published on an in-process event bus to ``session``."""
+        if session is None:
+            return
+        self._session = session
+        if self._bus_token is None:
+            self._bus_token = bus.add_listener(self._forward, self.topics)
+
+    def _forward(self, event: Dict[str, Any]):
+        level = "error" if event.get("event") in ERROR_TOPICS else "info"
+        task = asyncio.create_task(self._send(level, event))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, level: str, event: Dict[str, Any]):
+        try:
+            await self._session.send_log_message(level=level, data=event, logger="browser_daemon")
+        except Exception as e:
+            logger.debug(f"Could not relay {event.get('event')} event: {e}")
+
+
+# Shared by every tool call of this server process
+event_relay = EventRelay()
@@ -2,6 +2,7 @@
 from .start_daemon import handle_start_daemon
 from .stop_daemon import handle_stop_daemon
 from .navigate import handle_navigate
+from .navigate_many import handle_navigate_many
 from .execute_js import handle_execute_js
 from .close_tab import handle_close_tab
 from .explore_dom import handle_explore_dom
@@ -11,6 +12,9 @@ from .screenshot import handle_screenshot
 from .highlight_element import handle_highlight_element
 from .ai_agent import handle_ai_agent
 from .ai_agent.get_result import handle_get_ai_result
+from .batch import handle_batch
+from .crawl import handle_cancel_crawl, handle_crawl, handle_crawl_status
+from .storage import handle_delete_storage, handle_list_storage, handle_save_storage
 
 
 # Map of tool names to their handlers
@@ -18,6 +22,7 @@ HANDLERS = {
     "start-daemon": handle_start_daemon,
     "stop-daemon": handle_stop_daemon,
     "navigate": handle_navigate,
+    "navigate-many": handle_navigate_many,
     "execute-js": handle_execute_js,
     "close-tab": handle_close_tab,
     "explore-dom": handle_explore_dom,
@@ -26,7 +31,14 @@ HANDLERS = {
     "screenshot": handle_screenshot,
     "highlight-element": handle_highlight_element,
     "ai-agent": handle_ai_agent,
-    "get-ai-result": handle_get_ai_result
+    "get-ai-result": handle_get_ai_result,
+    "batch": handle_batch,
+    "crawl": handle_crawl,
+    "crawl-status": handle_crawl_status,
+    "cancel-crawl": handle_cancel_crawl,
+    "save-storage": handle_save_storage,
+    "list-storage": handle_list_storage,
+    "delete-storage": handle_delete_storage
 }
 
 # Export HANDLERS as TOOL_HANDLERS for backward compatibility
@@ -0,0 +1,22 @@
+"""Handler for batch requests."""
+from typing import Dict
+from .utils import send_to_manager, logger, create_resource_response
+
+
+async def handle_batch(arguments: Dict) -> list:
+    """Handle batch tool by running several daemon commands in one round trip."""
+    logger.debug(f"Handling batch request with args: {arguments}")
+
+    steps = arguments.get("steps")
+    if not steps:
+        raise Exception("steps is required")
+
+    response = await send_to_manager("batch", {
+        "steps": steps,
+        "on_error": arguments.get("on_error", "stop")
+    })
+
+    if "error" in response:
+        raise Exception(f"Batch failed: {response['error']}")
+
+    return create_resource_response(response, resource_type="batch")
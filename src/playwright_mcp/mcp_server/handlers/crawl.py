@@ -0,0 +1,41 @@
+"""Handlers for starting, checking on and cancelling crawl jobs."""
+from typing import Dict
+from .utils import send_to_manager, logger, create_resource_response
+
+
+async def handle_crawl(arguments: Dict) -> list:
+    """Handle crawl tool: start a crawl job from seed URLs in the daemon."""
+    logger.debug(f"Handling crawl request with args: {arguments}")
+
+    if not arguments.get("seeds"):
+        raise Exception("seeds is required")
+
+    response = await send_to_manager("crawl", arguments)
+    if "error" in response:
+        raise Exception(f"Starting crawl failed: {response['error']}")
+
+    return create_resource_response(response, resource_type="crawl")
+
+
+async def handle_crawl_status(arguments: Dict) -> list:
+    """Handle crawl-status tool."""
+    if not arguments.get("job_id"):
+        raise Exception("job_id is required")
+
+    response = await send_to_manager("crawl-status", arguments)
+    if "error" in response and "status" not in response:
+        raise Exception(f"Getting crawl status failed: {response['error']}")
+
+    return create_resource_response(response, resource_type="crawl")
+
+
+async def handle_cancel_crawl(arguments: Dict) -> list:
+    """Handle cancel-crawl tool."""
+    if not arguments.get("job_id"):
+        raise Exception("job_id is required")
+
+    response = await send_to_manager("cancel-crawl", {"job_id": arguments["job_id"]})
+    if "error" in response and "status" not in response:
+        raise Exception(f"Cancelling crawl failed: {response['error']}")
+
+    return create_resource_response(response, resource_type="crawl")
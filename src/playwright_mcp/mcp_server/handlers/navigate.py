@@ -17,9 +17,13 @@ async def handle_navigate(arguments: dict) -> list:
         logger.error(f"Navigation failed: {response['error']}")
         raise Exception(f"Navigation failed: {response['error']}")
 
-    return create_resource_response({
+    result = {
         "session_id": response["session_id"],
         "page_id": response["page_id"],
         "created_session": response["created_session"],
         "created_page": response["created_page"]
-    }, resource_type="navigation") 
\ No newline at end of file
+    }
+    for key in ("readiness", "blocked", "http_cache", "har"):
+        if key in response:
+            result[key] = response[key]
+    return create_resource_response(result, resource_type="navigation")
@@ -0,0 +1,17 @@
+"""Handler for navigate-many requests."""
+from typing import Dict
+from .utils import send_to_manager, logger, create_resource_response
+
+
+async def handle_navigate_many(arguments: Dict) -> list:
+    """Handle navigate-many tool by loading a list of URLs concurrently in the daemon."""
+    logger.debug(f"Handling navigate-many request for {len(arguments.get('urls') or [])} URLs")
+
+    if not arguments.get("urls"):
+        raise Exception("urls is required")
+
+    response = await send_to_manager("navigate-many", arguments)
+    if "error" in response:
+        raise Exception(f"Bulk navigation failed: {response['error']}")
+
+    return create_resource_response(response, resource_type="navigation")
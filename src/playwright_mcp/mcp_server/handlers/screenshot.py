@@ -1,27 +1,43 @@
 """Handler for screenshot requests."""
+import base64
 from typing import Dict
+from mcp.types import ImageContent
 from .utils import send_to_manager, logger, create_response
 
 
 async def handle_screenshot(arguments: Dict) -> list:
-    """Handle screenshot tool."""
+    """Handle screenshot tool.
+
+    Without a path the image is returned as image content; the daemon hands it
+    over through shared memory, so nothing is written to disk.
+    """
     logger.debug(f"Handling screenshot request with args: {arguments}")
     
     # Get required arguments
     page_id = arguments.get("page_id")
     path = arguments.get("path")
+    return_image = arguments.get("return_image", False)
     
-    if not all([page_id, path]):
-        raise Exception("page_id and path are required")
+    if not page_id:
+        raise Exception("page_id is required")
     
     # Take screenshot
-    response = await send_to_manager("screenshot", {
+    request = {
         "page_id": page_id,
-        "save_path": path,
         "full_page": arguments.get("full_page", False)
-    })
+    }
+    if path:
+        request.update(save_path=path, return_data=return_image)
+    response = await send_to_manager("screenshot", request)
     
     if "error" in response:
         raise Exception(f"Error taking screenshot: {response['error']}")
     
-    return create_response(f"Screenshot saved to: {path}") 
\ No newline at end of file
+    content = create_response(f"Screenshot saved to: {path}") if path else []
+    if "data" in response:
+        content.append(ImageContent(
+            type="image",
+            data=base64.b64encode(response["data"]).decode("ascii"),
+            mimeType=response.get("mime_type", "image/png")
+        ))
+    return content
@@ -1,5 +1,4 @@
 from typing import Dict
-import asyncio
 from .utils import check_daemon_running, start_daemon, create_response
 
 
@@ -9,13 +8,6 @@ async def handle_start_daemon(arguments: Dict) -> list:
     if await check_daemon_running():
         return create_response("Browser daemon is already running")
         
-    # Start daemon
-    await start_daemon()
-    
-    # Wait for daemon to start (up to 5 seconds)
-    for _ in range(10):
-        if await check_daemon_running():
-            return create_response("Browser daemon started successfully")
-        await asyncio.sleep(0.5)
-        
-    raise Exception("Failed to start browser daemon: timeout waiting for daemon to start") 
\ No newline at end of file
+    # Start daemon; this returns once the daemon reports that it is listening
+    elapsed = await start_daemon()
+    return create_response(f"Browser daemon started successfully in {elapsed * 1000:.0f} ms")
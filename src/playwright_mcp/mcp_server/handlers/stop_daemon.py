@@ -3,11 +3,26 @@ import asyncio
 import os
 import signal
 import subprocess
-from .utils import create_response
+from .utils import create_response, close_daemon_client, get_cluster, get_inproc_manager
 
 
 async def handle_stop_daemon(arguments: Dict) -> list:
     """Handle stop-daemon command by stopping the browser daemon if it's running."""
+    manager = get_inproc_manager()
+    if manager is not None:
+        # The daemon lives in this process; close its browsers but keep serving
+        await manager.session_manager.shutdown()
+        return create_response("Browser daemon runs in-process; closed all browser sessions")
+
+    cluster = get_cluster()
+    if cluster is not None:
+        # The nodes are managed elsewhere; only let go of our connections to them
+        await cluster.close()
+        return create_response("Browser daemons run as cluster nodes and were left running; disconnected from them")
+
+    # Drop our persistent connection so the next call reconnects to a fresh daemon
+    await close_daemon_client()
+
     # Find daemon process first
     result = subprocess.run(
         ["pgrep", "-f", "playwright_mcp.browser_daemon$"],
@@ -0,0 +1,38 @@
+"""Handlers for saving, listing and deleting storage-state snapshots."""
+from typing import Dict
+from .utils import send_to_manager, logger, create_resource_response
+
+
+async def handle_save_storage(arguments: Dict) -> list:
+    """Handle save-storage tool: snapshot a session's cookies and localStorage under a name."""
+    logger.debug(f"Handling save-storage request with args: {arguments}")
+
+    if not arguments.get("session_id") or not arguments.get("name"):
+        raise Exception("session_id and name are required")
+
+    response = await send_to_manager("save-storage", arguments)
+    if "error" in response:
+        raise Exception(f"Saving storage failed: {response['error']}")
+
+    return create_resource_response(response, resource_type="storage")
+
+
+async def handle_list_storage(arguments: Dict) -> list:
+    """Handle list-storage tool."""
+    response = await send_to_manager("list-storage", {})
+    if "error" in response:
+        raise Exception(f"Listing storage failed: {response['error']}")
+
+    return create_resource_response(response, resource_type="storage")
+
+
+async def handle_delete_storage(arguments: Dict) -> list:
+    """Handle delete-storage tool."""
+    if not arguments.get("name"):
+        raise Exception("name is required")
+
+    response = await send_to_manager("delete-storage", {"name": arguments["name"]})
+    if "error" in response:
+        raise Exception(f"Deleting storage failed: {response['error']}")
+
+    return create_resource_response(response, resource_type="storage")
@@ -6,7 +6,8 @@ This module provides core utilities for:
 3. MCP-compliant response formatting
 
 The browser daemon is a long-running process that manages browser instances and
-handles browser automation commands. Communication happens over a Unix domain socket.
+handles browser automation commands. Communication happens over a single persistent
+Unix domain socket connection that carries many concurrent requests.
 
 Example:
     ```python
@@ -24,12 +25,18 @@ Example:
 """
 
 import asyncio
+import base64
 import json
 import os
 import sys
-from typing import Dict, Any
+import time
+from typing import Dict, Any, Optional
 from playwright.async_api import Page
 from mcp.types import TextContent, EmbeddedResource, TextResourceContents
+from ...browser_daemon.core.client import DaemonClient
+from ...browser_daemon.core.protocol import ENCODING_JSON, ProtocolError
+from ...browser_daemon.core.readiness import READY_FD_ENV, wait_until_ready
+from ..cluster import Cluster
 from ...utils.logging import setup_logging
 
 
@@ -39,6 +46,21 @@ logger = setup_logging("handler_utils")
 # Store page instances
 _page_instances: Dict[str, Page] = {}
 
+# Seconds to wait for a newly launched daemon to start listening
+DAEMON_START_TIMEOUT = 30
+
+# Shared connection to the browser daemon, opened on first use
+_daemon_client: Optional[DaemonClient] = None
+
+# Browser manager running inside this process (--mode inproc). When set, commands
+# are dispatched to it directly instead of going over the socket.
+_inproc_manager = None
+
+# Remote daemon nodes (PLAYWRIGHT_MCP_NODES), loaded on first use. When configured,
+# commands are routed to the node that owns their session instead of the local daemon.
+_cluster: Optional[Cluster] = None
+_cluster_loaded = False
+
 
 def get_page(page_id: str) -> Page:
     """Get a Playwright page instance by its ID.
@@ -80,6 +102,12 @@ async def check_daemon_running() -> bool:
         This function handles its own exceptions and always returns a boolean.
         Failed connections, timeouts, etc. all result in False.
     """
+    if _inproc_manager is not None:
+        return True
+    cluster = get_cluster()
+    if cluster is not None:
+        return "error" not in await cluster.execute("ping", {})
+
     socket_path = os.path.join(os.getenv('TMPDIR', '/tmp'), 'playwright_mcp.sock')
     logger.debug(f"Checking if daemon is running at socket: {socket_path}")
     
@@ -88,27 +116,33 @@ async def check_daemon_running() -> bool:
         logger.debug("Socket file does not exist")
         return False
         
+    # Use a throwaway connection so a stale shared connection cannot mask the result
+    client = DaemonClient(socket_path, encodings=[ENCODING_JSON])
     try:
         logger.debug("Socket exists, attempting to connect...")
-        reader, writer = await asyncio.open_unix_connection(socket_path)
-        writer.write(json.dumps({"command": "ping"}).encode() + b'\n')
-        await writer.drain()
-        
-        response = await reader.readline()
-        writer.close()
-        await writer.wait_closed()
-        
-        response_data = json.loads(response.decode())
+        response_data = await client.request("ping", {}, timeout=5)
         is_running = response_data.get("result") == "pong"
         logger.debug(f"Daemon running check result: {is_running}")
         return is_running
-    except (OSError, asyncio.TimeoutError, json.JSONDecodeError) as e:
+    except (OSError, asyncio.TimeoutError, ProtocolError, ValueError) as e:
         logger.debug(f"Error checking if daemon running: {e}")
         return False
+    finally:
+        await client.close()
 
 
-async def start_daemon() -> None:
-    """Start the browser daemon if it's not running."""
+async def start_daemon() -> float:
+    """Start the browser daemon and wait until it accepts connections.
+    
+    The daemon signals readiness over an inherited pipe as soon as its socket
+    is listening, so there is no fixed sleep or polling.
+    
+    Returns:
+        float: Seconds from launching the process until it was ready
+        
+    Raises:
+        Exception: If the daemon exits or does not become ready in time
+    """
     logger.info("Starting browser daemon...")
     
     # Get the project root directory
@@ -144,45 +178,53 @@ async def start_daemon() -> None:
     debug_log = open(os.path.join(logs_dir, 'debug.log'), 'a', buffering=1)  # Line buffered
     error_log = open(os.path.join(logs_dir, 'error.log'), 'a', buffering=1)  # Line buffered
     
+    read_fd, write_fd = os.pipe()
+    env[READY_FD_ENV] = str(write_fd)
     try:
-        # Start process with file descriptors for logs
-        process = await asyncio.create_subprocess_exec(
-            sys.executable,
-            '-m',
-            'playwright_mcp.browser_daemon',
-            stdout=debug_log.fileno(),
-            stderr=error_log.fileno(),
-            env=env,
-            cwd=project_root
-        )
+        # Start process with file descriptors for logs, handing it the write end
+        # of the readiness pipe
+        started = time.monotonic()
+        try:
+            process = await asyncio.create_subprocess_exec(
+                sys.executable,
+                '-m',
+                'playwright_mcp.browser_daemon',
+                stdout=debug_log.fileno(),
+                stderr=error_log.fileno(),
+                env=env,
+                cwd=project_root,
+                pass_fds=(write_fd,)
+            )
+        finally:
+            # Only the daemon may hold the write end, so the pipe closes if it dies
+            os.close(write_fd)
         
         logger.info("Daemon start command issued")
         
-        # Give the process a moment to start
-        await asyncio.sleep(1)
+        # Wait for the daemon to report that its socket is listening
+        ready_fd, read_fd = read_fd, None
+        try:
+            ready = await wait_until_ready(ready_fd, DAEMON_START_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise Exception(f"Daemon did not become ready within {DAEMON_START_TIMEOUT} seconds")
         
-        # Verify the process is still running
-        if process.returncode is not None:
-            raise Exception(f"Daemon process exited immediately with code {process.returncode}")
-            
-        # Wait for the socket to become available (up to 5 seconds)
-        socket_path = os.path.join(os.getenv('TMPDIR', '/tmp'), 'playwright_mcp.sock')
-        for _ in range(10):
-            if os.path.exists(socket_path):
-                # Verify we can connect
-                if await check_daemon_running():
-                    logger.info("Daemon started successfully")
-                    debug_log.flush()  # Ensure logs are written
-                    error_log.flush()
-                    return
-            await asyncio.sleep(0.5)
-            
-        raise Exception("Daemon started but socket connection could not be established")
+        if not ready:
+            try:
+                returncode = await asyncio.wait_for(process.wait(), 1)
+            except asyncio.TimeoutError:
+                raise Exception("Daemon closed its readiness pipe without signalling readiness")
+            raise Exception(f"Daemon process exited during startup with code {returncode}")
+        
+        elapsed = time.monotonic() - started
+        logger.info(f"Daemon started successfully in {elapsed * 1000:.0f} ms")
+        return elapsed
             
     except Exception as e:
         logger.error(f"Error starting daemon: {str(e)}")
         raise Exception(f"Failed to start daemon: {str(e)}")
     finally:
+        if read_fd is not None:
+            os.close(read_fd)
         # Flush and close log files
         debug_log.flush()
         error_log.flush()
@@ -190,11 +232,65 @@ async def start_daemon() -> None:
         error_log.close()
 
 
+def set_inproc_manager(manager) -> None:
+    """Run commands on a BrowserManager in this process, or go back to the daemon socket if None.
+    
+    Args:
+        manager: The in-process BrowserManager, or None
+    """
+    global _inproc_manager
+    _inproc_manager = manager
+
+
+def get_inproc_manager():
+    """Get the in-process BrowserManager, if the server runs in inproc mode."""
+    return _inproc_manager
+
+
+def get_cluster() -> Optional[Cluster]:
+    """Get the cluster of daemon nodes configured in PLAYWRIGHT_MCP_NODES, if any."""
+    global _cluster, _cluster_loaded
+    if not _cluster_loaded:
+        _cluster = Cluster.from_env()
+        _cluster_loaded = True
+    return _cluster
+
+
+def set_cluster(cluster: Optional[Cluster]) -> None:
+    """Route commands to the nodes of ``cluster``, or to the local daemon if None."""
+    global _cluster, _cluster_loaded
+    _cluster = cluster
+    _cluster_loaded = True
+
+
+def get_daemon_client() -> DaemonClient:
+    """Get the process-wide connection to the browser daemon.
+    
+    Returns:
+        DaemonClient: The shared client, created on first use
+    """
+    global _daemon_client
+    socket_path = os.path.join(os.getenv('TMPDIR', '/tmp'), 'playwright_mcp.sock')
+    if _daemon_client is None or _daemon_client.socket_path != socket_path:
+        _daemon_client = DaemonClient(socket_path)
+    return _daemon_client
+
+
+async def close_daemon_client() -> None:
+    """Close the shared daemon connection, if one is open."""
+    global _daemon_client
+    if _daemon_client is not None:
+        await _daemon_client.close()
+        _daemon_client = None
+
+
 async def send_to_manager(command: str, args: dict) -> dict:
     """Send a command to the browser manager service.
     
-    Establishes a connection to the browser daemon's Unix domain socket and sends
-    a JSON-encoded command with arguments. Waits for and parses the response.
+    Sends a JSON-encoded command with arguments over the shared persistent
+    connection to the browser daemon and waits for the matching reply. Many
+    commands can be in flight at once; replies are matched by request id and
+    arrive as length-prefixed frames, so large results are never truncated.
     
     Args:
         command: The command name to execute
@@ -208,24 +304,35 @@ async def send_to_manager(command: str, args: dict) -> dict:
         ValueError: If daemon returns an error response
         
     Note:
-        The connection is closed after receiving the response. For long-running
-        operations, the daemon maintains state independently of this connection.
+        The connection is kept open between calls and re-opened if the daemon
+        restarts. For long-running operations, the daemon maintains state
+        independently of this connection.
+        
+        In inproc mode the command is run on the in-process manager instead,
+        with no serialization or socket hop. With a cluster of daemon nodes
+        configured it goes to the node that owns its session, page or job.
     """
-    socket_path = os.path.join(os.getenv('TMPDIR', '/tmp'), 'playwright_mcp.sock')
-    logger.info(f"Attempting to connect to browser manager at {socket_path}")
+    if _inproc_manager is not None:
+        logger.debug(f"Running {command} in-process")
+        # Copy, as the socket path would, so handlers cannot mutate the caller's args
+        return await _inproc_manager.execute(command, dict(args))
+
+    cluster = get_cluster()
+    if cluster is not None:
+        logger.info(f"Sending {command} to the browser daemon cluster")
+        return await cluster.execute(command, args)
+
+    client = get_daemon_client()
+    socket_path = client.socket_path
+    logger.info(f"Sending {command} to browser manager at {socket_path}")
 
     # Check if socket exists first
     if not os.path.exists(socket_path):
         raise Exception("Browser daemon is not running. Please call the 'start-daemon' tool first.")
 
     try:
-        logger.debug("Attempting to connect to browser manager")
-        logger.debug(f"Socket path: {socket_path}")
-        logger.debug(f"Socket exists: {os.path.exists(socket_path)}")
-        
         try:
-            reader, writer = await asyncio.open_unix_connection(socket_path)
-            logger.debug("Connected to browser manager")
+            await client.connect()
         except ConnectionRefusedError as e:
             logger.error(f"Connection refused to socket {socket_path}. Socket file exists but no process is listening.")
             raise Exception(f"Browser daemon socket exists but is not accepting connections: {e}")
@@ -236,30 +343,10 @@ async def send_to_manager(command: str, args: dict) -> dict:
             logger.error(f"OS error connecting to socket {socket_path}: {e}")
             raise Exception(f"Failed to connect to browser daemon socket: {e}")
 
-        # Send request with delimiter
-        request = {"command": command, "args": args}
-        logger.debug(f"Sending request: {request}")
-        writer.write(json.dumps(request).encode() + b'\n')
-        await writer.drain()
-
-        # Read response with a large buffer size
-        response = await reader.read(1024 * 1024)  # 1MB buffer
-        if b'\n' in response:
-            response = response.split(b'\n')[0]  # Take everything up to first newline
-            
-        writer.close()
-        await writer.wait_closed()
-
-        # Parse response
-        try:
-            logger.debug(f"Received raw response: {response}")
-            response_text = response.decode()
-            logger.debug(f"Received response: {response_text}")
-            return json.loads(response_text)
-        except json.JSONDecodeError:
-            # Try to fix Python-style single quotes
-            response_text = response_text.replace("'", '"')
-            return json.loads(response_text)
+        logger.debug(f"Sending request: {command} {args}")
+        response = await client.request(command, args)
+        logger.debug(f"Received response: {response}")
+        return response
 
     except Exception as e:
         logger.error(f"Error sending command to browser manager: {e}")
@@ -301,6 +388,13 @@ def create_resource_response(data: dict, resource_type: str = "result") -> list:
         type="resource",
         resource=TextResourceContents(
             uri=f"mcp://{resource_type}",
-            text=json.dumps(data)
+            text=json.dumps(data, default=_json_default)
         )
     )]
+
+
+def _json_default(value):
+    """Encode raw bytes in resources, e.g. a batch's screenshot data, as base64."""
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return base64.b64encode(value).decode("ascii")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -5,6 +5,8 @@ import mcp.types as types
 from mcp.server.stdio import stdio_server
 from ..browser_daemon.tools.definitions import get_tool_definitions
 from .handlers import TOOL_HANDLERS
+from .handlers.utils import get_cluster, get_daemon_client, get_inproc_manager
+from .events import event_relay
 from ..utils.logging import setup_logging
 from ..browser_daemon.core.session import session_manager
 import asyncio
@@ -225,9 +227,26 @@ async def handle_call_tool(
 
     result = await TOOL_HANDLERS[name](arguments or {})
     logger.debug(f"result before return: {result}")
+    await relay_daemon_events()
     return result
 
 
+async def relay_daemon_events():
+    """Forward daemon events to the calling session once the daemon connection is open."""
+    try:
+        session = server.request_context.session
+    except LookupError:
+        return  # Not called from within an MCP request
+    manager = get_inproc_manager()
+    if manager is not None:
+        event_relay.attach_bus(session, manager.event_bus)
+        return
+    try:
+        await event_relay.attach(session, get_cluster() or get_daemon_client())
+    except Exception as e:
+        logger.debug(f"Could not subscribe to daemon events: {e}")
+
+
 async def start_server():
     """Start the server with stdio transport."""
     logger.info("Starting MCP server initialization...")  # More explicit about MCP server
@@ -25,6 +25,21 @@ def _sanitize_filename(filename: str) -> str:
     return sanitized or 'app.log'
 
 
+class DeferredFileHandler(logging.FileHandler):
+    """File handler that creates its directory and opens the file on the first record.
+
+    Loggers are set up at import time in nearly every module; deferring the
+    filesystem work keeps it off the startup path.
+    """
+
+    def __init__(self, filename, mode: str = "a", encoding=None):
+        super().__init__(filename, mode=mode, encoding=encoding, delay=True)
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+
 def setup_logging(name: str, log_file: str = "app.log") -> logging.Logger:
     """Set up logging configuration.
     
@@ -35,9 +50,8 @@ def setup_logging(name: str, log_file: str = "app.log") -> logging.Logger:
     Returns:
         Configured logger instance
     """
-    # Create logs directory if it doesn't exist
+    # Log files go in ./logs, created when the first record is written
     log_dir = Path("logs")
-    log_dir.mkdir(exist_ok=True)
     
     # Configure logging
     logger = logging.getLogger(name)
@@ -48,7 +62,7 @@ def setup_logging(name: str, log_file: str = "app.log") -> logging.Logger:
 
     # Sanitize and use the provided log filename
     safe_filename = _sanitize_filename(log_file)
-    file_handler = logging.FileHandler(log_dir / safe_filename)
+    file_handler = DeferredFileHandler(log_dir / safe_filename)
     file_handler.setLevel(logging.DEBUG)  # Capture all levels, filtering happens at logger level
     formatter = logging.Formatter(
         '%(asctime)s - %(name)s - %(levelname)s - %(message)s\n%(pathname)s:%(lineno)d'
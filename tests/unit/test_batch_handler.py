@@ -0,0 +1,149 @@
+import base64
+import json
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from playwright_mcp.browser_daemon.handlers.batch import BatchHandler
+from playwright_mcp.browser_daemon.core.session import SessionManager
+from playwright_mcp.mcp_server.handlers import batch
+
+
+@pytest.fixture
+def dispatch():
+    """Fake daemon dispatch that records calls."""
+    async def fake_dispatch(command, args):
+        if command == "navigate":
+            return {"session_id": "chromium_1", "page_id": "page_1", "created_session": True}
+        if command == "fail":
+            return {"error": "boom"}
+        if command == "raise":
+            raise RuntimeError("exploded")
+        return {"success": True, "args": args}
+    return AsyncMock(side_effect=fake_dispatch)
+
+
+@pytest.fixture
+def batch_handler(dispatch):
+    """Create a batch handler instance."""
+    return BatchHandler(MagicMock(spec=SessionManager), dispatch)
+
+
+@pytest.mark.asyncio
+async def test_handle_unknown_command(batch_handler):
+    """Test handling unknown command."""
+    result = await batch_handler.handle({"command": "unknown"})
+    assert "Unknown batch command" in result["error"]
+
+
+@pytest.mark.asyncio
+async def test_batch_missing_steps(batch_handler):
+    """Test batch without steps."""
+    result = await batch_handler.handle({"command": "batch"})
+    assert "Missing required arguments" in result["error"]
+
+
+@pytest.mark.asyncio
+async def test_batch_invalid_on_error(batch_handler):
+    """Test batch with an unknown on_error mode."""
+    result = await batch_handler.handle({"command": "batch", "steps": [], "on_error": "retry"})
+    assert "Invalid on_error" in result["error"]
+
+
+@pytest.mark.asyncio
+async def test_batch_runs_steps_in_order(batch_handler, dispatch):
+    """Test that all steps run in order and results are returned together."""
+    result = await batch_handler.handle({
+        "command": "batch",
+        "steps": [
+            {"command": "navigate", "args": {"url": "https://example.com"}},
+            {"command": "search-dom", "args": {"page_id": "$0.page_id", "search_text": "x"}},
+            {"command": "screenshot", "args": {"page_id": "$prev.args.page_id", "save_path": "/tmp/a.png"}},
+        ]
+    })
+
+    assert [call.args[0] for call in dispatch.await_args_list] == ["navigate", "search-dom", "screenshot"]
+    assert result["completed"] == 3
+    assert result["failed"] == 0
+    assert [step["status"] for step in result["results"]] == ["ok", "ok", "ok"]
+    assert dispatch.await_args_list[1].args[1]["page_id"] == "page_1"
+    assert dispatch.await_args_list[2].args[1]["page_id"] == "page_1"
+
+
+@pytest.mark.asyncio
+async def test_batch_stops_on_error(batch_handler, dispatch):
+    """Test that remaining steps are skipped after a failure by default."""
+    result = await batch_handler.handle({
+        "command": "batch",
+        "steps": [
+            {"command": "navigate", "args": {"url": "https://example.com"}},
+            {"command": "fail"},
+            {"command": "close-tab", "args": {"page_id": "$0.page_id"}},
+        ]
+    })
+
+    assert dispatch.await_count == 2
+    assert [step["status"] for step in result["results"]] == ["ok", "error", "skipped"]
+    assert result["results"][1]["result"] == {"error": "boom"}
+    assert (result["completed"], result["failed"], result["skipped"]) == (1, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_batch_continues_on_error(batch_handler, dispatch):
+    """Test that continue mode runs every step and reports each failure."""
+    result = await batch_handler.handle({
+        "command": "batch",
+        "on_error": "continue",
+        "steps": [
+            {"command": "raise"},
+            {"command": "fail"},
+            {"command": "close-tab", "args": {"page_id": "p"}},
+        ]
+    })
+
+    assert dispatch.await_count == 3
+    assert [step["status"] for step in result["results"]] == ["error", "error", "ok"]
+    assert result["results"][0]["result"] == {"error": "exploded"}
+    assert (result["completed"], result["failed"], result["skipped"]) == (1, 2, 0)
+
+
+@pytest.mark.asyncio
+async def test_batch_reference_to_failed_step(batch_handler, dispatch):
+    """Test that a reference to a failed step fails that step without dispatching it."""
+    result = await batch_handler.handle({
+        "command": "batch",
+        "on_error": "continue",
+        "steps": [
+            {"command": "fail"},
+            {"command": "close-tab", "args": {"page_id": "$0.page_id"}},
+            {"command": "close-tab", "args": {"page_id": "$5.page_id"}},
+        ]
+    })
+
+    assert dispatch.await_count == 1
+    assert "failed" in result["results"][1]["result"]["error"]
+    assert "has not run" in result["results"][2]["result"]["error"]
+
+
+@pytest.mark.asyncio
+async def test_batch_rejects_nested_batch(batch_handler, dispatch):
+    """Test that a batch cannot contain another batch."""
+    result = await batch_handler.handle({
+        "command": "batch",
+        "steps": [{"command": "batch", "args": {"steps": []}}]
+    })
+
+    dispatch.assert_not_awaited()
+    assert "Nested batch" in result["results"][0]["result"]["error"]
+
+
+@pytest.mark.asyncio
+async def test_mcp_batch_returns_screenshot_data_as_base64(monkeypatch):
+    """A batch ending in a screenshot without save_path carries raw bytes, sent as base64."""
+    response = {"results": [{"page_id": "page_1"}, {"data": b"\x89PNG\r\n", "mime_type": "image/png"}]}
+    monkeypatch.setattr(batch, "send_to_manager", AsyncMock(return_value=response))
+
+    content = await batch.handle_batch({"steps": [{"command": "navigate"}, {"command": "screenshot"}]})
+
+    results = json.loads(content[0].resource.text)["results"]
+    assert base64.b64decode(results[1]["data"]) == b"\x89PNG\r\n"
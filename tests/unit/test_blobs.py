@@ -0,0 +1,100 @@
+"""Tests for shared-memory transfer of large binary results."""
+import os
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from playwright_mcp.browser_daemon.core.blobs import SHM_KEY, SHM_MANIFEST_KEY, BlobStore, import_blobs, read_blob
+from playwright_mcp.browser_daemon.handlers.screenshot import ScreenshotHandler
+
+
+def segment_exists(name):
+    return os.path.exists(os.path.join("/dev/shm", name))
+
+
+@pytest.fixture
+def store():
+    store = BlobStore()
+    yield store
+    store.cleanup()
+
+
+def test_large_bytes_are_exported_and_read_back(store):
+    """Large values become handles; the client reads and unlinks the segment."""
+    data = os.urandom(store.threshold * 3)
+    exported = store.export({"success": True, "data": data, "nested": {"pdf": data}})
+
+    handle = exported["data"][SHM_KEY]
+    assert handle["size"] == len(data)
+    assert exported["success"] is True
+
+    restored = import_blobs(exported)
+    assert restored["data"] == data
+    assert restored["nested"]["pdf"] == data
+    assert not segment_exists(handle["name"])
+
+
+def test_bytes_in_lists_are_exported(store):
+    """Batch replies hold their steps' results in a list."""
+    data = os.urandom(store.threshold)
+    exported = store.export({"results": [{"page_id": "page_1"}, {"data": data}]})
+
+    assert exported[SHM_MANIFEST_KEY] == [exported["results"][1]["data"][SHM_KEY]["name"]]
+    assert import_blobs(exported) == {"results": [{"page_id": "page_1"}, {"data": data}]}
+
+
+def test_only_listed_segments_are_read(store):
+    """A handle-shaped value in page data does not make the client unlink that segment."""
+    victim = store.put(b"x" * store.threshold)
+    data = os.urandom(store.threshold)
+    # The page returns a handle to someone else's segment, and tries to list it too
+    exported = store.export({"result": victim, SHM_MANIFEST_KEY: [victim[SHM_KEY]["name"]], "data": data})
+
+    restored = import_blobs(exported)
+    assert restored["data"] == data
+    assert restored["result"] == victim and segment_exists(victim[SHM_KEY]["name"])
+    assert import_blobs({"result": victim}) == {"result": victim}
+    assert segment_exists(victim[SHM_KEY]["name"])
+
+
+def test_small_bytes_stay_inline(store):
+    """Values below the threshold are not worth a segment."""
+    data = b"x" * (store.threshold - 1)
+    assert store.export({"data": data}) == {"data": data}
+
+
+def test_uncollected_segments_are_reclaimed(store):
+    """Segments the client never read are unlinked once expired, or on cleanup."""
+    data = b"x" * store.threshold
+    expired = store.put(data)[SHM_KEY]["name"]
+    store.expire(max_age=0)
+    assert not segment_exists(expired)
+
+    leftover = store.put(data)[SHM_KEY]["name"]
+    store.expire()
+    assert segment_exists(leftover)
+    store.cleanup()
+    assert not segment_exists(leftover)
+
+
+def test_reading_a_reclaimed_blob_fails(store):
+    handle = store.put(b"x" * store.threshold)[SHM_KEY]
+    store.cleanup()
+    with pytest.raises(FileNotFoundError):
+        read_blob(handle)
+
+
+@pytest.mark.asyncio
+async def test_screenshot_without_path_returns_image_bytes():
+    """Without save_path nothing is written to disk and the PNG is returned."""
+    page = AsyncMock()
+    page.screenshot = AsyncMock(return_value=b"\x89PNG")
+    session_manager = MagicMock()
+    session_manager.get_page = MagicMock(return_value=page)
+
+    result = await ScreenshotHandler(session_manager).handle(
+        {"command": "screenshot", "page_id": "page", "full_page": True}
+    )
+
+    assert result == {"success": True, "data": b"\x89PNG", "mime_type": "image/png"}
+    page.screenshot.assert_awaited_once_with(full_page=True)
@@ -21,7 +21,6 @@ async def test_shutdown(mock_server_class):
     """Test shutdown of BrowserManager."""
     # Set up mocks
     mock_server = Mock()
-    mock_server.cleanup = AsyncMock()
     mock_server_class.return_value = mock_server
 
     mock_session_manager = Mock()
@@ -32,12 +31,17 @@ async def test_shutdown(mock_server_class):
     browser_manager.server = mock_server
     browser_manager.session_manager = mock_session_manager
 
-    # Call shutdown
+    # A manager that never listened (inproc mode) leaves the socket alone
+    await browser_manager.shutdown()
+    mock_session_manager.shutdown.assert_awaited_once()
+    mock_server.cleanup.assert_not_called()
+
+    # Call shutdown after the server was listening
+    browser_manager._on_listening()
     await browser_manager.shutdown()
 
     # Verify mocks were called
-    mock_session_manager.shutdown.assert_awaited_once()
-    mock_server.cleanup.assert_awaited_once()
+    mock_server.cleanup.assert_called_once()
 
 
 class TestInput:
@@ -70,11 +74,17 @@ async def test_daemon_parameter_handling():
     
     # Mock the server's read_command method
     class MockReader:
+        sent = False
+
         async def read(self):
             # This is what's happening in the real code - daemon is being passed in args
             return b'{"command": "test-handler", "args": {"value": "test", "daemon": "first_daemon"}}'
         
         async def readline(self):
+            # The connection stays open until the client closes it, so end after one command
+            if self.sent:
+                return b""
+            self.sent = True
             return await self.read()
     
     class MockWriter:
@@ -0,0 +1,149 @@
+"""Tests for bulk navigation (navigate-many)."""
+import asyncio
+from collections import Counter
+from unittest.mock import AsyncMock, MagicMock
+from urllib.parse import urlsplit
+
+import pytest
+
+from playwright_mcp.browser_daemon.core.events import event_bus
+from playwright_mcp.browser_daemon.core.session import SessionManager
+from playwright_mcp.browser_daemon.handlers import bulk
+from playwright_mcp.browser_daemon.handlers.bulk import BulkNavigationHandler
+
+
+class FakePage:
+    """A page whose loads take a moment, tracking how many run at once per domain."""
+
+    def __init__(self, site):
+        self.site = site
+        self.url = "about:blank"
+
+    async def goto(self, url, wait_until, timeout):
+        self.site.timeouts.append(timeout)
+        domain = urlsplit(url).hostname
+        self.site.active[domain] += 1
+        self.site.peak[domain] = max(self.site.peak[domain], self.site.active[domain])
+        self.site.pages.add(self)
+        try:
+            await asyncio.sleep(0.01)
+            self.site.requests[url] += 1
+            status = self.site.statuses.get(url, [200])
+            status = status[min(self.site.requests[url], len(status)) - 1]
+            if status is None:
+                raise TimeoutError(f"Timeout loading {url}")
+            self.url = url
+            return MagicMock(status=status)
+        finally:
+            self.site.active[domain] -= 1
+
+    async def title(self):
+        return f"Title of {self.url}"
+
+    async def evaluate(self, expression, arg=None):
+        if expression == "boom":
+            raise RuntimeError("ReferenceError: boom is not defined")
+        return arg and f"text of {arg}" or len(self.url)
+
+    def is_closed(self):
+        return False
+
+    def on(self, event, listener):
+        pass
+
+    def remove_listener(self, event, listener):
+        pass
+
+    async def wait_for_selector(self, selector, **options):
+        pass
+
+
+class FakeSite:
+    def __init__(self, statuses=None):
+        self.statuses = statuses or {}
+        self.active, self.peak, self.requests = Counter(), Counter(), Counter()
+        self.pages = set()
+        self.timeouts = []
+
+
+@pytest.fixture
+def manager():
+    manager = MagicMock(spec=SessionManager)
+    pages = {}
+
+    async def new_page(session_id):
+        page_id = f"page_{len(pages)}.0"
+        pages[page_id] = FakePage(manager.site)
+        return page_id
+    manager.get_session = MagicMock(return_value=None)
+    manager.launch_browser = AsyncMock(return_value="chromium_0.0")
+    manager.new_page = AsyncMock(side_effect=new_page)
+    manager.get_page = MagicMock(side_effect=pages.get)
+    manager.close_browser = AsyncMock(return_value=True)
+    manager.site = FakeSite()
+    return manager
+
+
+@pytest.mark.asyncio
+async def test_fans_out_with_per_domain_limits(manager):
+    urls = [f"https://{host}/{i}" for i in range(6) for host in ("a.test", "b.test", "c.test")]
+    events = []
+    token = event_bus.add_listener(events.append, ["bulk"])
+    try:
+        result = await BulkNavigationHandler(manager).handle({
+            "command": "navigate-many", "urls": urls, "concurrency": 6, "per_domain": 2, "wait_until": "load",
+            "extract": {"title": True, "text": "h1"},
+        })
+    finally:
+        event_bus.remove_listener(token)
+
+    assert result["succeeded"] == 18 and result["failed"] == 0
+    assert [r["url"] for r in result["results"]] == urls
+    first = result["results"][0]
+    assert first["title"] == "Title of https://a.test/0" and first["text"] == "text of h1"
+    assert first["http_status"] == 200 and set(first["timing"]) == {"navigate_ms", "extract_ms", "total_ms"}
+    assert max(manager.site.peak.values()) == 2
+    assert len(manager.site.pages) == 6
+    assert [e["data"]["done"] for e in events] == list(range(1, 19))
+    assert events[0]["event"] == "bulk.result" and events[0]["data"]["job_id"] == result["job_id"]
+    # The job's own session is closed afterwards
+    manager.close_browser.assert_awaited_once_with("chromium_0.0")
+
+
+@pytest.mark.asyncio
+async def test_retries_failed_loads(manager, monkeypatch):
+    monkeypatch.setattr(bulk, "RETRY_BACKOFF", 0)
+    manager.site.statuses = {"https://a.test/flaky": [503, 200], "https://a.test/down": [None]}
+
+    result = await BulkNavigationHandler(manager).handle({
+        "command": "navigate-many", "retries": 2, "wait_until": "load",
+        "urls": ["https://a.test/flaky", "https://a.test/down",
+                 {"url": "https://a.test/js", "extract": {"js": "boom"}}],
+    })
+
+    flaky, down, js = result["results"]
+    assert flaky["status"] == "ok" and flaky["attempts"] == 2
+    assert down["status"] == "error" and down["attempts"] == 3 and "Timeout" in down["error"]
+    # Extraction errors are not retried
+    assert js["status"] == "error" and js["attempts"] == 1 and "boom" in js["error"]
+    assert result["succeeded"] == 1 and result["failed"] == 2
+
+
+@pytest.mark.asyncio
+async def test_ready_loads_keep_the_navigation_timeout(manager):
+    result = await BulkNavigationHandler(manager).handle({
+        "command": "navigate-many", "urls": ["https://a.test/"], "wait_until": "ready",
+        "ready": {"selector": "main"}, "timeout_ms": 1234,
+    })
+
+    assert result["succeeded"] == 1
+    assert manager.site.timeouts == [1234]
+
+
+@pytest.mark.asyncio
+async def test_rejects_invalid_jobs(manager):
+    handler = BulkNavigationHandler(manager)
+    for args in [{"urls": []}, {"urls": [42]}, {"urls": ["https://a.test"], "concurrency": 0},
+                 {"urls": ["https://a.test"], "extract": {"xpath": "//h1"}}]:
+        assert "error" in await handler.handle({"command": "navigate-many", **args})
+    manager.launch_browser.assert_not_awaited()
@@ -0,0 +1,187 @@
+"""Tests for routing commands across a cluster of daemons on TCP ports."""
+import asyncio
+import socket
+from unittest.mock import AsyncMock
+
+import pytest
+
+from playwright_mcp.browser_daemon.browser_manager import BrowserManager
+from playwright_mcp.browser_daemon.core.client import DaemonClient
+from playwright_mcp.browser_daemon.core.protocol import parse_tcp_address
+from playwright_mcp.mcp_server.cluster import UNREACHABLE, Cluster, node_load, parse_nodes
+from playwright_mcp.mcp_server.handlers.utils import send_to_manager, set_cluster
+
+
+class FakeBrowserHandler:
+    """Answers like a daemon's handlers, recording what it was sent."""
+
+    def __init__(self, node):
+        self.node = node
+        self.calls = []
+
+    async def handle(self, args):
+        self.calls.append(dict(args))
+        if args["command"] == "navigate":
+            return {"session_id": "chromium_1", "page_id": "page_1", "node": self.node}
+        return {"success": True, "page_id": args.get("page_id")}
+
+
+async def start_daemon(name, load, token=None, monkeypatch=None):
+    if token:
+        monkeypatch.setenv("PLAYWRIGHT_MCP_TOKEN", token)
+    manager = BrowserManager("tcp://127.0.0.1:0")
+    if token:
+        monkeypatch.delenv("PLAYWRIGHT_MCP_TOKEN")
+    handler = FakeBrowserHandler(name)
+    manager.handlers = {"navigate": handler, "close-tab": handler}
+    manager.stats = AsyncMock(return_value={"sessions": load, "scheduler": {"running": 0, "queued": 0}})
+    task = asyncio.create_task(manager.server.start(manager.handle_connection))
+    while manager.server.port == 0:
+        await asyncio.sleep(0.01)
+    return manager, handler, task
+
+
+@pytest.fixture
+async def daemons():
+    started = {name: await start_daemon(name, load) for name, load in [("a", 5), ("b", 1), ("c", 3)]}
+    cluster = Cluster({name: f"tcp://127.0.0.1:{manager.server.port}" for name, (manager, _, _) in started.items()})
+    yield cluster, {name: handler for name, (_, handler, _) in started.items()}, started
+    set_cluster(None)
+    await cluster.close()
+    for _, _, task in started.values():
+        task.cancel()
+    await asyncio.gather(*(task for _, _, task in started.values()), return_exceptions=True)
+
+
+def test_parse_nodes():
+    assert parse_nodes("a=tcp://h1:9333, b=/tmp/b.sock") == {"a": "tcp://h1:9333", "b": "/tmp/b.sock"}
+    assert parse_tcp_address("tcp://10.0.0.5:9333") == ("10.0.0.5", 9333)
+    assert parse_tcp_address("/tmp/playwright_mcp.sock") is None
+    for spec in ["a", "a=x,a=y", "a:b=x"]:
+        with pytest.raises(ValueError):
+            parse_nodes(spec)
+
+
+def test_node_load_adds_up_workers():
+    worker = {"sessions": 2, "scheduler": {"running": 1, "queued": 1}}
+    assert node_load(worker) == 4
+    assert node_load({"workers": {"w0": worker, "w1": worker}}) == 8
+
+
+@pytest.mark.asyncio
+async def test_new_sessions_go_to_least_loaded_node_and_stay_there(daemons):
+    cluster, handlers, _ = daemons
+    set_cluster(cluster)
+
+    created = await send_to_manager("navigate", {"url": "https://example.com"})
+    assert created == {"session_id": "b:chromium_1", "page_id": "b:page_1", "node": "b"}
+
+    response = await send_to_manager("close-tab", {"page_id": created["page_id"]})
+    assert response == {"success": True, "page_id": "b:page_1"}
+    assert handlers["b"].calls[-1]["page_id"] == "page_1"
+    assert handlers["a"].calls == handlers["c"].calls == []
+
+    assert "error" in await send_to_manager("close-tab", {"page_id": "page_1"})
+    assert "error" in await send_to_manager("close-tab", {"page_id": "z:page_1"})
+
+
+@pytest.mark.asyncio
+async def test_unreachable_nodes_are_skipped(daemons):
+    cluster, handlers, started = daemons
+    manager, _, task = started["b"]
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+    created = await cluster.execute("navigate", {"url": "https://example.com"})
+
+    assert created["node"] == "c"
+    with pytest.raises(Exception, match="node b is unreachable"):
+        await cluster.execute("close-tab", {"page_id": "b:page_1"})
+
+
+@pytest.mark.asyncio
+async def test_events_carry_node_prefix(daemons):
+    cluster, _, started = daemons
+    received = []
+    cluster.add_event_listener(received.append)
+    await cluster.subscribe(["page"])
+
+    started["c"][0].event_bus.publish("page.closed", {"page_id": "page_1"})
+    for _ in range(100):
+        if received:
+            break
+        await asyncio.sleep(0.01)
+
+    # Every node is an in-process daemon on the same event bus, so each relays it
+    assert {"event": "page.closed", "data": {"page_id": "c:page_1"}} in received
+    assert len(received) == 3
+
+
+@pytest.mark.asyncio
+async def test_tcp_daemon_requires_token(monkeypatch):
+    manager, _, task = await start_daemon("t", 0, token="s3cret", monkeypatch=monkeypatch)
+    address = f"tcp://127.0.0.1:{manager.server.port}"
+    try:
+        with pytest.raises(PermissionError):
+            await DaemonClient(address, token="wrong").request("ping", {})
+
+        client = DaemonClient(address, token="s3cret")
+        assert await client.request("ping", {}) == {"result": "pong"}
+        assert not client.shared_memory
+        await client.close()
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+def test_tcp_daemon_off_loopback_needs_token(monkeypatch):
+    monkeypatch.delenv("PLAYWRIGHT_MCP_TOKEN", raising=False)
+    with pytest.raises(ValueError, match="PLAYWRIGHT_MCP_TOKEN"):
+        BrowserManager("tcp://0.0.0.0:9333")
+    assert BrowserManager("tcp://127.0.0.1:0").token is None
+
+    monkeypatch.setenv("PLAYWRIGHT_MCP_TOKEN", "s3cret")
+    assert BrowserManager("tcp://0.0.0.0:9333").token == "s3cret"
+
+
+@pytest.mark.asyncio
+async def test_only_new_sessions_count_against_node_load(daemons):
+    cluster, _, _ = daemons
+    await cluster.execute("close-tab", {})
+    assert cluster.nodes["b"].load == 1
+
+    await cluster.execute("navigate", {"url": "https://example.com"})
+    assert cluster.nodes["b"].load == 2
+
+
+@pytest.mark.asyncio
+async def test_node_down_at_subscribe_is_subscribed_on_reconnect():
+    with socket.socket() as reserved:
+        reserved.bind(("127.0.0.1", 0))
+        port = reserved.getsockname()[1]
+    cluster = Cluster({"a": f"tcp://127.0.0.1:{port}"})
+    received = []
+    cluster.add_event_listener(received.append)
+    replies = await cluster.subscribe(["page"])
+    assert "error" in replies["a"]
+
+    manager = BrowserManager(f"tcp://127.0.0.1:{port}")
+    manager.stats = AsyncMock(return_value={"sessions": 0})
+    task = asyncio.create_task(manager.server.start(manager.handle_connection))
+    try:
+        for _ in range(100):
+            await cluster.nodes["a"].refresh_load()
+            if cluster.nodes["a"].load != UNREACHABLE:
+                break
+            await asyncio.sleep(0.01)
+        assert cluster.nodes["a"].client.subscribed
+        manager.event_bus.publish("page.closed", {"page_id": "page_9"})
+        for _ in range(100):
+            if received:
+                break
+            await asyncio.sleep(0.01)
+        assert received == [{"event": "page.closed", "data": {"page_id": "a:page_9"}}]
+    finally:
+        await cluster.close()
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
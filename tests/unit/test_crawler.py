@@ -0,0 +1,157 @@
+"""Tests for the crawler, end to end against a local static site."""
+import functools
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock
+
+import pytest
+
+from playwright_mcp.browser_daemon.core.events import event_bus
+from playwright_mcp.browser_daemon.crawler import BloomFilter, Crawler, Frontier, HttpFetcher, JsonlStore
+from playwright_mcp.browser_daemon.crawler import normalize_url, seen_set
+from playwright_mcp.browser_daemon.crawler.seen import ExactSeen
+from playwright_mcp.browser_daemon.crawler.store import CRAWL_DIR_ENV, read_records
+from playwright_mcp.browser_daemon.handlers.crawl import CrawlHandler
+
+SITE = {
+    "index.html": '<title>Home</title><a href="a.html">A</a> <a href="b.html#top">B</a> '
+                  '<a href="./b.html?utm_source=mail">B again</a> <a href="missing.html">gone</a> '
+                  '<a href="http://other.test/">elsewhere</a> <a href="mailto:x@y.test">mail</a>',
+    "a.html": '<title>A</title><a href="/index.html">home</a> <a href="deep/c.html">C</a>',
+    "b.html": '<title>B</title><a href="/a.html">A</a>',
+    "deep/c.html": '<title>C</title><base href="/deep/"><a href="d.html">D</a>',
+    "deep/d.html": '<title>D</title>',
+}
+
+
+@pytest.fixture
+def site(tmp_path):
+    root = tmp_path / "site"
+    for name, html in SITE.items():
+        (root / name).parent.mkdir(parents=True, exist_ok=True)
+        (root / name).write_text(f"<html><body>{html}</body></html>")
+
+    class Handler(SimpleHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(Handler, directory=str(root)))
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_normalize_url():
+    same = [
+        "HTTP://Example.COM:80/a/./b/../c?b=2&a=1#frag",
+        "http://example.com/a/c?a=1&b=2&utm_source=news",
+        "http://example.com/a/%63?a=1&b=2",
+    ]
+    assert {normalize_url(url) for url in same} == {"http://example.com/a/c?a=1&b=2"}
+    assert normalize_url("https://example.com:8443") == "https://example.com:8443/"
+    assert normalize_url("../x.html", "http://example.com/a/b/page.html") == "http://example.com/a/x.html"
+    for url in ["mailto:someone@example.com", "javascript:void(0)", "/relative", "http://[bad"]:
+        assert normalize_url(url) is None
+
+
+def test_seen_sets():
+    bloom = BloomFilter(10_000, 0.01)
+    added = [f"http://example.com/{i}" for i in range(10_000)]
+    assert all(bloom.add(url) for url in added[:5]) and not bloom.add(added[0])
+    for url in added[5:]:
+        bloom.add(url)
+    # No false negatives, and false positives near the target rate
+    assert all(url in bloom for url in added)
+    false_positives = sum(f"http://example.org/{i}" in bloom for i in range(10_000))
+    assert false_positives < 200
+    assert len(bloom.bits) < 10_000 * 10 / 8 * 1.1
+
+    assert isinstance(seen_set(1_000), ExactSeen) and isinstance(seen_set(1_000_000), BloomFilter)
+
+
+def test_frontier_orders_by_priority_and_rate_limits_domains():
+    frontier = Frontier(rate=2)
+    frontier.push("http://a.test/deep", 2)
+    frontier.push("http://a.test/", 0)
+    frontier.push("http://b.test/", 1)
+
+    entry, _ = frontier.pop(now=0)
+    assert entry.url == "http://a.test/"
+    # a.test must wait half a second, so b.test goes next even though it is deeper
+    entry, _ = frontier.pop(now=0.1)
+    assert entry.url == "http://b.test/"
+    entry, wait = frontier.pop(now=0.2)
+    assert entry is None and wait == pytest.approx(0.3)
+    entry, _ = frontier.pop(now=0.5)
+    assert entry.url == "http://a.test/deep" and len(frontier) == 0
+    assert frontier.pop(now=1) == (None, 0)
+
+
+@pytest.mark.asyncio
+async def test_crawls_static_site(site, tmp_path):
+    store = JsonlStore(tmp_path / "out.jsonl")
+
+    async def link_count(result):
+        return {"links_out": len(result.links)}
+
+    crawler = Crawler(HttpFetcher({"title": True}), store, [f"{site}/index.html"], max_pages=50, max_depth=2,
+                      rate=0, concurrency=3, hooks=[link_count])
+    stats = await crawler.run()
+
+    records = {r["url"].replace(site, ""): r for r in read_records(tmp_path / "out.jsonl")}
+    # Each page once, despite fragments and tracking parameters; d.html is too deep and other.test out of scope
+    assert set(records) == {"/index.html", "/a.html", "/b.html", "/missing.html", "/deep/c.html"}
+    assert records["/deep/c.html"]["depth"] == 2 and records["/deep/c.html"]["parent"] == f"{site}/a.html"
+    assert records["/a.html"]["data"] == {"title": "A", "links_out": 2}
+    assert records["/missing.html"]["status"] == 404
+    assert f"{site}/deep/d.html" in records["/deep/c.html"]["links"]
+    assert stats["pages"] == 5 and stats["failed"] == 1 and stats["stopped"] == "exhausted"
+
+
+@pytest.mark.asyncio
+async def test_crawl_stops_at_page_budget(site, tmp_path):
+    store = JsonlStore(tmp_path / "out.jsonl")
+    stats = await Crawler(HttpFetcher({}), store, [f"{site}/index.html"], max_pages=2, rate=0).run()
+
+    assert stats["pages"] == 2 and stats["stopped"] == "budget" and stats["queued"] > 0
+    assert len(list(read_records(store.path))) == 2
+
+
+def test_records_are_readable_while_the_store_is_open(tmp_path):
+    store = JsonlStore(tmp_path / "out.jsonl")
+    store.append({"url": "http://a.test/"})
+    assert list(read_records(store.path)) == [{"url": "http://a.test/"}]
+    store.close()
+
+
+@pytest.mark.asyncio
+async def test_crawl_job(site, tmp_path, monkeypatch):
+    monkeypatch.setenv(CRAWL_DIR_ENV, str(tmp_path / "crawls"))
+    handler = CrawlHandler(MagicMock())
+    events = []
+    token = event_bus.add_listener(events.append, ["job"])
+    try:
+        started = await handler.handle({"command": "crawl", "seeds": [f"{site}/index.html"], "fetcher": "http",
+                                        "max_depth": 1, "rate": 0})
+        status = await handler.handle({"command": "crawl-status", "job_id": started["job_id"], "wait": True,
+                                       "timeout": 10})
+    finally:
+        event_bus.remove_listener(token)
+
+    assert status["status"] == "completed" and status["result"]["pages"] == 4
+    assert status["progress"] == status["result"]
+    assert started["output"] == str(tmp_path / "crawls" / f"{started['job_id']}.jsonl")
+    assert len(list(read_records(started["output"]))) == 4
+    assert "job.progress" in {e["event"] for e in events}
+
+
+@pytest.mark.asyncio
+async def test_rejects_invalid_crawls():
+    handler = CrawlHandler(MagicMock())
+    for args in [{"seeds": []}, {"seeds": ["ftp://example.com"]}, {"seeds": ["http://a.test"], "max_pages": 0},
+                 {"seeds": ["http://a.test"], "scope": "planet"},
+                 {"seeds": ["http://a.test"], "fetcher": "http", "extract": {"js": "1"}}]:
+        assert "error" in await handler.handle({"command": "crawl", **args})
+    assert "error" in await handler.handle({"command": "crawl-status", "job_id": "nope"})
@@ -0,0 +1,207 @@
+"""Tests for the persistent, multiplexed daemon connection."""
+import asyncio
+import os
+import shutil
+import tempfile
+
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+
+from playwright_mcp.browser_daemon.browser_manager import BrowserManager
+from playwright_mcp.browser_daemon.core.blobs import blob_store
+from playwright_mcp.browser_daemon.core.client import DaemonClient
+from playwright_mcp.browser_daemon.core.events import event_bus
+
+
+class SlowHandler:
+    """Handler that replies after the number of seconds given in its args."""
+
+    async def handle(self, args):
+        await asyncio.sleep(args["delay"])
+        return {"echo": args["value"]}
+
+
+class LargeHandler:
+    """Handler that returns a multi-megabyte search-dom style reply."""
+
+    async def handle(self, args):
+        matches = [{"tag": "div", "text": f"match {i} " + "x" * 1000} for i in range(args["count"])]
+        return {"matches": matches, "total": len(matches)}
+
+
+@pytest.fixture
+def socket_path():
+    """Short socket path (Unix socket paths are limited to ~100 bytes)."""
+    directory = tempfile.mkdtemp(prefix="pwmcp")
+    yield os.path.join(directory, "daemon.sock")
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+@pytest.fixture
+async def daemon(socket_path):
+    """Run a BrowserManager connection handler on a private socket."""
+    manager = BrowserManager()
+    manager.handlers = {"slow": SlowHandler(), "large": LargeHandler()}
+    connections = []
+
+    async def on_connect(reader, writer):
+        connections.append(writer)
+        await manager.handle_connection(reader, writer)
+
+    server = await asyncio.start_unix_server(on_connect, socket_path)
+    yield connections
+    server.close()
+    await server.wait_closed()
+
+
+@pytest.mark.asyncio
+async def test_requests_share_one_connection(daemon, socket_path):
+    """Sequential requests reuse the same connection."""
+    client = DaemonClient(socket_path)
+    try:
+        assert await client.request("ping", {}) == {"result": "pong"}
+        assert await client.request("ping", {}) == {"result": "pong"}
+        assert await client.request("slow", {"delay": 0, "value": 1}) == {"echo": 1}
+        assert len(daemon) == 1
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_replies_can_arrive_out_of_order(daemon, socket_path):
+    """Concurrent requests are matched to their replies by id."""
+    client = DaemonClient(socket_path)
+    finished = []
+
+    async def call(delay, value):
+        result = await client.request("slow", {"delay": delay, "value": value})
+        finished.append(value)
+        return result
+
+    try:
+        results = await asyncio.gather(call(0.2, "first"), call(0.0, "second"), call(0.1, "third"))
+        assert results == [{"echo": "first"}, {"echo": "second"}, {"echo": "third"}]
+        assert finished == ["second", "third", "first"]
+        assert len(daemon) == 1
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_errors_are_returned_per_request(daemon, socket_path):
+    """A failing command does not affect other requests on the connection."""
+    client = DaemonClient(socket_path)
+    try:
+        unknown, pong = await asyncio.gather(client.request("nope", {}), client.request("ping", {}))
+        assert unknown == {"error": "Unknown command: nope"}
+        assert pong == {"result": "pong"}
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_large_replies_arrive_intact(daemon, socket_path):
+    """Multi-megabyte replies are streamed without truncation."""
+    client = DaemonClient(socket_path)
+    try:
+        large, pong = await asyncio.gather(
+            client.request("large", {"count": 5000}),
+            client.request("ping", {}),
+        )
+        assert large["total"] == 5000
+        assert len(large["matches"]) == 5000
+        assert large["matches"][-1]["text"].startswith("match 4999 ")
+        assert pong == {"result": "pong"}
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("encodings", [["json"], ["msgpack", "json"]])
+async def test_negotiated_encoding_round_trips_bytes(daemon, socket_path, encodings):
+    """Both encodings return identical replies, including raw bytes."""
+    if "msgpack" in encodings:
+        pytest.importorskip("msgpack")
+    client = DaemonClient(socket_path, encodings=encodings)
+    try:
+        result = await client.request("slow", {"delay": 0, "value": b"\x00\x01binary"})
+        assert client.encoding == encodings[0]
+        assert result == {"echo": b"\x00\x01binary"}
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("shared_memory", [True, False])
+async def test_large_bytes_travel_through_shared_memory(daemon, socket_path, shared_memory):
+    """Large binary values skip the socket when the client allows it."""
+    data = os.urandom(blob_store.threshold * 4)
+    client = DaemonClient(socket_path, shared_memory=shared_memory)
+    try:
+        with patch.object(blob_store, "put", wraps=blob_store.put) as put:
+            result = await client.request("slow", {"delay": 0, "value": data})
+        assert result == {"echo": data}
+        assert put.called == shared_memory
+    finally:
+        await client.close()
+        blob_store.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_subscribed_events_are_pushed(daemon, socket_path):
+    """Events on subscribed topics arrive on the connection, alongside replies."""
+    client = DaemonClient(socket_path)
+    received = asyncio.Queue()
+    client.add_event_listener(received.put_nowait)
+    try:
+        assert await client.subscribe(["job"]) == {"subscribed": ["job"]}
+        event_bus.publish("page.navigated", {"page_id": "p"})
+        event_bus.publish("job.status", {"job_id": "j", "status": "completed"})
+
+        event = await asyncio.wait_for(received.get(), 1)
+        assert event == {"event": "job.status", "data": {"job_id": "j", "status": "completed"}}
+        assert received.empty()
+
+        # The subscription is renewed when the connection is re-opened
+        daemon[0].close()
+        await asyncio.sleep(0.05)
+        await client.request("ping", {})
+        event_bus.publish("job.status", {"job_id": "k", "status": "error"})
+        assert (await asyncio.wait_for(received.get(), 1))["data"]["job_id"] == "k"
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_reconnects_after_connection_loss(daemon, socket_path):
+    """The client opens a new connection if the daemon drops the old one."""
+    client = DaemonClient(socket_path)
+    try:
+        await client.request("ping", {})
+        daemon[0].close()
+        await asyncio.sleep(0.05)
+        assert await client.request("ping", {}) == {"result": "pong"}
+        assert len(daemon) == 2
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_handle_connection_serves_until_eof():
+    """handle_connection answers every command before closing the connection."""
+    manager = BrowserManager()
+    manager.server = Mock()
+    manager.server.read_command = AsyncMock(side_effect=[
+        (1, {"command": "ping"}, "json"),
+        (2, {"command": "ping"}, "json"),
+        None,
+    ])
+    manager.server.send_response = AsyncMock()
+    manager.server.close = AsyncMock()
+
+    await manager.handle_connection(Mock(), Mock())
+
+    replies = [call.args[1:] for call in manager.server.send_response.await_args_list]
+    assert sorted(request_id for request_id, _, _ in replies) == [1, 2]
+    assert all(response == {"result": "pong"} for _, response, _ in replies)
+    manager.server.close.assert_awaited_once()
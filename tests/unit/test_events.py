@@ -0,0 +1,133 @@
+"""Tests for daemon event publishing and job completion waits."""
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from playwright_mcp.browser_daemon.core.events import EventBus, topic_matches
+from playwright_mcp.browser_daemon.core.session import SessionManager
+from playwright_mcp.browser_daemon.handlers.ai_agent.job_store import job_store
+from playwright_mcp.browser_daemon.handlers.get_result import GetResultHandler
+from playwright_mcp.mcp_server.events import EventRelay
+
+
+@pytest.fixture
+def events():
+    """Collect every event published while the test runs."""
+    bus = EventBus()
+    received = []
+    token = bus.add_listener(received.append)
+    yield received
+    bus.remove_listener(token)
+
+
+@pytest.mark.parametrize("topic, topics, expected", [
+    ("page.crashed", None, True),
+    ("page.crashed", ("page",), True),
+    ("page.crashed", ("page.crashed",), True),
+    ("pages.crashed", ("page",), False),
+    ("job.status", ("page",), False),
+])
+def test_topic_matching(topic, topics, expected):
+    assert topic_matches(topic, topics) is expected
+
+
+def test_failing_listener_does_not_stop_delivery(events):
+    bus = EventBus()
+    token = bus.add_listener(MagicMock(side_effect=RuntimeError("boom")), ["job"])
+    try:
+        bus.publish("job.status", {"job_id": "1"})
+    finally:
+        bus.remove_listener(token)
+    assert events == [{"event": "job.status", "data": {"job_id": "1"}}]
+
+
+@pytest.mark.asyncio
+async def test_job_status_changes_are_published(events):
+    job_id = await job_store.create_job("page_1", "find the login button")
+    job_store.set_running(job_id)
+    job_store.complete_job(job_id, "done")
+
+    statuses = [e["data"]["status"] for e in events if e["data"].get("job_id") == job_id]
+    assert statuses == ["pending", "running", "completed"]
+
+
+@pytest.mark.asyncio
+async def test_get_ai_result_waits_for_completion():
+    """A blocking get-ai-result returns as soon as the job finishes."""
+    job_id = await job_store.create_job("page_1", "summarize")
+    handler = GetResultHandler(MagicMock())
+
+    async def finish_later():
+        await asyncio.sleep(0.05)
+        job_store.complete_job(job_id, {"summary": "ok"})
+
+    finisher = asyncio.create_task(finish_later())
+    result = await handler.handle({"command": "get-ai-result", "job_id": job_id, "wait": True, "timeout": 5})
+    await finisher
+
+    assert result == {"job_id": job_id, "status": "completed", "result": {"summary": "ok"}}
+
+
+@pytest.mark.asyncio
+async def test_get_ai_result_wait_times_out_with_current_status():
+    job_id = await job_store.create_job("page_1", "never finishes")
+    handler = GetResultHandler(MagicMock())
+
+    result = await handler.handle({"command": "get-ai-result", "job_id": job_id, "wait": True, "timeout": 0.01})
+
+    assert result["status"] == "pending"
+
+
+@pytest.mark.asyncio
+async def test_page_events_are_published(events):
+    """Main-frame navigations, console errors and crashes of new pages become events."""
+    page = MagicMock()
+    browser = MagicMock()
+
+    async def new_page():
+        return page
+    browser.new_page = new_page
+
+    manager = SessionManager()
+    manager.sessions["s"] = browser
+    try:
+        page_id = await manager.new_page("s")
+    finally:
+        manager.sessions.pop("s", None)
+        manager.pages.clear()
+    callbacks = {call.args[0]: call.args[1] for call in page.on.call_args_list}
+
+    callbacks["framenavigated"](MagicMock(parent_frame=None, url="https://example.com/"))
+    callbacks["framenavigated"](MagicMock(parent_frame=object(), url="https://ads.example.com/"))
+    callbacks["console"](MagicMock(type="log", text="hello"))
+    callbacks["console"](MagicMock(type="error", text="oops"))
+    callbacks["crash"](page)
+
+    assert events == [
+        {"event": "page.navigated", "data": {"page_id": page_id, "url": "https://example.com/"}},
+        {"event": "page.console", "data": {"page_id": page_id, "type": "error", "text": "oops"}},
+        {"event": "page.crashed", "data": {"page_id": page_id}},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_relay_forwards_events_as_log_notifications():
+    """The MCP server subscribes once and relays events to the session."""
+    client = MagicMock(connected=True, subscribed=False)
+    client.subscribe = AsyncMock(return_value={"subscribed": ["job", "page", "session", "bulk"]})
+    session = MagicMock()
+    session.send_log_message = AsyncMock()
+    relay = EventRelay()
+
+    await relay.attach(session, client)
+    client.subscribed = True
+    await relay.attach(session, client)
+
+    client.subscribe.assert_awaited_once_with(["job", "page", "session", "bulk"])
+    forward = client.add_event_listener.call_args.args[0]
+    forward({"event": "page.crashed", "data": {"page_id": "p"}})
+    await asyncio.sleep(0)
+    session.send_log_message.assert_awaited_once_with(
+        level="error", data={"event": "page.crashed", "data": {"page_id": "p"}}, logger="browser_daemon"
+    )
@@ -0,0 +1,129 @@
+"""Tests for HAR record and replay."""
+import base64
+import json
+import os
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from playwright.async_api import BrowserContext
+
+from playwright_mcp.browser_daemon.core.har import HarArchives, HarMode, HarReplayer
+from playwright_mcp.browser_daemon.core.session import SessionManager
+
+
+def exchange(url, status=200, body="", method="GET", headers=None, started="2026-10-01T10:00:00.000Z", **content):
+    return {
+        "startedDateTime": started,
+        "request": {"method": method, "url": url, "headers": []},
+        "response": {
+            "status": status,
+            "headers": [{"name": k, "value": v} for k, v in (headers or {}).items()],
+            "content": {"text": body, **content},
+            "redirectURL": "",
+        },
+    }
+
+
+def write_har(directory, name, entries):
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, name), "w") as f:
+        json.dump({"log": {"version": "1.2", "entries": entries}}, f)
+
+
+@pytest.fixture
+def archives(tmp_path):
+    archives = HarArchives(str(tmp_path / "har"))
+    write_har(archives.path("site"), "1.har", [
+        exchange("http://site.test/", 302, headers={"Location": "/home"}),
+        exchange("http://site.test/home", body="<h1>Home</h1>", headers={"Content-Type": "text/html"}),
+        exchange("http://site.test/api/count", body="1", started="2026-10-01T10:00:01.000Z"),
+    ])
+    write_har(archives.path("site"), "2.har", [
+        exchange("http://site.test/api/count", body="2", started="2026-10-01T10:00:02.000Z"),
+        exchange("http://site.test/logo.png", body=base64.b64encode(b"\x89PNG").decode(), encoding="base64",
+                 headers={"Content-Encoding": "gzip", "Content-Type": "image/png"}),
+    ])
+    return archives
+
+
+def test_parse_har_mode():
+    assert HarMode.parse(None) is None
+    assert HarMode.parse("record:site") == HarMode("record", "site")
+    assert HarMode.parse({"mode": "replay", "archive": "site"}) == HarMode("replay", "site")
+    for value in ["site", "play:site", "record:../etc", {"mode": "record"}, {"mode": "record", "name": "x"}]:
+        with pytest.raises(ValueError):
+            HarMode.parse(value)
+
+
+def make_route(url):
+    route = MagicMock()
+    route.request.url = url
+    route.request.method = "GET"
+    route.request.post_data = None
+    route.fulfill = AsyncMock()
+    route.abort = AsyncMock()
+    return route
+
+
+@pytest.mark.asyncio
+async def test_replay_serves_from_archive(archives):
+    index = archives.index("site")
+    assert len(index) == 5
+    assert archives.index("site") is index
+    assert archives.index("missing") is None
+    replayer = HarReplayer("site", index)
+
+    routes = {}
+    for url in ["http://site.test/#top", "http://site.test/logo.png", "http://site.test/api/count",
+                "http://site.test/api/count", "http://site.test/api/count", "http://other.test/"]:
+        routes.setdefault(url, []).append(route := make_route(url))
+        await replayer.handle(route)
+
+    # The redirect is replayed as recorded, for the browser to follow
+    redirect = routes["http://site.test/#top"][0].fulfill.await_args.kwargs
+    assert redirect["status"] == 302 and redirect["headers"] == {"Location": "/home"}
+    home = make_route("http://site.test/home")
+    await replayer.handle(home)
+    assert home.fulfill.await_args.kwargs["body"] == b"<h1>Home</h1>"
+    logo = routes["http://site.test/logo.png"][0].fulfill.await_args.kwargs
+    assert logo["body"] == b"\x89PNG" and logo["headers"] == {"Content-Type": "image/png"}
+    # Repeated requests get the recordings in order, then the last one again
+    assert [r.fulfill.await_args.kwargs["body"] for r in routes["http://site.test/api/count"]] == [b"1", b"2", b"2"]
+    routes["http://other.test/"][0].abort.assert_awaited_once_with("internetdisconnected")
+    assert replayer.report() == {"mode": "replay", "archive": "site", "served": 6, "missed": 1,
+                                 "missed_urls": ["http://other.test/"]}
+
+    # A new recording invalidates the index
+    write_har(archives.path("site"), "3.har", [exchange("http://site.test/new")])
+    assert archives.index("site") is not index
+
+
+@pytest.mark.asyncio
+async def test_sessions_record_and_replay(archives, monkeypatch):
+    monkeypatch.setattr("playwright_mcp.browser_daemon.core.session.har_archives", archives)
+    manager = SessionManager()
+    browser = MagicMock()
+    browser.new_context = AsyncMock(side_effect=lambda **options: MagicMock(spec=BrowserContext))
+    manager._shared_browser = AsyncMock(return_value=browser)
+    manager.pool.take = MagicMock()
+    session_ids = []
+    try:
+        session_ids.append(await manager.launch_browser(har=HarMode("record", "fresh")))
+        path = browser.new_context.await_args.kwargs["record_har_path"]
+        assert os.path.dirname(path) == archives.path("fresh") and path.endswith(".har")
+        assert manager.har_report(session_ids[0])["mode"] == "record"
+
+        session_ids.append(await manager.launch_browser(har=HarMode("replay", "site")))
+        context = manager.get_session(session_ids[1])
+        context.route.assert_awaited_once_with("**/*", manager.har_replayers[session_ids[1]].handle)
+        assert manager.har_report(session_ids[1])["served"] == 0
+
+        manager.pool.take.assert_not_called()
+        with pytest.raises(FileNotFoundError):
+            await manager.launch_browser(har=HarMode("replay", "fresh"))
+    finally:
+        for session_id in session_ids:
+            manager.remove_session(session_id)
+        del manager._shared_browser
+        del manager.pool.take
+    assert not manager.har_modes and not manager.har_replayers
@@ -0,0 +1,244 @@
+"""Tests for the shared HTTP cache, against a local HTTP server."""
+import asyncio
+import threading
+import urllib.error
+import urllib.request
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from playwright_mcp.browser_daemon.core.http_cache import CacheEntry, HttpCache, freshness_lifetime, storable
+
+ASSETS = {
+    "/app.js": ({"Cache-Control": "max-age=60"}, b"console.log('app');" * 100),
+    "/style.css": ({"Cache-Control": "no-cache", "ETag": '"v1"'}, b"body { margin: 0 }" * 100),
+    "/user.js": ({"Cache-Control": "private, max-age=60"}, b"var user = 1;"),
+    "/big.png": ({"Cache-Control": "max-age=60"}, b"\x89PNG" * 1000),
+}
+
+
+@pytest.fixture
+def server():
+    hits = Counter()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            hits[self.path] += 1
+            if self.path == "/moved.js":
+                self.send_response(302)
+                self.send_header("Location", "/app.js")
+                self.send_header("Cache-Control", "max-age=60")
+                self.end_headers()
+                return
+            headers, body = ASSETS[self.path]
+            if headers.get("ETag") and self.headers.get("If-None-Match") == headers["ETag"]:
+                self.send_response(304)
+                self.send_header("ETag", headers["ETag"])
+                self.end_headers()
+                return
+            self.send_response(200)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}", hits
+    httpd.shutdown()
+    httpd.server_close()
+
+
+class NoRedirects(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args):
+        return None
+
+
+def fetch(url, headers, max_redirects=None):
+    """What route.fetch does, over urllib."""
+    opener = urllib.request.build_opener(*([NoRedirects] if max_redirects == 0 else []))
+    try:
+        with opener.open(urllib.request.Request(url, headers=headers or {})) as reply:
+            return reply.status, dict(reply.headers), reply.read()
+    except urllib.error.HTTPError as e:
+        return e.code, dict(e.headers), b""
+
+
+def make_route(url, page, resource_type="script"):
+    """A route whose fetch goes to the local server; fulfilled bodies are kept on ``route.served``."""
+    route = MagicMock()
+    route.request.url = url
+    route.request.method = "GET"
+    route.request.resource_type = resource_type
+    route.request.headers = {}
+    route.request.frame.page = page
+
+    async def do_fetch(headers=None, max_redirects=None):
+        status, reply_headers, body = await asyncio.to_thread(fetch, url, headers, max_redirects)
+        response = MagicMock(status=status, headers={k.lower(): v for k, v in reply_headers.items()})
+        response.body = AsyncMock(return_value=body)
+        return response
+
+    async def fulfill(response=None, status=None, headers=None, body=None):
+        route.served = body
+        route.status = response.status if response else status
+    route.fetch = AsyncMock(side_effect=do_fetch)
+    route.fulfill = AsyncMock(side_effect=fulfill)
+    route.fallback = AsyncMock()
+    return route
+
+
+def test_freshness_and_storability():
+    assert freshness_lifetime({"cache-control": "public, s-maxage=600, max-age=60"}) == 600
+    assert freshness_lifetime({"date": "Mon, 05 Oct 2026 10:00:00 GMT",
+                               "expires": "Mon, 05 Oct 2026 10:05:00 GMT"}) == 300
+    assert freshness_lifetime({"date": "Mon, 05 Oct 2026 10:00:00 GMT",
+                               "last-modified": "Mon, 05 Oct 2026 09:00:00 GMT"}) == 360
+    assert freshness_lifetime({"expires": "0"}) == 0
+
+    assert storable(200, {"cache-control": "max-age=60", "vary": "Accept-Encoding"})
+    assert storable(200, {"etag": '"x"'})
+    assert not storable(200, {})
+    assert not storable(200, {"cache-control": "no-store"})
+    assert not storable(200, {"cache-control": "max-age=60", "set-cookie": "a=b"})
+    assert not storable(200, {"cache-control": "max-age=60", "vary": "Cookie"})
+    assert not storable(404, {"cache-control": "max-age=60"})
+    assert not storable(200, {"cache-control": "max-age=60"}, authorized=True)
+    assert storable(200, {"cache-control": "public, max-age=60"}, authorized=True)
+    assert storable(200, {"cache-control": "s-maxage=60"}, authorized=True)
+    assert not CacheEntry("u", 200, {"cache-control": "max-age=60", "age": "soon"}, 0, 1).fresh
+
+
+@pytest.mark.asyncio
+async def test_serves_fresh_entries_and_revalidates_stale_ones(server, tmp_path):
+    base, hits = server
+    cache = HttpCache(str(tmp_path / "cache"), 2**20)
+    first, second = MagicMock(), MagicMock()
+
+    for page in (first, second):
+        cache.start_counting(page)
+        for path in ("/app.js", "/style.css", "/user.js"):
+            route = make_route(base + path, page, "stylesheet" if path.endswith(".css") else "script")
+            await cache.handle(route)
+            assert route.served == ASSETS[path][1]
+
+    # Fresh: fetched once. no-cache: revalidated with its ETag. private: never kept.
+    assert hits == {"/app.js": 1, "/style.css": 2, "/user.js": 2}
+    assert cache.counts(first).to_dict()["hit_ratio"] == 0.0
+    assert cache.counts(second).to_dict() == {
+        "requests": 3, "hits": 1, "revalidated": 1, "hit_ratio": 0.667,
+        "bytes_served": len(ASSETS["/app.js"][1]) + len(ASSETS["/style.css"][1]),
+    }
+    assert cache.stats()["entries"] == 2
+
+    # The index is rebuilt from disk
+    reloaded = HttpCache(str(tmp_path / "cache"), 2**20)
+    assert set(reloaded.entries) == {base + "/app.js", base + "/style.css"}
+    assert reloaded.size == cache.size
+
+
+@pytest.mark.asyncio
+async def test_evicts_least_recently_used(server, tmp_path):
+    base, hits = server
+    size = len(ASSETS["/app.js"][1]) + len(ASSETS["/big.png"][1])
+    cache = HttpCache(str(tmp_path / "cache"), int(size * 8))
+    page = MagicMock()
+
+    await cache.handle(make_route(base + "/app.js", page))
+    await cache.handle(make_route(base + "/big.png", page, "image"))
+    cache.max_bytes = size - 1
+    await cache.handle(make_route(base + "/app.js", page))
+    # app.js was used last, so big.png goes to make room
+    cache._add("https://example.com/other.js", CacheEntry("https://example.com/other.js", 200, {}, 0, 1))
+
+    assert list(cache.entries) == [base + "/app.js", "https://example.com/other.js"]
+    assert hits["/app.js"] == 1
+    assert cache.size <= cache.max_bytes
+
+
+@pytest.mark.asyncio
+async def test_skips_uncacheable_requests(tmp_path):
+    cache = HttpCache(str(tmp_path / "cache"), 2**20)
+    document = make_route("https://example.com/", MagicMock(), "document")
+    post = make_route("https://example.com/api.js", MagicMock())
+    post.request.method = "POST"
+
+    for route in (document, post):
+        await cache.handle(route)
+        route.fallback.assert_awaited_once()
+        route.fetch.assert_not_awaited()
+    assert cache.total.requests == 0
+
+
+@pytest.mark.asyncio
+async def test_refetches_when_a_revalidated_body_is_gone(server, tmp_path):
+    base, hits = server
+    cache = HttpCache(str(tmp_path / "cache"), 2**20)
+    url = base + "/style.css"
+    await cache.handle(make_route(url, MagicMock(), "stylesheet"))
+    cache._read = MagicMock(side_effect=OSError("gone"))
+
+    route = make_route(url, MagicMock(), "stylesheet")
+    await cache.handle(route)
+
+    assert route.served == ASSETS["/style.css"][1]
+    assert [call.kwargs.get("headers") for call in route.fetch.await_args_list] == [{"if-none-match": '"v1"'}, None]
+    assert hits["/style.css"] == 3
+
+
+@pytest.mark.asyncio
+async def test_falls_back_when_it_cannot_answer(tmp_path):
+    cache = HttpCache(str(tmp_path / "cache"), 2**20)
+    route = make_route("https://example.com/app.js", MagicMock())
+    route.fetch = AsyncMock(side_effect=Exception("net::ERR_CONNECTION_REFUSED"))
+
+    await cache.handle(route)
+
+    route.fallback.assert_awaited_once()
+    route.fulfill.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_authorized_responses_are_kept_only_if_public(server, tmp_path):
+    base, hits = server
+    cache = HttpCache(str(tmp_path / "cache"), 2**20)
+    route = make_route(base + "/app.js", MagicMock())
+    route.request.headers = {"authorization": "Bearer secret"}
+
+    await cache.handle(route)
+
+    assert route.served == ASSETS["/app.js"][1]
+    assert cache.stats()["entries"] == 0
+
+
+def test_index_leaves_foreign_files_alone(tmp_path):
+    directory = tmp_path / "cache"
+    (directory / "notes").mkdir(parents=True)
+    (directory / "README").write_text("not an entry")
+    (directory / ("0" * 64)).write_bytes(b"\x00")
+    (directory / ".tmpabc").write_bytes(b"partial")
+
+    cache = HttpCache(str(directory), 2**20)
+
+    assert cache.entries == {}
+    assert sorted(p.name for p in directory.iterdir()) == ["README", "notes"]
+
+
+@pytest.mark.asyncio
+async def test_redirects_are_left_to_the_browser(server, tmp_path):
+    base, hits = server
+    cache = HttpCache(str(tmp_path / "cache"), 2**20)
+    for _ in range(2):
+        route = make_route(base + "/moved.js", MagicMock())
+        await cache.handle(route)
+        assert route.status == 302
+
+    assert hits == {"/moved.js": 2}
+    assert cache.stats()["entries"] == 0
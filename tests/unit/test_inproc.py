@@ -0,0 +1,81 @@
+"""Tests for running the browser manager inside the MCP server process."""
+import asyncio
+import os
+import shutil
+import tempfile
+
+import pytest
+
+from playwright_mcp.browser_daemon.browser_manager import BrowserManager
+from playwright_mcp.browser_daemon.handlers.batch import BatchHandler
+from playwright_mcp.mcp_server.handlers import utils
+from playwright_mcp.mcp_server.handlers.utils import (
+    check_daemon_running, close_daemon_client, send_to_manager, set_inproc_manager,
+)
+
+
+class EchoHandler:
+    async def handle(self, args):
+        if args.get("fail"):
+            raise RuntimeError("handler blew up")
+        return {"command": args["command"], "value": args.get("value"), "items": [1, 2, 3]}
+
+
+@pytest.fixture
+async def manager(monkeypatch):
+    """A manager served on the daemon socket path (under a private TMPDIR)."""
+    directory = tempfile.mkdtemp(prefix="pwmcp")
+    monkeypatch.setenv("TMPDIR", directory)
+    manager = BrowserManager()
+    manager.handlers = {"echo": EchoHandler(), "batch": BatchHandler(manager.session_manager, manager.dispatch)}
+    server = await asyncio.start_unix_server(manager.handle_connection, os.path.join(directory, "playwright_mcp.sock"))
+    yield manager
+    set_inproc_manager(None)
+    await close_daemon_client()
+    server.close()
+    await server.wait_closed()
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+CALLS = [
+    ("ping", {}),
+    ("echo", {"value": "hello"}),
+    ("echo", {"value": b"\x00binary"}),
+    ("echo", {"fail": True}),
+    ("nope", {}),
+    ("batch", {"steps": [{"command": "echo", "args": {"value": 1}}, {"command": "nope"}]}),
+]
+
+
+@pytest.mark.asyncio
+async def test_inproc_responses_match_socket(manager):
+    over_socket = [await send_to_manager(command, dict(args)) for command, args in CALLS]
+
+    set_inproc_manager(manager)
+    in_process = [await send_to_manager(command, dict(args)) for command, args in CALLS]
+
+    assert in_process == over_socket
+    assert over_socket[3] == {"error": "handler blew up"}
+
+
+@pytest.mark.asyncio
+async def test_inproc_mode_needs_no_daemon(monkeypatch):
+    monkeypatch.setenv("TMPDIR", tempfile.mkdtemp(prefix="pwmcp"))
+    manager = BrowserManager()
+    set_inproc_manager(manager)
+    try:
+        args = {"value": 1}
+        assert await check_daemon_running()
+        assert await send_to_manager("ping", args) == {"result": "pong"}
+        assert args == {"value": 1}
+        assert utils._daemon_client is None or not utils._daemon_client.connected
+    finally:
+        set_inproc_manager(None)
+
+
+@pytest.mark.asyncio
+async def test_stats_over_socket(manager):
+    stats = await send_to_manager("stats", {})
+
+    assert {"sessions", "pages", "free_pages", "recycled_pages", "pool", "evictions", "scheduler"} <= set(stats)
+    assert {"hits", "misses", "warm"} <= set(stats["pool"])
@@ -0,0 +1,173 @@
+"""Tests for browser resource sampling and recycling."""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from playwright.async_api import Browser, BrowserContext, Page
+
+from playwright_mcp.browser_daemon.core.events import event_bus
+from playwright_mcp.browser_daemon.core.monitor import ResourceMonitor
+from playwright_mcp.browser_daemon.core.resources import ResourcePolicy
+from playwright_mcp.browser_daemon.core.scheduler import CommandScheduler
+from playwright_mcp.browser_daemon.core.session import SessionManager, WarmPool
+
+STATE = {"cookies": [{"name": "sid", "value": "abc"}], "origins": []}
+
+
+def make_browser(cpu_times):
+    """A mock Chromium whose processes 10 and 11 report the given CPU times, one sample at a time."""
+    browser = MagicMock(spec=Browser)
+    browser.close = AsyncMock()
+    cdp = MagicMock()
+    cdp.send = AsyncMock(side_effect=[
+        {"processInfo": [{"id": 10, "type": "browser", "cpuTime": t}, {"id": 11, "type": "renderer", "cpuTime": t}]}
+        for t in cpu_times
+    ])
+    browser.new_browser_cdp_session = AsyncMock(return_value=cdp)
+
+    def new_context(**options):
+        context = MagicMock(spec=BrowserContext)
+        context.browser = browser
+        context.options = options
+        context.close = AsyncMock()
+        context.route = AsyncMock()
+        context.storage_state = AsyncMock(return_value=STATE)
+        context.new_cdp_session = AsyncMock(side_effect=Exception("not chromium"))
+
+        def new_page():
+            page = MagicMock(spec=Page, close=AsyncMock(), goto=AsyncMock())
+            page.url = "about:blank"
+            page.context = context
+            return page
+        context.new_page = AsyncMock(side_effect=new_page)
+        return context
+    browser.new_context = AsyncMock(side_effect=new_context)
+    return browser
+
+
+@pytest.fixture
+async def manager():
+    """The shared session manager, emptied, launching mock browsers."""
+    mgr = SessionManager()
+    await mgr.shutdown()
+    mgr.isolation = "context"
+    mgr.pool = WarmPool(mgr._warm_session)
+    old, fresh = make_browser([1.0, 3.0]), make_browser([0.0])
+    mgr._launch_browser = AsyncMock(side_effect=[old, fresh])
+    yield mgr, old, fresh
+    await mgr.shutdown()
+    del mgr._launch_browser
+
+
+@pytest.mark.asyncio
+async def test_samples_browser_processes_and_pages(manager):
+    mgr, old, _ = manager
+    session_id = await mgr.launch_browser()
+    page_id = await mgr.new_page(session_id)
+    page = mgr.get_page(page_id)
+    cdp = MagicMock(send=AsyncMock(return_value={"metrics": [
+        {"name": "JSHeapUsedSize", "value": 2e6}, {"name": "Nodes", "value": 120}, {"name": "Timestamp", "value": 1},
+    ]}))
+    page.context.new_cdp_session = AsyncMock(return_value=cdp)
+    monitor = ResourceMonitor(mgr, rss=lambda pid: pid * 2**20)
+
+    await monitor.sample()
+    await monitor.sample()
+
+    stats = monitor.stats()
+    [browser] = stats["browsers"]
+    assert browser["browser"] == "chromium/headless"
+    assert browser["sessions"] == [session_id]
+    assert browser["processes"] == 2
+    assert browser["rss"] == 21 * 2**20
+    assert browser["cpu_percent"] > 0
+    assert stats["pages"] == {page_id: {"js_heap_used": 2e6, "nodes": 120}}
+    cdp.send.assert_any_await("Performance.enable")
+    old.new_browser_cdp_session.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_browser_over_threshold_is_recycled(manager):
+    mgr, old, fresh = manager
+    session_id = await mgr.launch_browser(policy=ResourcePolicy.parse("assets"))
+    page_id = await mgr.new_page(session_id)
+    old_page = mgr.get_page(page_id)
+    old_page.url = "https://example.com/account"
+    recycled = []
+    monitor = ResourceMonitor(mgr, recycle_rss_mb=15, rss=lambda pid: pid * 2**20)
+
+    token = event_bus.add_listener(recycled.append, ["session"])
+    try:
+        assert await monitor.check() == [session_id]
+    finally:
+        event_bus.remove_listener(token)
+
+    context = mgr.get_session(session_id)
+    assert context.browser is fresh
+    assert context.options == {"storage_state": STATE}
+    assert mgr.blockers[session_id].policy == ResourcePolicy.parse("assets")
+    new_page = mgr.get_page(page_id)
+    assert new_page is not old_page
+    new_page.goto.assert_awaited_once_with("https://example.com/account")
+    assert mgr.page_id_for(new_page) == page_id
+    assert mgr.browsers[("chromium", True)] is fresh
+    old.close.assert_awaited_once()
+    assert monitor.recycled == 1
+    assert {"event": "session.recycled", "data": {"session_id": session_id, "reason": "memory"}} in recycled
+
+
+@pytest.mark.asyncio
+async def test_busy_browser_is_not_recycled(manager):
+    mgr, old, _ = manager
+    session_id = await mgr.launch_browser()
+    page_id = await mgr.new_page(session_id)
+    monitor = ResourceMonitor(mgr, busy=lambda key: key == page_id, recycle_rss_mb=1, rss=lambda pid: 2**30)
+
+    assert await monitor.check() == []
+    assert mgr.get_session(session_id).browser is old
+    old.close.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_commands_wait_for_recycling_to_finish(manager):
+    mgr, _, fresh = manager
+    session_id = await mgr.launch_browser()
+    page_id = await mgr.new_page(session_id)
+    scheduler = CommandScheduler()
+    monitor = ResourceMonitor(mgr, busy=scheduler.is_busy, hold=scheduler.hold, recycle_rss_mb=1,
+                              rss=lambda pid: 2**30)
+    order = []
+    migrate = mgr._migrate_session
+
+    async def slow_migrate(*args):
+        order.append("migrating")
+        await asyncio.sleep(0.05)
+        await migrate(*args)
+        order.append("migrated")
+
+    async def command():
+        order.append(mgr.get_session(session_id).browser is fresh)
+
+    mgr._migrate_session = slow_migrate
+    try:
+        recycling = asyncio.create_task(monitor.check())
+        while not order:
+            await asyncio.sleep(0)
+        await scheduler.run(command, page_id, session_id)
+        assert await recycling == [session_id]
+    finally:
+        del mgr._migrate_session
+    assert order == ["migrating", "migrated", True]
+
+
+@pytest.mark.asyncio
+async def test_browser_left_alone_is_not_counted(manager):
+    mgr, _, _ = manager
+    await mgr.launch_browser()
+    monitor = ResourceMonitor(mgr, recycle_rss_mb=1, rss=lambda pid: 2**30)
+    mgr.recycle_browser = AsyncMock(return_value=[])
+    try:
+        assert await monitor.check() == []
+    finally:
+        del mgr.recycle_browser
+    assert monitor.recycled == 0
@@ -0,0 +1,120 @@
+"""Tests for the adaptive page readiness mode."""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from playwright_mcp.browser_daemon.core.page_ready import PageReadiness
+
+
+class FakePage:
+    """A page whose DOM is quiet and which replays requests as the test scripts them."""
+
+    def __init__(self):
+        self.listeners = {}
+        self.goto = AsyncMock()
+        self.evaluate = AsyncMock()
+        self.wait_for_selector = AsyncMock()
+
+    def on(self, event, listener):
+        self.listeners.setdefault(event, []).append(listener)
+
+    def remove_listener(self, event, listener):
+        self.listeners[event].remove(listener)
+
+    def emit(self, event, request):
+        for listener in list(self.listeners.get(event, [])):
+            listener(request)
+
+
+def request(url, resource_type="fetch"):
+    return MagicMock(url=url, resource_type=resource_type)
+
+
+async def finish_later(page, req, delay):
+    await asyncio.sleep(delay)
+    page.emit("requestfinished", req)
+
+
+@pytest.mark.asyncio
+async def test_ready_waits_for_requests_but_not_long_lived_ones():
+    page = FakePage()
+    api = request("https://example.com/api/items")
+
+    async def goto(url, wait_until):
+        assert wait_until == "domcontentloaded"
+        page.emit("request", api)
+        page.emit("request", request("wss://example.com/live", "websocket"))
+        page.emit("request", request("https://www.google-analytics.com/g/collect"))
+        page.emit("request", request("https://example.com/poll?channel=1"))
+        asyncio.create_task(finish_later(page, api, 0.1))
+    page.goto.side_effect = goto
+
+    readiness = PageReadiness(page, quiet_ms=10, ignore=["/poll?"])
+    report = await readiness.goto("https://example.com")
+
+    assert report["signal"] == "quiet"
+    assert report["ignored_requests"] == 3
+    assert report["pending_requests"] == 0
+    phases = report["phases"]
+    assert phases["domcontentloaded"] <= phases["dom_quiet"] < phases["network_quiet"] <= phases["ready"]
+    assert phases["network_quiet"] >= 100
+    assert page.listeners == {"request": [], "requestfinished": [], "requestfailed": []}
+
+
+@pytest.mark.asyncio
+async def test_long_polls_stop_counting():
+    page = FakePage()
+
+    async def goto(url, wait_until):
+        page.emit("request", request("https://example.com/updates"))
+    page.goto.side_effect = goto
+
+    report = await PageReadiness(page, quiet_ms=10, long_request_ms=50).goto("https://example.com")
+
+    assert report["signal"] == "quiet"
+    assert report["pending_requests"] == 1
+    assert report["phases"]["ready"] < 1000
+
+
+@pytest.mark.asyncio
+async def test_selector_and_timeout_signals():
+    page = FakePage()
+    report = await PageReadiness(page, selector="#results").goto("https://example.com")
+    assert report["signal"] == "selector"
+    args, kwargs = page.wait_for_selector.await_args
+    assert args == ("#results",) and kwargs["state"] == "visible" and 0 < kwargs["timeout"] <= 10_000
+    page.evaluate.assert_not_awaited()
+
+    page = FakePage()
+
+    async def never_quiet(*args):
+        await asyncio.sleep(10)
+    page.evaluate.side_effect = never_quiet
+    report = await PageReadiness(page, timeout_ms=50).goto("https://example.com")
+    assert report["signal"] == "timeout"
+    assert "dom_quiet" not in report["phases"]
+
+
+@pytest.mark.asyncio
+async def test_timeout_only_covers_the_wait_after_the_dom_loads():
+    page = FakePage()
+
+    async def slow_goto(url, wait_until):
+        await asyncio.sleep(0.1)
+    page.goto.side_effect = slow_goto
+    report = await PageReadiness(page, selector="#results", timeout_ms=50).goto("https://example.com")
+    assert report["signal"] == "selector"
+    assert "timeout" not in page.goto.await_args.kwargs
+
+    page = FakePage()
+    page.wait_for_selector.side_effect = PlaywrightTimeoutError("Timeout 50ms exceeded")
+    report = await PageReadiness(page, selector="#results", timeout_ms=50).goto("https://example.com")
+    assert report["signal"] == "timeout"
+
+
+def test_unknown_options():
+    with pytest.raises(ValueError):
+        PageReadiness.from_args(FakePage(), {"quiet": 100})
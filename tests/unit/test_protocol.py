@@ -0,0 +1,199 @@
+"""Tests for the framed daemon wire protocol."""
+import asyncio
+import json
+
+import pytest
+
+from playwright_mcp.browser_daemon.core import protocol
+from playwright_mcp.browser_daemon.core.protocol import (
+    CHUNK_SIZE, ENCODING_JSON, ENCODING_MSGPACK, FLAG_ABORT, FLAG_END, FLAG_MSGPACK, HEADER,
+    MessageReader, ProtocolError, available_encodings, decode_message, encode_frames,
+    negotiate_encoding, write_message,
+)
+
+
+def feed(*chunks: bytes) -> asyncio.StreamReader:
+    """Build a stream reader pre-loaded with the given bytes."""
+    reader = asyncio.StreamReader()
+    for chunk in chunks:
+        reader.feed_data(chunk)
+    reader.feed_eof()
+    return reader
+
+
+def large_search_result(count: int) -> dict:
+    """A search-dom style reply with ``count`` matches."""
+    return {
+        "matches": [
+            {
+                "type": "text",
+                "tag": "div",
+                "path": f"/[document][0]/html[1]/body[1]/div[{i}]",
+                "text": f"Ünïcödé match {i} " * 20,
+                "attributes": {"class": ["result", "item"], "data-index": str(i)},
+            }
+            for i in range(count)
+        ],
+        "total": count,
+    }
+
+
+def test_small_message_is_single_frame():
+    """Small messages fit in a single final frame."""
+    frames = list(encode_frames(7, {"result": "pong"}))
+    assert len(frames) == 1
+    request_id, length, flags = HEADER.unpack(frames[0][:HEADER.size])
+    assert (request_id, flags) == (7, FLAG_END)
+    assert json.loads(frames[0][HEADER.size:]) == {"result": "pong"}
+    assert length == len(frames[0]) - HEADER.size
+
+
+def test_large_message_is_chunked():
+    """Large messages are split into bounded frames that reassemble exactly."""
+    message = large_search_result(5000)
+    frames = list(encode_frames(1, message))
+    assert len(frames) > 1
+
+    payload = bytearray()
+    for i, frame in enumerate(frames):
+        _, length, flags = HEADER.unpack(frame[:HEADER.size])
+        assert length <= CHUNK_SIZE
+        assert bool(flags & FLAG_END) == (i == len(frames) - 1)
+        payload += frame[HEADER.size:]
+    assert decode_message(payload) == message
+
+
+def test_single_huge_value_is_chunked():
+    """A single multi-megabyte string is still split into bounded frames."""
+    message = {"result": "x" * (3 * 1024 * 1024 + 17)}
+    frames = list(encode_frames(1, message))
+    assert all(len(frame) - HEADER.size <= CHUNK_SIZE for frame in frames)
+    assert decode_message(b"".join(frame[HEADER.size:] for frame in frames)) == message
+
+
+@pytest.mark.asyncio
+async def test_reader_reassembles_interleaved_messages():
+    """Frames of different requests may be interleaved on the stream."""
+    first = list(encode_frames(1, large_search_result(2000)))
+    second = list(encode_frames(2, {"result": "pong"}))
+    reader = MessageReader(feed(first[0], second[0], *first[1:]))
+
+    request_id, _, payload = await reader.read()
+    assert (request_id, decode_message(payload)) == (2, {"result": "pong"})
+    request_id, _, payload = await reader.read()
+    assert (request_id, decode_message(payload)) == (1, large_search_result(2000))
+    assert await reader.read() is None
+
+
+@pytest.mark.asyncio
+async def test_reader_discards_aborted_message():
+    """An abort frame drops the partial message for that request."""
+    partial = list(encode_frames(3, large_search_result(2000)))[0]
+    abort = HEADER.pack(3, 0, FLAG_ABORT)
+    retry = list(encode_frames(3, {"error": "failed"}))
+    reader = MessageReader(feed(partial, abort, *retry))
+
+    request_id, _, payload = await reader.read()
+    assert (request_id, decode_message(payload)) == (3, {"error": "failed"})
+
+
+@pytest.mark.asyncio
+async def test_reader_rejects_oversized_frame():
+    """Frames above the size limit are a protocol error."""
+    reader = MessageReader(feed(HEADER.pack(1, protocol.MAX_FRAME_SIZE + 1, FLAG_END)))
+    with pytest.raises(ProtocolError):
+        await reader.read()
+
+
+@pytest.mark.asyncio
+async def test_reader_rejects_oversized_message(monkeypatch):
+    """Messages above the total size limit are a protocol error."""
+    monkeypatch.setattr(protocol, "MAX_MESSAGE_SIZE", 100)
+    reader = MessageReader(feed(*encode_frames(1, {"result": "x" * 200})))
+    with pytest.raises(ProtocolError):
+        await reader.read()
+
+
+@pytest.mark.asyncio
+async def test_reader_rejects_truncated_frame():
+    """A connection closed mid-frame is a protocol error, not end of stream."""
+    frame = next(encode_frames(1, {"result": "pong"}))
+    reader = MessageReader(feed(frame[:-2]))
+    with pytest.raises(ProtocolError):
+        await reader.read()
+
+
+@pytest.mark.asyncio
+async def test_write_message_aborts_on_encoding_error():
+    """An unencodable value sends an abort frame instead of a dangling message."""
+    written = []
+
+    class Writer:
+        def write(self, data):
+            written.append(bytes(data))
+
+        async def drain(self):
+            pass
+
+    message = {"matches": ["x" * CHUNK_SIZE, object()]}
+    with pytest.raises(TypeError):
+        await write_message(Writer(), 9, message)
+
+    _, _, flags = HEADER.unpack(written[-1][:HEADER.size])
+    assert flags == FLAG_ABORT
+
+
+def test_json_fallback_round_trips_bytes():
+    """Bytes survive the JSON encoding as base64."""
+    message = {"data": b"\x89PNG\r\n\x00\xff", "nested": {"blob": bytearray(b"abc")}}
+    frames = list(encode_frames(1, message, ENCODING_JSON))
+    decoded = decode_message(b"".join(frame[HEADER.size:] for frame in frames), ENCODING_JSON)
+    assert decoded == {"data": b"\x89PNG\r\n\x00\xff", "nested": {"blob": b"abc"}}
+
+
+def test_json_fallback_keeps_marker_shaped_data():
+    """Dicts that look like wrapped bytes, e.g. from an execute-js result, stay dicts."""
+    message = {
+        "result": {"__bytes__": "aGVsbG8="},
+        "__bytes__": "top level",
+        "items": [{"__bytes__~": 1, "__bytes__": [{"__bytes__": "eA=="}]}, "__bytes__"],
+        "data": b"real bytes",
+    }
+    frames = list(encode_frames(1, message, ENCODING_JSON))
+    assert decode_message(b"".join(frame[HEADER.size:] for frame in frames), ENCODING_JSON) == message
+
+
+def test_negotiate_encoding():
+    """The first mutually supported encoding wins, with JSON as the fallback."""
+    assert negotiate_encoding(["cbor", "json"]) == ENCODING_JSON
+    assert negotiate_encoding([]) == ENCODING_JSON
+    assert negotiate_encoding(["json", "msgpack"]) == ENCODING_JSON
+    assert ENCODING_JSON in available_encodings()
+
+
+@pytest.mark.asyncio
+async def test_msgpack_round_trip():
+    """MessagePack frames are flagged and carry raw bytes without base64."""
+    pytest.importorskip("msgpack")
+    assert negotiate_encoding(["msgpack", "json"]) == ENCODING_MSGPACK
+
+    screenshot = bytes(range(256)) * 1000
+    message = dict(large_search_result(2000), screenshot=screenshot)
+    frames = list(encode_frames(4, message, ENCODING_MSGPACK))
+    assert len(frames) > 1
+    assert all(HEADER.unpack(frame[:HEADER.size])[2] & FLAG_MSGPACK for frame in frames)
+    assert sum(len(frame) - HEADER.size for frame in frames) < len(screenshot) * 4 // 3 + 2_000_000
+
+    request_id, encoding, payload = await MessageReader(feed(*frames)).read()
+    assert (request_id, encoding) == (4, ENCODING_MSGPACK)
+    decoded = decode_message(payload, encoding)
+    assert decoded["screenshot"] == screenshot
+    assert decoded == message
+
+
+def test_msgpack_rejected_when_unavailable(monkeypatch):
+    """A MessagePack payload without msgpack installed is a ValueError."""
+    monkeypatch.setattr(protocol, "msgpack", None)
+    assert available_encodings() == [ENCODING_JSON]
+    with pytest.raises(ValueError):
+        decode_message(b"\x80", ENCODING_MSGPACK)
@@ -0,0 +1,92 @@
+"""Tests for daemon startup readiness signalling."""
+import asyncio
+import os
+import shutil
+import socket
+import sys
+import tempfile
+
+import pytest
+
+from playwright_mcp.browser_daemon.core.readiness import READY_FD_ENV, notify_ready, wait_until_ready
+from playwright_mcp.browser_daemon.core.server import UnixSocketServer
+
+
+@pytest.fixture
+def short_dir():
+    """Short directory for Unix sockets (paths are limited to ~100 bytes)."""
+    directory = tempfile.mkdtemp(prefix="pwmcp")
+    yield directory
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+async def spawn(code, write_fd):
+    env = dict(os.environ, **{READY_FD_ENV: str(write_fd)})
+    env["PYTHONPATH"] = os.pathsep.join(sys.path)
+    try:
+        return await asyncio.create_subprocess_exec(sys.executable, "-c", code, env=env, pass_fds=(write_fd,))
+    finally:
+        os.close(write_fd)
+
+
+@pytest.mark.asyncio
+async def test_child_signals_readiness_over_pipe():
+    read_fd, write_fd = os.pipe()
+    process = await spawn(
+        "from playwright_mcp.browser_daemon.core.readiness import notify_ready\n"
+        "import time; notify_ready(); time.sleep(0.5)",
+        write_fd,
+    )
+    try:
+        assert await wait_until_ready(read_fd, timeout=10) is True
+        assert process.returncode is None  # Ready while still running, not on exit
+    finally:
+        await process.wait()
+
+
+@pytest.mark.asyncio
+async def test_child_exiting_before_ready_is_detected():
+    read_fd, write_fd = os.pipe()
+    process = await spawn("raise SystemExit(3)", write_fd)
+
+    assert await wait_until_ready(read_fd, timeout=10) is False
+    assert await process.wait() == 3
+
+
+@pytest.mark.asyncio
+async def test_wait_times_out():
+    read_fd, write_fd = os.pipe()
+    try:
+        with pytest.raises(asyncio.TimeoutError):
+            await wait_until_ready(read_fd, timeout=0.05)
+    finally:
+        os.close(write_fd)
+
+
+def test_notify_ready_sends_sd_notify_message(monkeypatch, short_dir):
+    path = os.path.join(short_dir, "notify")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+        sock.bind(path)
+        monkeypatch.setenv("NOTIFY_SOCKET", path)
+        monkeypatch.delenv(READY_FD_ENV, raising=False)
+        notify_ready()
+        assert sock.recv(64) == b"READY=1"
+
+
+@pytest.mark.asyncio
+async def test_server_reports_ready_once_listening(short_dir):
+    server = UnixSocketServer()
+    server._socket_path = os.path.join(short_dir, "daemon.sock")
+    connected = asyncio.get_running_loop().create_future()
+
+    def on_ready():
+        # The socket must already accept connections
+        connected.set_result(asyncio.ensure_future(asyncio.open_unix_connection(server._socket_path)))
+
+    task = asyncio.create_task(server.start(lambda reader, writer: writer.close(), on_ready=on_ready))
+    try:
+        _, writer = await asyncio.wait_for(await connected, 5)
+        writer.close()
+    finally:
+        task.cancel()
+        server.cleanup()
@@ -0,0 +1,116 @@
+"""Tests for idle and LRU eviction of sessions and pages."""
+import os
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from playwright.async_api import Browser, BrowserContext, Page
+
+from playwright_mcp.browser_daemon.browser_manager import BrowserManager
+from playwright_mcp.browser_daemon.core.reaper import Reaper, process_tree_rss
+from playwright_mcp.browser_daemon.core.session import SessionManager, WarmPool
+
+
+@pytest.fixture
+async def manager():
+    """The shared session manager, emptied, with a mock browser."""
+    mgr = SessionManager()
+    await mgr.shutdown()
+    mgr.evicted.clear()
+    mgr.isolation = "context"
+    mgr.pool = WarmPool(mgr._warm_session)
+    mgr.max_free_pages = 0
+
+    def new_context():
+        context = MagicMock(spec=BrowserContext)
+        context.close = AsyncMock()
+        context.new_page = AsyncMock(side_effect=lambda: MagicMock(spec=Page, close=AsyncMock()))
+        return context
+
+    browser = MagicMock(spec=Browser)
+    browser.new_context = AsyncMock(side_effect=new_context)
+    browser.close = AsyncMock()
+    mgr._launch_browser = AsyncMock(return_value=browser)
+    yield mgr
+    await mgr.shutdown()
+    mgr.evicted.clear()
+    del mgr._launch_browser
+
+
+def age(mgr, key, seconds):
+    mgr.last_used[key] = time.monotonic() - seconds
+
+
+@pytest.mark.asyncio
+async def test_idle_sessions_and_pages_are_evicted(manager):
+    idle = await manager.launch_browser()
+    idle_pages = [await manager.new_page(idle) for _ in range(2)]
+    active = await manager.launch_browser()
+    active_page = await manager.new_page(active)
+    stale_page = await manager.new_page(active)
+    for key in [idle, *idle_pages, stale_page]:
+        age(manager, key, 120)
+
+    reaper = Reaper(manager, idle_ttl=60)
+    evicted = await reaper.sweep()
+
+    assert evicted == [(idle, "idle"), (stale_page, "idle")]
+    assert set(manager.sessions) == {active}
+    assert set(manager.pages) == {active_page}
+    for key in [idle, *idle_pages, stale_page]:
+        assert manager.eviction_reason(key) == "idle"
+    assert reaper.stats() == {"idle": 2}
+
+
+@pytest.mark.asyncio
+async def test_limits_evict_least_recently_used_first(manager):
+    session_id = await manager.launch_browser()
+    pages = [await manager.new_page(session_id) for _ in range(4)]
+    for seconds, page_id in zip([10, 40, 30, 20], pages):
+        age(manager, page_id, seconds)
+
+    # The oldest page has a command in flight, so the next oldest go instead
+    reaper = Reaper(manager, busy=lambda key: key == pages[1], idle_ttl=0, max_pages=2)
+    evicted = await reaper.sweep()
+
+    assert evicted == [(pages[2], "page limit"), (pages[3], "page limit")]
+    assert set(manager.pages) == {pages[0], pages[1]}
+
+
+@pytest.mark.asyncio
+async def test_memory_limit_evicts_one_session_per_round_while_it_helps(manager):
+    sessions = [await manager.launch_browser() for _ in range(4)]
+    for seconds, session_id in zip([40, 30, 20, 10], sessions):
+        age(manager, session_id, seconds)
+    samples = [300, 200, 250, 250, 100, 300]
+    rss = MagicMock(side_effect=[mb * 2**20 for mb in samples])
+
+    reaper = Reaper(manager, idle_ttl=0, max_rss_mb=150, rss=rss)
+    rounds = [await reaper.sweep() for _ in samples]
+
+    # 200 MB: the first eviction helped. 250 MB: the second did not, so no more until memory drops
+    assert rounds == [[(sessions[0], "memory limit")], [(sessions[1], "memory limit")], [], [], [],
+                      [(sessions[2], "memory limit")]]
+    assert rss.call_count == len(samples)
+    assert set(manager.sessions) == {sessions[3]}
+
+
+@pytest.mark.asyncio
+async def test_commands_for_evicted_ids_report_eviction(manager):
+    browser_manager = BrowserManager()
+    handler = MagicMock()
+    handler.handle = AsyncMock(return_value={"success": True})
+    browser_manager.handlers = {"close-tab": handler}
+    session_id = await manager.launch_browser()
+    page_id = await manager.new_page(session_id)
+
+    await manager.evict_session(session_id, "idle")
+    response = await browser_manager.dispatch("close-tab", {"page_id": page_id})
+
+    assert response["code"] == "evicted"
+    assert page_id in response["error"]
+    handler.handle.assert_not_awaited()
+
+
+def test_process_tree_rss():
+    assert process_tree_rss(os.getppid()) > 0
@@ -0,0 +1,42 @@
+"""Tests for the registry handing out session and page IDs."""
+from playwright_mcp.browser_daemon.core.registry import Registry, parse_id
+
+
+def test_ids_are_never_reused():
+    registry = Registry()
+    first = registry.add("page", "a")
+    del registry[first]
+    second = registry.add("page", "b")
+
+    assert (first, second) == ("page_0.0", "page_0.1")
+    assert first not in registry
+    assert registry.get(first) is None
+    assert registry[second] == "b"
+
+    registry.clear()
+    assert registry.add("page", "c") == "page_0.2"
+    assert len(registry) == 1
+
+
+def test_prefix_is_part_of_the_id():
+    registry = Registry()
+    key = registry.add("chromium", "context")
+
+    assert key == "chromium_0.0"
+    assert "firefox_0.0" not in registry
+    assert parse_id("chromium_0.0") == ("chromium", 0, 0)
+    assert parse_id("page_140230") is None
+
+
+def test_works_as_a_mapping():
+    registry = Registry()
+    keys = [registry.add("page", value) for value in "abc"]
+    registry["page_bench"] = "d"
+    registry[keys[1]] = "B"
+
+    assert dict(registry) == {keys[0]: "a", keys[1]: "B", keys[2]: "c", "page_bench": "d"}
+    assert registry.pop(keys[0]) == "a"
+    assert registry.pop(keys[0], None) is None
+    assert list(registry) == [keys[1], keys[2], "page_bench"]
+    # Freed slots are reused, with a new generation
+    assert registry.add("page", "e") == "page_0.1"
@@ -0,0 +1,118 @@
+"""Tests for per-session resource policies."""
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from playwright.async_api import BrowserContext
+
+from playwright_mcp.browser_daemon.core.resources import ResourceBlocker, ResourcePolicy, TYPICAL_BYTES
+from playwright_mcp.browser_daemon.core.session import SessionManager
+from playwright_mcp.browser_daemon.handlers.navigation import NavigationHandler
+
+
+def test_parse_policy():
+    assert ResourcePolicy.parse(None) is None
+    assert ResourcePolicy.parse("none") is None
+    assert ResourcePolicy.parse("assets").block_types == {"image", "media", "font"}
+
+    policy = ResourcePolicy.parse({"preset": "assets", "block_types": ["stylesheet"], "block_domains": [".ads.io"]})
+    assert policy.block_types == {"image", "media", "font", "stylesheet"}
+    assert policy.block_domains == ("ads.io",)
+
+    for value in ["everything", {"block_types": ["pictures"]}, {"block": ["image"]}, {"block_domains": "x.com"}]:
+        with pytest.raises(ValueError):
+            ResourcePolicy.parse(value)
+
+
+def test_policy_blocks_types_and_domains():
+    policy = ResourcePolicy(frozenset({"font"}), ("tracker.io",))
+
+    assert policy.blocks("https://example.com/a.woff2", "font")
+    assert policy.blocks("https://cdn.tracker.io/t.js", "script")
+    assert policy.blocks("https://tracker.io/pixel", "image")
+    assert not policy.blocks("https://nottracker.io/app.js", "script")
+    assert not policy.blocks("https://example.com/", "document")
+
+
+def make_route(url, resource_type, page):
+    route = MagicMock()
+    route.request.url = url
+    route.request.resource_type = resource_type
+    route.request.frame.page = page
+    route.abort = AsyncMock()
+    route.fallback = AsyncMock()
+    return route
+
+
+@pytest.mark.asyncio
+async def test_blocker_counts_per_page():
+    blocker = ResourceBlocker(ResourcePolicy.parse("lean"))
+    page, other = MagicMock(), MagicMock()
+    blocker.start_counting(page)
+
+    image = make_route("https://example.com/hero.png", "image", page)
+    await blocker.handle(image)
+    await blocker.handle(make_route("https://www.google-analytics.com/g/collect", "fetch", page))
+    await blocker.handle(make_route("https://example.com/logo.svg", "image", other))
+    allowed = make_route("https://example.com/app.js", "script", page)
+    await blocker.handle(allowed)
+
+    image.abort.assert_awaited_once_with("blockedbyclient")
+    allowed.fallback.assert_awaited_once()
+    allowed.abort.assert_not_awaited()
+    assert blocker.counts(page).to_dict() == {
+        "requests": 2,
+        "bytes_saved": TYPICAL_BYTES["image"] + 5_000,
+        "by_type": {"image": 1, "fetch": 1},
+    }
+    assert blocker.counts(other).requests == 1
+    assert blocker.total.requests == 3
+
+
+@pytest.mark.asyncio
+async def test_session_policy_routes_its_context():
+    manager = SessionManager()
+    context = MagicMock(spec=BrowserContext)
+    context.route = AsyncMock()
+    context.unroute = AsyncMock()
+    manager.add_session("chromium_test", context)
+    try:
+        blocker = await manager.set_resource_policy("chromium_test", ResourcePolicy.parse("assets"))
+        context.route.assert_awaited_once_with("**/*", blocker.handle)
+        assert await manager.set_resource_policy("chromium_test", ResourcePolicy.parse("assets")) is blocker
+
+        assert await manager.set_resource_policy("chromium_test", None) is None
+        context.unroute.assert_awaited_once_with("**/*", blocker.handle)
+        assert "chromium_test" not in manager.blockers
+    finally:
+        manager.remove_session("chromium_test")
+
+
+@pytest.mark.asyncio
+async def test_navigate_reports_blocked_requests():
+    page = AsyncMock()
+    blocker = ResourceBlocker(ResourcePolicy.parse("assets"))
+
+    async def goto(url, wait_until):
+        await blocker.handle(make_route("https://example.com/a.png", "image", page))
+    page.goto = AsyncMock(side_effect=goto)
+
+    manager = MagicMock(spec=SessionManager)
+    manager.blockers = {}
+    manager.http_cache = None
+
+    async def launch_browser(browser_type, headless, policy, storage_state, har=None):
+        manager.blockers["s1"] = blocker
+        assert policy == ResourcePolicy.parse("assets")
+        return "s1"
+    manager.get_session = MagicMock(return_value=None)
+    manager.launch_browser = AsyncMock(side_effect=launch_browser)
+    manager.new_page = AsyncMock(return_value="p1")
+    manager.get_page = MagicMock(return_value=page)
+
+    handler = NavigationHandler(manager)
+    result = await handler.handle({"command": "navigate", "url": "https://example.com", "resource_policy": "assets",
+                                   "wait_until": "load"})
+
+    assert result["blocked"] == {"requests": 1, "bytes_saved": TYPICAL_BYTES["image"], "by_type": {"image": 1}}
+    assert "error" in await handler.handle({"command": "navigate", "url": "https://example.com",
+                                            "resource_policy": "everything"})
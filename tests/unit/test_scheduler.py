@@ -0,0 +1,111 @@
+"""Tests for per-page command ordering and concurrency limits."""
+import asyncio
+
+import pytest
+
+from playwright_mcp.browser_daemon.browser_manager import BrowserManager
+from playwright_mcp.browser_daemon.core.scheduler import CommandScheduler, Overloaded
+
+
+class Recorder:
+    """Records when each named job starts and finishes."""
+
+    def __init__(self):
+        self.log = []
+        self.active = 0
+        self.peak = 0
+
+    def job(self, name, delay=0.02):
+        async def run():
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            self.log.append(f"start {name}")
+            await asyncio.sleep(delay)
+            self.log.append(f"end {name}")
+            self.active -= 1
+            return name
+        return run
+
+
+@pytest.mark.asyncio
+async def test_commands_for_one_page_run_in_order():
+    scheduler = CommandScheduler()
+    recorder = Recorder()
+
+    results = await asyncio.gather(
+        scheduler.run(recorder.job("navigate", 0.05), page_id="p1"),
+        scheduler.run(recorder.job("click", 0), page_id="p1"),
+        scheduler.run(recorder.job("screenshot", 0), page_id="p1"),
+    )
+
+    assert results == ["navigate", "click", "screenshot"]
+    assert recorder.log == [
+        "start navigate", "end navigate", "start click", "end click", "start screenshot", "end screenshot",
+    ]
+    assert scheduler.stats()["active_pages"] == 0
+
+
+@pytest.mark.asyncio
+async def test_different_pages_run_in_parallel():
+    scheduler = CommandScheduler()
+    recorder = Recorder()
+
+    await asyncio.gather(*(scheduler.run(recorder.job(f"p{i}"), page_id=f"p{i}") for i in range(5)))
+
+    assert recorder.peak == 5
+
+
+@pytest.mark.asyncio
+async def test_global_and_session_limits():
+    scheduler = CommandScheduler(max_concurrent=3, max_per_session=2)
+    recorder = Recorder()
+
+    await asyncio.gather(*(scheduler.run(recorder.job(i), page_id=f"p{i}", session_id="s") for i in range(6)))
+    assert recorder.peak == 2
+
+    recorder = Recorder()
+    await asyncio.gather(*(scheduler.run(recorder.job(i), page_id=f"p{i}", session_id=f"s{i}") for i in range(6)))
+    assert recorder.peak == 3
+
+
+@pytest.mark.asyncio
+async def test_rejects_when_queue_is_full():
+    scheduler = CommandScheduler(max_queued=2)
+    recorder = Recorder()
+
+    running = asyncio.ensure_future(scheduler.run(recorder.job("running", 0.05), page_id="p"))
+    await asyncio.sleep(0)
+    queued = [asyncio.ensure_future(scheduler.run(recorder.job(i, 0), page_id="p")) for i in range(2)]
+    await asyncio.sleep(0)
+
+    with pytest.raises(Overloaded):
+        await scheduler.run(recorder.job("rejected"), page_id="p")
+    assert scheduler.stats()["rejected"] == 1
+
+    await asyncio.gather(running, *queued)
+    assert scheduler.stats()["queued"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiters_leave_the_queue():
+    scheduler = CommandScheduler()
+    recorder = Recorder()
+
+    running = asyncio.ensure_future(scheduler.run(recorder.job("running", 0.05), page_id="p"))
+    waiting = asyncio.ensure_future(scheduler.run(recorder.job("waiting"), page_id="p"))
+    await asyncio.sleep(0)
+    waiting.cancel()
+    await running
+
+    assert scheduler.stats() == {"running": 0, "queued": 0, "rejected": 0, "active_pages": 0, "active_sessions": 0}
+
+
+@pytest.mark.asyncio
+async def test_dispatch_reports_overload():
+    manager = BrowserManager()
+    manager.scheduler = CommandScheduler(max_queued=0)
+
+    result = await manager.dispatch("navigate", {"url": "https://example.com"})
+
+    assert result["code"] == "overloaded"
+    assert result["error"].startswith("Browser daemon is overloaded")
@@ -1,8 +1,9 @@
 """Unit tests for SessionManager class."""
 import pytest
 from unittest.mock import AsyncMock, MagicMock
-from playwright.async_api import Browser, Page
-from playwright_mcp.browser_daemon.core.session import SessionManager, session_manager
+from playwright.async_api import Browser, BrowserContext, Page
+from playwright_mcp.browser_daemon.browser_manager import BrowserManager
+from playwright_mcp.browser_daemon.core.session import SessionManager, WarmPool, session_manager
 
 
 @pytest.fixture
@@ -13,6 +14,14 @@ def mock_browser():
     return browser
 
 
+@pytest.fixture
+def mock_context():
+    """Create a mock browser context instance."""
+    context = MagicMock(spec=BrowserContext)
+    context.close = AsyncMock()
+    return context
+
+
 @pytest.fixture
 def mock_page():
     """Create a mock page instance."""
@@ -22,11 +31,21 @@ def mock_page():
 
 
 @pytest.fixture
-def session_mgr(mock_browser, mock_page):
+def session_mgr(mock_browser, mock_context, mock_page):
     """Get a clean session manager instance for each test."""
     mgr = SessionManager()
     mgr.sessions.clear()
     mgr.pages.clear()
+    mgr.page_sessions.clear()
+    mgr.session_pages.clear()
+    mgr.page_ids.clear()
+    mgr.browsers.clear()
+    mgr.session_browsers.clear()
+    mgr._warm_pages.clear()
+    mgr.free_pages.clear()
+    mgr.max_free_pages = 4
+    mgr.pool = WarmPool(mgr._warm_session)
+    mgr.isolation = "context"
     mgr.playwright = None
     mgr._initialized = True
     
@@ -38,7 +57,8 @@ def session_mgr(mock_browser, mock_page):
     async def mock_new_page():
         return mock_page
         
-    mock_browser.new_page = mock_new_page
+    mock_browser.new_context = AsyncMock(return_value=mock_context)
+    mock_context.new_page = mock_new_page
     mgr._launch_browser = AsyncMock(side_effect=mock_launch)
     
     return mgr
@@ -54,7 +74,7 @@ async def test_singleton_behavior():
 
 
 @pytest.mark.asyncio
-async def test_session_management(session_mgr, mock_browser):
+async def test_session_management(session_mgr, mock_browser, mock_context):
     """Test basic session management operations."""
     # Launch browser
     session_id = await session_mgr.launch_browser(headless=True)
@@ -64,15 +84,101 @@ async def test_session_management(session_mgr, mock_browser):
     # Get session
     session = session_mgr.get_session(session_id)
     assert session is not None
-    assert session is mock_browser
+    assert session is mock_context
     
-    # Close session
+    # Close session; the shared browser stays up
     result = await session_mgr.close_browser(session_id)
     assert result is True
     assert session_id not in session_mgr.sessions
+    mock_context.close.assert_awaited_once()
+    mock_browser.close.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_sessions_share_one_browser(session_mgr, mock_browser):
+    """Sessions of the same browser type reuse one browser, each with its own context."""
+    mock_browser.new_context = AsyncMock(side_effect=lambda: MagicMock(spec=BrowserContext))
+
+    first = await session_mgr.launch_browser(headless=True)
+    second = await session_mgr.launch_browser(headless=True)
+
+    assert first != second
+    assert session_mgr.get_session(first) is not session_mgr.get_session(second)
+    session_mgr._launch_browser.assert_awaited_once_with("chromium", True)
+
+    # A different mode gets a browser of its own
+    await session_mgr.launch_browser(headless=False)
+    assert session_mgr._launch_browser.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_browser_isolation(session_mgr, mock_browser):
+    """With browser isolation every session launches and closes its own browser."""
+    session_mgr.isolation = "browser"
+    mock_browser.new_context = AsyncMock(side_effect=lambda: MagicMock(spec=BrowserContext, close=AsyncMock()))
+
+    first = await session_mgr.launch_browser(headless=True)
+    second = await session_mgr.launch_browser(headless=True)
+    assert session_mgr._launch_browser.await_count == 2
+    assert session_mgr.browsers == {}
+
+    await session_mgr.close_browser(first)
     mock_browser.close.assert_awaited_once()
+    assert first not in session_mgr.session_browsers
+    assert second in session_mgr.session_browsers
+
+
+@pytest.mark.asyncio
+async def test_close_browser_removes_pages(session_mgr, mock_page):
+    """Closing a session forgets the pages that belonged to it."""
+    session_id = await session_mgr.launch_browser(headless=True)
+    page_id = await session_mgr.new_page(session_id)
+
+    await session_mgr.close_browser(session_id)
+
+    assert page_id not in session_mgr.pages
+    assert session_mgr.session_for_page(page_id) is None
+
+
+@pytest.mark.asyncio
+async def test_sessions_index_their_pages(session_mgr, mock_context):
+    """Pages are found through their session, and a session knows which pages it owns."""
+    session_mgr._launch_browser.side_effect = None
+    session_mgr._launch_browser.return_value.new_context = distinct_contexts()
+    first, second = [await session_mgr.launch_browser(headless=True) for _ in range(2)]
+    first_pages = [await session_mgr.new_page(first) for _ in range(2)]
+    second_page = await session_mgr.new_page(second)
+
+    assert session_mgr.pages_of(first) == first_pages
+    assert session_mgr.owns(first, first_pages[0]) and not session_mgr.owns(first, second_page)
+    assert session_mgr.page_id_for(session_mgr.pages[second_page]) == second_page
+
+    await session_mgr.close_page(first_pages[0])
+    assert session_mgr.pages_of(first) == first_pages[1:]
+    await session_mgr.close_browser(first)
+    assert session_mgr.pages_of(first) == []
+    assert list(session_mgr.pages) == [second_page]
 
 
+@pytest.mark.asyncio
+async def test_commands_on_another_sessions_page_are_refused(session_mgr, mock_browser):
+    """A command naming a session and a page of a different session never reaches its handler."""
+    mock_browser.new_context = distinct_contexts()
+    first, second = [await session_mgr.launch_browser(headless=True) for _ in range(2)]
+    page_id = await session_mgr.new_page(second)
+    browser_manager = BrowserManager()
+    handler = MagicMock()
+    handler.handle = AsyncMock(return_value={"success": True})
+    browser_manager.handlers = {"close-tab": handler}
+
+    response = await browser_manager.dispatch("close-tab", {"session_id": first, "page_id": page_id})
+    assert "does not belong" in response["error"]
+    handler.handle.assert_not_awaited()
+
+    assert await browser_manager.dispatch("close-tab", {"session_id": second, "page_id": page_id}) == {"success": True}
+
+
+@pytest.mark.asyncio
 @pytest.mark.asyncio
 async def test_page_management(session_mgr, mock_browser, mock_page):
     """Test page creation and management."""
@@ -117,18 +223,148 @@ async def test_page_persistence(session_mgr, mock_browser, mock_page):
     assert page_id in session_mgr.pages
 
 
+@pytest.fixture
+def reusable_page(mock_context, mock_page):
+    """Make the mock page resettable and the context hand it out on new_page."""
+    mock_page.is_closed = MagicMock(return_value=False)
+    mock_page.unroute_all = AsyncMock()
+    mock_page.evaluate = AsyncMock()
+    mock_page.goto = AsyncMock()
+    mock_page.context.new_cdp_session = AsyncMock(return_value=AsyncMock())
+    mock_context.new_page = AsyncMock(return_value=mock_page)
+    return mock_page
+
+
+@pytest.mark.asyncio
+async def test_closed_tab_is_recycled(session_mgr, mock_context, reusable_page):
+    """Closing a tab resets its page and the next new tab reuses it under a new ID."""
+    session_id = await session_mgr.launch_browser(headless=True)
+    first = await session_mgr.new_page(session_id)
+
+    assert await session_mgr.close_page(first) is True
+    reusable_page.close.assert_not_awaited()
+    reusable_page.unroute_all.assert_awaited_once()
+    reusable_page.goto.assert_awaited_once_with("about:blank")
+    cdp = reusable_page.context.new_cdp_session.return_value
+    cdp.send.assert_awaited_once_with("Page.resetNavigationHistory")
+    assert reusable_page.remove_listener.call_count == reusable_page.on.call_count
+    assert session_mgr.free_pages[session_id] == [reusable_page]
+
+    second = await session_mgr.new_page(session_id)
+    assert second != first
+    assert session_mgr.get_page(second) is reusable_page
+    assert session_mgr.get_page(first) is None
+    mock_context.new_page.assert_awaited_once()
+    assert session_mgr.free_pages[session_id] == []
+
+
+@pytest.mark.asyncio
+async def test_closed_tab_closed_when_not_recyclable(session_mgr, reusable_page):
+    """Pages are closed when the free list is full or the reset fails."""
+    session_id = await session_mgr.launch_browser(headless=True)
+
+    session_mgr.max_free_pages = 0
+    await session_mgr.close_page(await session_mgr.new_page(session_id))
+    assert reusable_page.close.await_count == 1
+
+    session_mgr.max_free_pages = 4
+    reusable_page.goto.side_effect = Exception("Target crashed")
+    await session_mgr.close_page(await session_mgr.new_page(session_id))
+    assert reusable_page.close.await_count == 2
+
+    # Without CDP the tab's history cannot be reset
+    reusable_page.goto.side_effect = None
+    reusable_page.context.new_cdp_session.side_effect = Exception("CDP is only supported on Chromium")
+    await session_mgr.close_page(await session_mgr.new_page(session_id))
+    assert reusable_page.close.await_count == 3
+    assert session_mgr.free_pages[session_id] == []
+
+
+@pytest.mark.asyncio
+async def test_tab_that_visited_several_origins_is_not_recycled(session_mgr, reusable_page):
+    """sessionStorage can only be cleared for the current origin, so such tabs are closed."""
+    session_id = await session_mgr.launch_browser(headless=True)
+    page_id = await session_mgr.new_page(session_id)
+    on_navigated = dict(call.args for call in reusable_page.on.call_args_list)["framenavigated"]
+    for url in ["https://a.test/login", "https://a.test/home", "https://b.test/"]:
+        on_navigated(MagicMock(parent_frame=None, url=url))
+
+    await session_mgr.close_page(page_id)
+
+    reusable_page.close.assert_awaited_once()
+    assert session_mgr.free_pages[session_id] == []
+
+
+def distinct_contexts():
+    """A new_context mock that returns a new context, with a new page, on every call."""
+    def new_context():
+        context = MagicMock(spec=BrowserContext)
+        context.close = AsyncMock()
+        context.new_page = AsyncMock(side_effect=lambda: MagicMock(spec=Page))
+        return context
+    return AsyncMock(side_effect=new_context)
+
+
+@pytest.mark.asyncio
+async def test_warm_pool_serves_sessions(session_mgr, mock_browser):
+    """New sessions come from the pool, with their blank page, and the pool refills."""
+    mock_browser.new_context = distinct_contexts()
+    session_mgr.pool = WarmPool(session_mgr._warm_session, size=1)
+    key = ("chromium", True)
+    await session_mgr.pool.fill(key)
+    warm = session_mgr.pool.entries[key][0]
+
+    session_id = await session_mgr.launch_browser(headless=True)
+    assert session_mgr.get_session(session_id) is warm.context
+    page_id = await session_mgr.new_page(session_id)
+    assert session_mgr.get_page(page_id) is warm.page
+    warm.context.new_page.assert_awaited_once()  # Only the warm page
+
+    await session_mgr.pool._refills[key]
+    assert session_mgr.pool.stats() == {"size": 1, "hits": 1, "misses": 0, "warm": {"chromium/headless": 1}}
+
+    await session_mgr.shutdown()
+    assert session_mgr.pool.entries == {}
+
+
+@pytest.mark.asyncio
+async def test_warm_pool_miss(session_mgr, mock_browser):
+    """An empty pool counts a miss and the session is started on demand."""
+    mock_browser.new_context = distinct_contexts()
+    session_mgr.pool = WarmPool(session_mgr._warm_session, size=2)
+
+    session_id = await session_mgr.launch_browser(headless=False)
+
+    assert session_id in session_mgr.sessions
+    assert session_mgr.pool.misses == 1
+    await session_mgr.pool._refills[("chromium", False)]
+    assert len(session_mgr.pool.entries[("chromium", False)]) == 2
+
+
+@pytest.mark.asyncio
+async def test_warm_pool_disabled(session_mgr):
+    """A pool of size zero never starts sessions or counts lookups."""
+    session_mgr.pool.warm_up()
+    await session_mgr.launch_browser(headless=True)
+
+    assert session_mgr.pool.stats() == {"size": 0, "hits": 0, "misses": 0, "warm": {}}
+    assert session_mgr.pool._refills == {}
+
+
 @pytest.mark.asyncio
-async def test_shared_instance_behavior(mock_browser, mock_page):
+async def test_shared_instance_behavior(mock_browser, mock_context, mock_page):
     """Test behavior of the shared session_manager instance."""
     # Clear any existing state
     session_manager.sessions.clear()
     session_manager.pages.clear()
+    session_manager.browsers.clear()
     
     # Setup mocks for the shared instance
     async def mock_launch(browser_type: str, headless: bool):
         return mock_browser
     session_manager._launch_browser = AsyncMock(side_effect=mock_launch)
-    mock_browser.new_page = AsyncMock(return_value=mock_page)
+    mock_browser.new_context = AsyncMock(return_value=mock_context)
+    mock_context.new_page = AsyncMock(return_value=mock_page)
     
     # Create session and page
     session_id = await session_manager.launch_browser(headless=True)
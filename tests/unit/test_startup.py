@@ -0,0 +1,37 @@
+"""Tests for keeping heavy subsystems off the daemon startup path."""
+import os
+import subprocess
+import sys
+
+import pytest
+
+from playwright_mcp.browser_daemon.startup_profile import import_breakdown, profile_startup
+
+HEAVY_MODULES = ["pydantic_ai", "anthropic", "bs4", "lxml", "mcp"]
+
+
+def test_daemon_import_skips_heavy_subsystems(tmp_path):
+    """Importing the daemon loads neither the AI agent stack, the HTML parser nor the MCP SDK."""
+    code = (
+        "import sys, playwright_mcp.browser_daemon.browser_manager\n"
+        f"print([m for m in {HEAVY_MODULES!r} if m in sys.modules])"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=tmp_path,
+        env=dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path), LOG_LEVEL="WARNING"),
+    )
+    assert result.stdout.strip() == "[]"
+    assert not (tmp_path / "logs").exists()  # Log files are only created once something is logged
+
+
+def test_import_breakdown_lists_packages():
+    breakdown = dict(import_breakdown(top=100))
+    assert "playwright" in breakdown
+    assert "pydantic_ai" not in breakdown
+
+
+@pytest.mark.asyncio
+async def test_profile_startup_reaches_first_pong():
+    phases = await profile_startup()
+    assert list(phases) == ["import", "init", "listening", "first pong"]
+    assert phases["import"] <= phases["init"] <= phases["listening"] <= phases["first pong"]
@@ -0,0 +1,120 @@
+"""Tests for storage-state snapshots."""
+import json
+import os
+import stat
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from playwright.async_api import BrowserContext
+
+from playwright_mcp.browser_daemon.core.session import SessionManager
+from playwright_mcp.browser_daemon.core.storage import SnapshotStore
+from playwright_mcp.browser_daemon.handlers.navigation import NavigationHandler
+from playwright_mcp.browser_daemon.handlers.session import SessionHandler
+
+STATE = {"cookies": [{"name": "sid", "value": "abc", "domain": "example.com", "path": "/"}], "origins": []}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SnapshotStore(str(tmp_path / "storage"), default_ttl=60)
+
+
+def test_save_and_load(store):
+    meta = store.save("example-login", STATE)
+
+    assert meta["expires_at"] - meta["saved_at"] == 60
+    assert store.load("example-login") == STATE
+    assert store.load("other") is None
+    assert [s["name"] for s in store.list()] == ["example-login"]
+    # Written in one piece, readable only by its owner
+    assert os.listdir(store.directory) == ["example-login.json"]
+    mode = os.stat(os.path.join(store.directory, "example-login.json")).st_mode
+    assert stat.S_IMODE(mode) == 0o600
+
+    assert store.delete("example-login") is True
+    assert store.delete("example-login") is False
+    assert store.list() == []
+
+
+def test_expired_snapshots_are_gone(store):
+    store.save("old", STATE, ttl=60)
+    path = os.path.join(store.directory, "old.json")
+    with open(path) as f:
+        snapshot = json.load(f)
+    snapshot["expires_at"] = snapshot["saved_at"] - 1
+    with open(path, "w") as f:
+        json.dump(snapshot, f)
+
+    assert store.load("old") is None
+    assert not os.path.exists(path)
+
+
+def test_invalid_names(store):
+    for name in ["", "../secrets", ".hidden", "a/b", "x" * 200]:
+        with pytest.raises(ValueError):
+            store.save(name, STATE)
+    with pytest.raises(ValueError):
+        store.save("fine", STATE, ttl=0)
+
+
+@pytest.mark.asyncio
+async def test_save_storage_command(store):
+    context = MagicMock(spec=BrowserContext)
+    context.storage_state = AsyncMock(return_value=STATE)
+    manager = MagicMock(spec=SessionManager)
+    manager.get_session = MagicMock(side_effect=lambda session_id: context if session_id == "s1" else None)
+    handler = SessionHandler(manager, store)
+
+    saved = await handler.handle({"command": "save-storage", "session_id": "s1", "name": "login", "ttl": 30})
+
+    assert saved["name"] == "login" and saved["cookies"] == 1 and saved["origins"] == 0
+    assert store.load("login") == STATE
+    assert "error" in await handler.handle({"command": "save-storage", "session_id": "s2", "name": "login"})
+    assert (await handler.handle({"command": "list-storage"}))["snapshots"][0]["name"] == "login"
+    assert await handler.handle({"command": "delete-storage", "name": "login"}) == {"success": True}
+
+
+@pytest.mark.asyncio
+async def test_navigate_seeds_new_session(store, monkeypatch):
+    monkeypatch.setattr("playwright_mcp.browser_daemon.handlers.navigation.snapshot_store", store)
+    store.save("login", STATE)
+    manager = MagicMock(spec=SessionManager)
+    manager.blockers = {}
+    manager.http_cache = None
+    manager.get_session = MagicMock(return_value=None)
+    manager.launch_browser = AsyncMock(return_value="s1")
+    manager.new_page = AsyncMock(return_value="p1")
+    manager.get_page = MagicMock(return_value=AsyncMock())
+    handler = NavigationHandler(manager)
+
+    result = await handler.handle({"command": "navigate", "url": "https://example.com", "storage": "login",
+                                   "wait_until": "load"})
+
+    assert result["session_id"] == "s1"
+    assert manager.launch_browser.await_args.args[3] == STATE
+    missing = await handler.handle({"command": "navigate", "url": "https://example.com", "storage": "nope"})
+    assert missing["code"] == "no_snapshot"
+
+    manager.get_session = MagicMock(return_value=MagicMock())
+    existing = await handler.handle({"command": "navigate", "url": "https://example.com", "session_id": "s1",
+                                     "storage": "login"})
+    assert existing == {"error": "storage can only be set for a new session"}
+
+
+@pytest.mark.asyncio
+async def test_seeded_session_skips_warm_pool():
+    manager = SessionManager()
+    browser = MagicMock()
+    browser.new_context = AsyncMock(return_value=MagicMock(spec=BrowserContext))
+    manager._shared_browser = AsyncMock(return_value=browser)
+    manager.pool.take = MagicMock()
+    try:
+        session_id = await manager.launch_browser(storage_state=STATE)
+
+        manager.pool.take.assert_not_called()
+        browser.new_context.assert_awaited_once_with(storage_state=STATE)
+    finally:
+        manager.remove_session(session_id)
+        del manager._shared_browser
+        del manager.pool.take
@@ -0,0 +1,138 @@
+"""Tests for routing commands across browser worker processes."""
+import asyncio
+import os
+import shutil
+import tempfile
+from unittest.mock import AsyncMock
+
+import pytest
+
+from playwright_mcp.browser_daemon.browser_manager import BrowserManager
+from playwright_mcp.browser_daemon.core.events import EventBus
+from playwright_mcp.browser_daemon.core.protocol import ProtocolError
+from playwright_mcp.browser_daemon.core.routing import add_owner, find_ids, split_owner, strip_owner
+from playwright_mcp.browser_daemon.core.workers import WorkerPool
+
+
+def test_owner_prefixes_round_trip():
+    response = {
+        "session_id": "chromium_1",
+        "page_id": "page_2",
+        "results": [{"command": "new-tab", "status": "ok", "result": {"page_ids": ["page_3", "page_4"]}}],
+    }
+
+    routed = add_owner(response, "w1")
+
+    assert routed == {
+        "session_id": "w1:chromium_1",
+        "page_id": "w1:page_2",
+        "results": [{"command": "new-tab", "status": "ok", "result": {"page_ids": ["w1:page_3", "w1:page_4"]}}],
+    }
+    assert strip_owner(routed, "w1") == response
+    assert split_owner("n2:w1:page_2") == ("n2", "w1:page_2")
+    assert split_owner("page_2") == (None, "page_2")
+    with pytest.raises(ValueError):
+        strip_owner(routed, "w0")
+
+
+def test_page_data_ids_are_not_prefixed():
+    """IDs inside results, e.g. an execute-js return value, are page data."""
+    response = {"page_id": "page_2", "result": {"page_id": "from the page", "rows": [{"session_id": "s"}]},
+                "results": [{"url": "https://example.com", "page_id": "p"}]}
+
+    routed = add_owner(response, "w1")
+
+    assert routed["page_id"] == "w1:page_2"
+    assert routed["result"] == response["result"] and routed["results"] == response["results"]
+
+
+def test_batch_references_are_not_ids():
+    args = {"steps": [{"args": {"page_id": "w0:page_1"}}, {"args": {"page_id": "$0.page_id"}}]}
+
+    assert list(find_ids(args)) == ["w0:page_1"]
+    assert strip_owner(args, "w0")["steps"][1]["args"]["page_id"] == "$0.page_id"
+
+
+@pytest.fixture
+def pool():
+    pool = WorkerPool(3, EventBus())
+    for worker in pool.workers:
+        worker.request = AsyncMock(return_value={"page_id": "page_9"})
+    yield pool
+    shutil.rmtree(pool.directory, ignore_errors=True)
+
+
+def test_route(pool):
+    w0, w1, w2 = pool.workers
+
+    assert pool.route({"page_id": "w2:page_1"}) is w2
+    # Unprefixed IDs always land on the same worker
+    assert pool.route({"session_id": "chromium_7"}) is pool.route({"session_id": "chromium_7"})
+    # New sessions go to the least busy worker
+    w0.in_flight, w1.in_flight, w2.in_flight = 3, 1, 2
+    assert pool.route({"url": "https://example.com"}) is w1
+    with pytest.raises(ValueError):
+        pool.route({"steps": [{"args": {"page_id": "w0:a"}}, {"args": {"page_id": "w1:b"}}]})
+
+
+@pytest.mark.asyncio
+async def test_execute_strips_and_adds_owner(pool):
+    response = await pool.execute("close-tab", {"page_id": "w1:page_1"})
+
+    pool.workers[1].request.assert_awaited_once_with("close-tab", {"page_id": "page_1"})
+    assert response == {"page_id": "w1:page_9"}
+    assert await pool.execute("close-tab", {"page_id": "w7:page_1"}) == {"error": "Unknown browser worker: w7"}
+
+
+@pytest.mark.asyncio
+async def test_malformed_worker_reply_resets_connection(pool):
+    worker = pool.workers[1]
+    worker.request.side_effect = ProtocolError("Frame of 999999999 bytes exceeds limit")
+    worker.client.close = AsyncMock()
+
+    response = await pool.execute("close-tab", {"page_id": "w1:page_1"})
+
+    assert response["error"].startswith("Browser worker w1 is unavailable")
+    worker.client.close.assert_awaited_once()
+
+
+def test_worker_events_are_republished_with_owner(pool):
+    received = []
+    pool.event_bus.add_listener(received.append)
+
+    pool._relay(pool.workers[2])({"event": "page.closed", "data": {"page_id": "page_1"}})
+
+    assert received == [{"event": "page.closed", "data": {"page_id": "w2:page_1"}}]
+
+
+@pytest.mark.asyncio
+async def test_front_dispatcher_with_worker_processes(monkeypatch):
+    monkeypatch.setenv("LOG_LEVEL", "WARNING")
+    directory = tempfile.mkdtemp(prefix="pwmcp")
+    manager = BrowserManager(os.path.join(directory, "front.sock"), workers=2)
+    server = asyncio.create_task(manager.start())
+    try:
+        while not manager._listening:
+            await asyncio.sleep(0.05)
+        stats = await manager.execute("stats", {})
+        assert set(stats["workers"]) == {"w0", "w1"}
+        assert await manager.execute("close-tab", {"page_id": "w1:page_1"}) == {"success": False}
+
+        # A worker that dies is replaced
+        worker = manager.workers.by_name["w0"]
+        pid = worker.process.pid
+        worker.process.kill()
+        for _ in range(200):
+            await asyncio.sleep(0.05)
+            if worker.process.pid == pid:
+                continue
+            if await manager.execute("close-tab", {"page_id": "w0:page_1"}) == {"success": False}:
+                break
+        else:
+            pytest.fail("Worker was not restarted")
+    finally:
+        await manager.shutdown()
+        server.cancel()
+        await asyncio.gather(server, return_exceptions=True)
+        shutil.rmtree(directory, ignore_errors=True)
+    assert all(worker.process.returncode is not None for worker in manager.workers.workers)